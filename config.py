@@ -39,6 +39,8 @@ MIN_EBITDA_MULTIPLE = 6.0
 MAX_EBITDA_MULTIPLE = 25.0
 DCF_PROJECTION_YEARS = 8
 TERMINAL_GROWTH_RATE = 0.02  # 2% perpetual growth
+DCF_DISTRIBUTION_PATHS = 2000  # Sampled paths behind a company's DCF valuation range
+DCF_SENSITIVITY_GRID = ('discount_rate', 'terminal_growth')  # Rows x columns of the company detail heat table
 
 # Deal Generation
 NUM_AVAILABLE_DEALS = 5  # Companies available for acquisition each quarter
@@ -56,6 +58,14 @@ MAX_MANAGER_COOPERATIVENESS = 1.0
 EVENT_PROBABILITY = 0.25  # 25% chance of event each quarter (medium difficulty)
 CRISIS_PROBABILITY = 0.1  # 10% of events are crises (medium difficulty)
 
+# Delayed event effects (see game.event_queue)
+LAWSUIT_SETTLEMENT_QUARTERS = (2, 4)  # Quarters until a lawsuit settles
+LAWSUIT_SETTLEMENT_RATE = 0.25  # Settlement as a share of revenue, times crisis severity
+RECALL_RECOVERY_QUARTERS = 4  # Quarters over which a recall's lost revenue partly returns
+RECALL_RECOVERY_SHARE = 0.5  # Share of lost revenue recovered (front-loaded)
+REGULATORY_PHASE_IN_QUARTERS = 3  # Quarters over which an adverse rule takes full effect
+EVENT_MITIGATION_SHARE = 0.5  # Share of a company event's harm undone by an immediate response
+
 # Difficulty Settings (applied at game start)
 DIFFICULTY_SETTINGS = {
     'easy': {
@@ -98,9 +108,61 @@ COST_CUTTING_MAX_IMPACT = 0.15  # Up to 15% margin improvement
 CAPEX_BOOST_MAX_IMPACT = 0.10  # Up to 10% revenue growth boost
 MANAGER_REPLACEMENT_COST = 2_000_000  # $2M
 
+# Analytics / Monte Carlo: operation outcome previews
+OUTCOME_PREVIEW_TRIALS = 5000  # Monte Carlo trials behind operation previews
+OUTCOME_PREVIEW_QUARTERS = 4  # Quarters simulated after the operation in previews
+OUTCOME_COMPARE_CONFIDENCE = 0.95  # Confidence level of intervals when comparing operations
+
+# Analytics / Monte Carlo: exit timing
+EXIT_GRID_HOLDS = (0, 1, 2, 4, 8)  # Extra quarters held compared in the exit grid
+EXIT_GRID_TRIALS = 1000  # Monte Carlo trials behind projected exit values
+EXIT_ADVISOR_HORIZON = 12  # Quarters ahead the exit advisor considers exiting
+EXIT_ADVISOR_TRIALS = 4000  # Simulated paths per company in the exit advisor
+
+# Analytics: deal allocation, screening and comparables
+DEAL_OPTIMIZER_HORIZON = 8  # Holding horizon (quarters) used to score acquisitions
+DEAL_OPTIMIZER_RISK_AVERSION = 0.5  # Penalty per unit of horizon volatility
+DEAL_OPTIMIZER_RESOLUTION = 500  # Budget steps in the knapsack
+DEAL_OPTIMIZER_SHORTLIST = 10  # Ranked candidates shown to the player
+SCREEN_RESULTS_LIMIT = 25  # Matches listed on the screen-deals results page
+COMPS_COUNT = 5  # Comparable companies shown for each company
+COMPS_SECTOR_PENALTY = 2.0  # Extra distance for a comp in another sector
+COMPS_REFERENCE_SEED = 500  # Seed for the S&P 500 reference comps
+COMPS_REFERENCE_VALUATION_RANGE = (10_000_000_000, 2_000_000_000_000)  # S&P 500 comps span large- and mega-cap
+
+# Analytics / Monte Carlo: portfolio risk and stress tests
+RISK_QUARTERS = 4  # Quarters ahead portfolio risk is measured
+RISK_TRIALS = 2000  # Simulated paths behind portfolio risk figures
+RISK_CONFIDENCE = 0.95  # Confidence level of VaR and expected shortfall
+STRESS_TEST_PILOT_SHARE = 0.2  # Share of stress-test trials spent fitting the oversampling
+STRESS_TEST_PILOT_TAIL = 0.1  # Worst share of pilot trials the oversampling is fitted to
+STRESS_TEST_MAX_SHARE = 0.8  # Cap on the stressed events' share of draws each quarter
+
+# Analytics / Monte Carlo: quasi-random sampling (see simulation.qmc)
+SOBOL_SAMPLING = False  # Draw valuation and risk simulations from a scrambled Sobol sequence
+
+# Deal flow (persistent deal book)
+DEAL_FLOW_SLOTS_PER_TIER = 3  # Listings a sector/tier holds when fully stocked
+DEAL_FLOW_REFILL_RATE = 0.4  # Chance each open slot gets a new listing per quarter
+DEAL_FLOW_RIVAL_BID_RATE = 0.10  # Average quarterly chance a rival fund buys a listing
+DEAL_FLOW_AUCTION_QUARTERS = (3, 8)  # Range of quarters before a listing's auction deadline
+DEAL_FLOW_EXCLUSIVE_CHANCE = 0.2  # Chance a new listing opens with an exclusivity window for the player
+DEAL_FLOW_EXCLUSIVITY_QUARTERS = 2  # Quarters rivals are shut out of an exclusive listing
+DEAL_FLOW_RELIST_CHANCE = 0.3  # Chance a withdrawn deal comes back to market
+DEAL_FLOW_RELIST_DELAY = 2  # Quarters a withdrawn deal stays off the market
+DEAL_FLOW_RELIST_DISCOUNT = 0.15  # Asking-price cut when a withdrawn deal is relisted
+DEAL_FLOW_PRICE_CUT = 0.02  # Asking-price cut per quarter a deal sits unsold
+DEAL_FLOW_HISTORY_QUARTERS = 12  # Quarters of revenue/EBITDA history a listing keeps
+
 # Leverage
 MAX_DEBT_TO_EBITDA = 5.0
 DEBT_INTEREST_RATE_SPREAD = 0.02  # 2% over base rate
+ACQUISITION_LOAN_TERM_QUARTERS = 28  # Acquisition loans amortize straight-line over 7 years
+COVENANT_BREACH_REPUTATION_PENALTY = 0.01  # Per company over MAX_DEBT_TO_EBITDA each quarter
+
+# Save Settings
+AUTOSAVE_ENABLED = True  # Snapshot to saves/autosave.json every quarter (background thread)
+ACTION_LOG_KEYFRAME_INTERVAL = 4  # Quarters between full-state keyframes in the action log
 
 # Display Settings
 CURRENCY_DECIMALS = 0
@@ -0,0 +1,199 @@
+"""
+Action log - event-sourced record of every state-changing command.
+
+Each command executed through GameEngine.perform is appended with its
+arguments and the position of the random stream it started from. Keyframes
+(full state snapshots) are taken every few quarters, so the state at any
+point is rebuilt by restoring the nearest earlier keyframe and replaying the
+commands after it.
+"""
+
+import json
+import random
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Callable
+
+from game import save_system
+import config
+
+
+def encode_rng_state(state: tuple) -> list:
+    """Convert random.getstate() into JSON-friendly lists."""
+    version, internal, gauss_next = state
+    return [version, list(internal), gauss_next]
+
+
+def decode_rng_state(data: list) -> tuple:
+    """Inverse of encode_rng_state, suitable for random.setstate()."""
+    version, internal, gauss_next = data
+    return (version, tuple(internal), gauss_next)
+
+
+class ActionLog:
+    """Append-only command log with periodic keyframe snapshots."""
+    
+    def __init__(self, keyframe_interval: int = None):
+        self.keyframe_interval = keyframe_interval or config.ACTION_LOG_KEYFRAME_INTERVAL
+        self.entries: List[Dict[str, Any]] = []
+        self.keyframes: List[Dict[str, Any]] = []
+        
+        # Random state after the last recorded command; a command starting
+        # from the same state does not need its own copy
+        self._rng_after_last: Optional[tuple] = None
+        
+    @property
+    def seq(self) -> int:
+        """Sequence number of the last recorded command (0 if none)."""
+        return len(self.entries)
+        
+    def take_keyframe(self, engine: 'GameEngine') -> None:
+        """Snapshot the full game state and random stream position."""
+        rng_state = random.getstate()
+        self.keyframes.append({
+            'seq': self.seq,
+            'quarter': engine.time_manager.current_quarter,
+            'state': json.dumps(save_system.serialize_game_state(engine)),
+            'rng_state': encode_rng_state(rng_state)
+        })
+        self._rng_after_last = rng_state
+        
+    def record(self, engine: 'GameEngine', action: str, args: Dict[str, Any],
+               handler: Callable[..., Any]) -> Any:
+        """
+        Execute a command and append it to the log.
+        
+        Args:
+            engine: Engine the command runs against
+            action: Command name
+            args: Command arguments (JSON-serializable)
+            handler: Bound _cmd_* method to execute
+            
+        Returns:
+            The handler's result
+        """
+        if not self.keyframes:
+            self.take_keyframe(engine)
+            
+        rng_state = random.getstate()
+        quarter = engine.time_manager.current_quarter
+        
+        result = handler(**args)
+        
+        entry_args = dict(args)
+        if action == 'advance_quarter':
+            # Interactive event responses are only known once the quarter ran
+            entry_args['event_choice'] = result['event_choice']
+            
+        self.entries.append({
+            'seq': self.seq + 1,
+            'quarter': quarter,
+            'action': action,
+            'args': entry_args,
+            'rng_state': None if rng_state == self._rng_after_last else encode_rng_state(rng_state)
+        })
+        self._rng_after_last = random.getstate()
+        
+        if action == 'advance_quarter' and engine.time_manager.current_quarter % self.keyframe_interval == 0:
+            self.take_keyframe(engine)
+            
+        return result
+        
+    def replay(self, seq: int = None) -> 'GameEngine':
+        """
+        Rebuild the game as it was right after command `seq`.
+        
+        The global random state is left untouched, so replaying does not
+        disturb the live game.
+        
+        Args:
+            seq: Sequence number to stop at (defaults to the latest command)
+            
+        Returns:
+            A new headless GameEngine in that state
+        """
+        from game.engine import GameEngine
+        
+        if not self.keyframes:
+            raise ValueError("Action log has no keyframes to replay from")
+            
+        seq = self.seq if seq is None else max(0, min(seq, self.seq))
+        keyframe = self.keyframes[0]
+        for candidate in self.keyframes:
+            if candidate['seq'] <= seq:
+                keyframe = candidate
+                
+        saved_rng = random.getstate()
+        try:
+            state = json.loads(keyframe['state'])
+            engine = GameEngine(difficulty=state['player'].get('difficulty', 'medium'))
+            engine.action_log = None
+            save_system.deserialize_game_state(state, engine)
+            random.setstate(decode_rng_state(keyframe['rng_state']))
+            
+            for entry in self.entries[keyframe['seq']:seq]:
+                if entry['rng_state'] is not None:
+                    random.setstate(decode_rng_state(entry['rng_state']))
+                getattr(engine, f"_cmd_{entry['action']}")(**entry['args'])
+        finally:
+            random.setstate(saved_rng)
+            
+        return engine
+        
+    def seq_at_quarter(self, quarter: int) -> int:
+        """Sequence number of the last command before the quarter ended."""
+        seq = 0
+        for entry in self.entries:
+            if entry['quarter'] > quarter or (
+                entry['quarter'] == quarter and entry['action'] == 'advance_quarter'
+            ):
+                break
+            seq = entry['seq']
+        return seq
+        
+    def state_at_quarter(self, quarter: int) -> 'GameEngine':
+        """Rebuild the game as it stood at the end of a quarter's actions."""
+        return self.replay(self.seq_at_quarter(quarter))
+        
+    def undo(self, engine: 'GameEngine', steps: int = 1) -> None:
+        """
+        Roll the live engine back by a number of commands.
+        
+        Args:
+            engine: Live engine to restore in place
+            steps: Number of commands to undo
+        """
+        seq = max(0, self.seq - steps)
+        restored = self.replay(seq)
+        
+        engine.player = restored.player
+        engine.market = restored.market
+        engine.time_manager = restored.time_manager
+        engine.available_deals = restored.available_deals
+        engine.deal_schedule = restored.deal_schedule
+        engine.event_queue = restored.event_queue
+        
+        del self.entries[seq:]
+        self.keyframes = [k for k in self.keyframes if k['seq'] <= seq]
+        self._rng_after_last = None
+        
+    def dump(self, path: Path) -> None:
+        """Write keyframes and commands as JSON lines."""
+        lines = [json.dumps({'type': 'keyframe', **k}) for k in self.keyframes]
+        lines.extend(json.dumps({'type': 'action', **e}) for e in self.entries)
+        save_system.atomic_write_text(path, "\n".join(lines) + "\n")
+        
+    @classmethod
+    def load(cls, path: Path) -> 'ActionLog':
+        """Read a log written by dump()."""
+        log = cls()
+        with open(path, 'r') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                record_type = record.pop('type')
+                if record_type == 'keyframe':
+                    log.keyframes.append(record)
+                else:
+                    log.entries.append(record)
+        return log
@@ -0,0 +1,381 @@
+"""
+Autosave - quarterly background snapshots plus an action journal.
+
+The game state is snapshotted on the main thread (a cheap copy into plain
+dicts/lists) and written to disk on a worker thread, atomically via temp file
++ rename. Actions taken between snapshots are appended to a small journal of
+after-images of what each action changed (fsynced by the worker), so recovery
+restores the last snapshot and replays the journal.
+"""
+
+import json
+import os
+import threading
+from typing import Dict, Any, Optional, List, Iterable, Callable
+
+from game import save_system
+from game.save_system import GameSaver
+import config
+
+
+AUTOSAVE_NAME = "autosave"
+JOURNAL_SUFFIX = ".journal"
+
+
+# Player fields journaled by value when an action changes them
+JOURNALED_SCALARS = ('fund_name', 'difficulty', 'cash', 'current_debt',
+                     'base_debt_capacity', 'reputation', 'total_taxes_paid',
+                     'next_acquisition_id')
+
+
+class ActionJournal:
+    """Append-only log of state changes made since the last autosave snapshot."""
+    
+    def __init__(self, save_name: str = AUTOSAVE_NAME, on_append: Optional[Callable[[], None]] = None):
+        self.save_name = save_name
+        self.seq = 0
+        self.on_append = on_append  # Called after each append (AutoSaver queues an fsync)
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._base: Optional[Dict[str, Any]] = None
+        
+    @property
+    def path(self):
+        """Path of the journal file (next to the autosave)."""
+        return save_system.SAVES_DIR / f"{self.save_name}{JOURNAL_SUFFIX}"
+        
+    def mark(self, player: 'Player') -> None:
+        """
+        Remember the player's state as the base the next record is a delta of.
+        
+        Called when a snapshot is taken, so records only carry what changed
+        since that snapshot or the previous record.
+        """
+        self._base = {
+            'scalars': {field: getattr(player, field) for field in JOURNALED_SCALARS},
+            'ledger': player.ledger,
+            'ledger_len': len(player.ledger.entries),
+            'ledger_quarter': player.ledger.quarter,
+            'deals': player.deal_history,
+            'deals_len': len(player.deal_history),
+            'debt_book': player.debt_book,
+            'debt_key': _debt_book_key(player.debt_book)
+        }
+        
+    def _player_delta(self, player: 'Player') -> Dict[str, Any]:
+        """Player fields changed since the base (everything if there is none)."""
+        base = self._base or {}
+        scalars = base.get('scalars', {})
+        delta = {'player': {field: getattr(player, field) for field in JOURNALED_SCALARS
+                            if field not in scalars or scalars[field] != getattr(player, field)}}
+        
+        ledger = player.ledger
+        if base.get('ledger') is ledger and len(ledger.entries) >= base['ledger_len']:
+            if len(ledger.entries) > base['ledger_len']:
+                delta['ledger_entries'] = [e.to_list() for e in ledger.entries[base['ledger_len']:]]
+            if ledger.quarter != base['ledger_quarter']:
+                delta['ledger_quarter'] = ledger.quarter
+        else:
+            delta['ledger'] = ledger.to_dict()  # Replaced (e.g. by undo) - rewrite in full
+            
+        deals = player.deal_history
+        if base.get('deals') is deals and len(deals) >= base['deals_len']:
+            if len(deals) > base['deals_len']:
+                delta['deals_added'] = [dict(d) for d in deals[base['deals_len']:]]
+        else:
+            delta['deal_history'] = [dict(d) for d in deals]
+            
+        if base.get('debt_book') is not player.debt_book or base['debt_key'] != _debt_book_key(player.debt_book):
+            delta['debt_book'] = player.debt_book.to_dict()
+            
+        return delta
+        
+    def append(self, action: str, quarter: int, player: 'Player',
+               companies: Iterable['Company'] = (), removed: Iterable[int] = (),
+               deals_removed: Iterable[tuple] = ()) -> int:
+        """
+        Append an action record to the journal.
+        
+        Records carry after-images of what the action changed (player fields,
+        new ledger entries and deals, touched companies) rather than intents,
+        so replay does not depend on the random draws that produced them. The
+        line is flushed to the OS here; fsync is left to the autosave worker.
+        
+        Args:
+            action: Action name (e.g. 'acquisition', 'cost_cutting')
+            quarter: Quarter the action was taken in
+            player: Player after the action
+            companies: Portfolio companies added or modified by the action
+            removed: Acquisition ids of companies that left the portfolio
+            deals_removed: (sector, tier, listing_id) of deals taken off the market
+            
+        Returns:
+            Sequence number of the record
+        """
+        with self._lock:
+            self.seq += 1
+            record = {
+                'seq': self.seq,
+                'action': action,
+                'quarter': quarter,
+                **self._player_delta(player),
+                'companies': [save_system.serialize_portfolio_company(c) for c in companies],
+                'removed': list(removed),
+                'deals_removed': [list(d) for d in deals_removed]
+            }
+            GameSaver.ensure_saves_directory()
+            with open(self.path, 'a') as f:
+                f.write(json.dumps(record) + "\n")
+            self._dirty = True
+            self.mark(player)
+            seq = self.seq
+            
+        if self.on_append:
+            self.on_append()
+        return seq
+        
+    def sync(self) -> None:
+        """Force appended records to disk."""
+        with self._lock:
+            if not self._dirty:
+                return
+            self._dirty = False
+            try:
+                fd = os.open(self.path, os.O_RDONLY)
+            except OSError:
+                return  # Already truncated away by a snapshot
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+                
+    def reset(self) -> None:
+        """Discard the journal (called when a fresh snapshot starts a session)."""
+        with self._lock:
+            self.seq = 0
+            if self.path.exists():
+                self.path.unlink()
+                
+    def read(self, after_seq: int = 0) -> List[Dict[str, Any]]:
+        """
+        Read journal records newer than a snapshot.
+        
+        A torn final line (crash mid-append) is ignored.
+        """
+        records = []
+        try:
+            with open(self.path, 'r') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        break
+                    if record['seq'] > after_seq:
+                        records.append(record)
+        except OSError:
+            pass
+        return records
+        
+    def truncate(self, up_to_seq: int) -> None:
+        """Drop records already covered by a written snapshot."""
+        with self._lock:
+            remaining = self.read(after_seq=up_to_seq)
+            if remaining:
+                lines = "".join(json.dumps(r) + "\n" for r in remaining)
+                tmp_path = self.path.with_suffix(JOURNAL_SUFFIX + ".tmp")
+                with open(tmp_path, 'w') as f:
+                    f.write(lines)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.path)
+            elif self.path.exists():
+                self.path.unlink()
+
+
+class AutoSaver:
+    """Writes quarterly autosave snapshots on a background thread."""
+    
+    def __init__(self, save_name: str = AUTOSAVE_NAME):
+        self.save_name = save_name
+        self.journal = ActionJournal(save_name, on_append=self._request_sync)
+        self.last_error: Optional[Exception] = None
+        
+        self._cond = threading.Condition()
+        self._pending: Optional[Dict[str, Any]] = None
+        self._sync_pending = False
+        self._busy = False
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        
+    def snapshot(self, engine: 'GameEngine') -> None:
+        """
+        Snapshot the game state and queue it for writing.
+        
+        Only the copy into plain data happens on the caller's thread. If a
+        previous snapshot is still queued it is replaced (latest wins).
+        """
+        game_state = save_system.serialize_game_state(engine)
+        game_state['journal_seq'] = self.journal.seq
+        self.journal.mark(engine.player)
+        
+        with self._cond:
+            if self._closed:
+                return
+            self._pending = game_state
+            self._ensure_worker()
+            self._cond.notify()
+            
+    def flush(self, timeout: float = None) -> bool:
+        """Block until queued snapshots are written. Returns False on timeout."""
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: self._pending is None and not self._sync_pending and not self._busy, timeout
+            )
+            
+    def close(self, timeout: float = None) -> None:
+        """Write any queued snapshot and stop the worker thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            
+    def _request_sync(self) -> None:
+        """Queue an fsync of the journal on the worker thread."""
+        with self._cond:
+            if self._closed:
+                self.journal.sync()
+                return
+            self._sync_pending = True
+            self._ensure_worker()
+            self._cond.notify()
+            
+    def _ensure_worker(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+            self._thread.start()
+            
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: self._pending is not None or self._sync_pending or self._closed
+                )
+                if self._pending is None and not self._sync_pending:
+                    return
+                game_state, self._pending = self._pending, None
+                sync, self._sync_pending = self._sync_pending, False
+                self._busy = True
+                
+            try:
+                if sync:
+                    self.journal.sync()
+                if game_state is not None:
+                    self._write(game_state)
+                self.last_error = None
+            except Exception as e:
+                self.last_error = e
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+                    
+    def _write(self, game_state: Dict[str, Any]) -> None:
+        GameSaver.ensure_saves_directory()
+        save_path = save_system.SAVES_DIR / f"{self.save_name}.json"
+        save_system.atomic_write_json(save_path, game_state)
+        
+        GameSaver.update_index(self.save_name, game_state, save_path)
+        
+        self.journal.truncate(game_state['journal_seq'])
+
+
+def apply_journal_record(record: Dict[str, Any], engine: 'GameEngine') -> None:
+    """
+    Apply a journal after-image to the engine.
+    
+    Args:
+        record: Record written by ActionJournal.append
+        engine: GameEngine to update
+    """
+    from models.ledger import FundLedger
+    from models.debt import DebtBook
+    
+    player = engine.player
+    for field, value in record['player'].items():
+        setattr(player, field, value)
+        
+    if 'ledger' in record:
+        player.ledger = FundLedger.from_dict(record['ledger'])
+    else:
+        player.ledger.extend(record.get('ledger_entries', []))
+        player.ledger.quarter = record.get('ledger_quarter', player.ledger.quarter)
+        
+    if 'deal_history' in record:
+        player.deal_history = record['deal_history']
+    else:
+        player.deal_history.extend(record.get('deals_added', []))
+        
+    if 'debt_book' in record:
+        player.debt_book = DebtBook.from_dict(record['debt_book'])
+        
+    portfolio = engine.player.portfolio
+    removed = set(record['removed'])
+    if removed:
+        engine.player.portfolio = portfolio = [c for c in portfolio if c.acquisition_id not in removed]
+        
+    # Companies are matched by acquisition id and deals by listing id, as names can repeat
+    for company_data in record['companies']:
+        company = save_system.deserialize_portfolio_company(company_data)
+        for i, existing in enumerate(portfolio):
+            if existing.acquisition_id == company.acquisition_id:
+                portfolio[i] = company
+                break
+        else:
+            portfolio.append(company)
+            
+    for sector, tier, listing_id in record['deals_removed']:
+        tiers = engine.available_deals.get(sector)
+        if tiers is None or tier not in tiers:
+            continue  # Not in the restored book - nothing to take off the market
+        tiers[tier] = [c for c in tiers[tier] if c.listing_id != listing_id]
+
+
+def _debt_book_key(book: 'DebtBook') -> tuple:
+    """Cheap fingerprint of a debt book, to tell whether an action changed it."""
+    return (book.balance.tobytes(), book.age.tobytes(), tuple(book.company_ids))
+
+
+def recover(engine: 'GameEngine', save_name: str = AUTOSAVE_NAME) -> bool:
+    """
+    Restore the latest autosave and replay journaled actions on top of it.
+    
+    Args:
+        engine: GameEngine to populate
+        save_name: Autosave slot name
+        
+    Returns:
+        True if successful, False otherwise
+    """
+    save_path = save_system.SAVES_DIR / f"{save_name}.json"
+    
+    try:
+        with open(save_path, 'r') as f:
+            game_state = json.load(f)
+        save_system.deserialize_game_state(game_state, engine)
+        
+        journal = ActionJournal(save_name)
+        records = journal.read(after_seq=game_state.get('journal_seq', 0))
+        for record in records:
+            apply_journal_record(record, engine)
+        return True
+    except Exception as e:
+        print(f"Error recovering autosave: {e}")
+        return False
+
+
+def create_autosaver() -> Optional[AutoSaver]:
+    """Create an AutoSaver if autosave is enabled in config."""
+    if not config.AUTOSAVE_ENABLED:
+        return None
+    return AutoSaver()
@@ -2,19 +2,29 @@
 Game Engine - central orchestrator for the PE Simulator.
 """
 
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterable, Tuple
+import copy
 import random
 
 from models.player import Player
 from models.company import Company
 from models.market import Market
 from models.deal import Deal
+from models import ledger
 from game.time_manager import TimeManager
 from game import menus
 from game import events
 from game import input_handlers as ih
+from game.action_log import ActionLog
+from game.event_queue import EventQueue, ScheduledEffect
 from simulation import procedural_gen
 from simulation import portfolio_ops
+from simulation import deal_screen
+from simulation import comps
+from simulation import dcf
+from simulation import dcf_sensitivity
+from simulation import deal_flow
+from simulation.deal_schedule import DealSchedule
 from ui import screens
 import config
 
@@ -35,15 +45,40 @@ class GameEngine:
         # Available companies for acquisition (organized by sector/tier)
         self.available_deals: Dict[str, Dict[str, List[Company]]] = {}
         
+        # Dated sale-process events for the deal book (deadlines, exclusivity, relistings)
+        self.deal_schedule = DealSchedule()
+        
+        # Delayed effects of past events (settlements, recoveries, phase-ins)
+        self.event_queue = EventQueue()
+        
+        # Sorted-array screening index over the deal book (rebuilt when it changes)
+        self._deal_index: Optional[deal_screen.DealIndex] = None
+        
+        # Comparable-company index (built on first use, kept in step with the deal book)
+        self._comps_index: Optional[comps.ComparableIndex] = None
+        
         # Game state
         self.running = True
         
+        # Background autosave (created when an interactive session starts)
+        self.autosaver = None
+        
+        # Event-sourced log of every state-changing command
+        self.action_log = ActionLog()
+        
+        # Asks the player how to respond to events (None when running headless)
+        self.event_responder = None
+        
+        # Whether advancing a quarter draws a fresh deal book (off in projections)
+        self.refresh_deals = True
+        
     def start_game(self) -> None:
         """Start the game and show intro or load menu."""
         # Check if user wants to load a game
         from game.save_system import GameSaver
         
         saves = GameSaver.list_saves()
+        self.event_responder = menus.event_menu
         
         if saves:
             print("\n" + "=" * 70)
@@ -52,8 +87,8 @@ class GameEngine:
             options = ["Start New Game", "Load Saved Game"]
             choice = ih.prompt_choice(options, "What would you like to do?")
             
-            if choice == 1:  # Load game
-                self.load_game_menu()
+            if choice == 1 and self.load_game_menu():  # Load game
+                self.start_autosave()
                 self.main_loop()
                 return
         
@@ -69,6 +104,7 @@ class GameEngine:
         
         screens.show_intro(self.player, self.market)
         self.generate_new_deals()
+        self.start_autosave()
         self.main_loop()
         
     def main_loop(self) -> None:
@@ -81,6 +117,8 @@ class GameEngine:
                     self.running = False
             elif action == 'portfolio':
                 self.view_portfolio()
+            elif action == 'risk':
+                self.view_risk()
             elif action == 'market':
                 self.view_market()
             elif action == 'acquire':
@@ -98,6 +136,8 @@ class GameEngine:
                 self.running = False
                 
         # Game over
+        if self.autosaver:
+            self.autosaver.close()
         self.end_game()
         
     def advance_quarter(self) -> None:
@@ -108,6 +148,143 @@ class GameEngine:
         from ui import screens
         screens.show_quote_screen()
         
+        report = self.perform('advance_quarter')
+        
+        # Display manager performance narratives
+        if report['manager_narratives']:
+            print("\n" + "=" * 70)
+            print("MANAGEMENT REPORTS")
+            print("=" * 70)
+            for company_name, narrative in report['manager_narratives']:
+                print(f"\n📊 {company_name}:")
+                print(f"   {narrative}")
+                
+        # Debt service
+        interest = report['interest']
+        if interest:
+            if not interest['unpaid']:
+                print(f"\nPaid ${interest['paid']:,.0f} in debt interest.")
+            else:
+                if interest['paid'] > 0:
+                    print(f"\nPaid ${interest['paid']:,.0f} in debt interest from cash.")
+                print(f"⚠️  Insufficient cash! ${interest['unpaid']:,.0f} in unpaid interest added to debt.")
+                print(f"Total debt is now ${self.player.current_debt:,.0f}")
+                print(f"📉 Reputation decreased by 2% for missing interest payment (now {interest['reputation']:.0%})")
+            if interest['principal_paid'] > 0:
+                print(f"Repaid ${interest['principal_paid']:,.0f} in scheduled loan principal.")
+            if interest['principal_deferred'] > 0:
+                print(f"⚠️  ${interest['principal_deferred']:,.0f} in scheduled principal deferred (insufficient cash).")
+                
+        for breach in report['covenant_breaches']:
+            print(f"⚠️  Covenant breach at {breach['company']}: debt is {breach['ratio']:.1f}x EBITDA "
+                  f"(limit {config.MAX_DEBT_TO_EBITDA:.1f}x). Reputation -{config.COVENANT_BREACH_REPUTATION_PENALTY:.0%}")
+                
+        reputation_change = report['reputation_change']
+        if reputation_change > 0:
+            print(f"\n📈 Reputation increased by {reputation_change:.1%} from profitable quarter (now {self.player.reputation:.0%})")
+        elif reputation_change < 0:
+            print(f"\n📉 Reputation decreased by {abs(reputation_change):.1%} from unprofitable quarter (now {self.player.reputation:.0%})")
+            
+        for title, description in report['scheduled_effects']:
+            print(f"\n⏱️  {title}: {description}")
+            
+        flow = report['deal_flow']
+        if flow:
+            print(f"\n🤝 Deal flow: {flow['new_listings']} new listings, "
+                  f"{len(flow['bought_by_rivals'])} bought by rival funds, "
+                  f"{len(flow['withdrawn'])} withdrawn at their auction deadline, "
+                  f"{len(flow['relisted'])} back on the market at a lower price.")
+            
+        # Snapshot for the background autosave (written off the main thread)
+        if self.autosaver:
+            self.autosaver.snapshot(self)
+        
+        print(f"\nNow in {self.time_manager.get_time_display()}")
+        print(f"Net Worth: ${self.player.compute_net_worth():,.0f}")
+        
+        ih.press_enter_to_continue()
+        
+    def fork(self) -> 'GameEngine':
+        """
+        Return a cheap, independent headless copy of the game for what-if analysis.
+        
+        Player, market and time are forked; portfolio companies are forked with
+        copy-on-write histories. The deal book's lists are copied but the listed
+        companies are shared (acquiring one forks it). The child has no
+        autosave, action log or interactive event prompts.
+        """
+        child = copy.copy(self)
+        child.player = self.player.fork()
+        child.market = self.market.fork()
+        child.time_manager = self.time_manager.fork()
+        child.deal_schedule = self.deal_schedule.fork()
+        child.event_queue = self.event_queue.fork()
+        child.available_deals = {
+            sector: {tier: list(companies) for tier, companies in tiers.items()}
+            for sector, tiers in self.available_deals.items()
+        }
+        child.autosaver = None
+        child.action_log = None
+        child.event_responder = None
+        return child
+        
+    def what_if(self, actions: Iterable[Tuple[str, Dict[str, Any]]] = (),
+                quarters: int = 4) -> 'GameEngine':
+        """
+        Project the game forward on a fork, leaving this game untouched.
+        
+        Args:
+            actions: (command, args) pairs to apply to the fork first,
+                e.g. [('cost_cutting', {'company': 0, 'intensity': 0.8})]
+            quarters: Quarters to simulate after the actions
+            
+        Returns:
+            The forked engine after the projection
+        """
+        child = self.fork()
+        child.refresh_deals = False
+        
+        for action, args in actions:
+            child.perform(action, **args)
+        for _ in range(quarters):
+            if child.time_manager.is_game_over():
+                break
+            child.perform('advance_quarter')
+        return child
+        
+    def perform(self, action: str, **args) -> Any:
+        """
+        Execute a state-changing command.
+        
+        Every change to game state goes through a _cmd_* method so the action
+        log can record it (with the random stream position) and replay it.
+        
+        Args:
+            action: Command name (dispatches to _cmd_<action>)
+            **args: JSON-serializable command arguments
+            
+        Returns:
+            Whatever the command returns
+        """
+        handler = getattr(self, f"_cmd_{action}")
+        if self.action_log is not None:
+            return self.action_log.record(self, action, args, handler)
+        return handler(**args)
+        
+    def _cmd_advance_quarter(self, event_choice: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Simulate one quarter without any console I/O.
+        
+        Args:
+            event_choice: Response to this quarter's event, used when there is
+                no interactive event_responder (e.g. during replay)
+                
+        Returns:
+            Report with manager narratives, event choice, debt service,
+            covenant breaches and reputation details for display
+        """
+        from simulation import manager_system
+        
         # Calculate profit before quarter simulation
         starting_cash = self.player.cash
         starting_portfolio_value = self.player.compute_portfolio_value()
@@ -131,7 +308,6 @@ class GameEngine:
             company.reset_quarterly_operations()
             
             # Generate manager narrative if noteworthy
-            from simulation import manager_system
             narrative = manager_system.get_quarterly_performance_narrative(
                 company, 
                 performance['manager_impact'], 
@@ -140,74 +316,167 @@ class GameEngine:
             
             if narrative:
                 manager_narratives.append((company.name, narrative))
+                
+        # Effects of earlier events that land this quarter
+        scheduled_effects = self.apply_scheduled_effects()
             
         # Generate random event
         event = events.generate_event(self.player, self.player.portfolio, self.market)
         if event:
-            self.handle_event(event)
-        
-        # Display manager performance narratives
-        if manager_narratives:
-            print("\n" + "=" * 70)
-            print("MANAGEMENT REPORTS")
-            print("=" * 70)
-            for company_name, narrative in manager_narratives:
-                print(f"\n📊 {company_name}:")
-                print(f"   {narrative}")
+            if self.event_responder is not None:
+                event_choice = self.event_responder(event)
+            self.handle_event(event, event_choice)
+        else:
+            event_choice = None
             
-        # Pay interest on debt
+        # Service debt: interest and scheduled principal across all tranches
+        interest_report = None
+        covenant_breaches = []
         if self.player.current_debt > 0:
-            interest = self.player.current_debt * (self.market.get_debt_rate() / 4)
+            interest_report = self.player.service_debt(self.market.get_debt_rate())
             
-            if self.player.cash >= interest:
-                # Can afford to pay interest
-                self.player.adjust_cash(-interest)
-                print(f"\nPaid ${interest:,.0f} in debt interest.")
-            else:
-                # Cannot afford interest - capitalize it into debt
-                unpaid_interest = interest - self.player.cash
-                
-                if self.player.cash > 0:
-                    # Pay what we can
-                    paid_amount = self.player.cash
-                    self.player.adjust_cash(-paid_amount)
-                    print(f"\nPaid ${paid_amount:,.0f} in debt interest from cash.")
-                
-                # Add unpaid interest to debt
-                self.player.current_debt += unpaid_interest
-                print(f"⚠️  Insufficient cash! ${unpaid_interest:,.0f} in unpaid interest added to debt.")
-                print(f"Total debt is now ${self.player.current_debt:,.0f}")
-                
-                # This hurts reputation
+            if interest_report['unpaid'] > 0:
+                # Missing an interest payment hurts reputation
                 self.player.adjust_reputation(-0.02)
-                print(f"📉 Reputation decreased by 2% for missing interest payment (now {self.player.reputation:.0%})")
+                interest_report['reputation'] = self.player.reputation
+                
+            # Leverage covenants are tested on every company loan at once
+            covenant_breaches = self.player.covenant_breaches()
+            if covenant_breaches:
+                self.player.adjust_reputation(
+                    -config.COVENANT_BREACH_REPUTATION_PENALTY * len(covenant_breaches)
+                )
         
         # Calculate quarterly profit and update reputation
         ending_cash = self.player.cash
         ending_portfolio_value = self.player.compute_portfolio_value()
         
         quarterly_profit = (ending_cash - starting_cash) + (ending_portfolio_value - starting_portfolio_value)
+        if interest_report:
+            # Principal repaid reduces debt one-for-one, so it is not a loss
+            quarterly_profit += interest_report['principal_paid']
         reputation_change = self.player.update_reputation_from_profits(quarterly_profit)
         
-        if reputation_change > 0:
-            print(f"\n📈 Reputation increased by {reputation_change:.1%} from profitable quarter (now {self.player.reputation:.0%})")
-        elif reputation_change < 0:
-            print(f"\n📉 Reputation decreased by {abs(reputation_change):.1%} from unprofitable quarter (now {self.player.reputation:.0%})")
-            
-        # Generate new acquisition opportunities
-        self.generate_new_deals()
-        
         # Advance time
         self.time_manager.advance_quarter()
+        self.player.ledger.quarter = self.time_manager.current_quarter
+        
+        # Age the deal book: rivals buy, deadlines pass, new deals arrive
+        deal_flow_report = None
+        if self.refresh_deals:
+            deal_flow_report = self.advance_deal_flow()
+        
+        return {
+            'manager_narratives': manager_narratives,
+            'event_choice': event_choice,
+            'scheduled_effects': scheduled_effects,
+            'interest': interest_report,
+            'covenant_breaches': covenant_breaches,
+            'reputation_change': reputation_change,
+            'deal_flow': deal_flow_report
+        }
         
-        print(f"\nNow in {self.time_manager.get_time_display()}")
-        print(f"Net Worth: ${self.player.compute_net_worth():,.0f}")
+    def start_autosave(self) -> None:
+        """Start a fresh autosave session from the current state."""
+        from game import autosave
         
-        ih.press_enter_to_continue()
+        self.autosaver = autosave.create_autosaver()
+        if self.autosaver:
+            self.autosaver.journal.reset()
+            self.autosaver.snapshot(self)
+            
+    def _journal_action(self, action: str, companies: List[Company] = (),
+                        removed: List[int] = (), deals_removed: List[tuple] = ()) -> None:
+        """Record a state-changing action in the autosave journal."""
+        if self.autosaver:
+            self.autosaver.journal.append(
+                action, self.time_manager.current_quarter, self.player,
+                companies=companies, removed=removed, deals_removed=deals_removed
+            )
+            
+    def _locate_available_deal(self, company: Company) -> Optional[tuple]:
+        """
+        Find a company in the deal book.
+        
+        Returns:
+            (sector, tier, index) of the deal, or None if not listed
+        """
+        for sector, tiers in self.available_deals.items():
+            for tier, companies in tiers.items():
+                for index, listed in enumerate(companies):
+                    if listed is company:
+                        return (sector, tier, index)
+        return None
+        
+    def screen_deals(self, **criteria) -> List[tuple]:
+        """
+        Query the deal book through its screening index.
+        
+        Args:
+            **criteria: Keyword arguments for DealIndex.query
+            
+        Returns:
+            Matching listings as (sector, tier, index, company) tuples
+        """
+        if self._deal_index is None or not self._deal_index.is_current(self.available_deals):
+            self._deal_index = deal_screen.DealIndex(self.available_deals)
+        return self._deal_index.query(**criteria)
+        
+    def dcf_range(self, company: Company) -> Dict[str, Any]:
+        """
+        DCF valuation range for a company under the current market.
+        
+        Returns:
+            dcf.calculate_dcf_distribution result
+        """
+        return dcf.calculate_dcf_distribution(company, self.market)
+        
+    def dcf_sensitivity(self, company: Company) -> Dict[str, Any]:
+        """
+        DCF sensitivity grid and tornado for a company under the current market.
+        
+        Returns:
+            dcf_sensitivity.sensitivity_report result
+        """
+        return dcf_sensitivity.sensitivity_report(company, self.market)
+        
+    def find_comps(self, company: Company, k: int = None) -> Dict[str, Any]:
+        """
+        Nearest comparable companies from the deal book and S&P 500 reference set.
+        
+        Args:
+            company: Company to value
+            k: Number of comps (defaults to config.COMPS_COUNT)
+            
+        Returns:
+            ComparableIndex.query result
+        """
+        if self._comps_index is None:
+            self._comps_index = comps.ComparableIndex()
+        self._comps_index.sync(self.available_deals)
+        return self._comps_index.query(company, k)
         
     def generate_new_deals(self) -> None:
         """Generate new companies available for acquisition organized by sector and tier."""
         self.available_deals = procedural_gen.generate_tiered_deal_portfolio(self.market)
+        self.deal_schedule = deal_flow.open_deal_book(self.available_deals, self.time_manager.current_quarter)
+        
+    def advance_deal_flow(self) -> Dict[str, Any]:
+        """
+        Move the deal book on by a quarter (or generate one if there is none).
+        
+        Returns:
+            deal_flow.advance_deal_book report, without the new book
+        """
+        if not self.available_deals:
+            self.generate_new_deals()
+            return {'bought_by_rivals': [], 'withdrawn': [], 'relisted': [], 'new_listings': 0}
+            
+        report = deal_flow.advance_deal_book(
+            self.available_deals, self.market, self.deal_schedule, self.time_manager.current_quarter
+        )
+        self.available_deals = report.pop('deals')
+        return report
         
     def handle_acquisition(self) -> None:
         """Handle company acquisition flow with hierarchical navigation."""
@@ -216,6 +485,14 @@ class GameEngine:
             sector = menus.sector_selection_menu()
             if sector is None:
                 return
+            if sector == menus.SUGGESTED_DEALS:
+                if self.handle_suggested_deals():
+                    return
+                continue
+            if sector == menus.SCREEN_DEALS:
+                if self.handle_deal_screen():
+                    return
+                continue
             
             # Step 2: Select valuation tier
             while True:
@@ -227,7 +504,7 @@ class GameEngine:
                 companies = self.available_deals.get(sector, {}).get(tier, [])
                 
                 if not companies:
-                    print(f"\nNo companies available in this tier right now.")
+                    print("\nNo companies available in this tier right now.")
                     ih.press_enter_to_continue()
                     continue
                 
@@ -237,85 +514,138 @@ class GameEngine:
                     if company is None:
                         break  # Back to tier selection
                     
-                    # Show company details
-                    ih.clear_screen()
-                    print("=" * 70)
-                    print(f"COMPANY DETAILS: {company.name}")
-                    print("=" * 70)
-                    from ui import table_views
-                    table_views.display_company_detail(company)
+                    status = self._review_acquisition(company)
+                    if status == 'acquired':
+                        return  # Exit acquisition flow
+                    if status == 'unaffordable':
+                        continue
+                    break  # Back to company selection
                     
-                    # Check if player can afford
-                    max_affordable = self.player.cash + (self.player.get_debt_capacity() - self.player.current_debt)
+    def handle_suggested_deals(self) -> bool:
+        """
+        Browse the deal optimizer's shortlist.
+        
+        Returns:
+            True if a company was acquired
+        """
+        from simulation import deal_optimizer
+        
+        while True:
+            plan = deal_optimizer.optimize_deals(self.available_deals, self.player, self.market)
+            candidate = menus.suggested_deals_menu(plan)
+            if candidate is None:
+                return False
+            if self._review_acquisition(candidate['company']) == 'acquired':
+                return True
+                
+    def handle_deal_screen(self) -> bool:
+        """
+        Filter the deal book by criteria and browse the matches.
+        
+        Returns:
+            True if a company was acquired
+        """
+        criteria = menus.screen_deals_menu()
+        if criteria is None:
+            return False
+            
+        while True:
+            results = self.screen_deals(**criteria)
+            company = menus.screen_results_menu(results)
+            if company is None:
+                return False
+            if self._review_acquisition(company) == 'acquired':
+                return True
+                
+    def _review_acquisition(self, company: Company) -> str:
+        """
+        Show a listed company's details and negotiate its purchase.
+        
+        Returns:
+            'acquired', 'unaffordable', or 'declined'
+        """
+        # Show company details
+        ih.clear_screen()
+        print("=" * 70)
+        print(f"COMPANY DETAILS: {company.name}")
+        print("=" * 70)
+        from ui import table_views
+        valuation_range = self.dcf_range(company)
+        table_views.display_company_detail(company, comps=self.find_comps(company), dcf=valuation_range,
+                                           sensitivity=self.dcf_sensitivity(company))
+        
+        # Where the sale process stands
+        quarter = self.time_manager.current_quarter
+        exclusive_until = self.deal_schedule.exclusive_until.get(company.listing_id)
+        deadline = self.deal_schedule.deadlines.get(company.listing_id)
+        if exclusive_until is not None:
+            print(f"\n🔒 Exclusive to you for {exclusive_until - quarter} more quarter(s) - rival funds cannot bid.")
+        if deadline is not None:
+            print(f"⏳ The auction closes in {deadline - quarter} quarter(s).")
+        
+        # Check if player can afford
+        max_affordable = self.player.cash + (self.player.get_debt_capacity() - self.player.current_debt)
+        
+        if company.current_valuation > max_affordable:
+            print(f"\n⚠️  This company costs ${company.current_valuation:,.0f}")
+            print(f"Your maximum capital (cash + available debt): ${max_affordable:,.0f}")
+            print("\nYou cannot afford this acquisition. Build your reputation and net worth!")
+            ih.press_enter_to_continue()
+            return 'unaffordable'
+            
+        # Negotiate
+        if ih.prompt_yes_no("Proceed with acquisition?"):
+            deal = Deal(company, deal_type='acquisition')
+            
+            # Simple negotiation
+            while not deal.deal_closed:
+                action = menus.deal_negotiation_menu(deal, self.player, dcf=valuation_range)
+                
+                if action == 'accept':
+                    result = deal.accept_asking_price()
+                    print(f"\n{result['message']}")
                     
-                    if company.current_valuation > max_affordable:
-                        print(f"\n⚠️  This company costs ${company.current_valuation:,.0f}")
-                        print(f"Your maximum capital (cash + available debt): ${max_affordable:,.0f}")
-                        print("\nYou cannot afford this acquisition. Build your reputation and net worth!")
+                    if result['accepted']:
+                        self.complete_acquisition(company, result['final_price'])
+                        
                         ih.press_enter_to_continue()
+                        return 'acquired'
+                        
+                    ih.press_enter_to_continue()
+                    break
+                    
+                elif action == 'offer':
+                    max_offer = self.player.available_capital()
+                    offer = ih.prompt_number(
+                        "Enter your offer",
+                        min_value=0,
+                        max_value=max_offer,
+                        allow_float=False
+                    )
+                    
+                    if offer is None:
                         continue
+                        
+                    result = deal.make_offer(offer)
+                    print(f"\n{result['message']}")
                     
-                    # Negotiate
-                    if ih.prompt_yes_no("Proceed with acquisition?"):
-                        deal = Deal(company, deal_type='acquisition')
+                    if result['accepted']:
+                        self.complete_acquisition(company, result['final_price'])
                         
-                        # Simple negotiation
-                        while not deal.deal_closed:
-                            action = menus.deal_negotiation_menu(deal, self.player)
-                            
-                            if action == 'accept':
-                                result = deal.accept_asking_price()
-                                print(f"\n{result['message']}")
-                                
-                                if result['accepted']:
-                                    self.complete_acquisition(company, result['final_price'])
-                                    
-                                    # Remove from available deals
-                                    if company in companies:
-                                        companies.remove(company)
-                                    
-                                    ih.press_enter_to_continue()
-                                    return  # Exit acquisition flow
-                                
-                                ih.press_enter_to_continue()
-                                break
-                                
-                            elif action == 'offer':
-                                max_offer = self.player.available_capital()
-                                offer = ih.prompt_number(
-                                    "Enter your offer",
-                                    min_value=0,
-                                    max_value=max_offer,
-                                    allow_float=False
-                                )
-                                
-                                if offer is None:
-                                    continue
-                                    
-                                result = deal.make_offer(offer)
-                                print(f"\n{result['message']}")
-                                
-                                if result['accepted']:
-                                    self.complete_acquisition(company, result['final_price'])
-                                    
-                                    # Remove from available deals
-                                    if company in companies:
-                                        companies.remove(company)
-                                    
-                                    ih.press_enter_to_continue()
-                                    return
-                                elif 'counter_offer' in result:
-                                    deal.asking_price = result['counter_offer']
-                                ih.press_enter_to_continue()
-                                
-                            else:  # walk away
-                                result = deal.walk_away()
-                                print(f"\n{result['message']}")
-                                ih.press_enter_to_continue()
-                                break
+                        ih.press_enter_to_continue()
+                        return 'acquired'
+                    elif 'counter_offer' in result:
+                        deal.asking_price = result['counter_offer']
+                    ih.press_enter_to_continue()
                     
-                    break  # Back to company selection
+                else:  # walk away
+                    result = deal.walk_away()
+                    print(f"\n{result['message']}")
+                    ih.press_enter_to_continue()
+                    break
                     
+        return 'declined'
+        
     def complete_acquisition(self, company: Company, price: float) -> None:
         """Complete an acquisition transaction with player-chosen financing."""
         # Calculate available resources
@@ -332,7 +662,7 @@ class GameEngine:
         print("FINANCING STRUCTURE")
         print("=" * 70)
         print(f"\nPurchase Price: ${price:,.0f}")
-        print(f"\nAvailable Resources:")
+        print("\nAvailable Resources:")
         print(f"  Cash Available:        ${available_cash:,.0f}")
         print(f"  Debt Capacity:         ${available_debt:,.0f}")
         print(f"  Total Available:       ${max_affordable:,.0f}")
@@ -370,7 +700,7 @@ class GameEngine:
         print(f"\nPurchase Price:  ${price:,.0f}")
         print(f"  Cash:          ${cash_to_use:,.0f} ({cash_to_use/price:.1%})")
         print(f"  Debt:          ${debt_to_use:,.0f} ({debt_to_use/price:.1%})")
-        print(f"\nAfter Transaction:")
+        print("\nAfter Transaction:")
         print(f"  Remaining Cash:     ${available_cash - cash_to_use:,.0f}")
         print(f"  Total Debt:         ${self.player.current_debt + debt_to_use:,.0f}")
         print(f"  Debt Utilization:   {(self.player.current_debt + debt_to_use) / self.player.get_debt_capacity():.1%}")
@@ -381,27 +711,23 @@ class GameEngine:
             return
         
         # Execute the transaction
-        if debt_to_use > 0:
-            if not self.player.take_debt(debt_to_use):
-                print("\nFailed to secure debt financing!")
-                return
+        location = self._locate_available_deal(company)
+        if location is None:
+            print("\nThis company is no longer available!")
+            return
         
-        self.player.adjust_cash(-price)
+        sector, tier, index = location
+        company = self.perform('acquisition', sector=sector, tier=tier, index=index,
+                               price=price, debt=debt_to_use)
+        if company is None:
+            print("\nFailed to secure debt financing!")
+            return
         debt_used = debt_to_use
-                
-        # Add company to portfolio
-        company.acquisition_price = price
-        company.acquisition_quarter = self.time_manager.current_quarter
-        self.player.add_company(company)
         
-        # Remove from available deals
-        if company in self.available_deals:
-            self.available_deals.remove(company)
-            
-        # Record deal
-        self.player.record_deal('acquisition', company.name, price, self.time_manager.current_quarter)
+        self._journal_action('acquisition', companies=[company],
+                             deals_removed=[(sector, tier, company.listing_id)])
         
-        print(f"\nAcquisition completed!")
+        print("\nAcquisition completed!")
         print(f"Purchase price: ${price:,.0f}")
         if debt_used > 0:
             print(f"Debt used: ${debt_used:,.0f}")
@@ -422,21 +748,24 @@ class GameEngine:
             elif action == 'cost_cutting':
                 self.handle_cost_cutting(company)
                 # Mark company as operated
-                company.mark_operated(self.time_manager.current_quarter)
+                self.perform('mark_operated', company=self.player.portfolio.index(company))
                 break  # Exit after one operation
             elif action == 'capex':
                 self.handle_capex_investment(company)
-                company.mark_operated(self.time_manager.current_quarter)
+                self.perform('mark_operated', company=self.player.portfolio.index(company))
                 break
             elif action == 'replace_mgmt':
                 self.handle_management_replacement(company)
-                company.mark_operated(self.time_manager.current_quarter)
+                self.perform('mark_operated', company=self.player.portfolio.index(company))
                 break
             elif action == 'strategy':
                 self.handle_growth_strategy(company)
-                company.mark_operated(self.time_manager.current_quarter)
+                self.perform('mark_operated', company=self.player.portfolio.index(company))
                 break
                 
+        if action != 'back':
+            self._journal_action(action, companies=[company])
+                
     def handle_cost_cutting(self, company: Company) -> None:
         """Handle cost cutting operation with narrative."""
         print("\n" + "=" * 70)
@@ -462,15 +791,8 @@ class GameEngine:
         print("PROJECTED IMPACT")
         print("=" * 70)
         
-        # Estimate the impact
-        estimated_margin_improvement = intensity_normalized * 0.10  # Up to 10%
-        estimated_growth_penalty = intensity_normalized * 0.08  # Up to 8%
-        estimated_health_damage = intensity_normalized * 0.25  # Up to 25%
-        
         print(f"\nExpected Results for {intensity}% intensity:")
-        print(f"  • EBITDA Margin:  {company.ebitda_margin:.1%} → {company.ebitda_margin + estimated_margin_improvement:.1%} (+{estimated_margin_improvement:.1%})")
-        print(f"  • Growth Rate:    {company.growth_rate:+.1%} → {company.growth_rate - estimated_growth_penalty:+.1%} (-{estimated_growth_penalty:.1%})")
-        print(f"  • Health:         {company.operational_health:.0%} → {max(0, company.operational_health - estimated_health_damage):.0%} (-{estimated_health_damage:.0%})")
+        self._show_outcome_preview(company, 'cost_cutting', intensity=intensity_normalized)
         
         if intensity_normalized > 0.7:
             print(f"\n⚠️  WARNING: High intensity cost-cutting!")
@@ -485,7 +807,8 @@ class GameEngine:
             ih.press_enter_to_continue()
             return
         
-        result = portfolio_ops.apply_cost_cutting(company, intensity_normalized)
+        result = self.perform('cost_cutting', company=self.player.portfolio.index(company),
+                              intensity=intensity_normalized)
         
         # Display narrative
         print("\n" + "=" * 70)
@@ -520,7 +843,6 @@ class GameEngine:
             print(f"   Additional growth penalty from poor employee morale")
             
         if result.get('reputation_hit', 0) > 0:
-            self.player.adjust_reputation(-result['reputation_hit'])
             print(f"\n📉 REPUTATION IMPACT:")
             print(f"   Your reputation decreased by {result['reputation_hit']:.1%}")
             print(f"   (Now at {self.player.reputation:.0%})")
@@ -533,13 +855,44 @@ class GameEngine:
             
         ih.press_enter_to_continue()
         
-    def choose_financing(self, amount: float, operation_name: str) -> tuple[bool, float]:
+    def _show_outcome_preview(self, company: Company, operation: str, **params) -> None:
+        """Print Monte Carlo percentile bands for an operation before it runs."""
+        from simulation import outcome_preview
+        
+        preview = outcome_preview.preview_operation(company, self.market, operation, **params)
+        bands = preview['bands']
+        
+        print(f"\n  Simulated outcomes ({preview['trials']:,} trials, {preview['quarters']} quarters ahead):")
+        print(f"  {'':<18}{'Now':>14}{'Low (P10)':>14}{'Median':>14}{'High (P90)':>14}")
+        
+        def signed_dollars(value):
+            return f"{'-' if value < 0 else '+'}${abs(value):,.0f}"
+            
+        rows = [
+            ("EBITDA Margin", company.ebitda_margin, bands['margin'], "{:.1%}".format),
+            ("Growth Rate", company.growth_rate, bands['growth'], "{:+.1%}".format),
+            ("Health", company.operational_health, bands['health'], "{:.0%}".format),
+            ("Valuation", company.current_valuation, bands['valuation'], "${:,.0f}".format),
+            ("vs. No Action", None, bands['valuation_vs_baseline'], signed_dollars),
+        ]
+        if 'cost' in bands:
+            rows.append(("Cost", None, bands['cost'], "${:,.0f}".format))
+            
+        for label, now, band, fmt in rows:
+            now_text = fmt(now) if now is not None else ""
+            print(f"  {label:<18}{now_text:>14}{fmt(band['p10']):>14}"
+                  f"{fmt(band['p50']):>14}{fmt(band['p90']):>14}")
+            
+    def choose_financing(self, amount: float, operation_name: str, kind: str = ledger.OTHER,
+                         company: str = None) -> tuple[bool, float]:
         """
         Let player choose financing for an operation.
         
         Args:
             amount: Total amount needed
             operation_name: Name of operation (for display)
+            kind: Ledger flow kind the spend is recorded under
+            company: Name of the company the spend is for
             
         Returns:
             (success, debt_used) tuple
@@ -558,6 +911,7 @@ class GameEngine:
         if amount <= available_cash:
             print(f"\nYou have sufficient cash (${available_cash:,.0f}) to pay all ${amount:,.0f}")
             if ih.prompt_yes_no("Use all cash (no debt)?"):
+                self.perform('financing', amount=amount, debt=0, kind=kind, company=company)
                 return (True, 0)
         
         # Show financing dialog
@@ -600,12 +954,11 @@ class GameEngine:
             return (False, 0)
         
         # Execute financing
-        if debt_to_use > 0:
-            if not self.player.take_debt(debt_to_use):
-                print("\nFailed to secure debt!")
-                return (False, 0)
+        if not self.perform('financing', amount=amount, debt=debt_to_use, kind=kind,
+                            company=company):
+            print("\nFailed to secure debt!")
+            return (False, 0)
         
-        self.player.adjust_cash(-amount)
         return (True, debt_to_use)
     
     def handle_capex_investment(self, company: Company) -> None:
@@ -635,16 +988,12 @@ class GameEngine:
         print("PROJECTED IMPACT")
         print("=" * 70)
         
-        # Estimate impact
         investment_ratio = amount / company.revenue
-        estimated_growth_boost = investment_ratio * 0.05  # ~5% per revenue-dollar invested
-        estimated_health_improvement = min(0.15, investment_ratio * 0.10)  # Up to 15%
         
         print(f"\nExpected Results for ${amount:,.0f} investment:")
         print(f"  • Investment/Revenue ratio: {investment_ratio:.1%}")
-        print(f"  • Growth Rate:   {company.growth_rate:+.1%} → {company.growth_rate + estimated_growth_boost:+.1%} (+{estimated_growth_boost:.1%})")
-        print(f"  • Health:        {company.operational_health:.0%} → {min(1.0, company.operational_health + estimated_health_improvement):.0%} (+{estimated_health_improvement:.0%})")
         print(f"  • Cost:          ${amount:,.0f}")
+        self._show_outcome_preview(company, 'capex', amount=amount)
         
         print("\n" + "=" * 70)
         
@@ -654,14 +1003,15 @@ class GameEngine:
             return
         
         # Choose financing
-        success, debt_used = self.choose_financing(amount, "CapEx Investment")
+        success, debt_used = self.choose_financing(amount, "CapEx Investment",
+                                                   ledger.CAPEX, company.name)
         
         if not success:
             print("\nInvestment cancelled.")
             ih.press_enter_to_continue()
             return
             
-        result = portfolio_ops.apply_capex_investment(company, amount)
+        result = self.perform('capex', company=self.player.portfolio.index(company), amount=amount)
         
         print(f"\n{result['message']}")
         if debt_used > 0:
@@ -739,7 +1089,9 @@ class GameEngine:
         # Choose financing
         success, debt_used = self.choose_financing(
             config.MANAGER_REPLACEMENT_COST, 
-            "Management Replacement"
+            "Management Replacement",
+            ledger.MANAGEMENT,
+            company.name
         )
         
         if not success:
@@ -747,7 +1099,13 @@ class GameEngine:
             ih.press_enter_to_continue()
             return
             
-        result = portfolio_ops.replace_management(company, self.player, selected_manager)
+        result = self.perform('replace_management', company=self.player.portfolio.index(company),
+                              manager={
+                                  'name': selected_manager.name,
+                                  'competence': selected_manager.competence,
+                                  'risk_profile': selected_manager.risk_profile,
+                                  'cooperativeness': selected_manager.cooperativeness
+                              })
         
         if result['success']:
             # Display firing narrative
@@ -840,6 +1198,8 @@ class GameEngine:
             print(f"  • Health Impact:     +2% to +6%")
             print(f"\n🛡️  DEFENSIVE, REDUCES VOLATILITY")
         
+        self._show_outcome_preview(company, 'strategy', strategy=strategy)
+        
         print("\n" + "=" * 70)
         
         if not ih.prompt_yes_no("Proceed with this growth strategy?"):
@@ -847,7 +1207,8 @@ class GameEngine:
             ih.press_enter_to_continue()
             return
         
-        result = portfolio_ops.pursue_acquisition_strategy(company, strategy)
+        result = self.perform('growth_strategy', company=self.player.portfolio.index(company),
+                              strategy=strategy)
         
         if result.get('cost'):
             strategy_names = {
@@ -859,7 +1220,9 @@ class GameEngine:
             # Choose financing
             success, debt_used = self.choose_financing(
                 result['cost'], 
-                strategy_names.get(strategy, 'Growth Strategy')
+                strategy_names.get(strategy, 'Growth Strategy'),
+                ledger.STRATEGY,
+                company.name
             )
             
             if not success:
@@ -874,7 +1237,7 @@ class GameEngine:
         
     def exit_investment(self) -> None:
         """Handle investment exit."""
-        company = menus.exit_menu(self.player, self.market)
+        company = menus.exit_menu(self.player, self.market, self.time_manager.current_quarter)
         
         if company is None:
             return
@@ -898,17 +1261,16 @@ class GameEngine:
             proceeds_after_tax = deal.asking_price - tax_owed
             print(f"Net Proceeds (after tax): ${proceeds_after_tax:,.0f}")
         
+        loan_balance = self.player.debt_book.company_balance(company.acquisition_id)
+        if loan_balance > 0:
+            print(f"Acquisition loans to repay from proceeds: ${loan_balance:,.0f}")
+        
         if ih.prompt_yes_no("Accept this offer?"):
             # Complete exit
-            self.player.adjust_cash(deal.asking_price)
-            
-            # Pay taxes on gains
-            if tax_owed > 0:
-                self.player.pay_taxes(tax_owed)
-            
-            self.player.remove_company(company)
-            self.player.record_deal('exit', company.name, deal.asking_price, 
-                                  self.time_manager.current_quarter)
+            debt_before = self.player.current_debt
+            tax_owed = self.perform('exit', company=self.player.portfolio.index(company),
+                                    price=deal.asking_price)
+            self._journal_action('exit', removed=[company.acquisition_id])
             
             print(f"\nInvestment exited successfully!")
             print(f"Gross Proceeds: ${deal.asking_price:,.0f}")
@@ -917,9 +1279,107 @@ class GameEngine:
                 print(f"Net Proceeds: ${deal.asking_price - tax_owed:,.0f}")
             else:
                 print(f"Net Proceeds: ${deal.asking_price:,.0f} (no tax on loss)")
+            if loan_balance > 0:
+                print(f"Loans Repaid: ${debt_before - self.player.current_debt:,.0f}")
             
         ih.press_enter_to_continue()
         
+    def _cmd_acquisition(self, sector: str, tier: str, index: int, price: float,
+                         debt: float = 0) -> Optional[Company]:
+        """
+        Buy a listed company.
+        
+        Listings may be shared with forked games, so the portfolio receives
+        its own copy of the company.
+        
+        Returns:
+            The acquired portfolio company, or None if debt financing fails
+        """
+        company = self.available_deals[sector][tier][index].fork()
+        company.acquisition_id = self.player.new_acquisition_id()
+        
+        # Acquisition debt is a loan secured on (and amortized by) the company
+        if debt > 0:
+            if not self.player.take_debt(debt, company=company.acquisition_id):
+                return None
+        
+        self.player.adjust_cash(-price, ledger.ACQUISITION, company.name)
+        
+        # Add company to portfolio
+        company.acquisition_price = price
+        company.acquisition_quarter = self.time_manager.current_quarter
+        self.player.add_company(company)
+        
+        # Remove from available deals
+        del self.available_deals[sector][tier][index]
+        
+        # Record deal
+        self.player.record_deal('acquisition', company.name, price, self.time_manager.current_quarter)
+        return company
+        
+    def _cmd_financing(self, amount: float, debt: float = 0, kind: str = ledger.OTHER,
+                       company: str = None) -> bool:
+        """Pay for an operation with cash plus optional debt."""
+        if debt > 0:
+            if not self.player.take_debt(debt):
+                return False
+        
+        self.player.adjust_cash(-amount, kind, company)
+        return True
+        
+    def _cmd_cost_cutting(self, company: int, intensity: float) -> Dict[str, Any]:
+        """Cost cutting on the portfolio company at the given index."""
+        result = portfolio_ops.apply_cost_cutting(self.player.portfolio[company], intensity)
+        if result.get('reputation_hit', 0) > 0:
+            self.player.adjust_reputation(-result['reputation_hit'])
+        return result
+        
+    def _cmd_capex(self, company: int, amount: float) -> Dict[str, Any]:
+        """Capex investment in the portfolio company at the given index."""
+        return portfolio_ops.apply_capex_investment(self.player.portfolio[company], amount)
+        
+    def _cmd_replace_management(self, company: int, manager: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Install a new manager (given by attributes) at the portfolio company.
+        
+        The base fee is paid beforehand through a 'financing' command, so only a
+        difficult-termination surcharge is charged here.
+        """
+        from models.manager import Manager
+        
+        return portfolio_ops.replace_management(
+            self.player.portfolio[company], self.player, Manager(**manager), fee_paid=True
+        )
+        
+    def _cmd_growth_strategy(self, company: int, strategy: str) -> Dict[str, Any]:
+        """Pursue a growth strategy at the portfolio company at the given index."""
+        return portfolio_ops.pursue_acquisition_strategy(self.player.portfolio[company], strategy)
+        
+    def _cmd_mark_operated(self, company: int) -> None:
+        """Use up this quarter's operation on the portfolio company."""
+        self.player.portfolio[company].mark_operated(self.time_manager.current_quarter)
+        
+    def _cmd_exit(self, company: int, price: float) -> float:
+        """
+        Sell a portfolio company. Returns the capital gains tax paid.
+        
+        Loans secured on the company are repaid from the proceeds after tax.
+        """
+        company = self.player.portfolio[company]
+        tax_owed = self.player.calculate_capital_gains_tax(price, company.acquisition_price)
+        
+        self.player.adjust_cash(price, ledger.EXIT, company.name)
+        
+        # Pay taxes on gains
+        if tax_owed > 0:
+            self.player.pay_taxes(tax_owed)
+            
+        self.player.repay_company_debt(company)
+        
+        self.player.remove_company(company)
+        self.player.record_deal('exit', company.name, price, self.time_manager.current_quarter)
+        return tax_owed
+        
     def view_portfolio(self) -> None:
         """View portfolio in detail."""
         company = menus.portfolio_menu(self.player)
@@ -927,33 +1387,48 @@ class GameEngine:
         if company:
             ih.clear_screen()
             from ui import table_views
-            table_views.display_company_detail(company)
+            table_views.display_company_detail(company, comps=self.find_comps(company),
+                                               dcf=self.dcf_range(company),
+                                               sensitivity=self.dcf_sensitivity(company))
+            ih.press_enter_to_continue()
+            
+    def view_risk(self) -> None:
+        """Show Value-at-Risk for the portfolio and its debt, optionally stress-tested."""
+        from simulation import portfolio_risk
+        from ui import table_views
+        
+        ih.clear_screen()
+        if not self.player.portfolio and self.player.current_debt <= 0:
+            print("\nNo portfolio companies or debt to analyze.")
             ih.press_enter_to_continue()
+            return
             
+        print("\nSimulating portfolio paths...")
+        table_views.display_risk_report(portfolio_risk.risk_report(self.player, self.market))
+        
+        if ih.prompt_yes_no("\nStress test (oversample crises and market crashes)?"):
+            table_views.display_risk_report(portfolio_risk.risk_report(self.player, self.market, stress=True))
+        ih.press_enter_to_continue()
+        
     def view_market(self) -> None:
         """View market conditions."""
         menus.market_overview_menu(self.market)
         
-    def handle_event(self, event: Dict[str, Any]) -> None:
-        """Handle a random event."""
-        player_choice = menus.event_menu(event)
+    def handle_event(self, event: Dict[str, Any], player_choice: Optional[str] = None) -> None:
+        """
+        Apply a random event's effects.
         
+        Args:
+            event: Event generated by events.generate_event
+            player_choice: Player's response from menus.event_menu
+        """
         # Apply event effects
         target = event.get('target')
         effects = event.get('effects', {})
         
         if isinstance(target, Market):
             # Market event
-            if 'market_growth_change' in effects:
-                self.market.growth_rate += effects['market_growth_change']
-            if 'interest_rate_change' in effects:
-                self.market.interest_rate += effects['interest_rate_change']
-            if 'multiple_compression' in effects:
-                for sector in self.market.sector_multiples:
-                    self.market.sector_multiples[sector] *= (1 - effects['multiple_compression'])
-            if 'multiple_expansion' in effects:
-                for sector in self.market.sector_multiples:
-                    self.market.sector_multiples[sector] *= (1 + effects['multiple_expansion'])
+            self._apply_market_effects(effects)
                     
         elif isinstance(target, Company):
             # Company event
@@ -961,10 +1436,10 @@ class GameEngine:
             
             # If player chose to address issue, provide some mitigation
             if player_choice == 'immediate':
-                # Reduce negative impact by 50%
+                # Reduce negative impact by EVENT_MITIGATION_SHARE
                 for key in ['revenue_impact', 'margin_impact', 'growth_impact']:
                     if key in effects and effects[key] < 0:
-                        mitigation = effects[key] * 0.5
+                        mitigation = effects[key] * config.EVENT_MITIGATION_SHARE
                         # Reverse some damage
                         if key == 'revenue_impact':
                             target.revenue *= (1 - mitigation / (1 + effects[key]))
@@ -973,6 +1448,56 @@ class GameEngine:
                         elif key == 'growth_impact':
                             target.growth_rate -= mitigation
                             
+        # Queue whatever the event does in later quarters (mitigated along with the initial hit)
+        company_id = target.acquisition_id if isinstance(target, Company) else None
+        mitigated = company_id is not None and player_choice == 'immediate'
+        for follow_up in event.get('follow_ups', []):
+            follow_effects = follow_up.get('mitigated_effects', follow_up['effects']) if mitigated else follow_up['effects']
+            self.event_queue.schedule(
+                self.time_manager.current_quarter + follow_up['delay'],
+                ScheduledEffect(event['title'], follow_up['description'], follow_effects, company_id)
+            )
+            
+    def _apply_market_effects(self, effects: Dict[str, Any]) -> None:
+        """Apply market-wide event effects."""
+        if 'market_growth_change' in effects:
+            self.market.growth_rate += effects['market_growth_change']
+        if 'interest_rate_change' in effects:
+            self.market.interest_rate += effects['interest_rate_change']
+        factor = events.multiple_factor(effects)
+        if factor != 1.0:
+            self.market.sector_multiples = {
+                sector: multiple * factor for sector, multiple in self.market.sector_multiples.items()
+            }
+                
+    def apply_scheduled_effects(self) -> List[Tuple[str, str]]:
+        """
+        Apply every queued event effect due this quarter.
+        
+        Effects on companies that have since been sold are dropped.
+        
+        Returns:
+            (event title, description) of each effect applied
+        """
+        due = self.event_queue.due(self.time_manager.current_quarter)
+        if not due:
+            return []
+            
+        portfolio = {company.acquisition_id: company for company in self.player.portfolio}
+        applied = []
+        for effect in due:
+            if effect.company is None:
+                self._apply_market_effects(effect.effects)
+            else:
+                company = portfolio.get(effect.company)
+                if company is None:
+                    continue
+                company.apply_event(effect.effects)
+                if effect.effects.get('settlement_cost'):
+                    self.player.adjust_cash(-effect.effects['settlement_cost'], ledger.OTHER, company.name)
+            applied.append((effect.title, effect.description))
+        return applied
+        
     def end_game(self) -> None:
         """End the game and show summary."""
         screens.show_endgame_summary(self.player, self.time_manager)
@@ -1021,16 +1546,25 @@ class GameEngine:
         
         save_name = ih.prompt_text("Enter save name (or press Enter for auto-name)", allow_empty=True)
         
-        try:
-            save_path = GameSaver.save_game(self, save_name)
-            print(f"\n✓ Game saved successfully to: {save_path}")
-        except Exception as e:
-            print(f"\n✗ Error saving game: {e}")
+        # Sanitize filename, falling back to fund name + quarter
+        save_name = "".join(c for c in (save_name or "") if c.isalnum() or c in (' ', '-', '_')).strip()
+        if not save_name:
+            fund_slug = "".join(c for c in self.player.fund_name if c.isalnum() or c in ('-', '_'))
+            save_name = f"{fund_slug or 'fund'}_Q{self.time_manager.current_quarter}"
+        
+        if GameSaver.save(self, save_name):
+            print(f"\n✓ Game saved successfully as: {save_name}")
+        else:
+            print("\n✗ Error saving game")
             
         ih.press_enter_to_continue()
     
-    def load_game_menu(self) -> None:
-        """Show load game menu and restore selected save."""
+    def load_game_menu(self) -> bool:
+        """Show load game menu and restore selected save.
+        
+        Returns:
+            True if a save was loaded, False if cancelled or loading failed
+        """
         from game.save_system import GameSaver
         
         saves = GameSaver.list_saves()
@@ -1038,31 +1572,39 @@ class GameEngine:
         if not saves:
             print("\nNo saved games found.")
             ih.press_enter_to_continue()
-            return
+            return False
         
         print("\n" + "=" * 70)
         print("LOAD GAME")
         print("=" * 70)
         print("\nAvailable Saves:")
         
-        for i, save in enumerate(saves, 1):
-            print(f"  {i}. {save['name']} (Last modified: {save['modified'].strftime('%Y-%m-%d %H:%M:%S')})")
-        
-        options = [s['name'] for s in saves] + ["Cancel"]
+        options = [f"{name} - {quarter} (saved: {timestamp[:19]})" 
+                   for name, timestamp, quarter in saves]
+        options.append("Cancel")
         choice = ih.prompt_choice(options, "Select a save to load")
         
         if choice < 0 or choice >= len(saves):
-            return
+            return False
         
         try:
-            save_name = saves[choice]['name']
-            game_state = GameSaver.load_game(save_name)
-            GameSaver.restore_game(game_state, self)
+            from game import autosave
+            
+            save_name = saves[choice][0]
+            if save_name == autosave.AUTOSAVE_NAME:
+                # Autosave: restore the snapshot and replay the action journal
+                loaded = autosave.recover(self)
+            else:
+                loaded = GameSaver.load(save_name, self)
+            if not loaded:
+                raise RuntimeError(f"could not load '{save_name}'")
             print(f"\n✓ Game loaded successfully from: {save_name}")
             print(f"   Quarter: {self.time_manager.get_time_display()}")
             print(f"   Net Worth: ${self.player.compute_net_worth():,.0f}")
             ih.press_enter_to_continue()
+            return True
         except Exception as e:
             print(f"\n✗ Error loading game: {e}")
             ih.press_enter_to_continue()
+            return False
 
@@ -0,0 +1,97 @@
+"""
+Event queue - effects of past events that land in later quarters.
+
+Lawsuits settle, recalled products win customers back and regulation phases
+in over time. Each delayed effect is pushed onto a min-heap keyed by the
+quarter it lands in, and the engine drains whatever is due at each quarter
+in one pass, so scheduling and applying both cost O(log n) per effect.
+
+Company effects refer to their company by Company.acquisition_id rather
+than hold it (names can repeat), so they survive forks and save/load;
+effects for a company that has since been sold are dropped when they come
+due.
+"""
+
+from typing import Dict, Any, List, Optional, Tuple
+import heapq
+
+
+class ScheduledEffect:
+    """An event effect due in a later quarter."""
+    
+    def __init__(self, title: str, description: str, effects: Dict[str, Any],
+                 company: Optional[int] = None):
+        """
+        Args:
+            title: Title of the event that scheduled it
+            description: What happens when it lands
+            effects: Effects dictionary, as in an event
+            company: Acquisition id of the target portfolio company (None for the market)
+        """
+        self.title = title
+        self.description = description
+        self.effects = effects
+        self.company = company
+        
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'title': self.title,
+            'description': self.description,
+            'effects': self.effects,
+            'company': self.company
+        }
+        
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ScheduledEffect':
+        return cls(data['title'], data['description'], data['effects'], data.get('company'))
+
+
+class EventQueue:
+    """Min-heap of scheduled effects keyed by quarter."""
+    
+    def __init__(self):
+        # (quarter, sequence, effect); sequence keeps ties in scheduling order
+        self.heap: List[Tuple[int, int, ScheduledEffect]] = []
+        self._seq = 0
+        
+    def __len__(self) -> int:
+        return len(self.heap)
+        
+    def schedule(self, quarter: int, effect: ScheduledEffect) -> None:
+        """Queue an effect to land in a given quarter."""
+        self._seq += 1
+        heapq.heappush(self.heap, (quarter, self._seq, effect))
+        
+    def due(self, quarter: int) -> List[ScheduledEffect]:
+        """Pop every effect due at or before `quarter`, earliest first."""
+        effects = []
+        while self.heap and self.heap[0][0] <= quarter:
+            effects.append(heapq.heappop(self.heap)[2])
+        return effects
+        
+    def pending(self, company: Optional[int] = None) -> List[Tuple[int, ScheduledEffect]]:
+        """Queued effects in landing order, optionally for one company only."""
+        return [(quarter, effect) for quarter, _, effect in sorted(self.heap, key=lambda e: e[:2])
+                if company is None or effect.company == company]
+                
+    def fork(self) -> 'EventQueue':
+        """Return an independent copy (scheduled effects are never mutated, so they are shared)."""
+        child = EventQueue()
+        child.heap = list(self.heap)
+        child._seq = self._seq
+        return child
+        
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'seq': self._seq,
+            'heap': [[quarter, seq, effect.to_dict()] for quarter, seq, effect in self.heap]
+        }
+        
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'EventQueue':
+        queue = cls()
+        queue._seq = data.get('seq', 0)
+        queue.heap = [(quarter, seq, ScheduledEffect.from_dict(effect))
+                      for quarter, seq, effect in data.get('heap', [])]
+        heapq.heapify(queue.heap)
+        return queue
@@ -1,16 +1,320 @@
 """
 Events - random events that affect companies, players, or markets.
+
+Event kinds live in a registry of EventDefinitions (weights, target
+selector and generator). The kind of each event is drawn from a Walker
+alias table built from the registry weights, so a draw costs O(1) however
+many kinds are registered, and many games can draw their events at once.
+Each kind also has a vectorized effect sampler, so a batch applies a
+quarter's events as sparse array updates (simulation.batch_sim.EventDeltas).
 """
 
 import random
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Callable, Union
+import numpy as np
 from models.company import Company
 from models.player import Player
 from models.market import Market
 from simulation.procedural_gen import generate_event_description
+from simulation.batch_sim import EventDeltas
 import config
 
 
+class AliasTable:
+    """
+    Walker alias table for O(1) sampling from a discrete distribution.
+    
+    Each of the n columns holds a probability of keeping its own index and
+    an alias to fall back to; a draw picks a column uniformly, then flips
+    that column's biased coin.
+    """
+    
+    def __init__(self, weights: List[float]):
+        """
+        Build the table (Vose's method, O(n)).
+        
+        Args:
+            weights: Non-negative weights, not all zero
+        """
+        weights = np.asarray(weights, dtype=float)
+        n = len(weights)
+        scaled = weights * n / weights.sum()
+        self.prob = np.ones(n)
+        self.alias = np.arange(n)
+        
+        small = [i for i in range(n) if scaled[i] < 1.0]
+        large = [i for i in range(n) if scaled[i] >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        # Whatever is left is 1 up to rounding and keeps prob 1
+        
+    def __len__(self) -> int:
+        return len(self.prob)
+        
+    def sample(self, rand: Callable[[], float] = random.random) -> int:
+        """Draw one index using two uniform draws from `rand`."""
+        column = int(rand() * len(self.prob))
+        return column if rand() < self.prob[column] else int(self.alias[column])
+        
+    def sample_many(self, size: int, rng: np.random.Generator) -> np.ndarray:
+        """Draw `size` indices at once."""
+        column = rng.integers(0, len(self.prob), size)
+        return np.where(rng.random(size) < self.prob[column], column, self.alias[column])
+        
+    def sample_uniform(self, u: np.ndarray) -> np.ndarray:
+        """
+        Draw one index per uniform in [0, 1), using a single draw each.
+        
+        The integer part of u * n picks the column and the fractional part
+        decides between it and its alias, so evenly spread (e.g. Sobol)
+        uniforms give evenly spread outcomes.
+        """
+        scaled = np.asarray(u) * len(self.prob)
+        column = np.minimum(scaled.astype(int), len(self.prob) - 1)
+        return np.where(scaled - column < self.prob[column], column, self.alias[column])
+        
+    def probabilities(self) -> np.ndarray:
+        """The distribution the table samples from (for checks and display)."""
+        n = len(self.prob)
+        p = self.prob / n
+        np.add.at(p, self.alias, (1.0 - self.prob) / n)
+        return p
+
+
+class EventDefinition:
+    """
+    One kind of random event.
+    
+    An event kind is drawn with probability proportional to its weight in
+    the ordinary pool, mixed with its crisis_weight in the crisis pool; the
+    crisis pool's share grows with CRISIS_PROBABILITY and the difficulty's
+    crisis multiplier.
+    """
+    
+    def __init__(self, name: str, weight: float, crisis_weight: float,
+                 select_target: Callable[[Player, List[Company], Market], Optional[Union[Company, Market]]],
+                 generate: Callable[[Union[Company, Market], Player], Dict[str, Any]],
+                 sample_effects: Optional[Callable[[int, np.random.Generator], Dict[str, np.ndarray]]] = None):
+        """
+        Args:
+            name: Event kind
+            weight: Relative weight among ordinary events
+            crisis_weight: Relative weight among crisis events (0 if never a crisis)
+            select_target: Picks what the event hits, or None if nothing can be hit
+            generate: Builds the event dictionary for a target
+            sample_effects: Draws the effects of n such events at once for
+                batch simulation (None if the kind has no batch effects)
+        """
+        self.name = name
+        self.weight = weight
+        self.crisis_weight = crisis_weight
+        self.select_target = select_target
+        self.generate = generate
+        self.sample_effects = sample_effects
+        
+    @property
+    def targets_market(self) -> bool:
+        """Whether the event hits the market rather than a company."""
+        return self.select_target is _market_target
+
+
+def _market_target(player: Player, portfolio: List[Company], market: Market) -> Market:
+    return market
+
+
+def _portfolio_target(player: Player, portfolio: List[Company], market: Market) -> Optional[Company]:
+    return random.choice(portfolio) if portfolio else None
+
+
+# Vectorized effect draws, mirroring each generator's immediate effects.
+# Delayed follow-ups are folded in (a regulatory hit lands in full), and
+# choices the player would make are not modeled.
+
+def _sample_market_shift(n: int, rng: np.random.Generator) -> Dict[str, np.ndarray]:
+    return {'market_growth_change': rng.uniform(-0.03, 0.03, n),
+            'interest_rate_change': rng.uniform(-0.01, 0.01, n)}
+
+
+def _sample_operational(n: int, rng: np.random.Generator) -> Dict[str, np.ndarray]:
+    impact = rng.uniform(-0.10, 0.10, n)
+    return {'revenue_impact': impact, 'margin_impact': impact * 0.5}
+
+
+def _sample_crisis(n: int, rng: np.random.Generator) -> Dict[str, np.ndarray]:
+    severity = rng.uniform(0.15, 0.40, n)
+    return {'revenue_impact': -severity, 'margin_impact': -severity * 0.3, 'growth_impact': np.full(n, -0.03)}
+
+
+def _sample_breakthrough(n: int, rng: np.random.Generator) -> Dict[str, np.ndarray]:
+    magnitude = rng.uniform(0.10, 0.30, n)
+    return {'revenue_impact': magnitude * 0.5, 'growth_impact': np.full(n, 0.02), 'margin_impact': magnitude * 0.2}
+
+
+def _sample_management(n: int, rng: np.random.Generator) -> Dict[str, np.ndarray]:
+    severity = rng.uniform(0.0, 1.0, n)
+    return {'growth_impact': np.select([severity < 0.3, severity < 0.7], [-0.01, -0.02], default=-0.03)}
+
+
+def _sample_regulatory(n: int, rng: np.random.Generator) -> Dict[str, np.ndarray]:
+    return {'margin_impact': rng.uniform(-0.15, 0.05, n)}
+
+
+def _sample_market_crash(n: int, rng: np.random.Generator) -> Dict[str, np.ndarray]:
+    severity = rng.uniform(0.10, 0.30, n)
+    return {'market_growth_change': -severity, 'multiple_compression': rng.uniform(0.10, 0.20, n)}
+
+
+def _sample_market_boom(n: int, rng: np.random.Generator) -> Dict[str, np.ndarray]:
+    strength = rng.uniform(0.05, 0.15, n)
+    return {'market_growth_change': strength, 'multiple_expansion': rng.uniform(0.05, 0.15, n)}
+
+
+EVENT_REGISTRY: List[EventDefinition] = [
+    EventDefinition('market_shift', 1.0, 0.0, _market_target,
+                    lambda market, player: _generate_market_shift_event(market),
+                    _sample_market_shift),
+    EventDefinition('company_operational', 1.0, 0.0, _portfolio_target,
+                    lambda company, player: _generate_operational_event(company),
+                    _sample_operational),
+    EventDefinition('company_crisis', 1.0, 1.0, _portfolio_target,
+                    lambda company, player: _generate_crisis_event(company),
+                    _sample_crisis),
+    EventDefinition('company_breakthrough', 1.0, 0.0, _portfolio_target,
+                    lambda company, player: _generate_breakthrough_event(company),
+                    _sample_breakthrough),
+    EventDefinition('management_issue', 1.0, 1.0, _portfolio_target,
+                    lambda company, player: _generate_management_event(company, player),
+                    _sample_management),
+    EventDefinition('regulatory', 1.0, 0.0, _portfolio_target,
+                    lambda company, player: _generate_regulatory_event(company),
+                    _sample_regulatory),
+    EventDefinition('market_crash', 1.0, 1.0, _market_target,
+                    lambda market, player: _generate_market_crash_event(market),
+                    _sample_market_crash),
+    EventDefinition('market_boom', 1.0, 0.0, _market_target,
+                    lambda market, player: _generate_market_boom_event(market),
+                    _sample_market_boom),
+]
+
+# Alias tables by crisis probability; cleared whenever the registry changes
+_alias_tables: Dict[float, AliasTable] = {}
+
+
+def register_event(definition: EventDefinition) -> None:
+    """Add an event kind to the registry."""
+    EVENT_REGISTRY.append(definition)
+    _alias_tables.clear()
+
+
+def event_type_probabilities(difficulty_settings: Dict[str, Any]) -> np.ndarray:
+    """
+    Probability of each registered event kind, given that an event occurs.
+    
+    Args:
+        difficulty_settings: Market difficulty settings
+        
+    Returns:
+        Array aligned with EVENT_REGISTRY
+    """
+    crisis_probability = config.CRISIS_PROBABILITY * difficulty_settings['crisis_probability_multiplier']
+    weights = np.array([d.weight for d in EVENT_REGISTRY])
+    crisis_weights = np.array([d.crisis_weight for d in EVENT_REGISTRY])
+    return ((1 - crisis_probability) * weights / weights.sum() +
+            crisis_probability * crisis_weights / crisis_weights.sum())
+
+
+def event_alias_table(difficulty_settings: Dict[str, Any]) -> AliasTable:
+    """The (cached) alias table over EVENT_REGISTRY for a difficulty."""
+    key = config.CRISIS_PROBABILITY * difficulty_settings['crisis_probability_multiplier']
+    table = _alias_tables.get(key)
+    if table is None:
+        table = _alias_tables[key] = AliasTable(event_type_probabilities(difficulty_settings))
+    return table
+
+
+def sample_event_types(difficulty_settings: Dict[str, Any], size: int,
+                       rng: np.random.Generator) -> np.ndarray:
+    """
+    Draw this quarter's event kind for many games at once.
+    
+    Args:
+        difficulty_settings: Market difficulty settings
+        size: Number of games
+        rng: numpy random generator
+        
+    Returns:
+        Indices into EVENT_REGISTRY, -1 where no event occurs
+    """
+    event_probability = config.EVENT_PROBABILITY * difficulty_settings['event_probability_multiplier']
+    occurs = rng.random(size) < event_probability
+    return np.where(occurs, event_alias_table(difficulty_settings).sample_many(size, rng), -1)
+
+
+def sample_event_deltas(kinds: np.ndarray, targets: Optional[np.ndarray],
+                        rng: np.random.Generator,
+                        market_rows: Optional[np.ndarray] = None) -> List[EventDeltas]:
+    """
+    Draw the effects of a quarter's events across a batch.
+    
+    Args:
+        kinds: Event kind per game (indices into EVENT_REGISTRY, -1 for none),
+            e.g. from sample_event_types
+        targets: Company row hit by each game's company event (None when
+            row i is game i's only company)
+        rng: numpy random generator
+        market_rows: Market rows of each game, shape (rows per game, games),
+            when a game's market spans several rows (None when row i is
+            game i's market)
+            
+    Returns:
+        One EventDeltas per registered kind that occurred
+    """
+    deltas = []
+    for index, definition in enumerate(EVENT_REGISTRY):
+        games = np.flatnonzero(kinds == index)
+        if len(games) == 0 or definition.sample_effects is None:
+            continue
+        effects = definition.sample_effects(len(games), rng)
+        if not definition.targets_market:
+            rows = games if targets is None else targets[games]
+        elif market_rows is None:
+            rows = games
+        else:
+            # Every row of the game's market takes the same draw
+            rows = market_rows[:, games].ravel()
+            effects = {key: np.tile(value, len(market_rows)) for key, value in effects.items()}
+        deltas.append(EventDeltas(rows, **effects))
+    return deltas
+
+
+def event_deltas(event: Dict[str, Any], companies: List[Company]) -> EventDeltas:
+    """
+    Express an event's effects as deltas over a batch of companies.
+    
+    Args:
+        event: Event dictionary
+        companies: Companies in batch row order (CompanyBatch.from_companies)
+        
+    Returns:
+        Deltas hitting every row for market events, else the target's row
+    """
+    target = event.get('target')
+    effects = event.get('effects', {})
+    if isinstance(target, Market):
+        return EventDeltas(None, **{k: effects[k] for k in EventDeltas.MARKET_EFFECTS if k in effects})
+    rows = np.array([i for i, company in enumerate(companies) if company is target], dtype=int)
+    return EventDeltas(rows, **{k: effects[k] for k in EventDeltas.COMPANY_EFFECTS if k in effects})
+
+
+def multiple_factor(effects: Dict[str, Any]) -> float:
+    """Overall change in sector multiples from an event's effects."""
+    return (1 - effects.get('multiple_compression', 0.0)) * (1 + effects.get('multiple_expansion', 0.0))
+
+
 def generate_event(player: Player, portfolio: List[Company], market: Market) -> Optional[Dict[str, Any]]:
     """
     Generate a random event.
@@ -28,51 +332,11 @@ def generate_event(player: Player, portfolio: List[Company], market: Market) ->
     if random.random() > event_probability:
         return None
         
-    # Determine event type
-    event_types = [
-        'market_shift',
-        'company_operational',
-        'company_crisis',
-        'company_breakthrough',
-        'management_issue',
-        'regulatory',
-        'market_crash',
-        'market_boom'
-    ]
-    
-    # Crisis events are rarer (adjusted by difficulty)
-    crisis_probability = config.CRISIS_PROBABILITY * market.difficulty_settings['crisis_probability_multiplier']
-    if random.random() < crisis_probability:
-        event_type = random.choice(['company_crisis', 'market_crash', 'management_issue'])
-    else:
-        event_type = random.choice(event_types)
-        
-    # Generate event based on type
-    if event_type == 'market_shift':
-        return _generate_market_shift_event(market)
-    elif event_type == 'market_crash':
-        return _generate_market_crash_event(market)
-    elif event_type == 'market_boom':
-        return _generate_market_boom_event(market)
-    elif event_type in ['company_operational', 'company_crisis', 'company_breakthrough']:
-        if portfolio:
-            company = random.choice(portfolio)
-            if event_type == 'company_operational':
-                return _generate_operational_event(company)
-            elif event_type == 'company_crisis':
-                return _generate_crisis_event(company)
-            else:
-                return _generate_breakthrough_event(company)
-    elif event_type == 'management_issue':
-        if portfolio:
-            company = random.choice(portfolio)
-            return _generate_management_event(company, player)
-    elif event_type == 'regulatory':
-        if portfolio:
-            company = random.choice(portfolio)
-            return _generate_regulatory_event(company)
-            
-    return None
+    definition = EVENT_REGISTRY[event_alias_table(market.difficulty_settings).sample()]
+    target = definition.select_target(player, portfolio, market)
+    if target is None:
+        return None
+    return definition.generate(target, player)
 
 
 def apply_event(event: Dict[str, Any]) -> None:
@@ -177,8 +441,28 @@ def _generate_crisis_event(company: Company) -> Dict[str, Any]:
         "Major lawsuit threatens financial stability."
     ]
     
-    description = f"{company.name}: {random.choice(crisis_types)}"
+    crisis = random.choice(crisis_types)
+    description = f"{company.name}: {crisis}"
     
+    # Recalls and lawsuits keep playing out after the initial hit
+    follow_ups = []
+    if crisis == crisis_types[0]:
+        follow_ups = _recall_recovery(company, severity)
+        
+        # An immediate response limits the lost revenue, so there is less to win back
+        mitigated = _recall_recovery(company, severity * (1 - config.EVENT_MITIGATION_SHARE))
+        for follow_up, smaller in zip(follow_ups, mitigated):
+            follow_up['mitigated_effects'] = smaller['effects']
+    elif crisis == crisis_types[-1]:
+        low, high = config.LAWSUIT_SETTLEMENT_QUARTERS
+        follow_ups = [{
+            'delay': random.randint(low, high),
+            'description': f"{company.name} settles the lawsuit.",
+            'effects': {
+                'settlement_cost': severity * company.revenue * config.LAWSUIT_SETTLEMENT_RATE
+            }
+        }]
+        
     return {
         'type': 'crisis',
         'title': f'CRISIS: {company.name}',
@@ -189,10 +473,34 @@ def _generate_crisis_event(company: Company) -> Dict[str, Any]:
             'growth_impact': -0.03
         },
         'target': company,
-        'severity': severity
+        'severity': severity,
+        'follow_ups': follow_ups
     }
 
 
+def _recall_recovery(company: Company, severity: float) -> List[Dict[str, Any]]:
+    """
+    Follow-ups winning back part of a recall's lost revenue, front-loaded.
+    
+    Recovers RECALL_RECOVERY_SHARE of the revenue lost to a hit of
+    `severity` (the share of revenue actually lost), spread over
+    RECALL_RECOVERY_QUARTERS with each quarter recovering half as much as
+    the one before.
+    """
+    quarters = config.RECALL_RECOVERY_QUARTERS
+    total = (1 - severity + config.RECALL_RECOVERY_SHARE * severity) / (1 - severity)
+    shares = 0.5 ** np.arange(quarters)
+    shares /= shares.sum()
+    return [
+        {
+            'delay': delay,
+            'description': f"{company.name} wins back customers after the recall.",
+            'effects': {'revenue_impact': float(total ** share - 1)}
+        }
+        for delay, share in enumerate(shares, start=1)
+    ]
+
+
 def _generate_breakthrough_event(company: Company) -> Dict[str, Any]:
     """Generate a breakthrough event for a company."""
     magnitude = random.uniform(0.10, 0.30)
@@ -255,8 +563,22 @@ def _generate_regulatory_event(company: Company) -> Dict[str, Any]:
     """Generate a regulatory event."""
     impact = random.uniform(-0.15, 0.05)  # Usually negative
     
+    # Adverse rules phase in: an equal slice of the margin hit each quarter
+    follow_ups = []
+    margin_impact = impact
     if impact < 0:
         description = generate_event_description('regulatory', company.name)
+        phases = config.REGULATORY_PHASE_IN_QUARTERS
+        margin_impact = impact / phases
+        follow_ups = [
+            {
+                'delay': delay,
+                'description': f"New regulation at {company.name} phases in further.",
+                'effects': {'margin_impact': margin_impact},
+                'mitigated_effects': {'margin_impact': margin_impact * (1 - config.EVENT_MITIGATION_SHARE)}
+            }
+            for delay in range(1, phases)
+        ]
     else:
         description = f"{company.name}: Regulatory changes create new opportunities."
         
@@ -265,11 +587,12 @@ def _generate_regulatory_event(company: Company) -> Dict[str, Any]:
         'title': f'Regulatory Change: {company.name}',
         'description': description,
         'effects': {
-            'margin_impact': impact,
+            'margin_impact': margin_impact,
             'one_time_cost': abs(impact) * company.revenue * 0.1 if impact < 0 else 0
         },
         'target': company,
-        'impact': impact
+        'impact': impact,
+        'follow_ups': follow_ups
     }
 
 
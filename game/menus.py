@@ -9,6 +9,15 @@ from models.market import Market
 from models.deal import Deal
 from game import input_handlers as ih
 from ui import table_views as tv
+from simulation import exit_analysis
+import config
+
+
+# Returned by sector_selection_menu when the player asks for the optimizer's picks
+SUGGESTED_DEALS = 'suggested'
+
+# Returned by sector_selection_menu when the player wants to filter the deal book
+SCREEN_DEALS = 'screen'
 
 
 def main_menu(player: Player, market: Market, time_manager: 'TimeManager') -> str:
@@ -16,7 +25,7 @@ def main_menu(player: Player, market: Market, time_manager: 'TimeManager') -> st
     Display main menu and get player's action choice.
     
     Returns:
-        Action string: 'acquire', 'operate', 'exit', 'portfolio', 'market', 'advance', 'save', 'quit'
+        Action string: 'acquire', 'operate', 'exit', 'portfolio', 'risk', 'market', 'advance', 'save', 'quit'
     """
     ih.clear_screen()
     
@@ -33,6 +42,7 @@ def main_menu(player: Player, market: Market, time_manager: 'TimeManager') -> st
     
     options = [
         "View Portfolio",
+        "View Portfolio Risk",
         "View Market Conditions",
         "Acquire Company",
         "Operate Portfolio Companies",
@@ -43,7 +53,7 @@ def main_menu(player: Player, market: Market, time_manager: 'TimeManager') -> st
         "Quit Game (without saving)"
     ]
     
-    actions = ['portfolio', 'market', 'acquire', 'operate', 'exit', 'advance', 'save_continue', 'save_exit', 'quit']
+    actions = ['portfolio', 'risk', 'market', 'acquire', 'operate', 'exit', 'advance', 'save_continue', 'save_exit', 'quit']
     
     choice = ih.prompt_choice(options, "What would you like to do?")
     
@@ -85,10 +95,15 @@ def acquisition_menu(available_companies: List[Company], player: Player, market:
     return available_companies[choice]
 
 
-def deal_negotiation_menu(deal: Deal, player: Player) -> str:
+def deal_negotiation_menu(deal: Deal, player: Player, dcf: Dict[str, Any] = None) -> str:
     """
     Handle deal negotiation.
     
+    Args:
+        deal: Deal being negotiated
+        player: Buying player
+        dcf: Optional DCF valuation range for the company
+    
     Returns:
         Action: 'offer', 'accept', 'walk'
     """
@@ -97,10 +112,12 @@ def deal_negotiation_menu(deal: Deal, player: Player) -> str:
     print(f"DEAL NEGOTIATION: {deal.company.name}")
     print("=" * 70)
     
-    tv.display_company_detail(deal.company)
+    tv.display_company_detail(deal.company, dcf=dcf)
     
     print(f"\n{'Asking Price:':<30} ${deal.asking_price:,.0f}")
     print(f"{'Fair Value (estimate):':<30} ${deal.fair_value:,.0f}")
+    if dcf:
+        print(f"{'DCF Value Range:':<30} {tv.format_dcf_range(dcf)}")
     print(f"{'Your Cash:':<30} ${player.cash:,.0f}")
     print(f"{'Available Capital:':<30} ${player.available_capital():,.0f}")
     
@@ -245,10 +262,15 @@ def company_operations_menu(company: Company, player: Player) -> str:
     return actions[choice]
 
 
-def exit_menu(player: Player, market: Market) -> Optional[Company]:
+def exit_menu(player: Player, market: Market, current_quarter: int = 0) -> Optional[Company]:
     """
     Menu for exiting an investment.
     
+    Args:
+        player: Player whose portfolio is shown
+        market: Current market
+        current_quarter: Current game quarter (for holding periods)
+        
     Returns:
         Selected company or None
     """
@@ -263,6 +285,8 @@ def exit_menu(player: Player, market: Market) -> Optional[Company]:
     print("=" * 70)
     
     tv.display_portfolio(player.portfolio)
+    tv.display_exit_grid(exit_analysis.exit_grid(player, market, current_quarter))
+    tv.display_exit_advice(exit_analysis.exit_advice(player, market))
     
     options = [f"{c.name} - Current Value: ${c.current_valuation:,.0f}" for c in player.portfolio]
     options.append("Cancel")
@@ -309,6 +333,11 @@ def event_menu(event: Dict[str, Any]) -> Optional[str]:
             else:
                 print(f"  • {effect}: {value}")
                 
+    if event.get('follow_ups'):
+        print("\nStill to come:")
+        for follow_up in event['follow_ups']:
+            print(f"  • In {follow_up['delay']} quarter(s): {follow_up['description']}")
+            
     # If event requires action, present choices
     if event.get('effects', {}).get('requires_action'):
         options = [
@@ -404,7 +433,7 @@ def sector_selection_menu() -> str:
     Display menu for selecting a sector to browse companies.
     
     Returns:
-        Selected sector name or None if back
+        Selected sector name, SUGGESTED_DEALS, SCREEN_DEALS, or None if back
     """
     from simulation.procedural_gen import get_sectors
     
@@ -415,14 +444,133 @@ def sector_selection_menu() -> str:
     print("\nChoose a sector to view available companies:\n")
     
     sectors = get_sectors()
-    options = sectors + ["Back to Main Menu"]
+    options = [
+        "Suggested Deals (best use of available capital)",
+        "Screen Deals (filter by criteria)"
+    ] + sectors + ["Back to Main Menu"]
     
     choice = ih.prompt_choice(options, "Select a sector")
     
-    if choice < 0 or choice >= len(sectors):
+    if choice == 0:
+        return SUGGESTED_DEALS
+    if choice == 1:
+        return SCREEN_DEALS
+    if choice < 0 or choice > len(sectors) + 1:
+        return None
+        
+    return sectors[choice - 2]
+
+
+def suggested_deals_menu(plan: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Show the deal optimizer's ranked shortlist.
+    
+    Args:
+        plan: Result of simulation.deal_optimizer.optimize_deals
+        
+    Returns:
+        Selected shortlist entry or None if back
+    """
+    ih.clear_screen()
+    print("=" * 70)
+    print("SUGGESTED DEALS")
+    print("=" * 70)
+    
+    shortlist = plan['shortlist']
+    if not shortlist:
+        print("\nNo affordable deals are expected to create value right now.")
+        ih.press_enter_to_continue()
+        return None
+        
+    tv.display_deal_shortlist(plan)
+    
+    options = [f"{c['company'].name} ({c['sector']}) - ${c['price']:,.0f}" for c in shortlist]
+    options.append("Back to Sector Selection")
+    
+    choice = ih.prompt_choice(options, "Select a company to review")
+    
+    if choice < 0 or choice >= len(shortlist):
+        return None
+        
+    return shortlist[choice]
+
+
+def screen_deals_menu() -> Optional[Dict[str, Any]]:
+    """
+    Ask for deal screening criteria. Leaving a prompt blank skips that criterion.
+    
+    Returns:
+        Keyword arguments for GameEngine.screen_deals, or None if back
+    """
+    from simulation.procedural_gen import get_sectors
+    
+    ih.clear_screen()
+    print("=" * 70)
+    print("SCREEN DEALS")
+    print("=" * 70)
+    print("\nLeave any criterion blank to skip it.\n")
+    
+    sectors = get_sectors()
+    options = ["All Sectors"] + sectors + ["Back to Sector Selection"]
+    choice = ih.prompt_choice(options, "Sector")
+    if choice < 0 or choice > len(sectors):
+        return None
+        
+    criteria: Dict[str, Any] = {'order_by': 'valuation', 'descending': True}
+    if choice > 0:
+        criteria['sectors'] = [sectors[choice - 1]]
+        
+    min_value = ih.prompt_number("Minimum valuation ($)", min_value=0)
+    max_value = ih.prompt_number("Maximum valuation ($)", min_value=0)
+    if min_value is not None or max_value is not None:
+        criteria['valuation'] = (min_value, max_value)
+        
+    # Percentages are entered as whole numbers
+    for field, prompt in [('ebitda_margin', "Minimum EBITDA margin (%)"),
+                          ('growth_rate', "Minimum growth rate (%)"),
+                          ('competence', "Minimum manager competence (%)")]:
+        value = ih.prompt_number(prompt)
+        if value is not None:
+            criteria[field] = (value / 100, None)
+            
+    return criteria
+
+
+def screen_results_menu(results: List[tuple]) -> Optional[Company]:
+    """
+    Show screening results and pick a company.
+    
+    Args:
+        results: Listings from GameEngine.screen_deals
+        
+    Returns:
+        Selected company or None if back
+    """
+    ih.clear_screen()
+    print("=" * 70)
+    print("SCREEN RESULTS")
+    print("=" * 70)
+    
+    if not results:
+        print("\nNo companies match these criteria.")
+        ih.press_enter_to_continue()
+        return None
+        
+    shown = results[:config.SCREEN_RESULTS_LIMIT]
+    print(f"\n{len(results)} companies match" +
+          (f" (showing the {len(shown)} largest)" if len(shown) < len(results) else "") + ":\n")
+    tv.display_screen_results(shown)
+    
+    options = [f"{company.name} ({sector}) - ${company.current_valuation:,.0f}"
+               for sector, tier, index, company in shown]
+    options.append("Back to Sector Selection")
+    
+    choice = ih.prompt_choice(options, "Select a company to review")
+    
+    if choice < 0 or choice >= len(shown):
         return None
         
-    return sectors[choice]
+    return shown[choice][3]
 
 
 def valuation_tier_menu(sector: str) -> str:
@@ -5,13 +5,26 @@ Handles serialization and deserialization of game state.
 
 import json
 import os
+import tempfile
+import threading
 from datetime import datetime
 from typing import Dict, Any, Optional, List, Tuple
 from pathlib import Path
+import config
 
 
 SAVES_DIR = Path("saves")
 
+# Sidecar manifest holding one small header per save, so the save list can be
+# built without parsing every (potentially large) save body. The leading dot
+# keeps it out of the names a save can take (save names are sanitized to
+# alphanumerics, spaces, '-' and '_').
+INDEX_FILENAME = ".index.json"
+ACTION_LOG_SUFFIX = ".actions.jsonl"
+
+# Serializes index read-modify-write cycles (autosaves write from a worker thread)
+_index_lock = threading.RLock()
+
 
 class GameSaver:
     """Class to handle game save/load operations."""
@@ -21,31 +34,99 @@ class GameSaver:
         """Ensure the saves directory exists."""
         SAVES_DIR.mkdir(exist_ok=True)
     
+    @staticmethod
+    def index_path() -> Path:
+        """Path of the save index manifest."""
+        return SAVES_DIR / INDEX_FILENAME
+    
+    @staticmethod
+    def read_index() -> Dict[str, Dict[str, Any]]:
+        """
+        Read the save index manifest.
+        
+        Returns:
+            Dictionary mapping save name to its header (empty if missing or corrupt)
+        """
+        try:
+            with open(GameSaver.index_path(), 'r') as f:
+                index = json.load(f)
+            return index if isinstance(index, dict) else {}
+        except (OSError, ValueError):
+            return {}
+    
+    @staticmethod
+    def write_index(index: Dict[str, Dict[str, Any]]) -> None:
+        """Atomically replace the save index manifest."""
+        GameSaver.ensure_saves_directory()
+        atomic_write_json(GameSaver.index_path(), index)
+    
+    @staticmethod
+    def update_index(save_name: str, game_state: Dict[str, Any], save_path: Path) -> None:
+        """Record the header of a freshly written save in the index."""
+        with _index_lock:
+            index = GameSaver.read_index()
+            index[save_name] = build_save_header(game_state, save_path.stat())
+            GameSaver.write_index(index)
+    
     @staticmethod
     def list_saves() -> List[Tuple[str, str, str]]:
         """
         List all available save files.
         
+        Headers come from the index manifest. Only saves missing from the index,
+        or modified since it was written, are parsed; the index is then repaired.
+        
         Returns:
             List of tuples: (save_name, timestamp, quarter_info)
         """
         GameSaver.ensure_saves_directory()
         
-        saves = []
-        for save_file in SAVES_DIR.glob("*.json"):
-            try:
-                with open(save_file, 'r') as f:
-                    data = json.load(f)
+        # Hold the lock from read to write so a concurrent update_index (e.g. from
+        # the autosave thread) is never overwritten by a stale copy
+        with _index_lock:
+            index = GameSaver.read_index()
+            index_changed = False
+            seen = set()
+            
+            saves = []
+            for save_file in SAVES_DIR.glob("*.json"):
+                if save_file.name == INDEX_FILENAME:
+                    continue
                 
                 save_name = save_file.stem
-                timestamp = data.get('timestamp', 'Unknown')
-                quarter = data['time']['current_quarter']
-                year = data['time']['current_year']
+                seen.add(save_name)
                 
-                saves.append((save_name, timestamp, f"Year {year}, Q{quarter % 4 + 1}"))
-            except Exception:
-                continue
-        
+                try:
+                    stat = save_file.stat()
+                    header = index.get(save_name)
+                    
+                    if not _header_matches_file(header, stat):
+                        # Legacy save or written outside GameSaver - parse it once
+                        with open(save_file, 'r') as f:
+                            data = json.load(f)
+                        header = build_save_header(data, stat)
+                        index[save_name] = header
+                        index_changed = True
+                    
+                    timestamp = header.get('timestamp', 'Unknown')
+                    quarter = header['current_quarter']
+                    year = header['current_year']
+                    
+                    saves.append((save_name, timestamp, f"Year {year}, Q{quarter % 4 + 1}"))
+                except Exception:
+                    continue
+            
+            # Drop entries for saves deleted behind our back
+            for stale_name in [name for name in index if name not in seen]:
+                del index[stale_name]
+                index_changed = True
+            
+            if index_changed:
+                try:
+                    GameSaver.write_index(index)
+                except OSError:
+                    pass
+            
         return sorted(saves, key=lambda x: x[1], reverse=True)
     
     @staticmethod
@@ -60,14 +141,23 @@ class GameSaver:
         Returns:
             True if successful, False otherwise
         """
+        if f"{save_name}.json" == INDEX_FILENAME:
+            print(f"Error saving game: '{save_name}' is a reserved name")
+            return False
+            
         try:
             GameSaver.ensure_saves_directory()
             
             game_state = serialize_game_state(engine)
             save_path = SAVES_DIR / f"{save_name}.json"
             
-            with open(save_path, 'w') as f:
-                json.dump(game_state, f, indent=2)
+            atomic_write_json(save_path, game_state, indent=2)
+            
+            # Keep the action log next to the save for replays and post-mortems
+            if getattr(engine, 'action_log', None) is not None and engine.action_log.entries:
+                engine.action_log.dump(SAVES_DIR / f"{save_name}{ACTION_LOG_SUFFIX}")
+            
+            GameSaver.update_index(save_name, game_state, save_path)
             
             return True
         except Exception as e:
@@ -98,6 +188,10 @@ class GameSaver:
             
             deserialize_game_state(game_state, engine)
             
+            from game.action_log import ActionLog
+            log_path = SAVES_DIR / f"{save_name}{ACTION_LOG_SUFFIX}"
+            engine.action_log = ActionLog.load(log_path) if log_path.exists() else ActionLog()
+            
             return True
         except Exception as e:
             print(f"Error loading game: {e}")
@@ -116,6 +210,16 @@ class GameSaver:
         """
         try:
             save_path = SAVES_DIR / f"{save_name}.json"
+            
+            with _index_lock:
+                index = GameSaver.read_index()
+                if index.pop(save_name, None) is not None:
+                    GameSaver.write_index(index)
+            
+            log_path = SAVES_DIR / f"{save_name}{ACTION_LOG_SUFFIX}"
+            if log_path.exists():
+                log_path.unlink()
+            
             if save_path.exists():
                 save_path.unlink()
                 return True
@@ -130,6 +234,73 @@ def ensure_saves_directory():
     SAVES_DIR.mkdir(exist_ok=True)
 
 
+def atomic_write_json(path: Path, data: Any, indent: Optional[int] = None) -> None:
+    """
+    Write JSON to a file atomically.
+    
+    Args:
+        path: Destination file
+        data: JSON-serializable data
+        indent: Optional indentation passed to json.dumps
+    """
+    atomic_write_text(path, json.dumps(data, indent=indent))
+
+
+def atomic_write_text(path: Path, text: str) -> None:
+    """
+    Write text to a file atomically.
+    
+    The text is written to a temporary file in the same directory and renamed
+    over the target, so readers never observe a partially written file.
+    
+    Args:
+        path: Destination file
+        text: File contents
+    """
+    path = Path(path)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.stem}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+def build_save_header(game_state: Dict[str, Any], stat: os.stat_result) -> Dict[str, Any]:
+    """
+    Build the index header for a save.
+    
+    Args:
+        game_state: Serialized game state
+        stat: Result of stat() on the save file, used to detect stale headers
+        
+    Returns:
+        Dictionary with the fields needed to list the save
+    """
+    return {
+        'version': game_state.get('version'),
+        'timestamp': game_state.get('timestamp', 'Unknown'),
+        'current_quarter': game_state['time']['current_quarter'],
+        'current_year': game_state['time']['current_year'],
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns
+    }
+
+
+def _header_matches_file(header: Optional[Dict[str, Any]], stat: os.stat_result) -> bool:
+    """Check whether an index header still describes the file on disk."""
+    return (header is not None and
+            header.get('size') == stat.st_size and
+            header.get('mtime_ns') == stat.st_mtime_ns)
+
+
 def serialize_game_state(engine: 'GameEngine') -> Dict[str, Any]:
     """
     Serialize game state to a dictionary.
@@ -140,53 +311,20 @@ def serialize_game_state(engine: 'GameEngine') -> Dict[str, Any]:
     Returns:
         Dictionary containing all game state
     """
-    from models.company import Company
-    
     # Serialize player
-    player_data = {
-        'cash': engine.player.cash,
-        'current_debt': engine.player.current_debt,
-        'base_debt_capacity': engine.player.base_debt_capacity,
-        'reputation': engine.player.reputation,
-        'deal_history': engine.player.deal_history,
-        'portfolio': []
-    }
-    
-    # Serialize portfolio companies
-    for company in engine.player.portfolio:
-        company_data = {
-            'name': company.name,
-            'sector': company.sector,
-            'revenue': company.revenue,
-            'ebitda_margin': company.ebitda_margin,
-            'growth_rate': company.growth_rate,
-            'volatility': company.volatility,
-            'valuation_multiple': company.valuation_multiple,
-            'acquisition_price': company.acquisition_price,
-            'acquisition_quarter': company.acquisition_quarter,
-            'current_valuation': company.current_valuation,
-            'revenue_history': company.revenue_history,
-            'ebitda_history': company.ebitda_history,
-            'last_operation_quarter': company.last_operation_quarter,
-            'operations_this_quarter': company.operations_this_quarter,
-            'operational_health': company.operational_health,
-            'manager': {
-                'name': company.manager.name,
-                'competence': company.manager.competence,
-                'risk_profile': company.manager.risk_profile,
-                'cooperativeness': company.manager.cooperativeness
-            }
-        }
-        player_data['portfolio'].append(company_data)
+    player_data = serialize_player_scalars(engine.player)
+    player_data['portfolio'] = [serialize_portfolio_company(c) for c in engine.player.portfolio]
     
     # Serialize market
     market_data = {
         'interest_rate': engine.market.interest_rate,
         'growth_rate': engine.market.growth_rate,
-        'sector_multiples': engine.market.sector_multiples,
+        'sector_multiples': dict(engine.market.sector_multiples),
         'credit_conditions': engine.market.credit_conditions,
-        'interest_rate_history': engine.market.interest_rate_history,
-        'growth_rate_history': engine.market.growth_rate_history
+        'multiple_trend': engine.market.multiple_trend,
+        'interest_rate_history': list(engine.market.interest_rate_history),
+        'growth_rate_history': list(engine.market.growth_rate_history),
+        'multiple_trend_history': list(engine.market.multiple_trend_history)
     }
     
     # Serialize time manager
@@ -196,34 +334,22 @@ def serialize_game_state(engine: 'GameEngine') -> Dict[str, Any]:
         'total_quarters': engine.time_manager.total_quarters
     }
     
-    # Serialize available deals
-    deals_data = []
-    for company in engine.available_deals:
-        deal_data = {
-            'name': company.name,
-            'sector': company.sector,
-            'revenue': company.revenue,
-            'ebitda_margin': company.ebitda_margin,
-            'growth_rate': company.growth_rate,
-            'volatility': company.volatility,
-            'valuation_multiple': company.valuation_multiple,
-            'current_valuation': company.current_valuation,
-            'manager': {
-                'name': company.manager.name,
-                'competence': company.manager.competence,
-                'risk_profile': company.manager.risk_profile,
-                'cooperativeness': company.manager.cooperativeness
-            }
-        }
-        deals_data.append(deal_data)
+    # Serialize available deals (organized by sector and tier)
+    deals_data = {}
+    for sector, tiers in engine.available_deals.items():
+        deals_data[sector] = {}
+        for tier, companies in tiers.items():
+            deals_data[sector][tier] = [_serialize_deal_company(c) for c in companies]
     
     return {
-        'version': '2.0',
+        'version': '2.1',
         'timestamp': datetime.now().isoformat(),
         'player': player_data,
         'market': market_data,
         'time': time_data,
-        'available_deals': deals_data
+        'available_deals': deals_data,
+        'deal_schedule': engine.deal_schedule.to_dict(_serialize_deal_company),
+        'event_queue': engine.event_queue.to_dict()
     }
 
 
@@ -235,49 +361,17 @@ def deserialize_game_state(data: Dict[str, Any], engine: 'GameEngine') -> None:
         data: Dictionary containing game state
         engine: GameEngine instance to populate
     """
-    from models.company import Company
-    from models.manager import Manager
-    
     # Restore player
     player_data = data['player']
-    engine.player.cash = player_data['cash']
-    engine.player.current_debt = player_data['current_debt']
-    engine.player.base_debt_capacity = player_data['base_debt_capacity']
-    engine.player.reputation = player_data['reputation']
-    engine.player.deal_history = player_data['deal_history']
-    engine.player.portfolio = []
-    
-    # Restore portfolio companies
-    for company_data in player_data['portfolio']:
-        mgr_data = company_data['manager']
-        manager = Manager(
-            name=mgr_data['name'],
-            competence=mgr_data['competence'],
-            risk_profile=mgr_data['risk_profile'],
-            cooperativeness=mgr_data['cooperativeness']
-        )
-        
-        company = Company(
-            name=company_data['name'],
-            sector=company_data['sector'],
-            revenue=company_data['revenue'],
-            ebitda_margin=company_data['ebitda_margin'],
-            growth_rate=company_data['growth_rate'],
-            volatility=company_data['volatility'],
-            manager=manager,
-            valuation_multiple=company_data['valuation_multiple']
-        )
-        
-        company.acquisition_price = company_data['acquisition_price']
-        company.acquisition_quarter = company_data['acquisition_quarter']
-        company.current_valuation = company_data['current_valuation']
-        company.revenue_history = company_data['revenue_history']
-        company.ebitda_history = company_data['ebitda_history']
-        company.last_operation_quarter = company_data.get('last_operation_quarter')
-        company.operations_this_quarter = company_data.get('operations_this_quarter', 0)
-        company.operational_health = company_data.get('operational_health', 1.0)
-        
-        engine.player.portfolio.append(company)
+    apply_player_scalars(engine.player, player_data)
+    engine.player.portfolio = [
+        deserialize_portfolio_company(company_data) for company_data in player_data['portfolio']
+    ]
+    
+    # Older saves have no acquisition ids: number their holdings now
+    for company in engine.player.portfolio:
+        if company.acquisition_id is None:
+            company.acquisition_id = engine.player.new_acquisition_id()
     
     # Restore market
     market_data = data['market']
@@ -285,39 +379,224 @@ def deserialize_game_state(data: Dict[str, Any], engine: 'GameEngine') -> None:
     engine.market.growth_rate = market_data['growth_rate']
     engine.market.sector_multiples = market_data['sector_multiples']
     engine.market.credit_conditions = market_data['credit_conditions']
+    engine.market.multiple_trend = market_data.get('multiple_trend', 1.0)
     engine.market.interest_rate_history = market_data['interest_rate_history']
     engine.market.growth_rate_history = market_data['growth_rate_history']
+    engine.market.multiple_trend_history = market_data.get(
+        'multiple_trend_history', [engine.market.multiple_trend]
+    )
+    engine.market.difficulty = engine.player.difficulty
+    engine.market.difficulty_settings = config.DIFFICULTY_SETTINGS.get(
+        engine.player.difficulty, config.DIFFICULTY_SETTINGS['medium']
+    )
     
     # Restore time manager
     time_data = data['time']
     engine.time_manager.current_quarter = time_data['current_quarter']
     engine.time_manager.current_year = time_data['current_year']
     engine.time_manager.total_quarters = time_data['total_quarters']
+    engine.player.ledger.quarter = engine.time_manager.current_quarter
     
     # Restore available deals
-    engine.available_deals = []
-    for deal_data in data['available_deals']:
-        mgr_data = deal_data['manager']
-        manager = Manager(
-            name=mgr_data['name'],
-            competence=mgr_data['competence'],
-            risk_profile=mgr_data['risk_profile'],
-            cooperativeness=mgr_data['cooperativeness']
-        )
-        
-        company = Company(
-            name=deal_data['name'],
-            sector=deal_data['sector'],
-            revenue=deal_data['revenue'],
-            ebitda_margin=deal_data['ebitda_margin'],
-            growth_rate=deal_data['growth_rate'],
-            volatility=deal_data['volatility'],
-            manager=manager,
-            valuation_multiple=deal_data['valuation_multiple']
+    deals_data = data['available_deals']
+    if isinstance(deals_data, list):
+        # Version 2.0 saves stored a flat list; regenerate the tiered book instead
+        from simulation import procedural_gen
+        engine.available_deals = procedural_gen.generate_tiered_deal_portfolio(engine.market)
+    else:
+        engine.available_deals = {}
+        for sector, tiers in deals_data.items():
+            engine.available_deals[sector] = {}
+            for tier, companies in tiers.items():
+                engine.available_deals[sector][tier] = [
+                    _deserialize_deal_company(deal_data) for deal_data in companies
+                ]
+                
+    # Restore the deal schedule; older saves get fresh sale processes
+    from simulation import deal_flow
+    from simulation.deal_schedule import DealSchedule
+    if 'deal_schedule' in data and all(
+        company.listing_id is not None
+        for tiers in engine.available_deals.values() for companies in tiers.values() for company in companies
+    ):
+        engine.deal_schedule = DealSchedule.from_dict(data['deal_schedule'], _deserialize_deal_company)
+    else:
+        engine.deal_schedule = deal_flow.open_deal_book(
+            engine.available_deals, engine.time_manager.current_quarter
         )
         
-        company.current_valuation = deal_data['current_valuation']
-        engine.available_deals.append(company)
+    # Restore delayed event effects (older saves have none pending)
+    from game.event_queue import EventQueue
+    engine.event_queue = EventQueue.from_dict(data.get('event_queue', {}))
+
+
+def serialize_player_scalars(player: 'Player') -> Dict[str, Any]:
+    """
+    Serialize the player's balance-sheet state (everything except the portfolio).
+    
+    Mutable containers are copied so the snapshot can be written from another
+    thread while the game keeps running.
+    """
+    return {
+        'fund_name': player.fund_name,
+        'difficulty': player.difficulty,
+        'cash': player.cash,
+        'current_debt': player.current_debt,
+        'base_debt_capacity': player.base_debt_capacity,
+        'reputation': player.reputation,
+        'total_taxes_paid': player.total_taxes_paid,
+        'next_acquisition_id': player.next_acquisition_id,
+        'deal_history': [dict(deal) for deal in player.deal_history],
+        'ledger': player.ledger.to_dict(),
+        'debt_book': player.debt_book.to_dict()
+    }
+
+
+def apply_player_scalars(player: 'Player', player_data: Dict[str, Any]) -> None:
+    """Restore state produced by serialize_player_scalars onto a player."""
+    from models.ledger import FundLedger
+    from models.debt import DebtBook
+    
+    player.fund_name = player_data.get('fund_name', player.fund_name)
+    player.difficulty = player_data.get('difficulty', player.difficulty)
+    player.cash = player_data['cash']
+    player.current_debt = player_data['current_debt']
+    player.base_debt_capacity = player_data['base_debt_capacity']
+    player.reputation = player_data['reputation']
+    player.total_taxes_paid = player_data.get('total_taxes_paid', 0.0)
+    player.next_acquisition_id = player_data.get('next_acquisition_id', 0)
+    player.deal_history = player_data['deal_history']
+    player.ledger = FundLedger.from_dict(player_data.get('ledger', {}))
+    
+    if 'debt_book' in player_data:
+        player.debt_book = DebtBook.from_dict(player_data['debt_book'])
+    else:
+        # Older saves only have a total: carry it as a single revolver balance
+        player.debt_book = DebtBook()
+        if player.current_debt > 0:
+            player.debt_book.add_tranche(player.current_debt)
+
+
+def serialize_portfolio_company(company: 'Company') -> Dict[str, Any]:
+    """Serialize a portfolio company, copying its history lists."""
+    return {
+        'name': company.name,
+        'sector': company.sector,
+        'revenue': company.revenue,
+        'ebitda_margin': company.ebitda_margin,
+        'growth_rate': company.growth_rate,
+        'volatility': company.volatility,
+        'valuation_multiple': company.valuation_multiple,
+        'acquisition_price': company.acquisition_price,
+        'acquisition_quarter': company.acquisition_quarter,
+        'acquisition_id': company.acquisition_id,
+        'current_valuation': company.current_valuation,
+        'revenue_history': list(company.revenue_history),
+        'ebitda_history': list(company.ebitda_history),
+        'last_operation_quarter': company.last_operation_quarter,
+        'operations_this_quarter': company.operations_this_quarter,
+        'operational_health': company.operational_health,
+        'manager': {
+            'name': company.manager.name,
+            'competence': company.manager.competence,
+            'risk_profile': company.manager.risk_profile,
+            'cooperativeness': company.manager.cooperativeness
+        }
+    }
+
+
+def deserialize_portfolio_company(company_data: Dict[str, Any]) -> 'Company':
+    """Rebuild a portfolio company from serialize_portfolio_company output."""
+    from models.company import Company
+    from models.manager import Manager
+    
+    mgr_data = company_data['manager']
+    manager = Manager(
+        name=mgr_data['name'],
+        competence=mgr_data['competence'],
+        risk_profile=mgr_data['risk_profile'],
+        cooperativeness=mgr_data['cooperativeness']
+    )
+    
+    company = Company(
+        name=company_data['name'],
+        sector=company_data['sector'],
+        revenue=company_data['revenue'],
+        ebitda_margin=company_data['ebitda_margin'],
+        growth_rate=company_data['growth_rate'],
+        volatility=company_data['volatility'],
+        manager=manager,
+        valuation_multiple=company_data['valuation_multiple']
+    )
+    
+    company.acquisition_price = company_data['acquisition_price']
+    company.acquisition_quarter = company_data['acquisition_quarter']
+    company.acquisition_id = company_data.get('acquisition_id')
+    company.current_valuation = company_data['current_valuation']
+    company.revenue_history = company_data['revenue_history']
+    company.ebitda_history = company_data['ebitda_history']
+    company.last_operation_quarter = company_data.get('last_operation_quarter')
+    company.operations_this_quarter = company_data.get('operations_this_quarter', 0)
+    company.operational_health = company_data.get('operational_health', 1.0)
+    
+    return company
+
+
+def _serialize_deal_company(company: 'Company') -> Dict[str, Any]:
+    """Serialize a company available for acquisition."""
+    return {
+        'name': company.name,
+        'sector': company.sector,
+        'revenue': company.revenue,
+        'ebitda_margin': company.ebitda_margin,
+        'growth_rate': company.growth_rate,
+        'volatility': company.volatility,
+        'valuation_multiple': company.valuation_multiple,
+        'current_valuation': company.current_valuation,
+        'operational_health': company.operational_health,
+        'quarters_listed': company.quarters_listed,
+        'listing_id': company.listing_id,
+        'asking_discount': company.asking_discount,
+        'manager': {
+            'name': company.manager.name,
+            'competence': company.manager.competence,
+            'risk_profile': company.manager.risk_profile,
+            'cooperativeness': company.manager.cooperativeness
+        }
+    }
+
+
+def _deserialize_deal_company(deal_data: Dict[str, Any]) -> 'Company':
+    """Deserialize a company available for acquisition."""
+    from models.company import Company
+    from models.manager import Manager
+    
+    mgr_data = deal_data['manager']
+    manager = Manager(
+        name=mgr_data['name'],
+        competence=mgr_data['competence'],
+        risk_profile=mgr_data['risk_profile'],
+        cooperativeness=mgr_data['cooperativeness']
+    )
+    
+    company = Company(
+        name=deal_data['name'],
+        sector=deal_data['sector'],
+        revenue=deal_data['revenue'],
+        ebitda_margin=deal_data['ebitda_margin'],
+        growth_rate=deal_data['growth_rate'],
+        volatility=deal_data['volatility'],
+        manager=manager,
+        valuation_multiple=deal_data['valuation_multiple']
+    )
+    
+    company.current_valuation = deal_data['current_valuation']
+    if 'operational_health' in deal_data:
+        company.operational_health = deal_data['operational_health']
+    company.quarters_listed = deal_data.get('quarters_listed', 0)
+    company.listing_id = deal_data.get('listing_id')
+    company.asking_discount = deal_data.get('asking_discount', 1.0)
+    return company
 
 
 def list_save_files() -> list:
@@ -2,6 +2,7 @@
 Time manager - tracks game progression and quarters.
 """
 
+import copy
 import config
 
 
@@ -13,6 +14,10 @@ class TimeManager:
         self.current_quarter = 0
         self.current_year = 1
         
+    def fork(self) -> 'TimeManager':
+        """Return an independent copy for what-if simulation."""
+        return copy.copy(self)
+        
     def advance_quarter(self) -> None:
         """Advance to the next quarter."""
         self.current_quarter += 1
@@ -1,6 +1,6 @@
 """
 Models package for PE Simulator.
-Contains core data structures for Player, Company, Market, Deal, Manager, and Finance.
+Contains core data structures for Player, Company, Market, Deal, Manager, Ledger, and Finance.
 """
 
 from .player import Player
@@ -8,6 +8,7 @@ from .company import Company
 from .manager import Manager
 from .market import Market
 from .deal import Deal
+from .ledger import FundLedger
 
-__all__ = ['Player', 'Company', 'Manager', 'Market', 'Deal']
+__all__ = ['Player', 'Company', 'Manager', 'Market', 'Deal', 'FundLedger']
 
@@ -3,6 +3,7 @@ Company model - core business entity with financial and operational attributes.
 """
 
 from typing import Optional, Dict, Any
+import copy
 import random
 from .manager import Manager
 import config
@@ -30,8 +31,18 @@ class Company:
         # Valuation tracking
         self.acquisition_price: Optional[float] = None
         self.acquisition_quarter: Optional[int] = None
+        
+        # Fund-wide id of the holding, assigned on acquisition (names can repeat)
+        self.acquisition_id: Optional[int] = None
         self.current_valuation = 0.0
         
+        # Quarters spent on the market while listed for acquisition, the
+        # id its sale process is scheduled under (see simulation.deal_schedule),
+        # and the price factor carried over from earlier listings
+        self.quarters_listed = 0
+        self.listing_id: Optional[int] = None
+        self.asking_discount = 1.0
+        
         # Operation tracking
         self.last_operation_quarter: Optional[int] = None
         self.operations_this_quarter = 0
@@ -39,6 +50,7 @@ class Company:
         # Historical tracking
         self.revenue_history = [revenue]
         self.ebitda_history = [revenue * ebitda_margin]
+        self._history_shared = False  # True while history lists are shared with a fork
         
         # Operational health (0-1 scale, affects long-term viability)
         # Initialize AFTER all other attributes are set
@@ -108,6 +120,8 @@ class Company:
         self.ebitda_margin = max(0.0, min(1.0, self.ebitda_margin + margin_drift))
         
         # Record history
+        if self._history_shared:
+            self._unshare_history()
         self.revenue_history.append(self.revenue)
         self.ebitda_history.append(self.ebitda)
         
@@ -119,6 +133,24 @@ class Company:
             'new_revenue': self.revenue
         }
         
+    def fork(self) -> 'Company':
+        """
+        Return an independent copy for what-if simulation.
+        
+        Scalars are copied; the history lists are shared copy-on-write (whichever
+        side appends first takes its own copy). The manager is shared as
+        managers are replaced, never mutated.
+        """
+        child = copy.copy(self)
+        self._history_shared = child._history_shared = True
+        return child
+        
+    def _unshare_history(self) -> None:
+        """Take private copies of history lists shared with a fork."""
+        self.revenue_history = list(self.revenue_history)
+        self.ebitda_history = list(self.ebitda_history)
+        self._history_shared = False
+        
     def get_growth_quality_adjustment(self) -> float:
         """
         PHASE 3: Calculate multiple adjustment based on recent growth performance.
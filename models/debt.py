@@ -0,0 +1,291 @@
+"""
+Debt book - the fund's loans as tranches with precomputed amortization.
+
+Tranches are stored as parallel numpy arrays (one element per loan) so that
+interest, scheduled principal and covenant tests for the whole book are
+evaluated in a single vectorized pass, however many loans the fund carries.
+"""
+
+from typing import Dict, Any, List, Optional, Tuple
+import numpy as np
+import config
+
+
+# Company code used for loans not tied to a portfolio company
+REVOLVER = -1
+
+
+class DebtBook:
+    """
+    All outstanding loans of a fund.
+    
+    Acquisition loans are tied to a portfolio company (by its
+    Company.acquisition_id, since names need not be unique) and amortize
+    straight-line over config.ACQUISITION_LOAN_TERM_QUARTERS; revolver draws
+    (operations financing, capitalized interest) are interest-only. Each
+    tranche's scheduled principal is precomputed at origination into a row of
+    `schedule`, indexed by the tranche's age in quarters.
+    """
+    
+    def __init__(self):
+        self.balance = np.zeros(0)
+        self.principal = np.zeros(0)
+        self.age = np.zeros(0, dtype=int)
+        self.company_code = np.zeros(0, dtype=int)
+        
+        # Scheduled principal by age, shape (tranches, longest term + 1); the
+        # last column is always zero so ages past maturity index into it
+        self.schedule = np.zeros((0, 1))
+        
+        # Acquisition id <-> integer code, so balances can be grouped with bincount
+        self.company_ids: List[int] = []
+        self._company_codes: Dict[int, int] = {}
+        
+    @property
+    def tranches(self) -> int:
+        return len(self.balance)
+        
+    @property
+    def total(self) -> float:
+        """Outstanding balance across all tranches."""
+        return float(self.balance.sum())
+        
+    def _code_for(self, company: Optional[int]) -> int:
+        if company is None:
+            return REVOLVER
+        code = self._company_codes.get(company)
+        if code is None:
+            code = len(self.company_ids)
+            self.company_ids.append(company)
+            self._company_codes[company] = code
+        return code
+        
+    def add_tranche(self, amount: float, company: Optional[int] = None,
+                    term: Optional[int] = None) -> None:
+        """
+        Originate a loan.
+        
+        Args:
+            amount: Principal drawn
+            company: Acquisition id of the portfolio company the loan finances
+                     (None for a revolver draw)
+            term: Amortization term in quarters; defaults to
+                  config.ACQUISITION_LOAN_TERM_QUARTERS for company loans and
+                  0 (interest-only) for revolver draws
+        """
+        if term is None:
+            term = config.ACQUISITION_LOAN_TERM_QUARTERS if company is not None else 0
+            
+        width = max(self.schedule.shape[1], term + 1)
+        row = np.zeros(width)
+        if term > 0:
+            row[:term] = amount / term
+        schedule = np.zeros((self.tranches + 1, width))
+        schedule[:-1, :self.schedule.shape[1]] = self.schedule
+        schedule[-1] = row
+        
+        self.schedule = schedule
+        self.balance = np.append(self.balance, amount)
+        self.principal = np.append(self.principal, amount)
+        self.age = np.append(self.age, 0)
+        self.company_code = np.append(self.company_code, self._code_for(company))
+        
+    def quarterly_service(self, annual_rate: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Interest and scheduled principal due this quarter, per tranche.
+        
+        Args:
+            annual_rate: Annual rate charged on outstanding balances
+            
+        Returns:
+            (interest, principal) arrays aligned with the tranches
+        """
+        interest = self.balance * (annual_rate / 4)
+        ages = np.minimum(self.age, self.schedule.shape[1] - 1)
+        scheduled = self.schedule[np.arange(self.tranches), ages]
+        principal = np.minimum(scheduled, self.balance)
+        return interest, principal
+        
+    def apply_principal(self, payments: np.ndarray) -> None:
+        """Reduce balances by per-tranche principal payments."""
+        self.balance = np.maximum(0.0, self.balance - payments)
+        
+    def end_quarter(self) -> None:
+        """Age every tranche by a quarter and drop fully repaid loans."""
+        self.age += 1
+        self.compact()
+        
+    def prepay(self, amount: float) -> float:
+        """
+        Repay principal ahead of schedule, revolver draws first, then oldest loans.
+        
+        Returns:
+            Amount actually applied
+        """
+        order = np.lexsort((-self.age, self.company_code != REVOLVER))
+        balances = self.balance[order]
+        before = np.cumsum(balances) - balances
+        paid = np.clip(amount - before, 0.0, balances)
+        
+        payments = np.zeros(self.tranches)
+        payments[order] = paid
+        self.apply_principal(payments)
+        self.compact()
+        return float(paid.sum())
+        
+    def company_balance(self, company: int) -> float:
+        """Outstanding balance of loans tied to a company."""
+        code = self._company_codes.get(company)
+        if code is None:
+            return 0.0
+        return float(self.balance[self.company_code == code].sum())
+        
+    def company_principal(self, company: int) -> float:
+        """Originally borrowed principal of loans tied to a company."""
+        code = self._company_codes.get(company)
+        if code is None:
+            return 0.0
+        return float(self.principal[self.company_code == code].sum())
+        
+    def projected_company_balances(self, companies: List[int], quarters) -> np.ndarray:
+        """
+        Company loan balances after k more quarters of scheduled amortization.
+        
+        Args:
+            companies: Acquisition ids of the companies to report
+            quarters: Sequence of horizons k (in quarters)
+            
+        Returns:
+            Array of shape (len(companies), len(quarters))
+        """
+        quarters = np.asarray(quarters, dtype=int)
+        width = self.schedule.shape[1]
+        
+        # Cumulative scheduled principal by age, with a leading zero column
+        cumulative = np.concatenate(
+            [np.zeros((self.tranches, 1)), np.cumsum(self.schedule, axis=1)], axis=1
+        )
+        rows = np.arange(self.tranches)[:, None]
+        start = np.minimum(self.age, width)[:, None]
+        end = np.minimum(self.age[:, None] + quarters[None, :], width)
+        paid = cumulative[rows, end] - cumulative[rows, start]
+        balances = np.maximum(0.0, self.balance[:, None] - paid)
+        
+        tied = self.company_code != REVOLVER
+        by_code = np.zeros((len(self.company_ids) + 1, len(quarters)))
+        np.add.at(by_code, self.company_code[tied], balances[tied])
+        
+        # Companies without loans map to the trailing all-zero row
+        rows = [self._company_codes.get(company, len(self.company_ids)) for company in companies]
+        return by_code[rows].reshape(len(companies), len(quarters))
+        
+    def repay_company(self, company: int, available: float) -> float:
+        """
+        Repay a company's loans (e.g. from exit proceeds).
+        
+        Whatever cannot be repaid from `available` stays outstanding as a
+        revolver balance, since the company no longer secures it.
+        
+        Returns:
+            Amount repaid
+        """
+        code = self._company_codes.get(company)
+        if code is None:
+            return 0.0
+            
+        mask = self.company_code == code
+        balances = np.where(mask, self.balance, 0.0)
+        before = np.cumsum(balances) - balances
+        paid = np.clip(available - before, 0.0, balances)
+        
+        self.apply_principal(paid)
+        self.company_code[mask] = REVOLVER
+        self.schedule[mask] = 0.0
+        self.compact()
+        return float(paid.sum())
+        
+    def balance_by_company(self) -> np.ndarray:
+        """Outstanding balance per company code (revolver draws excluded)."""
+        tied = self.company_code != REVOLVER
+        return np.bincount(self.company_code[tied], weights=self.balance[tied],
+                           minlength=len(self.company_ids))
+                           
+    def covenant_breaches(self, ebitda_by_company: Dict[int, float],
+                          max_ratio: float = None) -> List[Dict[str, Any]]:
+        """
+        Test every company's debt against its leverage covenant.
+        
+        Args:
+            ebitda_by_company: Current EBITDA keyed by acquisition id
+            max_ratio: Maximum debt/EBITDA (defaults to config.MAX_DEBT_TO_EBITDA)
+            
+        Returns:
+            One dict per breaching company with 'company' (its acquisition id),
+            'debt', 'ebitda' and 'ratio'
+        """
+        max_ratio = config.MAX_DEBT_TO_EBITDA if max_ratio is None else max_ratio
+        debt = self.balance_by_company()
+        ebitda = np.array([ebitda_by_company.get(company, np.nan) for company in self.company_ids])
+        
+        covered = ~np.isnan(ebitda) & (debt > 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio = np.where(ebitda > 0, debt / ebitda, np.inf)
+        breached = np.flatnonzero(covered & (ratio > max_ratio))
+        
+        return [
+            {
+                'company': self.company_ids[i],
+                'debt': float(debt[i]),
+                'ebitda': float(ebitda[i]),
+                'ratio': float(ratio[i])
+            }
+            for i in breached
+        ]
+        
+    def compact(self) -> None:
+        """Drop tranches that have been fully repaid."""
+        live = self.balance > 1e-6
+        if live.all():
+            return
+        self.balance = self.balance[live]
+        self.principal = self.principal[live]
+        self.age = self.age[live]
+        self.company_code = self.company_code[live]
+        self.schedule = self.schedule[live]
+        
+    def fork(self) -> 'DebtBook':
+        """Return an independent copy."""
+        child = DebtBook()
+        child.balance = self.balance.copy()
+        child.principal = self.principal.copy()
+        child.age = self.age.copy()
+        child.company_code = self.company_code.copy()
+        child.schedule = self.schedule.copy()
+        child.company_ids = list(self.company_ids)
+        child._company_codes = dict(self._company_codes)
+        return child
+        
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the book to JSON-friendly lists."""
+        return {
+            'balance': self.balance.tolist(),
+            'principal': self.principal.tolist(),
+            'age': self.age.tolist(),
+            'company_code': self.company_code.tolist(),
+            'schedule': self.schedule.tolist(),
+            'company_ids': list(self.company_ids)
+        }
+        
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'DebtBook':
+        """Rebuild a book from to_dict output."""
+        book = cls()
+        book.balance = np.array(data['balance'], dtype=float)
+        book.principal = np.array(data['principal'], dtype=float)
+        book.age = np.array(data['age'], dtype=int)
+        book.company_code = np.array(data['company_code'], dtype=int)
+        if book.tranches:
+            book.schedule = np.array(data['schedule'], dtype=float)
+        book.company_ids = list(data['company_ids'])
+        book._company_codes = {company: i for i, company in enumerate(book.company_ids)}
+        return book
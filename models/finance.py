@@ -2,10 +2,20 @@
 Finance utilities - leverage, debt service, IRR calculations.
 """
 
+from datetime import date
 from typing import List, Tuple
+import numpy as np
 import config
 
 
+# Rate grid used to bracket IRR roots before refinement
+_IRR_GRID_POINTS = 101
+
+# Times the bracket of a conventional stream may double (log-rates up to
+# +/-5 * 2**7 = 640) when its root lies outside the grid
+_IRR_MAX_EXPANSIONS = 7
+
+
 def calculate_max_leverage(company_ebitda: float, debt_to_ebitda_ratio: float = None) -> float:
     """
     Calculate maximum debt for a company based on EBITDA.
@@ -65,43 +75,207 @@ def calculate_interest_payment(debt_amount: float, interest_rate: float) -> floa
     return debt_amount * (interest_rate / 4)
 
 
-def calculate_irr(cash_flows: List[float], quarters: List[int] = None) -> float:
+def calculate_irr(cash_flows: List[float], quarters: List[float] = None) -> float:
     """
-    Calculate Internal Rate of Return using Newton's method.
+    Calculate Internal Rate of Return for a single cash-flow stream.
     
     Args:
         cash_flows: List of cash flows (negative for investments, positive for returns)
-        quarters: List of quarter numbers (optional, defaults to 0, 1, 2, ...)
-        
+        quarters: List of quarter numbers (optional, defaults to 0, 1, 2, ...);
+                  fractional quarters are allowed
+                  
     Returns:
-        Quarterly IRR (multiply by 4 for annual IRR)
+        Quarterly IRR (multiply by 4 for annual IRR), or NaN if the flows
+        have no IRR (e.g. no sign change)
     """
     if not cash_flows:
         return 0.0
         
-    if quarters is None:
-        quarters = list(range(len(cash_flows)))
+    rates, converged = calculate_irr_batch(
+        [cash_flows], None if quarters is None else [quarters]
+    )
+    return float(rates[0]) if converged[0] else float('nan')
+
+
+def calculate_irr_batch(
+    cash_flows,
+    periods=None,
+    guess: float = 0.1,
+    tolerance: float = 1e-10,
+    max_iterations: int = 100
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Solve IRR for many cash-flow vectors at once.
+    
+    Each row is first bracketed by scanning NPV over a grid of rates (taking
+    the sign change nearest the guess when several roots exist; a
+    conventional stream's bracket is widened when its root lies beyond the
+    grid), then refined with Newton steps that fall back to bisection
+    whenever a step would leave the bracket or fails to halve the previous
+    step. Rows with no sign change
+    have no IRR and are reported as not converged.
+    
+    Args:
+        cash_flows: Array of shape (n, m) - one cash-flow vector per row
+                    (a 1-D vector is treated as a single row)
+        periods: Period of each flow, shape (m,) or (n, m); fractional values
+                 allowed (XIRR). Defaults to 0, 1, ..., m-1
+        guess: Preferred rate per period when choosing among multiple roots
+        tolerance: Convergence tolerance on NPV relative to the largest flow
+        max_iterations: Maximum refinement iterations
+        
+    Returns:
+        Tuple of (rates, converged): rate per period for each row (NaN where
+        no IRR exists) and a boolean convergence flag per row
+    """
+    flows = np.atleast_2d(np.asarray(cash_flows, dtype=float))
+    n, m = flows.shape
+    if periods is None:
+        t = np.broadcast_to(np.arange(m, dtype=float), (n, m))
+    else:
+        t = np.broadcast_to(np.asarray(periods, dtype=float), (n, m))
         
-    # Newton's method to find IRR
-    rate = 0.1  # Initial guess: 10% quarterly
-    tolerance = 0.0001
-    max_iterations = 100
+    # Normalize so the tolerance is relative to each row's scale
+    scale = np.abs(flows).max(axis=1, keepdims=True)
+    scale[scale == 0] = 1.0
+    flows = flows / scale
     
-    for _ in range(max_iterations):
-        npv = sum(cf / (1 + rate)**q for cf, q in zip(cash_flows, quarters))
+    # An IRR needs both an outflow and an inflow
+    has_root = (flows > 0).any(axis=1) & (flows < 0).any(axis=1)
+    
+    # Solve in x = log(1 + rate), where NPV(x) = sum(cf * exp(-x * t))
+    grid = np.linspace(-5.0, 5.0, _IRR_GRID_POINTS)
+    step = grid[1] - grid[0]
+    x_guess = np.log1p(guess)
+    
+    with np.errstate(over='ignore', invalid='ignore', divide='ignore'):
+        # Conventional streams (one sign change in time order) have a single
+        # root, so the ends of the grid bracket it
+        order = np.argsort(t, axis=1)
+        signs = np.sign(np.take_along_axis(flows, order, axis=1))
+        last_nonzero = np.maximum.accumulate(np.where(signs != 0, np.arange(m), 0), axis=1)
+        filled = np.take_along_axis(signs, last_nonzero, axis=1)
+        conventional = (filled[:, 1:] * filled[:, :-1] < 0).sum(axis=1) == 1
         
-        if abs(npv) < tolerance:
-            return rate
+        lo = np.full(n, grid[0])
+        hi = np.full(n, grid[-1])
+        f_lo = _npv_sign(flows, t, lo)
+        f_hi = _npv_sign(flows, t, hi)
+        
+        # Roots beyond the grid (e.g. a 1000x multiple in one period): keep
+        # doubling the bracket until NPV changes sign across it
+        for _ in range(_IRR_MAX_EXPANSIONS):
+            widen = np.flatnonzero(has_root & conventional & (f_lo * f_hi > 0))
+            if widen.size == 0:
+                break
+            lo[widen] *= 2
+            hi[widen] *= 2
+            f_lo[widen] = _npv_sign(flows[widen], t[widen], lo[widen])
+            f_hi[widen] = _npv_sign(flows[widen], t[widen], hi[widen])
             
-        # Derivative of NPV with respect to rate
-        dnpv = sum(-q * cf / (1 + rate)**(q + 1) for cf, q in zip(cash_flows, quarters))
+        has_root &= ~conventional | (f_lo * f_hi <= 0)
         
-        if abs(dnpv) < 1e-10:
-            break
+        # Other streams may have several roots: scan NPV over the grid and
+        # keep the sign change nearest the guess. Discount factors are
+        # stepped multiplicatively along the grid instead of recomputed.
+        scan = np.flatnonzero(has_root & ~conventional)
+        if scan.size:
+            flows_s, t_s = flows[scan], t[scan]
+            discount = np.exp(-grid[0] * t_s)
+            step_factor = np.exp(-step * t_s)
+            prev_npv = (flows_s * discount).sum(axis=1)
+            
+            lo_s = np.zeros(scan.size)
+            f_lo_s = np.zeros(scan.size)
+            best_distance = np.full(scan.size, np.inf)
+            for left in grid[:-1]:
+                discount = discount * step_factor
+                next_npv = (flows_s * discount).sum(axis=1)
+                sign_change = ((np.sign(prev_npv) * np.sign(next_npv) <= 0) &
+                               np.isfinite(prev_npv) & np.isfinite(next_npv))
+                distance = abs(left + step / 2 - x_guess)
+                better = sign_change & (distance < best_distance)
+                lo_s[better] = left
+                f_lo_s[better] = prev_npv[better]
+                best_distance[better] = distance
+                prev_npv = next_npv
+                
+            lo[scan] = lo_s
+            hi[scan] = lo_s + step
+            f_lo[scan] = f_lo_s
+            has_root[scan] = np.isfinite(best_distance)
+            
+        # Refine: Newton steps, falling back to bisection when a step leaves
+        # the bracket or does not at least halve the previous step
+        x = np.where((x_guess > lo) & (x_guess < hi), x_guess, (lo + hi) / 2)
+        step_old = hi - lo
+        converged = ~has_root
+        
+        for _ in range(max_iterations):
+            active = np.flatnonzero(~converged)
+            if active.size == 0:
+                break
+                
+            xa, lo_a, hi_a, f_lo_a = x[active], lo[active], hi[active], f_lo[active]
+            ta, flows_a = t[active], flows[active]
+            discount = np.exp(-xa[:, None] * ta)
+            f = (flows_a * discount).sum(axis=1)
+            df = (-ta * flows_a * discount).sum(axis=1)
+            
+            done = (np.abs(f) <= tolerance) | (hi_a - lo_a <= tolerance)
+            converged[active[done]] = True
             
-        rate = rate - npv / dnpv
+            # Shrink the bracket around the root
+            same_side = np.sign(f) == np.sign(f_lo_a)
+            lo_a = np.where(same_side, xa, lo_a)
+            f_lo_a = np.where(same_side, f, f_lo_a)
+            hi_a = np.where(same_side, hi_a, xa)
+            
+            newton = xa - f / df
+            bisect = (~np.isfinite(newton) | (newton <= lo_a) | (newton >= hi_a) |
+                      (np.abs(newton - xa) > np.abs(step_old[active]) / 2))
+            x_new = np.where(bisect, (lo_a + hi_a) / 2, newton)
+            
+            keep = ~done
+            step_old[active[keep]] = (x_new - xa)[keep]
+            x[active[keep]] = x_new[keep]
+            lo[active], hi[active], f_lo[active] = lo_a, hi_a, f_lo_a
+            
+        rates = np.where(has_root, np.expm1(x), np.nan)
+        
+    return rates, converged & has_root
+
+
+def _npv_sign(flows: np.ndarray, t: np.ndarray, x: np.ndarray) -> np.ndarray:
+    """
+    Sign of NPV at log-rates x, one per row, without overflowing.
+    
+    Discounting is taken relative to the row's earliest (x > 0) or latest
+    (x < 0) period, so no exponent is positive; this rescales NPV by a
+    positive factor and leaves its sign unchanged.
+    """
+    t_ref = np.where(x > 0, t.min(axis=1), t.max(axis=1))
+    return np.sign((flows * np.exp(-x[:, None] * (t - t_ref[:, None]))).sum(axis=1))
+
+
+def calculate_xirr(cash_flows: List[float], dates: List[date]) -> float:
+    """
+    Calculate annualized IRR for cash flows on arbitrary dates (XIRR).
+    
+    Args:
+        cash_flows: List of cash flows
+        dates: Date of each cash flow
         
-    return rate
+    Returns:
+        Annual IRR, or NaN if the flows have no IRR
+    """
+    if not cash_flows:
+        return 0.0
+        
+    start = min(dates)
+    years = [(d - start).days / 365.0 for d in dates]
+    rates, converged = calculate_irr_batch([cash_flows], [years])
+    return float(rates[0]) if converged[0] else float('nan')
 
 
 def calculate_moic(initial_investment: float, exit_value: float) -> float:
@@ -157,22 +331,60 @@ def calculate_leveraged_returns(
     Returns:
         Tuple of (equity_return, equity_irr, moic)
     """
-    # Calculate total interest paid over holding period
+    equity_return, equity_irr, moic = calculate_leveraged_returns_batch(
+        purchase_price, exit_price, debt_amount, equity_amount, quarters_held, interest_rate
+    )
+    return float(equity_return), float(equity_irr), float(moic)
+
+
+def calculate_leveraged_returns_batch(
+    purchase_price,
+    exit_price,
+    debt_amount,
+    equity_amount,
+    quarters_held,
+    interest_rate
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Calculate returns on many hypothetical leveraged exits at once.
+    
+    All arguments broadcast against each other, so e.g. a column of
+    companies and a row of hold periods give a full exit grid. The equity
+    stream is a single investment followed by a single exit, so its IRR has
+    the closed form (proceeds / equity) ** (1 / quarters) - 1 and needs no
+    iterative solve.
+    
+    Args:
+        purchase_price: Total purchase price
+        exit_price: Exit sale price
+        debt_amount: Debt repaid at exit
+        equity_amount: Equity invested
+        quarters_held: Number of quarters held (at least one period is assumed)
+        interest_rate: Annual interest rate on debt
+        
+    Returns:
+        Tuple of (equity_return, equity_irr, moic) arrays; equity_irr is
+        annualized (quarterly rate x 4) and NaN where exit proceeds do not
+        cover the debt
+    """
+    purchase_price, exit_price, debt_amount, equity_amount, quarters_held, interest_rate = (
+        np.broadcast_arrays(*(np.asarray(a, dtype=float) for a in (
+            purchase_price, exit_price, debt_amount, equity_amount, quarters_held, interest_rate
+        )))
+    )
+    
+    # Total interest paid over the holding period
     total_interest = debt_amount * (interest_rate / 4) * quarters_held
     
     # Exit proceeds after repaying debt
     exit_proceeds = exit_price - debt_amount
-    
-    # Net equity return
     equity_return = exit_proceeds - equity_amount - total_interest
     
-    # Cash flows for IRR calculation
-    cash_flows = [-equity_amount]  # Initial investment
-    cash_flows.extend([0] * (quarters_held - 1))  # Holding periods
-    cash_flows.append(exit_proceeds)  # Exit
+    periods = np.maximum(quarters_held, 1)
+    valid = (equity_amount > 0) & (exit_proceeds > 0)
+    ratio = np.where(valid, exit_proceeds, 1.0) / np.where(valid, equity_amount, 1.0)
+    equity_irr = np.where(valid, ratio ** (1 / periods) - 1, np.nan) * 4
     
-    equity_irr = calculate_irr(cash_flows)
-    moic = calculate_moic(equity_amount, exit_proceeds)
+    moic = np.where(equity_amount > 0, exit_proceeds / np.where(equity_amount > 0, equity_amount, 1.0), 0.0)
     
-    return equity_return, equity_irr * 4, moic  # Convert quarterly IRR to annual
-
+    return equity_return, equity_irr, moic
@@ -0,0 +1,212 @@
+"""
+Fund ledger - append-only record of every capital flow with running fund metrics.
+"""
+
+from typing import Dict, Any, List, Optional
+import copy
+from .finance import calculate_irr_batch
+
+
+# Flow kinds (amounts are signed from the fund's cash perspective)
+ACQUISITION = 'acquisition'
+CAPEX = 'capex'
+STRATEGY = 'strategy'
+MANAGEMENT = 'management'
+INTEREST = 'interest'
+DEBT_DRAW = 'debt_draw'
+DEBT_REPAYMENT = 'debt_repayment'
+DEBT_PAYOFF = 'debt_payoff'  # A company's loans repaid from its exit proceeds
+EXIT = 'exit'
+TAX = 'tax'
+OTHER = 'other'
+
+FLOW_KINDS = (ACQUISITION, CAPEX, STRATEGY, MANAGEMENT, INTEREST,
+              DEBT_DRAW, DEBT_REPAYMENT, DEBT_PAYOFF, EXIT, TAX, OTHER)
+
+
+class LedgerEntry:
+    """A single capital flow."""
+    
+    def __init__(self, quarter: int, kind: str, amount: float, company: Optional[str] = None):
+        self.quarter = quarter
+        self.kind = kind
+        self.amount = amount
+        self.company = company
+        
+    def to_list(self) -> list:
+        return [self.quarter, self.kind, self.amount, self.company]
+        
+    def __repr__(self) -> str:
+        return f"LedgerEntry(Q{self.quarter}, {self.kind}, {self.amount:,.0f}, {self.company})"
+
+
+class FundLedger:
+    """
+    Append-only ledger of capital flows with incrementally maintained metrics.
+    
+    Metrics are from the fund equity's point of view: capital paid in is
+    investment outflows (acquisitions, follow-on spend, interest) net of the
+    debt that funded them, plus principal repaid from fund cash; distributions
+    are exit proceeds net of taxes and of the loans paid off from them (any
+    payoff beyond the proceeds is equity paid in); the residual value is
+    portfolio value less outstanding debt. Running totals are updated on
+    every append, so TVPI/DPI/RVPI are O(1) to read and the IRR is only
+    re-solved when flows or NAV have changed.
+    """
+    
+    def __init__(self):
+        self.entries: List[LedgerEntry] = []
+        self.quarter = 0  # Quarter stamped on new entries (kept current by the engine)
+        
+        # Running totals
+        self.invested = 0.0
+        self.debt_drawn = 0.0
+        self.debt_repaid = 0.0
+        self.debt_paid_off = 0.0
+        self.distributed = 0.0
+        self.taxes = 0.0
+        self.totals_by_kind: Dict[str, float] = {}
+        
+        # Net equity flow per quarter, for IRR
+        self.quarterly_flows: List[float] = []
+        
+        self._irr_cache: Optional[tuple] = None
+        self._last_quarterly_irr = 0.1
+        
+    def record(self, kind: str, amount: float, company: Optional[str] = None) -> LedgerEntry:
+        """
+        Append a flow and update running metrics.
+        
+        Args:
+            kind: One of FLOW_KINDS
+            amount: Signed cash amount (negative = cash out of the fund)
+            company: Portfolio company the flow relates to, if any
+            
+        Returns:
+            The new entry
+        """
+        if kind not in FLOW_KINDS:
+            raise ValueError(f"Unknown ledger flow kind: {kind}")
+            
+        entry = LedgerEntry(self.quarter, kind, amount, company)
+        self.entries.append(entry)
+        self._apply(entry)
+        return entry
+        
+    def _apply(self, entry: LedgerEntry) -> None:
+        kind, amount = entry.kind, entry.amount
+        
+        if kind == DEBT_DRAW:
+            self.debt_drawn += amount
+        elif kind == DEBT_REPAYMENT:
+            self.debt_repaid -= amount
+        elif kind == DEBT_PAYOFF:
+            self.debt_paid_off -= amount
+        elif kind == TAX:
+            self.taxes -= amount
+        elif amount < 0:
+            self.invested -= amount
+        else:
+            self.distributed += amount
+            
+        self.totals_by_kind[kind] = self.totals_by_kind.get(kind, 0.0) + amount
+        
+        while len(self.quarterly_flows) <= entry.quarter:
+            self.quarterly_flows.append(0.0)
+        self.quarterly_flows[entry.quarter] += amount
+        
+        self._irr_cache = None
+        
+    @property
+    def paid_in(self) -> float:
+        """Equity paid into investments and into paying down debt."""
+        payoff_beyond_proceeds = max(0.0, self.debt_paid_off - self.distributed)
+        return max(0.0, self.invested - self.debt_drawn + self.debt_repaid + payoff_beyond_proceeds)
+        
+    @property
+    def net_distributions(self) -> float:
+        """Exit proceeds less taxes paid and the loans paid off from them."""
+        return max(0.0, self.distributed - self.debt_paid_off) - self.taxes
+        
+    def dpi(self) -> float:
+        """Distributions to paid-in capital."""
+        return self.net_distributions / self.paid_in if self.paid_in > 0 else 0.0
+        
+    def rvpi(self, nav: float) -> float:
+        """Residual value (NAV) to paid-in capital."""
+        return nav / self.paid_in if self.paid_in > 0 else 0.0
+        
+    def tvpi(self, nav: float) -> float:
+        """Total value (distributions + NAV) to paid-in capital."""
+        return self.dpi() + self.rvpi(nav)
+        
+    def irr(self, nav: float, current_quarter: int) -> float:
+        """
+        Annualized IRR of quarterly equity flows with NAV as terminal value.
+        
+        The result is cached until a new flow is recorded or NAV/quarter change,
+        and the previous solution seeds the next solve.
+        
+        Returns:
+            Annual IRR, or NaN if not defined yet (e.g. nothing invested)
+        """
+        key = (nav, current_quarter)
+        if self._irr_cache is not None and self._irr_cache[0] == key:
+            return self._irr_cache[1]
+            
+        flows = list(self.quarterly_flows)
+        while len(flows) <= current_quarter:
+            flows.append(0.0)
+        flows[current_quarter] += nav
+        
+        rates, converged = calculate_irr_batch([flows], guess=self._last_quarterly_irr)
+        if converged[0]:
+            quarterly = float(rates[0])
+            self._last_quarterly_irr = quarterly
+            annual = (1 + quarterly) ** 4 - 1
+        else:
+            annual = float('nan')
+        self._irr_cache = (key, annual)
+        return annual
+        
+    def metrics(self, nav: float, current_quarter: int) -> Dict[str, float]:
+        """Current fund metrics for display."""
+        return {
+            'paid_in': self.paid_in,
+            'distributed': self.net_distributions,
+            'nav': nav,
+            'dpi': self.dpi(),
+            'rvpi': self.rvpi(nav),
+            'tvpi': self.tvpi(nav),
+            'irr': self.irr(nav, current_quarter)
+        }
+        
+    def fork(self) -> 'FundLedger':
+        """Return an independent copy (entries are immutable and shared)."""
+        child = copy.copy(self)
+        child.entries = list(self.entries)
+        child.totals_by_kind = dict(self.totals_by_kind)
+        child.quarterly_flows = list(self.quarterly_flows)
+        return child
+        
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize entries (running totals are rebuilt on load)."""
+        return {
+            'quarter': self.quarter,
+            'entries': [entry.to_list() for entry in self.entries]
+        }
+        
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'FundLedger':
+        """Rebuild a ledger from to_dict output."""
+        ledger = cls()
+        ledger.extend(data.get('entries', []))
+        ledger.quarter = data.get('quarter', 0)
+        return ledger
+        
+    def extend(self, rows: List[list]) -> None:
+        """Append entries serialized by LedgerEntry.to_list, keeping their quarters."""
+        for quarter, kind, amount, company in rows:
+            entry = LedgerEntry(quarter, kind, amount, company)
+            self.entries.append(entry)
+            self._apply(entry)
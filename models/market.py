@@ -3,6 +3,7 @@ Market model - global economic conditions affecting all companies.
 """
 
 from typing import Dict
+import copy
 import random
 import config
 
@@ -41,6 +42,19 @@ class Market:
         self.interest_rate_history = [self.interest_rate]
         self.growth_rate_history = [self.growth_rate]
         self.multiple_trend_history = [self.multiple_trend]
+        self._history_shared = False  # True while history lists are shared with a fork
+        
+    def fork(self) -> 'Market':
+        """
+        Return an independent copy for what-if simulation.
+        
+        Sector multiples are copied (they change every quarter); the history
+        lists are shared copy-on-write.
+        """
+        child = copy.copy(self)
+        child.sector_multiples = dict(self.sector_multiples)
+        self._history_shared = child._history_shared = True
+        return child
         
     def update_quarter(self) -> None:
         """Update market conditions for the new quarter."""
@@ -79,6 +93,11 @@ class Market:
             )
             
         # Record history
+        if self._history_shared:
+            self.interest_rate_history = list(self.interest_rate_history)
+            self.growth_rate_history = list(self.growth_rate_history)
+            self.multiple_trend_history = list(self.multiple_trend_history)
+            self._history_shared = False
         self.interest_rate_history.append(self.interest_rate)
         self.growth_rate_history.append(self.growth_rate)
         self.multiple_trend_history.append(self.multiple_trend)
@@ -3,7 +3,10 @@ Player model - represents the player's state in the game.
 """
 
 from typing import List, Dict, Any
+import copy
 import config
+from .ledger import FundLedger, DEBT_DRAW, DEBT_REPAYMENT, DEBT_PAYOFF, INTEREST, TAX, OTHER
+from .debt import DebtBook
 
 
 class Player:
@@ -12,6 +15,7 @@ class Player:
     def __init__(self, starting_cash: float = None, fund_name: str = None, difficulty: str = 'medium'):
         self.cash = starting_cash if starting_cash is not None else config.STARTING_CAPITAL
         self.current_debt = 0.0
+        self.debt_book = DebtBook()  # Tranche breakdown of current_debt
         self.portfolio: List['Company'] = []
         self.fund_name = fund_name or "Unnamed Fund"
         self.difficulty = difficulty
@@ -23,15 +27,44 @@ class Player:
         
         self.deal_history: List[Dict[str, Any]] = []
         
+        # Next Company.acquisition_id to hand out
+        self.next_acquisition_id = 0
+        
         # Tax tracking
         self.total_taxes_paid = 0.0
         
+        # Every capital flow, with running fund metrics
+        self.ledger = FundLedger()
+        
         # Base debt capacity (grows with reputation and net worth)
         self.base_debt_capacity = config.BASE_DEBT_CAPACITY
         
-    def adjust_cash(self, amount: float) -> None:
-        """Add or remove cash from player's balance."""
+    def fork(self) -> 'Player':
+        """
+        Return an independent copy for what-if simulation.
+        
+        Portfolio companies are forked (see Company.fork); deal history
+        records are shared since they are never modified once written.
+        """
+        child = copy.copy(self)
+        child.portfolio = [company.fork() for company in self.portfolio]
+        child.deal_history = list(self.deal_history)
+        child.ledger = self.ledger.fork()
+        child.debt_book = self.debt_book.fork()
+        return child
+        
+    def adjust_cash(self, amount: float, kind: str = OTHER, company: str = None) -> None:
+        """
+        Add or remove cash from player's balance, recording the flow.
+        
+        Args:
+            amount: Cash delta (negative for spending)
+            kind: Ledger flow kind (see models.ledger)
+            company: Name of the company the flow relates to, if any
+        """
         self.cash += amount
+        if amount:
+            self.ledger.record(kind, amount, company)
         
     def get_debt_capacity(self) -> float:
         """
@@ -59,25 +92,121 @@ class Player:
         
         return total_capacity
     
-    def take_debt(self, amount: float) -> bool:
-        """Attempt to take on debt. Returns True if successful."""
+    def take_debt(self, amount: float, company: int = None) -> bool:
+        """
+        Attempt to take on debt. Returns True if successful.
+        
+        Args:
+            amount: Amount to borrow
+            company: Acquisition id of the company an acquisition loan finances
+                     (None draws on the revolver)
+        """
         current_capacity = self.get_debt_capacity()
         if self.current_debt + amount <= current_capacity:
             self.current_debt += amount
-            self.cash += amount
+            self.debt_book.add_tranche(amount, company)
+            self.adjust_cash(amount, DEBT_DRAW)
             return True
         return False
         
     def repay_debt(self, amount: float) -> bool:
         """Repay debt. Returns True if successful."""
         if amount <= self.cash and amount <= self.current_debt:
-            self.cash -= amount
+            self.adjust_cash(-amount, DEBT_REPAYMENT)
             self.current_debt -= amount
+            self.debt_book.prepay(amount)
             return True
         return False
         
+    def repay_company_debt(self, company: 'Company') -> float:
+        """
+        Repay the acquisition loans tied to a company from available cash.
+        
+        Called on exit, so the payment is booked as a payoff from the proceeds.
+        
+        Returns:
+            Amount repaid
+        """
+        repaid = self.debt_book.repay_company(company.acquisition_id, max(0.0, self.cash))
+        if repaid > 0:
+            self.adjust_cash(-repaid, DEBT_PAYOFF, company.name)
+            self.current_debt -= repaid
+        return repaid
+        
+    def service_debt(self, annual_rate: float) -> Dict[str, float]:
+        """
+        Pay this quarter's interest and scheduled principal across all tranches.
+        
+        Interest that cash cannot cover is capitalized onto the revolver;
+        scheduled principal that cannot be paid is deferred (left outstanding).
+        
+        Args:
+            annual_rate: Annual rate charged on the debt
+            
+        Returns:
+            Dictionary with 'paid' and 'unpaid' interest, and 'principal_paid'
+            and 'principal_deferred'
+        """
+        interest, principal = self.debt_book.quarterly_service(annual_rate)
+        interest_due = float(interest.sum())
+        
+        interest_paid = min(interest_due, max(0.0, self.cash))
+        if interest_paid > 0:
+            self.adjust_cash(-interest_paid, INTEREST)
+            
+        # Principal is paid pro rata from whatever cash is left
+        principal_due = float(principal.sum())
+        principal_paid = min(principal_due, max(0.0, self.cash))
+        if principal_paid > 0:
+            self.debt_book.apply_principal(principal * (principal_paid / principal_due))
+            self.adjust_cash(-principal_paid, DEBT_REPAYMENT)
+            self.current_debt -= principal_paid
+            
+        unpaid_interest = interest_due - interest_paid
+        if unpaid_interest > 0:
+            self.capitalize_interest(unpaid_interest)
+            
+        self.debt_book.end_quarter()
+        
+        return {
+            'paid': interest_paid,
+            'unpaid': unpaid_interest,
+            'principal_paid': principal_paid,
+            'principal_deferred': principal_due - principal_paid
+        }
+        
+    def covenant_breaches(self) -> List[Dict[str, Any]]:
+        """Portfolio companies whose loans exceed the debt/EBITDA covenant."""
+        names = {company.acquisition_id: company.name for company in self.portfolio}
+        breaches = self.debt_book.covenant_breaches(
+            {company.acquisition_id: company.ebitda for company in self.portfolio}
+        )
+        for breach in breaches:
+            breach['company'] = names[breach['company']]
+        return breaches
+        
+    def capitalize_interest(self, amount: float) -> None:
+        """
+        Add unpaid interest to the debt balance.
+        
+        Recorded as interest funded by an equal debt draw, so the ledger still
+        reconciles to cash.
+        """
+        self.current_debt += amount
+        self.debt_book.add_tranche(amount)
+        self.ledger.record(INTEREST, -amount)
+        self.ledger.record(DEBT_DRAW, amount)
+        
+    def new_acquisition_id(self) -> int:
+        """Hand out the next Company.acquisition_id."""
+        acquisition_id = self.next_acquisition_id
+        self.next_acquisition_id += 1
+        return acquisition_id
+        
     def add_company(self, company: 'Company') -> None:
-        """Add a company to the portfolio."""
+        """Add a company to the portfolio, giving it an acquisition id if it has none."""
+        if company.acquisition_id is None:
+            company.acquisition_id = self.new_acquisition_id()
         self.portfolio.append(company)
         
     def remove_company(self, company: 'Company') -> None:
@@ -172,12 +301,13 @@ class Player:
         if capital_gain <= 0:
             return 0.0
         
-        # Get tax rate from difficulty settings
-        difficulty_settings = config.DIFFICULTY_SETTINGS.get(self.difficulty, config.DIFFICULTY_SETTINGS['medium'])
-        tax_rate = difficulty_settings['capital_gains_tax_rate']
-        
-        tax_owed = capital_gain * tax_rate
+        tax_owed = capital_gain * self.capital_gains_tax_rate()
         return tax_owed
+        
+    def capital_gains_tax_rate(self) -> float:
+        """Capital gains tax rate for this player's difficulty."""
+        difficulty_settings = config.DIFFICULTY_SETTINGS.get(self.difficulty, config.DIFFICULTY_SETTINGS['medium'])
+        return difficulty_settings['capital_gains_tax_rate']
     
     def pay_taxes(self, tax_amount: float) -> None:
         """
@@ -186,6 +316,20 @@ class Player:
         Args:
             tax_amount: Amount of tax to pay
         """
-        self.adjust_cash(-tax_amount)
+        self.adjust_cash(-tax_amount, TAX)
         self.total_taxes_paid += tax_amount
+        
+    def fund_metrics(self, current_quarter: int = None) -> Dict[str, float]:
+        """
+        Fund-level performance from the ledger (TVPI, DPI, RVPI, IRR).
+        
+        Residual value is the portfolio marked at current valuation, net of debt.
+        
+        Args:
+            current_quarter: Quarter to value NAV at (defaults to the ledger's)
+        """
+        if current_quarter is None:
+            current_quarter = self.ledger.quarter
+        nav = self.compute_portfolio_value() - self.current_debt
+        return self.ledger.metrics(nav, current_quarter)
 
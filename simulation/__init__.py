@@ -12,7 +12,12 @@ from .dcf import (
 from .stochastic import (
     random_walk,
     geometric_brownian_motion,
-    mean_reverting_process
+    mean_reverting_process,
+    random_walk_paths,
+    geometric_brownian_motion_paths,
+    mean_reverting_paths,
+    market_cycle_paths,
+    correlated_random_walk_paths
 )
 
 __all__ = [
@@ -22,6 +27,11 @@ __all__ = [
     'calculate_terminal_value',
     'random_walk',
     'geometric_brownian_motion',
-    'mean_reverting_process'
+    'mean_reverting_process',
+    'random_walk_paths',
+    'geometric_brownian_motion_paths',
+    'mean_reverting_paths',
+    'market_cycle_paths',
+    'correlated_random_walk_paths'
 ]
 
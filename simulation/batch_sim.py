@@ -0,0 +1,425 @@
+"""
+Batch simulation - vectorized quarter dynamics over many independent trials.
+
+A CompanyBatch holds one company's state as numpy arrays (one element per
+trial) and a MarketBatch the market factors that drive it. Their quarter
+kernels mirror Company.simulate_quarter, Market.update_quarter and
+Company.calculate_valuation, so thousands of trials cost about as much as a
+handful of scalar simulations.
+
+Noise is passed in as standard normal draws rather than drawn internally, so
+several batches can be stepped with common random numbers, and the draws can
+come in antithetic pairs (z, -z): trial i and trial i + trials/2 see mirrored
+market, manager and revenue shocks. Averaging each pair cancels much of the
+noise, and paired_interval turns per-trial results into confidence intervals
+that respect the pairing.
+"""
+
+from typing import Dict, Any, Optional, Iterable, List, Union, Tuple
+from statistics import NormalDist
+import numpy as np
+import config
+from simulation.qmc import SobolSampler
+
+
+class MarketBatch:
+    """Market factors relevant to one sector, across many trials."""
+    
+    def __init__(self, growth_rate: np.ndarray, multiple_trend: np.ndarray,
+                 sector_multiple: np.ndarray, difficulty_settings: Dict[str, Any]):
+        self.growth_rate = growth_rate
+        self.multiple_trend = multiple_trend
+        self.sector_multiple = sector_multiple
+        self.difficulty_settings = difficulty_settings
+        
+    @classmethod
+    def from_market(cls, market: 'Market', sector: str, trials: int) -> 'MarketBatch':
+        """Broadcast a Market's current state across trials."""
+        return cls(
+            growth_rate=np.full(trials, market.growth_rate),
+            multiple_trend=np.full(trials, market.multiple_trend),
+            sector_multiple=np.full(trials, market.get_sector_multiple(sector)),
+            difficulty_settings=market.difficulty_settings
+        )
+        
+    @classmethod
+    def for_companies(cls, market: 'Market', companies: List['Company']) -> 'MarketBatch':
+        """
+        Market factors for a batch with one row per company.
+        
+        Each row's sector multiple is the company's own multiple where it
+        has one, else its sector's.
+        """
+        n = len(companies)
+        return cls(
+            growth_rate=np.full(n, market.growth_rate),
+            multiple_trend=np.full(n, market.multiple_trend),
+            sector_multiple=np.array([
+                c.valuation_multiple if c.valuation_multiple is not None
+                else market.get_sector_multiple(c.sector)
+                for c in companies
+            ], dtype=float),
+            difficulty_settings=market.difficulty_settings
+        )
+        
+    @property
+    def trials(self) -> int:
+        return len(self.growth_rate)
+        
+    def update_quarter(self, z: np.ndarray) -> None:
+        """
+        Advance market factors one quarter (mirrors Market.update_quarter).
+        
+        Args:
+            z: Standard normal draws of shape (3, trials) for growth, multiple
+               trend and sector multiple
+        """
+        vol_mult = self.difficulty_settings['market_volatility_multiplier']
+        
+        self.growth_rate = np.clip(
+            self.growth_rate + z[0] * (config.MARKET_VOLATILITY * vol_mult), -0.10, 0.10
+        )
+        
+        reversion = (1.0 - self.multiple_trend) * 0.1
+        self.multiple_trend = np.clip(
+            self.multiple_trend + z[1] * self.difficulty_settings['multiple_trend_volatility'] + reversion,
+            0.80, 1.20
+        )
+        
+        self.sector_multiple = np.clip(
+            self.sector_multiple + z[2] * 0.3,
+            config.MIN_EBITDA_MULTIPLE, config.MAX_EBITDA_MULTIPLE
+        )
+
+
+class CompanyBatch:
+    """Struct-of-arrays state of one company across many trials."""
+    
+    # Number of trailing revenues kept for the growth quality adjustment
+    WINDOW = 4
+    
+    def __init__(self, revenue: np.ndarray, ebitda_margin: np.ndarray, growth_rate: np.ndarray,
+                 volatility: np.ndarray, operational_health: np.ndarray, competence: float,
+                 risk_profile: float, valuation_multiple: Optional[float],
+                 revenue_window: np.ndarray):
+        self.revenue = revenue
+        self.ebitda_margin = ebitda_margin
+        self.growth_rate = growth_rate
+        self.volatility = volatility
+        self.operational_health = operational_health
+        self.competence = competence
+        self.risk_profile = risk_profile
+        self.valuation_multiple = valuation_multiple
+        
+        # Trailing revenues, shape (trials, <= WINDOW), oldest first; rows
+        # with a shorter history are NaN-padded at the oldest end
+        self.revenue_window = revenue_window
+        
+    @classmethod
+    def from_company(cls, company: 'Company', trials: int) -> 'CompanyBatch':
+        """Broadcast a Company's current state across trials."""
+        window = np.array(company.revenue_history[-cls.WINDOW:], dtype=float)
+        return cls(
+            revenue=np.full(trials, company.revenue),
+            ebitda_margin=np.full(trials, company.ebitda_margin),
+            growth_rate=np.full(trials, company.growth_rate),
+            volatility=np.full(trials, company.volatility),
+            operational_health=np.full(trials, company.operational_health),
+            competence=company.manager.competence,
+            risk_profile=company.manager.risk_profile,
+            valuation_multiple=company.valuation_multiple,
+            revenue_window=np.tile(window, (trials, 1))
+        )
+        
+    @classmethod
+    def from_companies(cls, companies: List['Company']) -> 'CompanyBatch':
+        """
+        One row per company (pair with MarketBatch.for_companies).
+        
+        Only the latest revenue is windowed, so the growth quality
+        adjustment starts neutral.
+        """
+        revenue = np.array([c.revenue for c in companies], dtype=float)
+        return cls(
+            revenue=revenue,
+            ebitda_margin=np.array([c.ebitda_margin for c in companies], dtype=float),
+            growth_rate=np.array([c.growth_rate for c in companies], dtype=float),
+            volatility=np.array([c.volatility for c in companies], dtype=float),
+            operational_health=np.array([c.operational_health for c in companies], dtype=float),
+            competence=np.array([c.manager.competence for c in companies], dtype=float),
+            risk_profile=np.array([c.manager.risk_profile for c in companies], dtype=float),
+            valuation_multiple=None,
+            revenue_window=revenue[:, None]
+        )
+        
+    def copy(self) -> 'CompanyBatch':
+        """Independent copy (arrays are copied)."""
+        return CompanyBatch(
+            self.revenue.copy(), self.ebitda_margin.copy(), self.growth_rate.copy(),
+            self.volatility.copy(), self.operational_health.copy(), self.competence,
+            self.risk_profile, self.valuation_multiple, self.revenue_window.copy()
+        )
+        
+    @property
+    def trials(self) -> int:
+        return len(self.revenue)
+        
+    @property
+    def ebitda(self) -> np.ndarray:
+        return self.revenue * self.ebitda_margin
+        
+    def simulate_quarter(self, market: MarketBatch, z: np.ndarray) -> np.ndarray:
+        """
+        Advance one quarter (mirrors Company.simulate_quarter).
+        
+        Args:
+            market: Market factors after this quarter's update
+            z: Standard normal draws of shape (3, trials) for manager risk,
+               revenue noise and margin drift
+               
+        Returns:
+            Realized growth per trial
+        """
+        manager_impact = (self.competence - 0.5) * 0.1 + z[0] * (self.risk_profile * 0.05)
+        growth = self.growth_rate + manager_impact + market.growth_rate + z[1] * self.volatility
+        
+        self.revenue = np.maximum(0.0, self.revenue * (1 + growth))
+        self.ebitda_margin = np.clip(self.ebitda_margin + z[2] * 0.01, 0.0, 1.0)
+        
+        self.revenue_window = np.concatenate(
+            [self.revenue_window[:, -(self.WINDOW - 1):], self.revenue[:, None]], axis=1
+        )
+        return growth
+        
+    def growth_quality_adjustment(self) -> np.ndarray:
+        """Vectorized Company.get_growth_quality_adjustment."""
+        if self.revenue_window.shape[1] < self.WINDOW:
+            return np.ones(self.trials)
+            
+        # Column by column, so large batches make no full-window temporaries
+        total = np.zeros(self.trials)
+        count = np.zeros(self.trials)
+        for j in range(self.WINDOW - 1):
+            prev = self.revenue_window[:, j]
+            valid = prev > 0
+            total += np.divide(self.revenue_window[:, j + 1], prev, out=np.ones(self.trials), where=valid) - 1
+            count += valid
+        avg_growth = total / np.maximum(count, 1)
+        
+        # Steps of 4% at -3%, 0%, +3% and +6% average growth (boundaries as in Company)
+        adjustment = 1.0 + 0.04 * ((avg_growth > 0.03).astype(float) + (avg_growth > 0.06) -
+                                   (avg_growth < 0) - (avg_growth < -0.03))
+        
+        # Like Company, a history shorter than the window earns no adjustment
+        full_history = ~np.isnan(self.revenue_window[:, 0])
+        return np.where((count > 0) & full_history, adjustment, 1.0)
+        
+    def valuation(self, market: MarketBatch) -> np.ndarray:
+        """Vectorized Company.calculate_valuation."""
+        if self.valuation_multiple is not None:
+            base_multiple = self.valuation_multiple
+        else:
+            base_multiple = market.sector_multiple
+            
+        health_adjustment = 0.85 + self.operational_health * 0.15
+        return (self.ebitda * base_multiple * market.multiple_trend *
+                health_adjustment * self.growth_quality_adjustment())
+
+
+class EventDeltas:
+    """
+    Sparse event effects on the rows of a CompanyBatch and its MarketBatch.
+    
+    Only the rows an event hits are listed, each with its own impacts; rows
+    of None means every row, so a market-wide shock is a single whole-array
+    operation. Effects mirror Company.apply_event and the engine's handling
+    of market events. A MarketBatch has no interest rate, so
+    interest_rate_change is carried but left to the caller (see
+    simulation.portfolio_risk.PortfolioPaths).
+    """
+    
+    # Event effect keys carried by each field
+    COMPANY_EFFECTS = ('revenue_impact', 'margin_impact', 'growth_impact')
+    MARKET_EFFECTS = ('market_growth_change', 'interest_rate_change', 'multiple_compression',
+                      'multiple_expansion')
+    
+    def __init__(self, rows: Optional[np.ndarray] = None, **effects: Union[float, np.ndarray]):
+        """
+        Args:
+            rows: Row indices or boolean mask of the rows hit (None for all)
+            **effects: Event effect keys (COMPANY_EFFECTS and MARKET_EFFECTS),
+                each a scalar or an array aligned with the selected rows
+        """
+        unknown = set(effects) - set(self.COMPANY_EFFECTS) - set(self.MARKET_EFFECTS)
+        if unknown:
+            raise ValueError(f"Unknown event effects: {sorted(unknown)}")
+        if rows is not None:
+            rows = np.asarray(rows)
+            if rows.dtype == bool:
+                rows = np.flatnonzero(rows)
+        self.rows = rows
+        self.effects = effects
+        
+    def __len__(self) -> int:
+        """Number of rows hit (-1 for every row)."""
+        return -1 if self.rows is None else len(self.rows)
+        
+    def apply(self, companies: CompanyBatch, market: Optional[MarketBatch] = None) -> None:
+        """
+        Apply the deltas in place.
+        
+        Listed rows may repeat (several events hitting one row); their
+        effects then compound as if applied one after another.
+        
+        Args:
+            companies: Company batch to update
+            market: Market batch to update (market effects are skipped if None)
+        """
+        if self.rows is not None and len(self.rows) == 0:
+            return
+        effects = self.effects
+        
+        if 'revenue_impact' in effects:
+            self._scale(companies, 'revenue', 1 + effects['revenue_impact'])
+            companies.revenue = np.maximum(0.0, companies.revenue)
+        if 'margin_impact' in effects:
+            self._shift(companies, 'ebitda_margin', effects['margin_impact'])
+            companies.ebitda_margin = np.clip(companies.ebitda_margin, 0.0, 1.0)
+        if 'growth_impact' in effects:
+            self._shift(companies, 'growth_rate', effects['growth_impact'])
+            
+        if market is None:
+            return
+        if 'market_growth_change' in effects:
+            self._shift(market, 'growth_rate', effects['market_growth_change'])
+        factor = ((1 - effects.get('multiple_compression', 0.0)) *
+                  (1 + effects.get('multiple_expansion', 0.0)))
+        if np.any(factor != 1.0):
+            self._scale(market, 'sector_multiple', factor)
+            
+    def _target(self, batch: Any, field: str) -> np.ndarray:
+        """A fresh float copy of the field's array, set back on the batch (arrays may be shared views)."""
+        values = np.array(getattr(batch, field), dtype=float)
+        if values.ndim == 0:
+            values = np.full(batch.trials, float(values))
+        setattr(batch, field, values)
+        return values
+        
+    def _shift(self, batch: Any, field: str, delta: Union[float, np.ndarray]) -> None:
+        values = self._target(batch, field)
+        if self.rows is None:
+            values += delta
+        else:
+            np.add.at(values, self.rows, np.broadcast_to(delta, self.rows.shape))
+            
+    def _scale(self, batch: Any, field: str, factor: Union[float, np.ndarray]) -> None:
+        values = self._target(batch, field)
+        if self.rows is None:
+            values *= factor
+        else:
+            np.multiply.at(values, self.rows, np.broadcast_to(factor, self.rows.shape))
+
+
+def normal_draws(rng: np.random.Generator, shape: Tuple[int, ...], antithetic: bool = False) -> np.ndarray:
+    """
+    Standard normal draws, optionally as antithetic pairs along the last axis.
+    
+    With antithetic=True the second half of the trials is the negated first
+    half, so trial i pairs with trial i + trials/2.
+    
+    Raises:
+        ValueError: If antithetic pairs are requested for an odd trial count
+    """
+    if not antithetic:
+        return rng.standard_normal(shape)
+    if shape[-1] % 2:
+        raise ValueError("Antithetic draws need an even number of trials")
+    half = rng.standard_normal(shape[:-1] + (shape[-1] // 2,))
+    return np.concatenate([half, -half], axis=-1)
+
+
+def path_draws(rng: np.random.Generator, quarters: int, trials: int, sobol: bool = False) -> np.ndarray:
+    """
+    All the normal draws for a company path, shape (quarters, 6, trials).
+    
+    Rows 0-2 of each quarter feed MarketBatch.update_quarter and rows 3-5
+    CompanyBatch.simulate_quarter. Pseudo-random draws come out in the same
+    order as drawing each quarter's market then company shocks in turn. With
+    sobol=True they come from a scrambled Sobol sequence (one point per
+    trial, early quarters first), which pins down averages and percentiles
+    with several times fewer trials.
+    """
+    if not sobol:
+        return rng.standard_normal((quarters, 6, trials))
+    if quarters == 0:
+        return np.empty((0, 6, trials))
+    z = SobolSampler(6 * quarters, rng=rng).standard_normal((trials, quarters, 6))
+    return z.transpose(1, 2, 0)
+
+
+def simulate_quarters(companies: Iterable[CompanyBatch], market: MarketBatch, quarters: int,
+                      rng: np.random.Generator, antithetic: bool = False) -> None:
+    """
+    Step a market and one or more company batches forward in lockstep.
+    
+    Every company batch sees the same draws (common random numbers), so
+    differences between batches come only from their starting states.
+    
+    Args:
+        companies: Company batches to advance in place
+        market: Market batch to advance in place
+        quarters: Number of quarters to simulate
+        rng: numpy random generator
+        antithetic: Draw market and company noise as antithetic pairs
+    """
+    companies = list(companies)
+    for _ in range(quarters):
+        market.update_quarter(normal_draws(rng, (3, market.trials), antithetic))
+        z = normal_draws(rng, (3, market.trials), antithetic)
+        for batch in companies:
+            batch.simulate_quarter(market, z)
+
+
+def paired_interval(values: np.ndarray, antithetic: bool = False,
+                    confidence: float = 0.95) -> Dict[str, float]:
+    """
+    Mean of per-trial results with a normal-approximation confidence interval.
+    
+    Antithetic pairs are not independent, so they are averaged first and the
+    standard error is taken over the pair means. For a difference between
+    two arms run on common random numbers, pass the per-trial differences.
+    
+    Args:
+        values: Per-trial results (antithetic pairs at i and i + trials/2)
+        antithetic: Whether the trials were drawn as antithetic pairs
+        confidence: Two-sided confidence level
+        
+    Returns:
+        Dictionary with 'mean', 'stderr', 'low' and 'high'
+    """
+    values = np.asarray(values, dtype=float)
+    if antithetic:
+        half = len(values) // 2
+        values = (values[:half] + values[half:]) / 2
+        
+    mean = float(values.mean())
+    stderr = float(values.std(ddof=1) / np.sqrt(len(values))) if len(values) > 1 else float('inf')
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    return {
+        'mean': mean,
+        'stderr': stderr,
+        'low': mean - z * stderr,
+        'high': mean + z * stderr
+    }
+
+
+def percentile_bands(values: np.ndarray, percentiles: Iterable[int] = (10, 50, 90)) -> Dict[str, float]:
+    """
+    Summarize a trial distribution as percentile bands.
+    
+    Returns:
+        Dictionary like {'p10': ..., 'p50': ..., 'p90': ...}
+    """
+    percentiles = list(percentiles)
+    points = np.percentile(values, percentiles)
+    return {f"p{p}": float(v) for p, v in zip(percentiles, points)}
@@ -0,0 +1,235 @@
+"""
+Comparable companies - k-nearest-neighbour valuation comps.
+
+Each company is described by a small feature vector (size, margin, growth,
+operational health) scaled so one unit is a meaningful difference, plus
+its sector. The index holds these as a NumPy matrix over the deal book and
+an S&P 500 reference set, and a query computes every distance at once and
+partitions out the k closest, with their implied EV/EBITDA multiples.
+"""
+
+from typing import Dict, Any, List
+import random
+import numpy as np
+import config
+from simulation import procedural_gen
+from simulation.deal_optimizer import flatten_deal_book
+
+
+# Feature scales: differences of this size count as one unit of distance
+SIZE_SCALE = 1.0       # log10 EBITDA, i.e. one order of magnitude
+MARGIN_SCALE = 0.10
+GROWTH_SCALE = 0.05
+HEALTH_SCALE = 0.25
+
+# Row key of reference companies (deal-book rows are keyed by listing_id)
+REFERENCE_KEY = -1
+
+_reference_cache = None
+
+
+def company_features(companies: List['Company']) -> np.ndarray:
+    """Scaled feature matrix, one row per company."""
+    ebitda = np.array([c.ebitda for c in companies], dtype=float)
+    return np.column_stack([
+        np.log10(np.maximum(ebitda, 1.0)) / SIZE_SCALE,
+        np.array([c.ebitda_margin for c in companies], dtype=float) / MARGIN_SCALE,
+        np.array([c.growth_rate for c in companies], dtype=float) / GROWTH_SCALE,
+        np.array([c.operational_health for c in companies], dtype=float) / HEALTH_SCALE
+    ]).reshape(len(companies), 4)
+
+
+def implied_multiples(companies: List['Company']) -> np.ndarray:
+    """EV/EBITDA of each company (NaN where EBITDA is not positive)."""
+    ebitda = np.array([c.ebitda for c in companies], dtype=float)
+    valuation = np.array([c.current_valuation for c in companies], dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(ebitda > 0, valuation / ebitda, np.nan)
+
+
+def sp500_reference(seed: int = None) -> List['Company']:
+    """
+    Reference companies generated from the S&P 500 table.
+    
+    Generation is seeded and leaves the global random state untouched, so
+    the reference set is the same every game and building it does not
+    change the game's random sequence. The result is cached.
+    
+    Args:
+        seed: Seed for the reference financials (defaults to config)
+        
+    Returns:
+        One valued Company per S&P 500 constituent
+    """
+    global _reference_cache
+    if _reference_cache is not None and seed is None:
+        return _reference_cache
+        
+    low, high = config.COMPS_REFERENCE_VALUATION_RANGE
+    saved = random.getstate()
+    random.seed(config.COMPS_REFERENCE_SEED if seed is None else seed)
+    try:
+        reference = []
+        for row in procedural_gen.get_sp500_companies():
+            target = float(np.exp(random.uniform(np.log(low), np.log(high))))
+            company = procedural_gen.generate_company_from_sp500(row, target)
+            company.calculate_valuation()
+            reference.append(company)
+    finally:
+        random.setstate(saved)
+        
+    if seed is None:
+        _reference_cache = reference
+    return reference
+
+
+class ComparableIndex:
+    """
+    Nearest-neighbour index of comparable companies.
+    
+    Reference companies are fixed; deal-book listings are kept in step by
+    sync(), which adds new listings, drops departed ones and refreshes the
+    rows of listings still on the book in place instead of rebuilding the
+    whole matrix. Deal-book rows are keyed by Company.listing_id, which
+    survives the fork each listing is replaced by every quarter.
+    """
+    
+    def __init__(self, reference: List['Company'] = None):
+        reference = sp500_reference() if reference is None else reference
+        self.companies: List['Company'] = []
+        self.sources: List[str] = []
+        self.sectors: List[str] = []
+        self.features = np.zeros((0, 4))
+        self.multiples = np.zeros(0)
+        self.sector_code = np.zeros(0, dtype=int)
+        self._keys = np.zeros(0, dtype=np.int64)
+        self._signature = None
+        self._add(reference, 'S&P 500', np.full(len(reference), REFERENCE_KEY, dtype=np.int64))
+        
+    def __len__(self) -> int:
+        return len(self.companies)
+        
+    def _codes_for(self, sectors: List[str]) -> np.ndarray:
+        codes = []
+        for sector in sectors:
+            if sector not in self.sectors:
+                self.sectors.append(sector)
+            codes.append(self.sectors.index(sector))
+        return np.array(codes, dtype=int)
+        
+    def _add(self, companies: List['Company'], source: str, keys: np.ndarray) -> None:
+        if not companies:
+            return
+        self.companies.extend(companies)
+        self.sources.extend([source] * len(companies))
+        self.features = np.vstack([self.features, company_features(companies)])
+        self.multiples = np.concatenate([self.multiples, implied_multiples(companies)])
+        self.sector_code = np.concatenate([self.sector_code, self._codes_for([c.sector for c in companies])])
+        self._keys = np.concatenate([self._keys, keys])
+        
+    def _keep(self, mask: np.ndarray) -> None:
+        self.companies = [c for c, keep in zip(self.companies, mask) if keep]
+        self.sources = [s for s, keep in zip(self.sources, mask) if keep]
+        self.features = self.features[mask]
+        self.multiples = self.multiples[mask]
+        self.sector_code = self.sector_code[mask]
+        self._keys = self._keys[mask]
+        
+    def sync(self, available_deals: Dict[str, Dict[str, List['Company']]]) -> None:
+        """
+        Bring the deal-book rows in line with the current deal book.
+        
+        Listings already indexed keep their rows, which are only recomputed
+        when the listing has been replaced by an updated fork; additions and
+        removals are the only changes to the matrix's shape. Nothing is done
+        if the book's lists are unchanged since the last sync.
+        """
+        signature = tuple(
+            (id(companies), len(companies))
+            for tiers in available_deals.values()
+            for companies in tiers.values()
+        )
+        if signature == self._signature:
+            return
+        self._signature = signature
+        
+        listed = [listing[3] for listing in flatten_deal_book(available_deals)]
+        listed_keys = np.array([c.listing_id for c in listed], dtype=np.int64)
+        
+        stale = (self._keys != REFERENCE_KEY) & ~np.isin(self._keys, listed_keys)
+        if stale.any():
+            self._keep(~stale)
+            
+        # Row of each listing already indexed (-1 for new listings)
+        order = np.argsort(self._keys)
+        sorted_keys = self._keys[order]
+        pos = np.searchsorted(sorted_keys, listed_keys)
+        found = pos < len(sorted_keys)
+        found[found] = sorted_keys[pos[found]] == listed_keys[found]
+        rows = np.full(len(listed), -1)
+        rows[found] = order[pos[found]]
+        
+        replaced = [i for i, row in enumerate(rows) if row >= 0 and self.companies[row] is not listed[i]]
+        if replaced:
+            updated = [listed[i] for i in replaced]
+            update_rows = rows[replaced]
+            for row, company in zip(update_rows, updated):
+                self.companies[row] = company
+            self.features[update_rows] = company_features(updated)
+            self.multiples[update_rows] = implied_multiples(updated)
+            
+        new = rows < 0
+        self._add([c for c, is_new in zip(listed, new) if is_new], 'Deal Book', listed_keys[new])
+        
+    def query(self, company: 'Company', k: int = None) -> Dict[str, Any]:
+        """
+        The k closest comparable companies.
+        
+        Companies in other sectors are penalized by
+        config.COMPS_SECTOR_PENALTY (in feature units), so they only appear
+        when a sector has too few close comps.
+        
+        Args:
+            company: Company to find comps for (excluded from its own comps)
+            k: Number of comps (defaults to config.COMPS_COUNT)
+            
+        Returns:
+            Dictionary with 'comps' (dicts with 'name', 'sector', 'source',
+            'multiple' and 'distance', closest first), 'median_multiple' and
+            'implied_valuation' (median multiple applied to the company's
+            EBITDA); both are NaN when no comps are available
+        """
+        k = k or config.COMPS_COUNT
+        features = company_features([company])[0]
+        code = self.sectors.index(company.sector) if company.sector in self.sectors else -1
+        
+        distance = np.sqrt(
+            ((self.features - features) ** 2).sum(axis=1)
+            + np.where(self.sector_code == code, 0.0, config.COMPS_SECTOR_PENALTY ** 2)
+        )
+        distance[np.isnan(self.multiples)] = np.inf
+        if company.listing_id is not None:
+            distance[self._keys == company.listing_id] = np.inf
+        
+        k = min(k, int(np.isfinite(distance).sum()))
+        if k == 0:
+            return {'comps': [], 'median_multiple': float('nan'), 'implied_valuation': float('nan')}
+            
+        nearest = np.argpartition(distance, k - 1)[:k]
+        nearest = nearest[np.argsort(distance[nearest])]
+        median_multiple = float(np.median(self.multiples[nearest]))
+        
+        return {
+            'comps': [
+                {
+                    'name': self.companies[i].name,
+                    'sector': self.companies[i].sector,
+                    'source': self.sources[i],
+                    'multiple': float(self.multiples[i]),
+                    'distance': float(distance[i])
+                }
+                for i in nearest
+            ],
+            'median_multiple': median_multiple,
+            'implied_valuation': median_multiple * max(company.ebitda, 0.0)
+        }
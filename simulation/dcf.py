@@ -1,9 +1,21 @@
 """
 Discounted Cash Flow (DCF) analysis functions.
+
+calculate_dcf_valuation gives a point estimate from today's growth, margin
+and discount rate. calculate_dcf_distribution samples how those could
+evolve - revenue noise from the company's volatility, margin drift, and
+the market's growth and interest-rate walks - and values every path at
+once with the vectorized enterprise_value_batch.
 """
 
-from typing import List
+from typing import List, Dict, Any, Iterable, Tuple
+import numpy as np
 import config
+from simulation import qmc
+from simulation.batch_sim import percentile_bands
+
+# Tax rate applied to EBITDA in free cash flow
+TAX_RATE = 0.25
 
 
 def project_free_cash_flows(
@@ -45,11 +57,10 @@ def project_free_cash_flows(
         
         # Calculate free cash flow
         # FCF = EBITDA - Capex - NWC increase - Taxes (simplified)
-        tax_rate = 0.25  # 25% tax rate
         capex = revenue * capex_rate
         nwc_increase = revenue * annual_growth * nwc_rate
         
-        fcf = ebitda * (1 - tax_rate) - capex - nwc_increase
+        fcf = ebitda * (1 - TAX_RATE) - capex - nwc_increase
         fcf_list.append(fcf)
         
     return fcf_list
@@ -166,3 +177,145 @@ def calculate_dcf_valuation(company: 'Company', market: 'Market') -> float:
     
     return ev
 
+
+def enterprise_value_batch(
+    current_revenue: np.ndarray,
+    annual_growth: np.ndarray,
+    ebitda_margin: np.ndarray,
+    discount_rate: np.ndarray,
+    terminal_growth_rate: np.ndarray = None,
+    capex_rate: np.ndarray = 0.05,
+    nwc_rate: np.ndarray = 0.10,
+    tax_rate: np.ndarray = TAX_RATE
+) -> np.ndarray:
+    """
+    Vectorized calculate_enterprise_value over many scenarios.
+    
+    Growth, margin and discount rate may change from year to year: revenue
+    compounds at each year's growth, EBITDA is that year's margin on it,
+    cash flows are discounted at the compounded rates, and the terminal
+    value uses the final year's rate. With constant inputs this matches
+    calculate_enterprise_value.
+    
+    The last axis is always the year; any leading axes are scenarios, so a
+    grid of scenarios (rows x columns x years) values in one call. The
+    scalar assumptions may also be given one per scenario.
+    
+    Args:
+        current_revenue: Current revenue (scalar or one per scenario)
+        annual_growth: Annual growth, shape (scenarios..., years)
+        ebitda_margin: EBITDA margin per year, broadcastable to annual_growth
+        discount_rate: Annual discount rate per year, broadcastable to annual_growth
+        terminal_growth_rate: Terminal growth rate, scalar or per scenario
+                              (defaults to config)
+        capex_rate: Capex as % of revenue, scalar or per scenario
+        nwc_rate: Net working capital as % of revenue, scalar or per scenario
+        tax_rate: Tax rate on EBITDA, scalar or per scenario
+        
+    Returns:
+        Enterprise value per scenario
+    """
+    if terminal_growth_rate is None:
+        terminal_growth_rate = config.TERMINAL_GROWTH_RATE
+    growth, margin, rate = np.broadcast_arrays(
+        np.atleast_2d(annual_growth), np.atleast_2d(ebitda_margin), np.atleast_2d(discount_rate)
+    )
+    capex, nwc, tax = (np.asarray(x, dtype=float)[..., None] for x in (capex_rate, nwc_rate, tax_rate))
+    
+    revenue = np.asarray(current_revenue, dtype=float)[..., None] * np.cumprod(1 + growth, axis=-1)
+    fcf = revenue * (margin * (1 - tax) - capex - growth * nwc)
+    discount = np.cumprod(1 + rate, axis=-1)
+    pv_fcf = (fcf / discount).sum(axis=-1)
+    
+    final_rate = rate[..., -1]
+    terminal_growth_rate = np.asarray(terminal_growth_rate, dtype=float)
+    terminal_growth = np.where(final_rate <= terminal_growth_rate, final_rate - 0.01, terminal_growth_rate)
+    terminal_value = fcf[..., -1] * (1 + terminal_growth) / (final_rate - terminal_growth)
+    
+    return np.maximum(0.0, pv_fcf + terminal_value / discount[..., -1])
+
+
+def sample_dcf_paths(company: 'Company', market: 'Market',
+                     z: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Turn normal draws into yearly growth, margin and discount-rate paths.
+    
+    Each quarter the interest rate and market growth walk as in
+    Market.update_quarter, revenue growth is the company's growth rate plus
+    the market's move away from today plus noise scaled by the company's
+    volatility, and the margin drifts as in Company.simulate_quarter. Paths
+    are centered on today's inputs, so they spread around the point DCF.
+    
+    Args:
+        company: Company to value
+        market: Current market
+        z: Normal draws of shape (4, paths, quarters) for the interest
+           rate, market growth, revenue noise and margin drift
+           
+    Returns:
+        (annual growth, year-end margin, annual discount rate), each of
+        shape (paths, years)
+    """
+    _, paths, quarters = z.shape
+    years = quarters // 4
+    vol_mult = market.difficulty_settings['market_volatility_multiplier']
+    
+    rates = np.empty((paths, quarters))
+    market_growth = np.empty((paths, quarters))
+    margins = np.empty((paths, quarters))
+    rate = np.full(paths, market.interest_rate)
+    growth = np.full(paths, market.growth_rate)
+    margin = np.full(paths, company.ebitda_margin)
+    for q in range(quarters):
+        rate = np.clip(rate + z[0, :, q] * (config.INTEREST_RATE_VOLATILITY * vol_mult), 0.01, 0.15)
+        growth = np.clip(growth + z[1, :, q] * (config.MARKET_VOLATILITY * vol_mult), -0.10, 0.10)
+        margin = np.clip(margin + z[3, :, q] * 0.01, 0.0, 1.0)
+        rates[:, q], market_growth[:, q], margins[:, q] = rate, growth, margin
+        
+    quarterly_growth = (company.growth_rate + (market_growth - market.growth_rate) +
+                        z[2] * company.volatility)
+    annual_growth = np.maximum(0.0, 1 + quarterly_growth).reshape(paths, years, 4).prod(axis=2) - 1
+    
+    risk_premium = market.get_discount_rate() - market.interest_rate
+    discount_rate = rates.reshape(paths, years, 4).mean(axis=2) + risk_premium
+    return annual_growth, margins.reshape(paths, years, 4)[:, :, -1], discount_rate
+
+
+def calculate_dcf_distribution(company: 'Company', market: 'Market', n_paths: int = None,
+                               percentiles: Iterable[int] = (10, 50, 90), seed: int = None,
+                               sobol: bool = None) -> Dict[str, Any]:
+    """
+    Monte Carlo DCF valuation range for a company.
+    
+    Args:
+        company: Company to value (not modified)
+        market: Current market (not modified)
+        n_paths: Number of sampled paths (defaults to config.DCF_DISTRIBUTION_PATHS)
+        percentiles: Percentiles to report
+        seed: Optional seed for reproducible ranges
+        sobol: Use quasi-random paths (defaults to config.SOBOL_SAMPLING)
+        
+    Returns:
+        Dictionary with 'point' (calculate_dcf_valuation), 'mean', 'bands'
+        (percentile bands like {'p10': ...}) and 'paths'
+    """
+    n_paths = n_paths or config.DCF_DISTRIBUTION_PATHS
+    sobol = config.SOBOL_SAMPLING if sobol is None else sobol
+    quarters = 4 * config.DCF_PROJECTION_YEARS
+    rng = np.random.default_rng(seed)
+    
+    if sobol:
+        # Rate and market draws take the leading Sobol dimensions
+        z = qmc.normal_matrix(n_paths, 4 * quarters, rng).reshape(n_paths, 4, quarters).transpose(1, 0, 2)
+    else:
+        z = rng.standard_normal((4, n_paths, quarters))
+        
+    growth, margin, discount_rate = sample_dcf_paths(company, market, z)
+    values = enterprise_value_batch(company.revenue, growth, margin, discount_rate)
+    
+    return {
+        'point': calculate_dcf_valuation(company, market),
+        'mean': float(values.mean()),
+        'bands': percentile_bands(values, percentiles),
+        'paths': n_paths
+    }
@@ -0,0 +1,211 @@
+"""
+DCF sensitivity - how a company's enterprise value responds to its inputs.
+
+sensitivity_grid values a company over a 2-D grid of two inputs (discount
+rate x terminal growth, growth x margin, ...). The row input varies along
+the first axis and the column input along the second, every other input
+stays at today's value, and the whole grid is one broadcast call to
+dcf.enterprise_value_batch.
+
+tornado moves the secondary assumptions - capex, working capital, tax and
+the projection horizon - one at a time to a low and a high value and ranks
+them by how far they swing the value.
+"""
+
+from typing import Dict, Any, Tuple
+import numpy as np
+import config
+from simulation import dcf
+
+# Offsets from today's value for each grid input (growth is quarterly)
+GRID_STEPS = {
+    'discount_rate': (-0.02, -0.01, 0.0, 0.01, 0.02),
+    'terminal_growth': (-0.01, -0.005, 0.0, 0.005, 0.01),
+    'growth': (-0.01, -0.005, 0.0, 0.005, 0.01),
+    'margin': (-0.05, -0.025, 0.0, 0.025, 0.05),
+    'capex_rate': (-0.02, -0.01, 0.0, 0.01, 0.02),
+    'nwc_rate': (-0.05, -0.025, 0.0, 0.025, 0.05),
+    'tax_rate': (-0.05, -0.025, 0.0, 0.025, 0.05),
+}
+
+# Low and high value of each tornado input
+TORNADO_RANGES = {
+    'capex_rate': (0.03, 0.07),
+    'nwc_rate': (0.05, 0.15),
+    'tax_rate': (0.20, 0.30),
+    'years': (5, 10),
+}
+
+# Inputs that may go negative (the others are floored at zero)
+SIGNED_INPUTS = ('growth', 'terminal_growth')
+
+
+def base_inputs(company: 'Company', market: 'Market') -> Dict[str, float]:
+    """Today's DCF inputs for a company, as used by dcf.calculate_dcf_valuation."""
+    return {
+        'discount_rate': market.get_discount_rate(),
+        'terminal_growth': config.TERMINAL_GROWTH_RATE,
+        'growth': company.growth_rate,
+        'margin': company.ebitda_margin,
+        'capex_rate': 0.05,
+        'nwc_rate': 0.10,
+        'tax_rate': dcf.TAX_RATE,
+        'years': config.DCF_PROJECTION_YEARS
+    }
+
+
+def evaluate(revenue: float, inputs: Dict[str, Any]) -> np.ndarray:
+    """
+    Enterprise value for every combination of broadcastable inputs.
+    
+    Args:
+        revenue: Current revenue
+        inputs: Dictionary like base_inputs; any entry except 'years' may
+                be an array, and the arrays broadcast against each other
+                
+    Returns:
+        Enterprise values, shape of the broadcast inputs
+    """
+    years = np.ones(int(inputs['years']))
+    growth = np.asarray(inputs['growth'], dtype=float)
+    annual_growth = (1 + growth) ** 4 - 1
+    
+    return dcf.enterprise_value_batch(
+        revenue,
+        annual_growth[..., None] * years,
+        np.asarray(inputs['margin'], dtype=float)[..., None],
+        np.asarray(inputs['discount_rate'], dtype=float)[..., None],
+        terminal_growth_rate=inputs['terminal_growth'],
+        capex_rate=inputs['capex_rate'],
+        nwc_rate=inputs['nwc_rate'],
+        tax_rate=inputs['tax_rate']
+    )
+
+
+def grid_values(inputs: Dict[str, float], name: str) -> np.ndarray:
+    """Default grid points for an input: today's value plus GRID_STEPS."""
+    values = inputs[name] + np.array(GRID_STEPS[name])
+    return values if name in SIGNED_INPUTS else np.maximum(0.0, values)
+
+
+def sensitivity_grid(company: 'Company', market: 'Market', rows: str = 'discount_rate',
+                     cols: str = 'terminal_growth', row_values: np.ndarray = None,
+                     col_values: np.ndarray = None) -> Dict[str, Any]:
+    """
+    Enterprise value over a grid of two DCF inputs.
+    
+    Args:
+        company: Company to value (not modified)
+        market: Current market (not modified)
+        rows: Input varied down the rows (a GRID_STEPS key)
+        cols: Input varied across the columns (a GRID_STEPS key)
+        row_values: Values for the rows (defaults to grid_values)
+        col_values: Values for the columns (defaults to grid_values)
+        
+    Returns:
+        Dictionary with 'rows' and 'cols' (input names), 'row_values',
+        'col_values', 'values' (shape rows x cols) and 'base' (value at
+        today's inputs)
+        
+    Raises:
+        ValueError: If an input is unknown or rows and cols are the same
+    """
+    for name in (rows, cols):
+        if name not in GRID_STEPS:
+            raise ValueError(f"Unknown DCF input '{name}'")
+    if rows == cols:
+        raise ValueError("Sensitivity grid needs two different inputs")
+        
+    inputs = base_inputs(company, market)
+    row_values = grid_values(inputs, rows) if row_values is None else np.asarray(row_values, dtype=float)
+    col_values = grid_values(inputs, cols) if col_values is None else np.asarray(col_values, dtype=float)
+    
+    scenarios = dict(inputs)
+    scenarios[rows] = row_values[:, None]
+    scenarios[cols] = col_values[None, :]
+    
+    return {
+        'rows': rows,
+        'cols': cols,
+        'row_values': row_values,
+        'col_values': col_values,
+        'values': evaluate(company.revenue, scenarios),
+        'base': float(evaluate(company.revenue, inputs)[0])
+    }
+
+
+def tornado(company: 'Company', market: 'Market',
+            ranges: Dict[str, Tuple[float, float]] = None) -> Dict[str, Any]:
+    """
+    One-at-a-time sensitivity of enterprise value to the secondary inputs.
+    
+    Each input moves to its low and its high value while the rest stay at
+    today's. The scenarios for the rate inputs value in one batch; each
+    projection horizon changes the length of the year axis, so it is
+    valued on its own.
+    
+    Args:
+        company: Company to value (not modified)
+        market: Current market (not modified)
+        ranges: {input: (low, high)} (defaults to TORNADO_RANGES)
+        
+    Returns:
+        Dictionary with 'base' (value at today's inputs) and 'bars', a
+        list of {'input', 'low_value', 'high_value', 'low', 'high',
+        'swing'} sorted by swing (|high - low|), largest first
+    """
+    ranges = ranges or TORNADO_RANGES
+    inputs = base_inputs(company, market)
+    base = float(evaluate(company.revenue, inputs)[0])
+    
+    rates = [name for name in ranges if name != 'years']
+    lows_highs = {}
+    if rates:
+        # Scenario 2i is input i at its low, 2i+1 at its high
+        scenarios = dict(inputs)
+        for i, name in enumerate(rates):
+            column = np.full(2 * len(rates), float(inputs[name]))
+            column[2 * i:2 * i + 2] = ranges[name]
+            scenarios[name] = column
+        values = evaluate(company.revenue, scenarios).reshape(len(rates), 2)
+        lows_highs.update({name: values[i] for i, name in enumerate(rates)})
+        
+    if 'years' in ranges:
+        lows_highs['years'] = [
+            float(evaluate(company.revenue, dict(inputs, years=years))[0]) for years in ranges['years']
+        ]
+        
+    bars = [
+        {
+            'input': name,
+            'low_value': ranges[name][0],
+            'high_value': ranges[name][1],
+            'low': float(lows_highs[name][0]),
+            'high': float(lows_highs[name][1]),
+            'swing': abs(float(lows_highs[name][1]) - float(lows_highs[name][0]))
+        }
+        for name in ranges
+    ]
+    bars.sort(key=lambda bar: bar['swing'], reverse=True)
+    return {'base': base, 'bars': bars}
+
+
+def sensitivity_report(company: 'Company', market: 'Market', rows: str = None,
+                       cols: str = None) -> Dict[str, Any]:
+    """
+    Grid and tornado together, for the company detail view.
+    
+    Args:
+        company: Company to value (not modified)
+        market: Current market (not modified)
+        rows: Grid row input (defaults to config.DCF_SENSITIVITY_GRID)
+        cols: Grid column input (defaults to config.DCF_SENSITIVITY_GRID)
+        
+    Returns:
+        Dictionary with 'grid' (sensitivity_grid) and 'tornado' (tornado)
+    """
+    default_rows, default_cols = config.DCF_SENSITIVITY_GRID
+    return {
+        'grid': sensitivity_grid(company, market, rows or default_rows, cols or default_cols),
+        'tornado': tornado(company, market)
+    }
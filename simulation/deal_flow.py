@@ -0,0 +1,240 @@
+"""
+Deal flow - a persistent deal book that ages from quarter to quarter.
+
+Instead of regenerating every listing each quarter, listed companies keep
+trading: their fundamentals advance through the batch simulator's quarter
+kernel (all listings at once), sellers cut asking prices the longer a deal
+sits, rival funds buy the most attractive deals, and only a fraction of the
+open slots are refilled with newly generated companies.
+
+Each listing runs a sale process on the deal schedule (a heap of dated
+events): an optional exclusivity window during which rivals cannot bid,
+and an auction deadline after which the deal is withdrawn - and possibly
+relisted later at a lower price.
+
+Random draws come from a numpy generator seeded off the global random
+stream, so a quarter of deal flow replays exactly from a saved state.
+"""
+
+from typing import Dict, Any, List, Optional, Tuple
+import random
+import numpy as np
+import config
+from simulation import procedural_gen
+from simulation.batch_sim import CompanyBatch, MarketBatch
+from simulation.deal_optimizer import flatten_deal_book
+from simulation import deal_schedule
+from simulation.deal_schedule import DealSchedule
+
+
+def advance_listings(companies: List['Company'], market: 'Market',
+                     rng: np.random.Generator) -> Dict[str, np.ndarray]:
+    """
+    Step every listing one quarter and price it.
+    
+    Listings evolve exactly like portfolio companies (Company.simulate_quarter
+    via CompanyBatch, with each listing as one element of the batch); the
+    asking price is the resulting valuation less a cut per quarter listed,
+    times the discount carried over from any earlier listing.
+    
+    Args:
+        companies: Listed companies (not modified)
+        market: Market after this quarter's update
+        rng: numpy random generator
+        
+    Returns:
+        Arrays aligned with companies: 'revenue', 'ebitda_margin',
+        'valuation' (asking price) and 'quarters_listed'
+    """
+    batch = CompanyBatch.from_companies(companies)
+    market_batch = MarketBatch.for_companies(market, companies)
+    batch.simulate_quarter(market_batch, rng.standard_normal((3, len(companies))))
+    quarters_listed = np.array([c.quarters_listed for c in companies], dtype=int) + 1
+    asking_discount = np.array([c.asking_discount for c in companies])
+    
+    return {
+        'revenue': batch.revenue,
+        'ebitda_margin': batch.ebitda_margin,
+        'valuation': (batch.valuation(market_batch) * asking_discount *
+                      (1 - config.DEAL_FLOW_PRICE_CUT) ** quarters_listed),
+        'quarters_listed': quarters_listed
+    }
+
+
+def rival_bid_probability(companies: List['Company']) -> np.ndarray:
+    """
+    Chance each listing is bought by a rival fund this quarter.
+    
+    Rivals chase growth and good management: the base rate is scaled from
+    half to one and a half times by the listing's rank on expected growth.
+    """
+    n = len(companies)
+    appeal = np.array([c.growth_rate + (c.manager.competence - 0.5) * 0.1 for c in companies])
+    rank = np.empty(n)
+    rank[np.argsort(appeal, kind='stable')] = np.arange(n)
+    return config.DEAL_FLOW_RIVAL_BID_RATE * (0.5 + rank / max(n - 1, 1))
+
+
+def open_sale_process(schedule: DealSchedule, company: 'Company', sector: str, tier: str,
+                      quarter: int, rng: np.random.Generator) -> None:
+    """Put a new listing on the schedule with a random auction deadline and maybe exclusivity."""
+    low, high = config.DEAL_FLOW_AUCTION_QUARTERS
+    exclusive = rng.random() < config.DEAL_FLOW_EXCLUSIVE_CHANCE
+    schedule.list_company(
+        company, sector, tier, quarter,
+        deadline=int(rng.integers(low, high + 1)),
+        exclusive_quarters=config.DEAL_FLOW_EXCLUSIVITY_QUARTERS if exclusive else 0
+    )
+
+
+def open_deal_book(available_deals: Dict[str, Dict[str, List['Company']]],
+                   quarter: int) -> DealSchedule:
+    """
+    Start a schedule for a freshly generated (or legacy-loaded) deal book.
+    
+    Args:
+        available_deals: Tiered deal book {sector: {tier: [Company]}}
+        quarter: Current quarter
+        
+    Returns:
+        Schedule with a sale process for every listing
+    """
+    rng = np.random.default_rng(random.getrandbits(64))
+    schedule = DealSchedule()
+    for sector, tier, index, company in flatten_deal_book(available_deals):
+        open_sale_process(schedule, company, sector, tier, quarter, rng)
+    return schedule
+
+
+def _find_listing(deals: Dict[str, Dict[str, List['Company']]], schedule: DealSchedule,
+                  listing_id: int) -> Optional[Tuple[List['Company'], int]]:
+    """Locate a listing through the schedule (only its sector/tier list is searched)."""
+    location = schedule.location.get(listing_id)
+    if location is None:
+        return None
+    companies = deals.get(location[0], {}).get(location[1], [])
+    for index, company in enumerate(companies):
+        if company.listing_id == listing_id:
+            return companies, index
+    return None
+
+
+def advance_deal_book(available_deals: Dict[str, Dict[str, List['Company']]],
+                      market: 'Market', schedule: DealSchedule, quarter: int) -> Dict[str, Any]:
+    """
+    Age the deal book by one quarter.
+    
+    Surviving listings are replaced by updated forks (listings may be
+    shared with forked engines, so they are never modified in place), and
+    every sector/tier list is rebuilt. Schedule events due by `quarter` are
+    then drained, and open slots are partly refilled.
+    
+    Args:
+        available_deals: Tiered deal book {sector: {tier: [Company]}}
+        market: Market after this quarter's update
+        schedule: The book's deal schedule (updated in place)
+        quarter: The quarter being entered
+        
+    Returns:
+        Dictionary with 'deals' (the new book), 'bought_by_rivals',
+        'withdrawn' and 'relisted' (listing names) and 'new_listings'
+        (number of companies generated)
+    """
+    rng = np.random.default_rng(random.getrandbits(64))
+    listings = flatten_deal_book(available_deals)
+    companies = [listing[3] for listing in listings]
+    
+    deals: Dict[str, Dict[str, List['Company']]] = {
+        sector: {tier: [] for tier in procedural_gen.VALUATION_TIERS}
+        for sector in procedural_gen.get_sectors()
+    }
+    bought_by_rivals: List[str] = []
+    withdrawn: List[str] = []
+    relisted: List[str] = []
+    
+    if companies:
+        state = advance_listings(companies, market, rng)
+        exclusive = np.array([schedule.is_exclusive(c.listing_id) for c in companies], dtype=bool)
+        rival = ~exclusive & (rng.random(len(companies)) < rival_bid_probability(companies))
+        
+        for i, (sector, tier, index, company) in enumerate(listings):
+            if rival[i]:
+                bought_by_rivals.append(company.name)
+                schedule.close(company.listing_id)
+                continue
+                
+            listing = company.fork()
+            listing.revenue = float(state['revenue'][i])
+            listing.ebitda_margin = float(state['ebitda_margin'][i])
+            listing.current_valuation = float(state['valuation'][i])
+            listing.quarters_listed = int(state['quarters_listed'][i])
+            # Extend (not share) the history so growth signals see the trend
+            keep = config.DEAL_FLOW_HISTORY_QUARTERS
+            listing.revenue_history = (company.revenue_history + [listing.revenue])[-keep:]
+            listing.ebitda_history = (company.ebitda_history + [listing.ebitda])[-keep:]
+            listing._history_shared = False
+            deals.setdefault(sector, {}).setdefault(tier, []).append(listing)
+            
+    for event_quarter, kind, listing_id in schedule.due(quarter):
+        if kind == deal_schedule.EXCLUSIVITY_END:
+            if schedule.exclusive_until.get(listing_id) == event_quarter:
+                del schedule.exclusive_until[listing_id]
+                
+        elif kind == deal_schedule.DEADLINE:
+            if schedule.deadlines.get(listing_id) != event_quarter:
+                continue  # Superseded by a relisting's new deadline
+            found = _find_listing(deals, schedule, listing_id)
+            if found is None:
+                schedule.close(listing_id)  # Already acquired
+                continue
+            companies_in_tier, index = found
+            company = companies_in_tier.pop(index)
+            withdrawn.append(company.name)
+            
+            # Some sellers come back later, asking less
+            del schedule.deadlines[listing_id]
+            schedule.exclusive_until.pop(listing_id, None)
+            if rng.random() < config.DEAL_FLOW_RELIST_CHANCE:
+                schedule.withdrawn[listing_id] = company
+                schedule.push(event_quarter + config.DEAL_FLOW_RELIST_DELAY, deal_schedule.RELIST, listing_id)
+            else:
+                schedule.close(listing_id)
+                
+        elif kind == deal_schedule.RELIST:
+            company = schedule.withdrawn.pop(listing_id, None)
+            sector, tier = schedule.location.get(listing_id, (None, None))
+            if company is None or len(deals.get(sector, {}).get(tier, [])) >= config.DEAL_FLOW_SLOTS_PER_TIER:
+                schedule.close(listing_id)
+                continue
+            # The price cuts from its first listing stay, on top of the relist discount
+            listing = company.fork()
+            listing.current_valuation = company.current_valuation * (1 - config.DEAL_FLOW_RELIST_DISCOUNT)
+            listing.asking_discount = (company.asking_discount * (1 - config.DEAL_FLOW_RELIST_DISCOUNT) *
+                                       (1 - config.DEAL_FLOW_PRICE_CUT) ** company.quarters_listed)
+            listing.quarters_listed = 0
+            deals[sector][tier].append(listing)
+            open_sale_process(schedule, listing, sector, tier, quarter, rng)
+            relisted.append(listing.name)
+            
+    # Refill a fraction of the open slots, keeping every tier stocked
+    slots = [(sector, tier) for sector, tiers in deals.items() for tier in tiers]
+    open_slots = np.array([
+        max(0, config.DEAL_FLOW_SLOTS_PER_TIER - len(deals[sector][tier])) for sector, tier in slots
+    ])
+    arrivals = rng.binomial(open_slots, config.DEAL_FLOW_REFILL_RATE)
+    empty = np.array([not deals[sector][tier] for sector, tier in slots], dtype=bool)
+    arrivals = np.where(empty & (open_slots > 0), np.maximum(arrivals, 1), arrivals)
+    
+    for (sector, tier), count in zip(slots, arrivals):
+        for _ in range(int(count)):
+            company = procedural_gen.generate_tier_company(sector, tier, market)
+            deals[sector][tier].append(company)
+            open_sale_process(schedule, company, sector, tier, quarter, rng)
+            
+    return {
+        'deals': deals,
+        'bought_by_rivals': bought_by_rivals,
+        'withdrawn': withdrawn,
+        'relisted': relisted,
+        'new_listings': int(arrivals.sum())
+    }
@@ -0,0 +1,211 @@
+"""
+Deal optimizer - capital allocation across the whole tiered deal book.
+
+Every listed company is scored at once from array views of its state, then
+a 0/1 knapsack over the player's available capital (cash plus unused debt
+capacity) picks the set of acquisitions with the highest expected value.
+The knapsack is solved by dynamic programming over a discretized budget,
+with each item's update vectorized across all budget levels.
+"""
+
+from typing import Dict, Any, List, Tuple
+import numpy as np
+import config
+
+
+def flatten_deal_book(available_deals: Dict[str, Dict[str, List['Company']]]
+                      ) -> List[Tuple[str, str, int, 'Company']]:
+    """List every listing as (sector, tier, index, company)."""
+    return [
+        (sector, tier, index, company)
+        for sector, tiers in available_deals.items()
+        for tier, companies in tiers.items()
+        for index, company in enumerate(companies)
+    ]
+
+
+def score_candidates(companies: List['Company'], market: 'Market', horizon: int,
+                     risk_aversion: float) -> Dict[str, np.ndarray]:
+    """
+    Score candidate acquisitions with vectorized expected-value estimates.
+    
+    The expected quarterly drift mirrors Company.simulate_quarter (own
+    growth, manager competence and market growth); risk is the combined
+    revenue and manager volatility over the horizon.
+    
+    Args:
+        companies: Candidate companies
+        market: Current market
+        horizon: Holding horizon in quarters
+        risk_aversion: Penalty per unit of horizon volatility (fraction of price)
+        
+    Returns:
+        Dictionary of arrays: 'price', 'expected_gain', 'risk' and 'score'
+    """
+    price = np.array([c.current_valuation for c in companies], dtype=float)
+    growth = np.array([c.growth_rate for c in companies], dtype=float)
+    volatility = np.array([c.volatility for c in companies], dtype=float)
+    competence = np.array([c.manager.competence for c in companies], dtype=float)
+    risk_profile = np.array([c.manager.risk_profile for c in companies], dtype=float)
+    
+    drift = growth + (competence - 0.5) * 0.1 + market.growth_rate
+    expected_gain = price * (np.power(1 + np.maximum(drift, -0.99), horizon) - 1)
+    sigma = np.sqrt(volatility ** 2 + (risk_profile * 0.05) ** 2)
+    risk = price * sigma * np.sqrt(horizon)
+    
+    return {
+        'price': price,
+        'expected_gain': expected_gain,
+        'risk': risk,
+        'score': expected_gain - risk_aversion * risk
+    }
+
+
+def solve_knapsack(weights: np.ndarray, values: np.ndarray,
+                   capacity: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    0/1 knapsack by dynamic programming.
+    
+    Args:
+        weights: Positive integer weights
+        values: Item values
+        capacity: Total integer capacity
+        
+    Returns:
+        (best, take): best[c] is the highest value using exactly c units
+        (-inf when unreachable); take is the table reconstruct_knapsack
+        walks back to recover the chosen items
+    """
+    best = np.full(capacity + 1, -np.inf)
+    best[0] = 0.0
+    take = np.zeros((len(weights), capacity + 1), dtype=bool)
+    
+    for i, (weight, value) in enumerate(zip(weights, values)):
+        if weight > capacity:
+            continue
+        candidate = best[:capacity + 1 - weight] + value
+        improved = candidate > best[weight:]
+        take[i, weight:] = improved
+        np.copyto(best[weight:], candidate, where=improved)
+        
+    return best, take
+
+
+def prune_dominated(weights: np.ndarray, values: np.ndarray, capacity: int) -> np.ndarray:
+    """
+    Indices of items that can appear in an optimal knapsack.
+    
+    At most capacity // w items of weight w fit, so only the most valuable
+    capacity // w items of each weight are kept; the rest can always be
+    swapped for a better item of the same weight.
+    """
+    order = np.lexsort((-values, weights))
+    sorted_weights = weights[order]
+    group_start = np.searchsorted(sorted_weights, sorted_weights, side='left')
+    rank = np.arange(len(order)) - group_start
+    keep = rank < capacity // np.maximum(sorted_weights, 1)
+    return np.sort(order[keep])
+
+
+def reconstruct_knapsack(take: np.ndarray, weights: np.ndarray, used: int) -> List[int]:
+    """Walk the take table back from `used` capacity to the chosen items."""
+    chosen = []
+    for i in range(len(weights) - 1, -1, -1):
+        if used >= 0 and take[i, used]:
+            chosen.append(i)
+            used -= weights[i]
+    return chosen[::-1]
+
+
+def optimize_deals(available_deals: Dict[str, Dict[str, List['Company']]], player: 'Player',
+                   market: 'Market', horizon: int = None, risk_aversion: float = None,
+                   resolution: int = None, shortlist_size: int = None) -> Dict[str, Any]:
+    """
+    Choose the acquisitions that maximize expected value within the budget.
+    
+    The budget is Player.available_capital(). Spending beyond cash draws
+    debt, whose interest over the horizon is charged against the total
+    spend, so the optimizer only levers up when deals out-earn the debt.
+    
+    Args:
+        available_deals: Tiered deal book {sector: {tier: [Company]}}
+        player: Player making the acquisitions
+        market: Current market
+        horizon: Holding horizon in quarters (defaults to config)
+        risk_aversion: Risk penalty (defaults to config)
+        resolution: Budget steps in the knapsack (defaults to config)
+        shortlist_size: Number of ranked candidates to return (defaults to config)
+        
+    Returns:
+        Dictionary with 'budget', 'selected' (chosen candidates),
+        'shortlist' (best-scoring affordable candidates, chosen ones first),
+        'total_cost', 'expected_value' and 'financing_cost'. Each candidate
+        is a dict with 'sector', 'tier', 'index', 'company', 'price',
+        'expected_gain', 'score' and 'selected'
+    """
+    horizon = horizon or config.DEAL_OPTIMIZER_HORIZON
+    risk_aversion = config.DEAL_OPTIMIZER_RISK_AVERSION if risk_aversion is None else risk_aversion
+    resolution = resolution or config.DEAL_OPTIMIZER_RESOLUTION
+    shortlist_size = shortlist_size or config.DEAL_OPTIMIZER_SHORTLIST
+    
+    budget = max(0.0, player.available_capital())
+    listings = flatten_deal_book(available_deals)
+    result = {
+        'budget': budget,
+        'selected': [],
+        'shortlist': [],
+        'total_cost': 0.0,
+        'expected_value': 0.0,
+        'financing_cost': 0.0
+    }
+    if not listings or budget <= 0:
+        return result
+        
+    scores = score_candidates([listing[3] for listing in listings], market, horizon, risk_aversion)
+    
+    # Only affordable, value-creating candidates enter the knapsack
+    viable = np.flatnonzero((scores['price'] <= budget) & (scores['score'] > 0))
+    if len(viable) == 0:
+        return result
+    viable = viable[np.argsort(-scores['score'][viable])]
+    
+    # Round weights up so a chosen set never exceeds the real budget
+    unit = budget / resolution
+    weights = np.maximum(1, np.ceil(scores['price'][viable] / unit)).astype(int)
+    keep = prune_dominated(weights, scores['score'][viable], resolution)
+    viable, weights = viable[keep], weights[keep]
+    values = scores['score'][viable]
+    best, take = solve_knapsack(weights, values, resolution)
+    
+    # Spending past cash is debt-financed for the whole horizon
+    spend = np.arange(resolution + 1) * unit
+    financing = np.maximum(0.0, spend - max(0.0, player.cash)) * (market.get_debt_rate() / 4) * horizon
+    net = best - financing
+    used = int(np.argmax(net))
+    chosen = set(reconstruct_knapsack(take, weights, used)) if net[used] > 0 else set()
+    
+    def candidate(k: int) -> Dict[str, Any]:
+        i = viable[k]
+        sector, tier, index, company = listings[i]
+        return {
+            'sector': sector,
+            'tier': tier,
+            'index': index,
+            'company': company,
+            'price': float(scores['price'][i]),
+            'expected_gain': float(scores['expected_gain'][i]),
+            'score': float(scores['score'][i]),
+            'selected': k in chosen
+        }
+        
+    selected = [candidate(k) for k in sorted(chosen)]
+    others = [k for k in range(len(viable)) if k not in chosen][:max(0, shortlist_size - len(selected))]
+    
+    result['selected'] = selected
+    result['shortlist'] = selected + [candidate(k) for k in others]
+    result['total_cost'] = sum(c['price'] for c in selected)
+    result['expected_value'] = sum(c['score'] for c in selected)
+    result['financing_cost'] = float(
+        max(0.0, result['total_cost'] - max(0.0, player.cash)) * (market.get_debt_rate() / 4) * horizon
+    )
+    return result
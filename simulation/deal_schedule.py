@@ -0,0 +1,144 @@
+"""
+Deal schedule - a priority queue of dated deal-book events.
+
+Sale processes run on deadlines: exclusivity windows close, auctions end,
+and withdrawn deals come back to market at a lower price. Each of these is
+pushed onto a min-heap keyed by quarter when it is set up, and the engine
+drains whatever falls due as the quarter advances, so each event costs
+O(log n) instead of a rescan of the deal book.
+
+Entries are never removed from the middle of the heap: when a listing
+leaves the book some other way (acquired by the player or a rival), its
+pending events are simply skipped when they come due.
+"""
+
+from typing import Dict, Any, List, Optional, Tuple, Iterator, Callable
+import heapq
+
+
+# Event kinds
+EXCLUSIVITY_END = 'exclusivity_end'
+DEADLINE = 'deadline'
+RELIST = 'relist'
+
+
+class DealSchedule:
+    """
+    Dated events for the listings in a deal book.
+    
+    Listings are tracked by a stable listing_id (Company.listing_id) because
+    the deal book replaces listing objects as they age.
+    """
+    
+    def __init__(self):
+        # (quarter, sequence, kind, listing_id); sequence breaks ties in push order
+        self.heap: List[Tuple[int, int, str, int]] = []
+        self._seq = 0
+        self.next_listing_id = 0
+        
+        # Listing state needed when events fire or the player looks at a deal
+        self.location: Dict[int, Tuple[str, str]] = {}
+        self.deadlines: Dict[int, int] = {}
+        self.exclusive_until: Dict[int, int] = {}
+        
+        # Companies waiting to be relisted, by listing_id
+        self.withdrawn: Dict[int, 'Company'] = {}
+        
+    def __len__(self) -> int:
+        return len(self.heap)
+        
+    def push(self, quarter: int, kind: str, listing_id: int) -> None:
+        """Schedule an event for a listing."""
+        self._seq += 1
+        heapq.heappush(self.heap, (quarter, self._seq, kind, listing_id))
+        
+    def due(self, quarter: int) -> Iterator[Tuple[int, str, int]]:
+        """
+        Pop every event scheduled at or before `quarter`, earliest first.
+        
+        Events pushed while draining are also returned if they fall due.
+        
+        Yields:
+            (quarter, kind, listing_id)
+        """
+        while self.heap and self.heap[0][0] <= quarter:
+            event_quarter, _, kind, listing_id = heapq.heappop(self.heap)
+            yield event_quarter, kind, listing_id
+            
+    def next_event_quarter(self) -> Optional[int]:
+        """Quarter of the earliest pending event (None if nothing is scheduled)."""
+        return self.heap[0][0] if self.heap else None
+        
+    def list_company(self, company: 'Company', sector: str, tier: str, quarter: int,
+                     deadline: int, exclusive_quarters: int = 0) -> None:
+        """
+        Open a sale process for a listing.
+        
+        Args:
+            company: Listed company (gets a listing_id if it has none)
+            sector: Sector it is listed under
+            tier: Valuation tier it is listed under
+            quarter: Current quarter
+            deadline: Quarters until the auction closes
+            exclusive_quarters: Quarters only the player may bid (0 for none)
+        """
+        if company.listing_id is None:
+            company.listing_id = self.next_listing_id
+            self.next_listing_id += 1
+        listing_id = company.listing_id
+        
+        self.location[listing_id] = (sector, tier)
+        self.deadlines[listing_id] = quarter + deadline
+        self.push(quarter + deadline, DEADLINE, listing_id)
+        if exclusive_quarters > 0:
+            self.exclusive_until[listing_id] = quarter + exclusive_quarters
+            self.push(quarter + exclusive_quarters, EXCLUSIVITY_END, listing_id)
+            
+    def close(self, listing_id: int) -> None:
+        """Forget a listing's sale process (its queued events become no-ops)."""
+        self.location.pop(listing_id, None)
+        self.deadlines.pop(listing_id, None)
+        self.exclusive_until.pop(listing_id, None)
+        
+    def is_exclusive(self, listing_id: Optional[int]) -> bool:
+        """Whether rivals are currently shut out of a listing."""
+        return listing_id in self.exclusive_until
+        
+    def fork(self) -> 'DealSchedule':
+        """Return an independent copy (withdrawn companies are shared, never mutated)."""
+        child = DealSchedule()
+        child.heap = list(self.heap)
+        child._seq = self._seq
+        child.next_listing_id = self.next_listing_id
+        child.location = dict(self.location)
+        child.deadlines = dict(self.deadlines)
+        child.exclusive_until = dict(self.exclusive_until)
+        child.withdrawn = dict(self.withdrawn)
+        return child
+        
+    def to_dict(self, serialize_company: Callable[['Company'], Dict[str, Any]]) -> Dict[str, Any]:
+        """Serialize to JSON-friendly data; withdrawn companies go through serialize_company."""
+        return {
+            'heap': [list(entry) for entry in self.heap],
+            'seq': self._seq,
+            'next_listing_id': self.next_listing_id,
+            'location': [[i, sector, tier] for i, (sector, tier) in self.location.items()],
+            'deadlines': [[i, q] for i, q in self.deadlines.items()],
+            'exclusive_until': [[i, q] for i, q in self.exclusive_until.items()],
+            'withdrawn': [[i, serialize_company(c)] for i, c in self.withdrawn.items()]
+        }
+        
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any],
+                  deserialize_company: Callable[[Dict[str, Any]], 'Company']) -> 'DealSchedule':
+        """Rebuild a schedule from to_dict output."""
+        schedule = cls()
+        schedule.heap = [tuple(entry) for entry in data['heap']]
+        heapq.heapify(schedule.heap)
+        schedule._seq = data['seq']
+        schedule.next_listing_id = data['next_listing_id']
+        schedule.location = {i: (sector, tier) for i, sector, tier in data['location']}
+        schedule.deadlines = {i: q for i, q in data['deadlines']}
+        schedule.exclusive_until = {i: q for i, q in data['exclusive_until']}
+        schedule.withdrawn = {i: deserialize_company(c) for i, c in data['withdrawn']}
+        return schedule
@@ -0,0 +1,160 @@
+"""
+Deal screening - indexed queries over the tiered deal book.
+
+The deal book is flattened once into column arrays, and each screenable
+metric gets a sorted copy with its permutation. A range criterion is then
+two binary searches (np.searchsorted) rather than a scan: the most
+selective criterion yields the candidate set, and the remaining criteria
+are checked on those candidates only, vectorized over the columns.
+"""
+
+from typing import Dict, List, Optional, Tuple, Iterable
+import numpy as np
+from simulation.deal_optimizer import flatten_deal_book
+
+
+# Screenable metrics and how to read them from a Company
+FIELDS = {
+    'valuation': lambda c: c.current_valuation,
+    'revenue': lambda c: c.revenue,
+    'ebitda_margin': lambda c: c.ebitda_margin,
+    'growth_rate': lambda c: c.growth_rate,
+    'competence': lambda c: c.manager.competence
+}
+
+
+class DealIndex:
+    """
+    Sorted-array indexes over a deal book {sector: {tier: [Company]}}.
+    
+    The index is a snapshot: it records which lists it was built from and
+    their lengths, and is_current() reports whether the book has changed
+    since (a listing acquired or removed, or a fresh book generated).
+    """
+    
+    def __init__(self, available_deals: Dict[str, Dict[str, List['Company']]]):
+        self.listings = flatten_deal_book(available_deals)
+        self._signature = self._signature_of(available_deals)
+        
+        self.columns: Dict[str, np.ndarray] = {
+            field: np.array([getter(listing[3]) for listing in self.listings], dtype=float)
+            for field, getter in FIELDS.items()
+        }
+        
+        # Categorical columns are integer codes into a sorted vocabulary
+        self.vocabulary = {
+            'sector': sorted({listing[0] for listing in self.listings}),
+            'tier': sorted({listing[1] for listing in self.listings})
+        }
+        for position, name in enumerate(('sector', 'tier')):
+            codes = {label: i for i, label in enumerate(self.vocabulary[name])}
+            self.columns[name] = np.array(
+                [codes[listing[position]] for listing in self.listings], dtype=int
+            )
+            
+        # Every column sorted once; queries binary-search these
+        self._order: Dict[str, np.ndarray] = {}
+        self._sorted: Dict[str, np.ndarray] = {}
+        for field, values in self.columns.items():
+            order = np.argsort(values, kind='stable')
+            self._order[field] = order
+            self._sorted[field] = values[order]
+            
+    @staticmethod
+    def _signature_of(available_deals: Dict[str, Dict[str, List['Company']]]) -> tuple:
+        return tuple(
+            (sector, tier, id(companies), len(companies))
+            for sector, tiers in available_deals.items()
+            for tier, companies in tiers.items()
+        )
+        
+    def __len__(self) -> int:
+        return len(self.listings)
+        
+    def is_current(self, available_deals: Dict[str, Dict[str, List['Company']]]) -> bool:
+        """Whether the index still describes this deal book."""
+        return self._signature == self._signature_of(available_deals)
+        
+    def _range_ids(self, field: str, low: Optional[float], high: Optional[float]) -> np.ndarray:
+        """Listing ids with low <= field <= high, via binary search."""
+        values = self._sorted[field]
+        start = 0 if low is None else np.searchsorted(values, low, side='left')
+        end = len(values) if high is None else np.searchsorted(values, high, side='right')
+        return self._order[field][start:end]
+        
+    def _codes(self, name: str, labels: Iterable[str]) -> np.ndarray:
+        """Codes of the requested sector or tier labels (unknown labels match nothing)."""
+        vocabulary = self.vocabulary[name]
+        return np.array([vocabulary.index(label) for label in labels if label in vocabulary], dtype=int)
+        
+    def _group_ids(self, name: str, codes: np.ndarray) -> np.ndarray:
+        """Listing ids in any of the given categorical groups, via binary search."""
+        values = self._sorted[name]
+        starts = np.searchsorted(values, codes, side='left')
+        ends = np.searchsorted(values, codes, side='right')
+        order = self._order[name]
+        return np.concatenate([order[start:end] for start, end in zip(starts, ends)] + [order[:0]])
+        
+    def query(self, sectors: Iterable[str] = None, tiers: Iterable[str] = None,
+              order_by: str = 'valuation', descending: bool = False,
+              limit: int = None, **ranges: Tuple[Optional[float], Optional[float]]
+              ) -> List[Tuple[str, str, int, 'Company']]:
+        """
+        Screen the deal book.
+        
+        Example:
+            index.query(sectors={'Technology', 'Healthcare'},
+                        valuation=(5e6, 50e6), ebitda_margin=(0.15, None),
+                        growth_rate=(0.02, None), competence=(0.6, None))
+                        
+        Args:
+            sectors: Sectors to include (None for all)
+            tiers: Valuation tiers to include (None for all)
+            order_by: Field the results are sorted by
+            descending: Sort order
+            limit: Maximum number of results
+            **ranges: (low, high) bounds per field in FIELDS, inclusive;
+                      either bound may be None
+                      
+        Returns:
+            Matching listings as (sector, tier, index, company) tuples
+            
+        Raises:
+            ValueError: If a range or order_by names an unknown field
+        """
+        for field in list(ranges) + [order_by]:
+            if field not in FIELDS:
+                raise ValueError(f"Unknown screening field: {field}")
+                
+        groups = {}
+        if sectors is not None:
+            groups['sector'] = self._codes('sector', sectors)
+        if tiers is not None:
+            groups['tier'] = self._codes('tier', tiers)
+            
+        # Candidate sets: binary-searched slices of the sorted columns
+        candidates = [self._range_ids(field, *bounds) for field, bounds in ranges.items()]
+        candidates += [self._group_ids(name, codes) for name, codes in groups.items()]
+        
+        if candidates:
+            ids = min(candidates, key=len)
+        else:
+            ids = np.arange(len(self.listings))
+            
+        # Check every criterion on the (small) candidate set
+        mask = np.ones(len(ids), dtype=bool)
+        for field, (low, high) in ranges.items():
+            values = self.columns[field][ids]
+            if low is not None:
+                mask &= values >= low
+            if high is not None:
+                mask &= values <= high
+        for name, codes in groups.items():
+            mask &= np.isin(self.columns[name][ids], codes)
+        ids = ids[mask]
+        
+        keys = self.columns[order_by][ids]
+        ids = ids[np.argsort(-keys if descending else keys, kind='stable')]
+        if limit is not None:
+            ids = ids[:limit]
+        return [self.listings[i] for i in ids]
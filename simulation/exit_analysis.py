@@ -0,0 +1,280 @@
+"""
+Exit analysis - "exit now vs. hold k quarters" grids for the portfolio.
+
+Each company's exit value k quarters out is projected with the batch
+simulator (median over Monte Carlo trials), its loan balance with the debt
+book's amortization schedules, and the resulting equity returns for every
+company and horizon come from a single vectorized leveraged-returns call.
+
+The exit advisor goes further and values the option to exit at any future
+quarter, using least-squares Monte Carlo (Longstaff-Schwartz): paths for
+every company and trial are generated in one stacked batch, and working
+backward from the horizon, the value of holding on is estimated by
+regressing each company's realized continuation values on its paths' state.
+"""
+
+from typing import Dict, Any, List, Iterable, Tuple
+import numpy as np
+import config
+from models.finance import calculate_leveraged_returns_batch
+from simulation.batch_sim import CompanyBatch, MarketBatch, path_draws
+from simulation.portfolio_risk import PortfolioPaths
+from simulation import qmc
+
+
+def project_exit_values(company: 'Company', market: 'Market', holds: Iterable[int],
+                        trials: int, rng: np.random.Generator, sobol: bool = False) -> np.ndarray:
+    """
+    Median projected valuation of a company after each hold period.
+    
+    Args:
+        company: Portfolio company (not modified)
+        market: Current market (not modified)
+        holds: Extra quarters held; 0 means the current valuation
+        trials: Number of Monte Carlo trials
+        rng: numpy random generator
+        sobol: Draw from a scrambled Sobol sequence instead
+        
+    Returns:
+        Array of median valuations, one per hold period
+    """
+    holds = list(holds)
+    batch = CompanyBatch.from_company(company, trials)
+    market_batch = MarketBatch.from_market(market, company.sector, trials)
+    z = path_draws(rng, max(holds, default=0), trials, sobol)
+    
+    medians = {0: company.current_valuation}
+    for quarter in range(1, max(holds, default=0) + 1):
+        market_batch.update_quarter(z[quarter - 1, :3])
+        batch.simulate_quarter(market_batch, z[quarter - 1, 3:])
+        if quarter in holds:
+            medians[quarter] = float(np.median(batch.valuation(market_batch)))
+            
+    return np.array([medians[h] for h in holds])
+
+
+def exit_grid(player: 'Player', market: 'Market', current_quarter: int,
+              holds: Iterable[int] = None, trials: int = None,
+              seed: int = None, sobol: bool = None) -> Dict[str, Any]:
+    """
+    Compare exiting every portfolio company now against holding it longer.
+    
+    Equity invested is the acquisition price less the loans taken to fund
+    it; debt repaid at exit is the company's loan balance after scheduled
+    amortization over the hold.
+    
+    Args:
+        player: Player whose portfolio is analyzed
+        market: Current market
+        current_quarter: Current game quarter
+        holds: Extra quarters held (defaults to config.EXIT_GRID_HOLDS)
+        trials: Monte Carlo trials per company (defaults to config)
+        seed: Optional seed for reproducible projections
+        sobol: Use quasi-random draws (defaults to config.SOBOL_SAMPLING)
+        
+    Returns:
+        Dictionary with 'holds', 'companies' (names) and arrays of shape
+        (companies, holds) for 'exit_value', 'debt', 'equity_return',
+        'irr' and 'moic'
+    """
+    holds = list(config.EXIT_GRID_HOLDS if holds is None else holds)
+    trials = trials or config.EXIT_GRID_TRIALS
+    sobol = config.SOBOL_SAMPLING if sobol is None else sobol
+    rng = np.random.default_rng(seed)
+    portfolio = player.portfolio
+    book = player.debt_book
+    
+    exit_values = np.array([
+        project_exit_values(company, market, holds, trials, rng, sobol) for company in portfolio
+    ]).reshape(len(portfolio), len(holds))
+    
+    names = [company.name for company in portfolio]
+    debt = book.projected_company_balances([company.acquisition_id for company in portfolio], holds)
+    
+    purchase = np.array([
+        company.acquisition_price or company.current_valuation for company in portfolio
+    ])
+    equity = purchase - np.array([book.company_principal(company.acquisition_id) for company in portfolio])
+    held = np.array([
+        current_quarter - (company.acquisition_quarter or 0) for company in portfolio
+    ])
+    
+    equity_return, irr, moic = calculate_leveraged_returns_batch(
+        purchase[:, None], exit_values, debt, equity[:, None],
+        held[:, None] + np.array(holds)[None, :], market.get_debt_rate()
+    )
+    
+    return {
+        'holds': holds,
+        'companies': names,
+        'exit_value': exit_values,
+        'debt': debt,
+        'equity_return': equity_return,
+        'irr': irr,
+        'moic': moic
+    }
+
+
+def _regression_basis(value: np.ndarray, margin: np.ndarray, trend: np.ndarray) -> np.ndarray:
+    """Polynomial basis in relative valuation, margin and multiple trend."""
+    return np.column_stack([
+        np.ones_like(value), value, value ** 2, margin, value * margin, trend
+    ])
+
+
+def _exit_paths(companies: List['Company'], market: 'Market', horizon: int, trials: int,
+                rng: np.random.Generator, sobol: bool = False) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Simulated state of every company on every trial, from one stacked batch.
+    
+    All companies step together in a portfolio_risk.PortfolioPaths (rows
+    company-major), sharing each trial's market path.
+    
+    Returns:
+        Valuations, EBITDA margins and multiple trends, each of shape
+        (horizon + 1, companies, trials); index 0 is today's state
+    """
+    n = len(companies)
+    paths = PortfolioPaths(companies, market, trials)
+    values = np.empty((horizon + 1, n, trials))
+    margins = np.empty((horizon + 1, n, trials))
+    trends = np.empty((horizon + 1, n, trials))
+    values[0] = np.array([c.current_valuation for c in companies])[:, None]
+    margins[0] = paths.batch.ebitda_margin.reshape(n, trials)
+    trends[0] = market.multiple_trend
+    
+    dimensions = paths.shock_dimensions - 1
+    if sobol and horizon > 0:
+        # One Sobol point per trial, quarters in order (as portfolio_risk draws them)
+        u = qmc.uniform_matrix(trials, horizon * dimensions, rng)
+        shocks = qmc.norm_ppf(u.reshape(trials, horizon, dimensions).transpose(1, 2, 0))
+        
+    for t in range(1, horizon + 1):
+        company_market = paths.advance(rng, shocks[t - 1] if sobol else None)
+        values[t] = paths.batch.valuation(company_market).reshape(n, trials)
+        margins[t] = paths.batch.ebitda_margin.reshape(n, trials)
+        trends[t] = company_market.multiple_trend.reshape(n, trials)
+        
+    return values, margins, trends
+
+
+def _least_squares_exit(company: 'Company', player: 'Player', market: 'Market',
+                        values: np.ndarray, margins: np.ndarray, trends: np.ndarray,
+                        debt: np.ndarray) -> Dict[str, Any]:
+    """
+    Longstaff-Schwartz exit valuation over one company's simulated paths.
+    
+    Args:
+        values, margins, trends: Path states, shape (horizon + 1, trials)
+        debt: Loan balance on schedule at each quarter, shape (horizon + 1,)
+        
+    Returns:
+        optimal_exit's result dictionary
+    """
+    horizon, trials = values.shape
+    horizon -= 1
+    cost_basis = company.acquisition_price or company.current_valuation
+    quarterly_rate = market.get_debt_rate() / 4
+    discount = 1 / (1 + quarterly_rate)
+    
+    # Debt service paid while holding from quarter t to t + 1
+    service = debt[:-1] * quarterly_rate + (debt[:-1] - debt[1:])
+    payoff = (values - np.maximum(0.0, values - cost_basis) * player.capital_gains_tax_rate()
+              - debt[:, None])
+              
+    # Backward induction: forced exit at the horizon
+    realized = payoff[horizon].copy()
+    exit_quarter = np.full(trials, horizon)
+    scale = max(company.current_valuation, 1.0)
+    for t in range(horizon - 1, 0, -1):
+        continuation = discount * (realized - service[t])
+        basis = _regression_basis(values[t] / scale, margins[t], trends[t])
+        # Solved through the 6x6 normal equations; lstsq still copes with a
+        # degenerate basis (e.g. paths that never vary)
+        coefficients, *_ = np.linalg.lstsq(basis.T @ basis, basis.T @ continuation, rcond=None)
+        
+        exercise = payoff[t] >= basis @ coefficients
+        realized = np.where(exercise, payoff[t], continuation)
+        exit_quarter = np.where(exercise, t, exit_quarter)
+        
+    exit_now = float(payoff[0, 0])
+    hold_value = float(np.mean(discount * (realized - service[0]))) if horizon > 0 else exit_now
+    advice = 'exit' if exit_now >= hold_value else 'hold'
+    
+    return {
+        'company': company.name,
+        'exit_now': exit_now,
+        'hold_value': hold_value,
+        'advice': advice,
+        'expected_exit_quarter': 0.0 if advice == 'exit' else float(exit_quarter.mean()),
+        'exit_probability': np.bincount(exit_quarter, minlength=horizon + 1) / trials
+    }
+
+
+def optimal_exit(company: 'Company', player: 'Player', market: 'Market',
+                 horizon: int = None, trials: int = None,
+                 rng: np.random.Generator = None, sobol: bool = False) -> Dict[str, Any]:
+    """
+    Value exiting a company now against the best exit over the horizon.
+    
+    Payoffs are after-tax equity proceeds: valuation less capital gains tax
+    (Player.calculate_capital_gains_tax, vectorized) less the company's loan
+    balance on its amortization schedule. Holding costs the quarter's debt
+    service, and future payoffs are discounted at the market debt rate.
+    
+    Args:
+        company: Portfolio company (not modified)
+        player: Owning player (tax rate and loans)
+        market: Current market (not modified)
+        horizon: Last quarter an exit is considered (defaults to config)
+        trials: Number of simulated paths (defaults to config)
+        rng: numpy random generator
+        sobol: Draw paths from a scrambled Sobol sequence instead
+        
+    Returns:
+        Dictionary with 'company', 'exit_now' and 'hold_value' (after-tax
+        equity values), 'advice' ('exit' or 'hold'), 'expected_exit_quarter'
+        and 'exit_probability' (share of paths exiting at each quarter)
+    """
+    horizon = config.EXIT_ADVISOR_HORIZON if horizon is None else horizon
+    trials = trials or config.EXIT_ADVISOR_TRIALS
+    rng = rng if rng is not None else np.random.default_rng()
+    
+    values, margins, trends = _exit_paths([company], market, horizon, trials, rng, sobol)
+    debt = player.debt_book.projected_company_balances([company.acquisition_id], range(horizon + 1))[0]
+    return _least_squares_exit(company, player, market, values[:, 0], margins[:, 0], trends[:, 0], debt)
+
+
+def exit_advice(player: 'Player', market: 'Market', horizon: int = None,
+                trials: int = None, seed: int = None, sobol: bool = None) -> List[Dict[str, Any]]:
+    """
+    Run the exit advisor on every portfolio company.
+    
+    The whole portfolio's paths come from one stacked simulation; the
+    regressions then run company by company over its slices.
+    
+    Args:
+        player: Player whose portfolio is analyzed
+        market: Current market
+        horizon: Last quarter an exit is considered (defaults to config)
+        trials: Simulated paths per company (defaults to config)
+        seed: Optional seed for reproducible advice
+        sobol: Use quasi-random paths (defaults to config.SOBOL_SAMPLING)
+        
+    Returns:
+        One optimal_exit result per portfolio company
+    """
+    horizon = config.EXIT_ADVISOR_HORIZON if horizon is None else horizon
+    trials = trials or config.EXIT_ADVISOR_TRIALS
+    sobol = config.SOBOL_SAMPLING if sobol is None else sobol
+    portfolio = player.portfolio
+    if not portfolio:
+        return []
+        
+    values, margins, trends = _exit_paths(portfolio, market, horizon, trials,
+                                          np.random.default_rng(seed), sobol)
+    debt = player.debt_book.projected_company_balances([c.acquisition_id for c in portfolio], range(horizon + 1))
+    return [
+        _least_squares_exit(company, player, market, values[:, i], margins[:, i], trends[:, i], debt[i])
+        for i, company in enumerate(portfolio)
+    ]
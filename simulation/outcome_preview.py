@@ -0,0 +1,220 @@
+"""
+Outcome preview - Monte Carlo percentile bands for portfolio operations.
+
+Each operation's random effects (simulation.portfolio_ops' own effect
+functions, run on a batch) are sampled for thousands of trials at once,
+followed by a few quarters of follow-on simulation, and summarized as
+percentile bands. A no-action
+baseline is run on the same draws so the valuation impact of the operation
+itself can be read off directly.
+
+compare_operations ranks several candidate operations the same way: every
+arm is run on common random numbers (the same market and company shocks,
+optionally in antithetic pairs), so the confidence interval on each arm's
+difference from the first reflects the operations rather than market noise.
+"""
+
+from typing import Dict, Any, Optional, List
+import numpy as np
+import config
+from simulation import portfolio_ops
+from simulation.batch_sim import (
+    CompanyBatch, MarketBatch, simulate_quarters, percentile_bands, paired_interval
+)
+
+
+class BatchDraws:
+    """
+    Random draws for a batch of trials, one value per trial.
+    
+    Implements the ScalarDraws interface of simulation.portfolio_ops, so the
+    game's effect functions run unchanged on a CompanyBatch.
+    """
+    
+    minimum = staticmethod(np.minimum)
+    maximum = staticmethod(np.maximum)
+    
+    def __init__(self, rng: np.random.Generator, trials: int):
+        self.rng = rng
+        self.trials = trials
+        
+    def uniform(self, low: float, high: float) -> np.ndarray:
+        return self.rng.uniform(low, high, self.trials)
+        
+    def chance(self, p: float) -> np.ndarray:
+        return self.rng.random(self.trials) < p
+        
+    def where(self, condition: np.ndarray, if_true: Any, if_false: Any) -> np.ndarray:
+        """Pick per trial (both branches are drawn)."""
+        return np.where(condition,
+                        if_true() if callable(if_true) else if_true,
+                        if_false() if callable(if_false) else if_false)
+
+
+def sample_cost_cutting(batch: CompanyBatch, intensity: float, rng: np.random.Generator) -> None:
+    """Apply apply_cost_cutting's effects to every trial in the batch."""
+    portfolio_ops.cost_cutting_effects(batch, intensity, BatchDraws(rng, batch.trials))
+
+
+def sample_capex(batch: CompanyBatch, amount: float, rng: np.random.Generator) -> None:
+    """Apply apply_capex_investment's effects to every trial in the batch."""
+    portfolio_ops.capex_effects(batch, amount, BatchDraws(rng, batch.trials))
+
+
+def sample_growth_strategy(batch: CompanyBatch, strategy: str,
+                           rng: np.random.Generator) -> Optional[np.ndarray]:
+    """
+    Apply pursue_acquisition_strategy's effects to every trial in the batch.
+    
+    Returns:
+        Cost per trial, or None for strategies without an upfront cost
+    """
+    effects = portfolio_ops.strategy_effects(batch, strategy, BatchDraws(rng, batch.trials))
+    if effects is None:
+        raise ValueError(f"Unknown strategy type: {strategy}")
+    return effects['cost']
+
+
+def sample_operation(batch: CompanyBatch, operation: Optional[str], params: Dict[str, Any],
+                     rng: np.random.Generator) -> Optional[np.ndarray]:
+    """
+    Apply an operation's effects to every trial in the batch.
+    
+    Args:
+        batch: Company batch to modify in place
+        operation: 'cost_cutting', 'capex', 'strategy' or None (no action)
+        params: Operation parameters - intensity (0-1), amount, or strategy
+        rng: numpy random generator
+        
+    Returns:
+        Cost per trial, or None for operations without an upfront cost
+    """
+    if operation is None:
+        return None
+    if operation == 'cost_cutting':
+        sample_cost_cutting(batch, params['intensity'], rng)
+        return None
+    if operation == 'capex':
+        sample_capex(batch, params['amount'], rng)
+        return None
+    if operation == 'strategy':
+        return sample_growth_strategy(batch, params['strategy'], rng)
+    raise ValueError(f"Unknown operation: {operation}")
+
+
+def preview_operation(company: 'Company', market: 'Market', operation: str,
+                      quarters: int = None, trials: int = None, seed: int = None,
+                      **params) -> Dict[str, Any]:
+    """
+    Simulate an operation's outcome distribution.
+    
+    Args:
+        company: Company the operation would be applied to (not modified)
+        market: Current market (not modified)
+        operation: 'cost_cutting', 'capex' or 'strategy'
+        quarters: Follow-on quarters to simulate (defaults to config)
+        trials: Number of Monte Carlo trials (defaults to config)
+        seed: Optional seed for reproducible previews
+        **params: Operation parameters - intensity (0-1), amount, or strategy
+        
+    Returns:
+        Dictionary with 'trials', 'quarters' and 'bands', mapping metric name
+        ('margin', 'growth', 'health', 'valuation', 'valuation_vs_baseline'
+        and, when applicable, 'cost') to percentile bands
+    """
+    quarters = config.OUTCOME_PREVIEW_QUARTERS if quarters is None else quarters
+    trials = trials or config.OUTCOME_PREVIEW_TRIALS
+    rng = np.random.default_rng(seed)
+    
+    baseline = CompanyBatch.from_company(company, trials)
+    batch = baseline.copy()
+    cost = sample_operation(batch, operation, params, rng)
+    
+    market_batch = MarketBatch.from_market(market, company.sector, trials)
+    simulate_quarters([batch, baseline], market_batch, quarters, rng)
+    
+    valuation = batch.valuation(market_batch)
+    bands = {
+        'margin': percentile_bands(batch.ebitda_margin),
+        'growth': percentile_bands(batch.growth_rate),
+        'health': percentile_bands(batch.operational_health),
+        'valuation': percentile_bands(valuation),
+        'valuation_vs_baseline': percentile_bands(valuation - baseline.valuation(market_batch))
+    }
+    if cost is not None:
+        bands['cost'] = percentile_bands(cost)
+        
+    return {
+        'trials': trials,
+        'quarters': quarters,
+        'bands': bands
+    }
+
+
+def compare_operations(company: 'Company', market: 'Market', arms: Dict[str, Dict[str, Any]],
+                       quarters: int = None, trials: int = None, seed: int = None,
+                       antithetic: bool = True, confidence: float = None) -> Dict[str, Any]:
+    """
+    Compare operations on common random numbers.
+    
+    Every arm sees the same market and company shocks (antithetic pairs by
+    default), and each arm's operation effects are drawn from a fresh copy
+    of one shared stream, so arms that differ only in a parameter (say
+    cost-cutting intensity) also share their effect draws. Net value is the
+    valuation after `quarters` less any upfront cost.
+    
+    Args:
+        company: Company the operations would be applied to (not modified)
+        market: Current market (not modified)
+        arms: Arm name -> {'operation': ... or None, plus its parameters};
+              the first arm is the reference the others are compared to
+        quarters: Follow-on quarters to simulate (defaults to config)
+        trials: Number of Monte Carlo trials (defaults to config)
+        seed: Optional seed for reproducible comparisons
+        antithetic: Draw market and company noise as antithetic pairs
+        confidence: Confidence level of the intervals (defaults to config)
+        
+    Returns:
+        Dictionary with 'trials', 'quarters', 'antithetic', 'arms' (name ->
+        interval on net value) and 'differences' (name -> interval on net
+        value minus the reference arm's, plus 'variance_reduction': how many
+        times more independent trials the same precision would need)
+    """
+    quarters = config.OUTCOME_PREVIEW_QUARTERS if quarters is None else quarters
+    trials = trials or config.OUTCOME_PREVIEW_TRIALS
+    trials += trials % 2 if antithetic else 0
+    confidence = config.OUTCOME_COMPARE_CONFIDENCE if confidence is None else confidence
+    noise_seed, effect_seed = np.random.SeedSequence(seed).spawn(2)
+    
+    names: List[str] = list(arms)
+    batches = []
+    costs = []
+    for name in names:
+        params = dict(arms[name])
+        operation = params.pop('operation', None)
+        batch = CompanyBatch.from_company(company, trials)
+        cost = sample_operation(batch, operation, params, np.random.default_rng(effect_seed))
+        batches.append(batch)
+        costs.append(np.zeros(trials) if cost is None else cost)
+        
+    market_batch = MarketBatch.from_market(market, company.sector, trials)
+    simulate_quarters(batches, market_batch, quarters, np.random.default_rng(noise_seed), antithetic)
+    net_values = [batch.valuation(market_batch) - cost for batch, cost in zip(batches, costs)]
+    
+    reference = net_values[0]
+    differences = {}
+    for name, values in zip(names[1:], net_values[1:]):
+        interval = paired_interval(values - reference, antithetic, confidence)
+        independent = (values.var(ddof=1) + reference.var(ddof=1)) / trials
+        stderr = interval['stderr']
+        interval['variance_reduction'] = float(independent / stderr ** 2) if stderr > 0 else float('inf')
+        differences[name] = interval
+        
+    return {
+        'trials': trials,
+        'quarters': quarters,
+        'antithetic': antithetic,
+        'arms': {name: paired_interval(values, antithetic, confidence)
+                 for name, values in zip(names, net_values)},
+        'differences': differences
+    }
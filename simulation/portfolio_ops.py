@@ -2,30 +2,55 @@
 Portfolio operations - actions that can be taken on portfolio companies.
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import random
 import config
+from models import ledger
 from simulation.narratives import get_cost_cutting_consequence
 
 
-def apply_cost_cutting(company: 'Company', intensity: float = 0.5) -> Dict[str, Any]:
+class ScalarDraws:
     """
-    Apply cost-cutting measures to improve margins.
-    Now with narrative consequences!
+    Random draws for one company, from the game's random stream.
+    
+    The *_effects functions below are written against this interface so the
+    same effect math serves the game (one company) and the Monte Carlo
+    previews (simulation.outcome_preview.BatchDraws, one value per trial).
+    """
+    
+    @staticmethod
+    def uniform(low: float, high: float) -> float:
+        return random.uniform(low, high)
+        
+    @staticmethod
+    def chance(p: float) -> bool:
+        return random.random() < p
+        
+    @staticmethod
+    def where(condition: bool, if_true: Any, if_false: Any) -> Any:
+        """Pick a branch; callables are only drawn if their branch is taken."""
+        value = if_true if condition else if_false
+        return value() if callable(value) else value
+        
+    minimum = staticmethod(min)
+    maximum = staticmethod(max)
+
+
+def cost_cutting_effects(target: Any, intensity: float, draws: Any) -> Dict[str, Any]:
+    """
+    Apply cost-cutting's effects to a company (or batch of trials) in place.
     
     Args:
-        company: Company to apply cost-cutting to
+        target: Company or CompanyBatch
         intensity: Intensity of cost-cutting (0-1 scale)
+        draws: ScalarDraws or BatchDraws matching the target
         
     Returns:
-        Dictionary with results including narrative
+        Dictionary with 'margin_improvement', 'growth_penalty', 'health_damage',
+        'morale_impact' and 'reputation_hit'
     """
-    # Get sector-specific narrative
-    narrative_result = get_cost_cutting_consequence(company.sector, intensity)
-    
     # Cost cutting improves margins but may hurt growth
-    max_margin_improvement = config.COST_CUTTING_MAX_IMPACT * intensity
-    margin_improvement = random.uniform(0, max_margin_improvement)
+    margin_improvement = draws.uniform(0, config.COST_CUTTING_MAX_IMPACT * intensity)
     
     # Growth penalty (aggressive cost cutting hurts growth)
     growth_penalty = intensity * 0.02  # Up to -2% growth
@@ -34,92 +59,213 @@ def apply_cost_cutting(company: 'Company', intensity: float = 0.5) -> Dict[str,
     morale_impact = False
     reputation_hit = 0.0
     
+    # OPERATIONAL HEALTH DAMAGE (long-term viability risk)
+    # Cost-cutting damages operational health, making company fragile
+    health_damage = intensity * 0.15  # Up to 15% health loss per cut
+    
     if intensity > 0.7:
         # High intensity - significant risks
-        if random.random() < 0.5:
-            additional_growth_penalty = random.uniform(0.01, 0.03)
-            growth_penalty += additional_growth_penalty
-            morale_impact = True
+        morale_impact = draws.chance(0.5)
+        growth_penalty = growth_penalty + draws.where(morale_impact, lambda: draws.uniform(0.01, 0.03), 0.0)
         
         # Might hurt reputation
-        if random.random() < 0.3:
-            reputation_hit = random.uniform(0.01, 0.03)
+        reputation_hit = draws.where(draws.chance(0.3), lambda: draws.uniform(0.01, 0.03), 0.0)
+        
+        # Aggressive cutting causes exponentially more damage
+        health_damage = intensity * 0.25  # Up to 25% health loss
     
     elif intensity > 0.4:
         # Medium intensity - moderate risks
-        if random.random() < 0.3:
-            additional_growth_penalty = 0.01
-            growth_penalty += additional_growth_penalty
-            morale_impact = True
-    
-    # OPERATIONAL HEALTH DAMAGE (long-term viability risk)
-    # Cost-cutting damages operational health, making company fragile
-    health_damage = intensity * 0.15  # Up to 15% health loss per cut
+        morale_impact = draws.chance(0.3)
+        growth_penalty = growth_penalty + draws.where(morale_impact, 0.01, 0.0)
     
-    # Aggressive cutting causes exponentially more damage
-    if intensity > 0.7:
-        health_damage = intensity * 0.25  # Up to 25% health loss
+    target.operational_health = draws.maximum(0.0, target.operational_health - health_damage)
     
-    company.operational_health = max(0.0, company.operational_health - health_damage)
+    old_margin = target.ebitda_margin
+    target.ebitda_margin = draws.minimum(0.50, target.ebitda_margin + margin_improvement)
+    target.growth_rate = target.growth_rate - growth_penalty
     
-    # Apply changes
-    old_margin = company.ebitda_margin
-    company.ebitda_margin = min(0.50, company.ebitda_margin + margin_improvement)
-    company.growth_rate -= growth_penalty
-        
     return {
-        'success': True,
-        'margin_improvement': company.ebitda_margin - old_margin,
+        'margin_improvement': target.ebitda_margin - old_margin,
         'growth_penalty': growth_penalty,
         'health_damage': health_damage,
         'morale_impact': morale_impact,
-        'reputation_hit': reputation_hit,
-        'narrative_action': narrative_result['action'],
-        'narrative_consequence': narrative_result['consequence'],
-        'message': f"Margins improved by {(company.ebitda_margin - old_margin):.1%}"
+        'reputation_hit': reputation_hit
     }
 
 
-def apply_capex_investment(company: 'Company', amount: float) -> Dict[str, Any]:
+def capex_effects(target: Any, amount: float, draws: Any) -> Dict[str, Any]:
     """
-    Invest in capex to boost growth.
+    Apply a capex investment's effects to a company (or batch of trials) in place.
     
     Args:
-        company: Company to invest in
+        target: Company or CompanyBatch
         amount: Investment amount
+        draws: ScalarDraws or BatchDraws matching the target
         
     Returns:
-        Dictionary with results
+        Dictionary with 'growth_boost', 'health_improvement' and 'effectiveness'
     """
     # Convert investment amount to growth boost
     # Rough heuristic: $1M investment per $10M revenue = 0.5% growth boost
-    revenue_ratio = amount / company.revenue
-    growth_boost = revenue_ratio * 0.05
-    growth_boost = min(growth_boost, config.CAPEX_BOOST_MAX_IMPACT)
+    revenue_ratio = amount / target.revenue
+    growth_boost = draws.minimum(revenue_ratio * 0.05, config.CAPEX_BOOST_MAX_IMPACT)
     
     # Add some randomness to effectiveness
-    effectiveness = random.uniform(0.7, 1.3)
+    effectiveness = draws.uniform(0.7, 1.3)
     actual_growth_boost = growth_boost * effectiveness
-    
-    old_growth = company.growth_rate
-    company.growth_rate += actual_growth_boost
+    target.growth_rate = target.growth_rate + actual_growth_boost
     
     # HEALTH IMPROVEMENT - investing in the business improves operational health
     # Larger investments relative to revenue = more health improvement
-    health_improvement = min(0.15, revenue_ratio * 0.10)  # Up to 15% improvement
-    company.operational_health = min(1.0, company.operational_health + health_improvement)
+    health_improvement = draws.minimum(0.15, revenue_ratio * 0.10)  # Up to 15% improvement
+    target.operational_health = draws.minimum(1.0, target.operational_health + health_improvement)
     
     return {
-        'success': True,
         'growth_boost': actual_growth_boost,
         'health_improvement': health_improvement,
-        'effectiveness': effectiveness,
-        'message': f"Growth rate increased by {actual_growth_boost:.1%}. "
-                  f"Operational health improved by {health_improvement:.1%}."
+        'effectiveness': effectiveness
     }
 
 
-def replace_management(company: 'Company', player: 'Player', selected_manager: 'Manager' = None) -> Dict[str, Any]:
+def strategy_effects(target: Any, strategy_type: str, draws: Any) -> Optional[Dict[str, Any]]:
+    """
+    Apply a growth strategy's effects to a company (or batch of trials) in place.
+    
+    Args:
+        target: Company or CompanyBatch
+        strategy_type: 'roll_up', 'expand' or 'diversify'
+        draws: ScalarDraws or BatchDraws matching the target
+        
+    Returns:
+        Dictionary of the drawn effects, including 'cost' (None if the
+        strategy has no upfront cost), or None for an unknown strategy
+    """
+    if strategy_type == 'roll_up':
+        # COST: Acquiring competitors is expensive
+        # Cost = 150-200% of current revenue to buy smaller competitors
+        cost = target.revenue * draws.uniform(1.5, 2.0)
+        
+        # BENEFITS: Revenue and margin improvements
+        revenue_boost = draws.uniform(0.10, 0.20)  # Reduced from 0.25
+        margin_boost = draws.uniform(0.01, 0.03)  # Reduced from 0.05
+        
+        target.revenue = target.revenue * (1 + revenue_boost)
+        target.ebitda_margin = draws.minimum(0.50, target.ebitda_margin + margin_boost)
+        
+        # RISKS: Integration challenges
+        # Increased volatility during integration period
+        volatility_increase = draws.uniform(0.03, 0.08)
+        target.volatility = target.volatility + volatility_increase
+        
+        # Integration period creates temporary growth drag
+        integration_drag = draws.uniform(0.01, 0.03)
+        target.growth_rate = target.growth_rate - integration_drag
+        
+        # HEALTH: Mixed impact - smooth (>0.7), neutral, or rough (<=0.4) integration
+        integration_success = draws.uniform(0.0, 1.0)
+        health_change = draws.where(
+            integration_success > 0.7,
+            lambda: draws.uniform(0.03, 0.08),
+            lambda: draws.where(integration_success > 0.4, 0.0, lambda: -draws.uniform(0.05, 0.10))
+        )
+        target.operational_health = draws.maximum(
+            0.0, draws.minimum(1.0, target.operational_health + health_change)
+        )
+        
+        return {
+            'cost': cost,
+            'revenue_boost': revenue_boost,
+            'margin_boost': margin_boost,
+            'volatility_increase': volatility_increase,
+            'integration_drag': integration_drag,
+            'health_improvement': health_change,
+            'integration_success': integration_success
+        }
+        
+    elif strategy_type == 'expand':
+        # Geographic or market expansion, costing 10% of revenue upfront
+        growth_boost = draws.uniform(0.02, 0.05)
+        target.growth_rate = target.growth_rate + growth_boost
+        cost = target.revenue * 0.10
+        
+        # HEALTH IMPROVEMENT - expansion strengthens business
+        health_improvement = draws.uniform(0.03, 0.08)
+        target.operational_health = draws.minimum(1.0, target.operational_health + health_improvement)
+        
+        return {
+            'cost': cost,
+            'growth_boost': growth_boost,
+            'health_improvement': health_improvement
+        }
+        
+    elif strategy_type == 'diversify':
+        # Diversify revenue streams (reduces volatility)
+        old_volatility = target.volatility
+        target.volatility = draws.maximum(0.02, target.volatility - draws.uniform(0.02, 0.05))
+        
+        # Slight margin improvement from diversification
+        margin_boost = draws.uniform(0.0, 0.02)
+        target.ebitda_margin = draws.minimum(0.50, target.ebitda_margin + margin_boost)
+        
+        return {
+            'cost': None,
+            'volatility_reduction': old_volatility - target.volatility,
+            'margin_boost': margin_boost
+        }
+        
+    return None
+
+
+def apply_cost_cutting(company: 'Company', intensity: float = 0.5) -> Dict[str, Any]:
+    """
+    Apply cost-cutting measures to improve margins.
+    Now with narrative consequences!
+    
+    Args:
+        company: Company to apply cost-cutting to
+        intensity: Intensity of cost-cutting (0-1 scale)
+        
+    Returns:
+        Dictionary with results including narrative
+    """
+    # Get sector-specific narrative
+    narrative_result = get_cost_cutting_consequence(company.sector, intensity)
+    
+    effects = cost_cutting_effects(company, intensity, ScalarDraws)
+        
+    return {
+        'success': True,
+        **effects,
+        'narrative_action': narrative_result['action'],
+        'narrative_consequence': narrative_result['consequence'],
+        'message': f"Margins improved by {effects['margin_improvement']:.1%}"
+    }
+
+
+def apply_capex_investment(company: 'Company', amount: float) -> Dict[str, Any]:
+    """
+    Invest in capex to boost growth.
+    
+    Args:
+        company: Company to invest in
+        amount: Investment amount
+        
+    Returns:
+        Dictionary with results
+    """
+    effects = capex_effects(company, amount, ScalarDraws)
+    
+    return {
+        'success': True,
+        **effects,
+        'message': f"Growth rate increased by {effects['growth_boost']:.1%}. "
+                  f"Operational health improved by {effects['health_improvement']:.1%}."
+    }
+
+
+def replace_management(company: 'Company', player: 'Player', selected_manager: 'Manager' = None,
+                       fee_paid: bool = False) -> Dict[str, Any]:
     """
     Replace company management team with a selected candidate.
     
@@ -127,6 +273,8 @@ def replace_management(company: 'Company', player: 'Player', selected_manager: '
         company: Company to replace management
         player: Player (for cost and reputation effects)
         selected_manager: The chosen manager (if None, generates random)
+        fee_paid: True if the base replacement fee was already paid (e.g. through
+            financing); only a difficult-termination surcharge is then charged
         
     Returns:
         Dictionary with results including narratives
@@ -137,7 +285,7 @@ def replace_management(company: 'Company', player: 'Player', selected_manager: '
     cost = config.MANAGER_REPLACEMENT_COST
     
     # Check if player can afford it
-    if player.cash < cost:
+    if not fee_paid and player.cash < cost:
         return {
             'success': False,
             'message': "Insufficient cash for management replacement."
@@ -148,6 +296,7 @@ def replace_management(company: 'Company', player: 'Player', selected_manager: '
     difficulty = old_manager.get_negotiation_difficulty()
     
     # Difficult managers may cost more or hurt reputation
+    additional_cost = 0.0
     if difficulty > 0.7 and random.random() < 0.5:
         additional_cost = cost * 0.5
         cost += additional_cost
@@ -156,8 +305,10 @@ def replace_management(company: 'Company', player: 'Player', selected_manager: '
     else:
         difficult = False
         
-    # Deduct cost
-    player.adjust_cash(-cost)
+    # Deduct cost (just the surcharge if the base fee was already paid)
+    charge = additional_cost if fee_paid else cost
+    if charge > 0:
+        player.adjust_cash(-charge, ledger.MANAGEMENT, company.name)
     
     # Use selected manager or generate random
     new_manager = selected_manager if selected_manager else Manager()
@@ -210,104 +361,45 @@ def pursue_acquisition_strategy(company: 'Company', strategy_type: str) -> Dict[
     if strategy_type == 'roll_up':
         # Buy competitors to consolidate market - EXPENSIVE and RISKY
         num_acquisitions = random.randint(2, 5)
+        effects = strategy_effects(company, strategy_type, ScalarDraws)
         
-        # COST: Acquiring competitors is expensive
-        # Cost = 150-200% of current revenue to buy smaller competitors
-        cost_multiplier = random.uniform(1.5, 2.0)
-        cost = company.revenue * cost_multiplier
-        
-        # BENEFITS: Revenue and margin improvements
-        revenue_boost = random.uniform(0.10, 0.20)  # Reduced from 0.25
-        margin_boost = random.uniform(0.01, 0.03)  # Reduced from 0.05
-        
-        company.revenue *= (1 + revenue_boost)
-        company.ebitda_margin += margin_boost
-        company.ebitda_margin = min(0.50, company.ebitda_margin)
-        
-        # RISKS: Integration challenges
-        # Increased volatility during integration period
-        volatility_increase = random.uniform(0.03, 0.08)
-        company.volatility += volatility_increase
-        
-        # Integration period creates temporary growth drag
-        integration_drag = random.uniform(0.01, 0.03)
-        company.growth_rate -= integration_drag
-        
-        # HEALTH: Mixed impact - scale improves some things, integration damages others
-        # Net effect is usually slightly positive but not guaranteed
-        integration_success = random.random()
-        
-        if integration_success > 0.7:
-            # Smooth integration
-            health_improvement = random.uniform(0.03, 0.08)
-            company.operational_health = min(1.0, company.operational_health + health_improvement)
+        if effects['integration_success'] > 0.7:
             integration_message = "Integration went smoothly."
-        elif integration_success > 0.4:
-            # Neutral integration
-            health_improvement = 0
+        elif effects['integration_success'] > 0.4:
             integration_message = "Integration proceeded normally."
         else:
-            # Rough integration
-            health_damage = random.uniform(0.05, 0.10)
-            company.operational_health = max(0.0, company.operational_health - health_damage)
-            health_improvement = -health_damage
             integration_message = "Integration challenges encountered!"
         
         return {
             'success': True,
-            'cost': cost,
+            **effects,
             'num_acquisitions': num_acquisitions,
-            'revenue_boost': revenue_boost,
-            'margin_boost': margin_boost,
-            'volatility_increase': volatility_increase,
-            'integration_drag': integration_drag,
-            'health_improvement': health_improvement,
-            'integration_success': integration_success,
-            'message': f"Roll-up strategy: Acquired {num_acquisitions} competitors for ${cost:,.0f}. "
-                      f"Revenue +{revenue_boost:.1%}, Margin +{margin_boost:.1%}. "
-                      f"Volatility +{volatility_increase:.1%} (integration risk). "
-                      f"Temporary growth drag -{integration_drag:.1%}. "
+            'message': f"Roll-up strategy: Acquired {num_acquisitions} competitors for ${effects['cost']:,.0f}. "
+                      f"Revenue +{effects['revenue_boost']:.1%}, Margin +{effects['margin_boost']:.1%}. "
+                      f"Volatility +{effects['volatility_increase']:.1%} (integration risk). "
+                      f"Temporary growth drag -{effects['integration_drag']:.1%}. "
                       f"{integration_message}"
         }
         
     elif strategy_type == 'expand':
         # Geographic or market expansion
-        growth_boost = random.uniform(0.02, 0.05)
-        upfront_cost_ratio = 0.10  # Costs 10% of revenue upfront
-        
-        company.growth_rate += growth_boost
-        cost = company.revenue * upfront_cost_ratio
-        
-        # HEALTH IMPROVEMENT - expansion strengthens business
-        health_improvement = random.uniform(0.03, 0.08)
-        company.operational_health = min(1.0, company.operational_health + health_improvement)
+        effects = strategy_effects(company, strategy_type, ScalarDraws)
         
         return {
             'success': True,
-            'growth_boost': growth_boost,
-            'health_improvement': health_improvement,
-            'cost': cost,
-            'message': f"Expansion strategy: Growth +{growth_boost:.1%}, Cost ${cost:,.0f}. "
-                      f"Operational health improved by {health_improvement:.1%}."
+            **effects,
+            'message': f"Expansion strategy: Growth +{effects['growth_boost']:.1%}, Cost ${effects['cost']:,.0f}. "
+                      f"Operational health improved by {effects['health_improvement']:.1%}."
         }
         
     elif strategy_type == 'diversify':
-        # Diversify revenue streams (reduces volatility)
-        volatility_reduction = random.uniform(0.02, 0.05)
-        
-        old_volatility = company.volatility
-        company.volatility = max(0.02, company.volatility - volatility_reduction)
-        
-        # Slight margin improvement from diversification
-        margin_boost = random.uniform(0.0, 0.02)
-        company.ebitda_margin += margin_boost
-        company.ebitda_margin = min(0.50, company.ebitda_margin)
+        effects = strategy_effects(company, strategy_type, ScalarDraws)
+        del effects['cost']
         
         return {
             'success': True,
-            'volatility_reduction': old_volatility - company.volatility,
-            'margin_boost': margin_boost,
-            'message': f"Diversification: Reduced risk, Margin +{margin_boost:.1%}"
+            **effects,
+            'message': f"Diversification: Reduced risk, Margin +{effects['margin_boost']:.1%}"
         }
         
     return {
@@ -341,7 +433,7 @@ def implement_value_creation_plan(
         
     if plan.get('capex_amount'):
         if player.cash >= plan['capex_amount']:
-            player.adjust_cash(-plan['capex_amount'])
+            player.adjust_cash(-plan['capex_amount'], ledger.CAPEX, company.name)
             total_cost += plan['capex_amount']
             result = apply_capex_investment(company, plan['capex_amount'])
             results.append(result)
@@ -356,7 +448,7 @@ def implement_value_creation_plan(
         result = pursue_acquisition_strategy(company, plan['strategy'])
         if result.get('cost'):
             if player.cash >= result['cost']:
-                player.adjust_cash(-result['cost'])
+                player.adjust_cash(-result['cost'], ledger.STRATEGY, company.name)
                 total_cost += result['cost']
         results.append(result)
         
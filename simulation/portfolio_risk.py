@@ -0,0 +1,576 @@
+"""
+Portfolio risk - tail losses of the whole portfolio over the next few quarters.
+
+Every portfolio company is simulated across many trials as one batch with a
+row per (company, trial). Market paths are shared by all companies within a
+trial, and the quarter's random event is drawn per trial and applied as
+sparse deltas (simulation.batch_sim.EventDeltas). The debt book is serviced
+on each path at that path's interest rate, as Player.service_debt would.
+
+Crises and crashes drive the tail but are rare, so naive Monte Carlo spends
+nearly all of its trials on ordinary quarters. The stress-testing mode draws
+events from a proposal that oversamples the stressed kinds and weights each
+trial by its likelihood ratio (nominal over proposal probability of the
+events it drew), so tail estimates stay unbiased. How hard to oversample each
+kind is fitted by a short cross-entropy pilot: a kind is drawn as often as
+it occurs among the pilot's worst trials. A crisis that sinks a concentrated
+portfolio gets boosted hard; a kind that barely moves a diversified one is
+left close to its nominal rate.
+
+With sobol=True every quarter's event outcome and normal shocks come from
+a scrambled Sobol sequence (one point per trial), so rare outcomes are
+drawn in close to their exact proportions; the effects of the events that
+occur stay pseudo-random.
+"""
+
+from typing import Dict, Any, List, Optional, Tuple
+import numpy as np
+import config
+from game import events
+from game.events import AliasTable
+from simulation.batch_sim import CompanyBatch, MarketBatch, EventDeltas
+from simulation import qmc
+
+# Event kinds oversampled by stress tests
+STRESSED_EVENTS = ('company_crisis', 'market_crash')
+
+
+def outcome_probabilities(difficulty_settings: Dict[str, Any],
+                          boosts: Optional[Dict[str, float]] = None) -> np.ndarray:
+    """
+    Probability of each quarterly event outcome, optionally tilted toward stress.
+    
+    Outcome 0 is "no event" and outcome k + 1 is EVENT_REGISTRY[k]. Boosted
+    kinds are drawn that many times as often (their combined share capped at
+    STRESS_TEST_MAX_SHARE) and the other outcomes are scaled down to
+    compensate.
+    
+    Args:
+        difficulty_settings: Market difficulty settings
+        boosts: Oversampling factor by event kind name (None for nominal)
+        
+    Returns:
+        Array of probabilities summing to 1
+    """
+    event_probability = config.EVENT_PROBABILITY * difficulty_settings['event_probability_multiplier']
+    nominal = np.concatenate([[1 - event_probability],
+                              event_probability * events.event_type_probabilities(difficulty_settings)])
+    if not boosts:
+        return nominal
+        
+    factor = np.ones(len(nominal))
+    for i, definition in enumerate(events.EVENT_REGISTRY):
+        factor[i + 1] = boosts.get(definition.name, 1.0)
+    boosted = factor != 1.0
+    share = nominal[boosted].sum()
+    tilted = nominal[boosted] * factor[boosted]
+    tilted *= min(1.0, config.STRESS_TEST_MAX_SHARE / tilted.sum())
+    
+    proposal = nominal * (1 - tilted.sum()) / (1 - share)
+    proposal[boosted] = tilted
+    return proposal
+
+
+class PortfolioPaths:
+    """
+    A portfolio simulated across trials, one batch row per (company, trial).
+    
+    Rows are company-major (row = company * trials + trial), so per-company
+    results reshape to (companies, trials). The market has a row per
+    (sector, trial); growth and multiple trend draws are shared by a
+    trial's sectors, so they move together as in the scalar Market.
+    """
+    
+    def __init__(self, companies: List['Company'], market: 'Market', trials: int):
+        self.companies = list(companies)
+        self.trials = trials
+        self.difficulty_settings = market.difficulty_settings
+        self.interest_rate = np.full(trials, market.interest_rate)
+        n = len(self.companies)
+        
+        sectors = sorted({c.sector for c in self.companies})
+        sector_of = np.array([sectors.index(c.sector) for c in self.companies], dtype=int)
+        self.sector_count = len(sectors)
+        
+        # Company rows, each company's state repeated across its trials
+        base = CompanyBatch.from_companies(self.companies)
+        window = np.full((n, CompanyBatch.WINDOW), np.nan)
+        for i, company in enumerate(self.companies):
+            # Short histories are NaN-padded and get no growth adjustment yet
+            history = company.revenue_history[-CompanyBatch.WINDOW:]
+            window[i, CompanyBatch.WINDOW - len(history):] = history
+        self.batch = CompanyBatch(
+            revenue=np.repeat(base.revenue, trials),
+            ebitda_margin=np.repeat(base.ebitda_margin, trials),
+            growth_rate=np.repeat(base.growth_rate, trials),
+            volatility=np.repeat(base.volatility, trials),
+            operational_health=np.repeat(base.operational_health, trials),
+            competence=np.repeat(base.competence, trials),
+            risk_profile=np.repeat(base.risk_profile, trials),
+            valuation_multiple=None,
+            revenue_window=np.repeat(window, trials, axis=0)
+        )
+        
+        # Market rows per (sector, trial)
+        self.market = MarketBatch(
+            growth_rate=np.full(self.sector_count * trials, market.growth_rate),
+            multiple_trend=np.full(self.sector_count * trials, market.multiple_trend),
+            sector_multiple=np.repeat([market.get_sector_multiple(s) for s in sectors], trials).astype(float),
+            difficulty_settings=market.difficulty_settings
+        )
+        self.market_rows = np.arange(self.sector_count * trials).reshape(self.sector_count, trials)
+        
+        # Market row each company row reads, and company-specific multiples
+        trial = np.tile(np.arange(trials), n)
+        self._market_row = np.repeat(sector_of, trials) * trials + trial
+        self._own_multiple = np.repeat([
+            np.nan if c.valuation_multiple is None else c.valuation_multiple for c in self.companies
+        ], trials)
+        
+    def _company_market(self) -> MarketBatch:
+        """Market factors as seen by each company row."""
+        rows = self._market_row
+        return MarketBatch(
+            growth_rate=self.market.growth_rate[rows],
+            multiple_trend=self.market.multiple_trend[rows],
+            sector_multiple=np.where(np.isnan(self._own_multiple),
+                                     self.market.sector_multiple[rows], self._own_multiple),
+            difficulty_settings=self.difficulty_settings
+        )
+        
+    @property
+    def shock_dimensions(self) -> int:
+        """Normal draws per trial per quarter: 3 market factors, one per sector, 3 per company."""
+        return 3 + self.sector_count + 3 * len(self.companies)
+        
+    def step(self, rng: np.random.Generator, outcomes: Optional[AliasTable] = None,
+             shocks: Optional[np.ndarray] = None, event_uniform: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Simulate one quarter: market, companies, then the quarter's event.
+        
+        Args:
+            rng: numpy random generator
+            outcomes: Alias table over outcome_probabilities (nominal if None)
+            shocks: Normal draws of shape (shock_dimensions, trials): interest
+                    rate, market growth, multiple trend, each sector's
+                    multiple, then each company's manager, revenue and
+                    margin noise (drawn from rng if None)
+            event_uniform: One uniform per trial choosing its event outcome
+                           (two draws from rng if None)
+            
+        Returns:
+            Event outcome drawn per trial (0 for none, k + 1 for EVENT_REGISTRY[k])
+        """
+        trials = self.trials
+        if shocks is None:
+            rate = rng.standard_normal(trials)
+        else:
+            rate = shocks[0]
+            
+        vol_mult = self.difficulty_settings['market_volatility_multiplier']
+        self.interest_rate = np.clip(
+            self.interest_rate + rate * (config.INTEREST_RATE_VOLATILITY * vol_mult),
+            0.01, 0.15
+        )
+        self.advance(rng, None if shocks is None else shocks[1:])
+        
+        if outcomes is None:
+            outcomes = AliasTable(outcome_probabilities(self.difficulty_settings))
+        if event_uniform is None:
+            drawn = outcomes.sample_many(trials, rng)
+        else:
+            drawn = outcomes.sample_uniform(event_uniform)
+        
+        # Company events hit a uniformly chosen company of the trial
+        if self.companies:
+            targets = rng.integers(0, len(self.companies), trials) * trials + np.arange(trials)
+            for deltas in events.sample_event_deltas(drawn - 1, targets, rng, self.market_rows):
+                deltas.apply(self.batch, self.market)
+                if 'interest_rate_change' in deltas.effects:
+                    self._shift_interest_rate(deltas)
+        return drawn
+        
+    def _shift_interest_rate(self, deltas: EventDeltas) -> None:
+        """Apply a market event's rate change to the per-trial interest rate."""
+        # Market deltas list each trial's rows sector by sector; the first
+        # sector's rows are the trials themselves
+        hit = len(deltas.rows) // self.sector_count
+        trials = deltas.rows[:hit]
+        change = np.broadcast_to(deltas.effects['interest_rate_change'], deltas.rows.shape)[:hit]
+        self.interest_rate[trials] = np.clip(self.interest_rate[trials] + change, 0.01, 0.15)
+        
+    def advance(self, rng: np.random.Generator, shocks: Optional[np.ndarray] = None) -> MarketBatch:
+        """
+        Move the market factors and companies one quarter (no rates or events).
+        
+        Args:
+            rng: numpy random generator
+            shocks: Normal draws of shape (shock_dimensions - 1, trials):
+                    market growth, multiple trend, each sector's multiple,
+                    then each company's manager, revenue and margin noise
+                    (drawn from rng if None)
+            
+        Returns:
+            The new market factors as seen by each company row
+        """
+        trials, sectors = self.trials, self.sector_count
+        if shocks is None:
+            factors = rng.standard_normal((2, trials))
+            sector_noise = rng.standard_normal(sectors * trials)
+            company_noise = rng.standard_normal((3, len(self.batch.revenue)))
+        else:
+            factors = shocks[:2]
+            sector_noise = shocks[2:2 + sectors].reshape(-1)
+            # Per-company rows (company, kind) to batch rows (kind, company * trials + trial)
+            company_noise = shocks[2 + sectors:].reshape(len(self.companies), 3, trials)
+            company_noise = company_noise.transpose(1, 0, 2).reshape(3, -1)
+            
+        self.market.update_quarter(np.stack([
+            np.tile(factors[0], sectors), np.tile(factors[1], sectors), sector_noise
+        ]))
+        company_market = self._company_market()
+        self.batch.simulate_quarter(company_market, company_noise)
+        return company_market
+        
+    def valuations(self) -> np.ndarray:
+        """Company valuations, shape (companies, trials)."""
+        values = self.batch.valuation(self._company_market())
+        return values.reshape(len(self.companies), self.trials)
+
+
+class DebtPaths:
+    """
+    The fund's cash and debt book serviced along every trial.
+    
+    Mirrors Player.service_debt: interest is paid from cash, then scheduled
+    principal pro rata from what is left; interest cash cannot cover is
+    capitalized onto an interest-only balance.
+    """
+    
+    def __init__(self, player: 'Player', trials: int):
+        book = player.debt_book
+        self.balance = np.repeat(book.balance[:, None], trials, axis=1)
+        self.schedule = book.schedule
+        self.age = book.age.copy()
+        self.capitalized = np.zeros(trials)
+        self.cash = np.full(trials, float(player.cash))
+        
+    def service(self, debt_rate: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Service one quarter of debt.
+        
+        Args:
+            debt_rate: Annual debt rate per trial
+            
+        Returns:
+            (interest due, unpaid interest) per trial
+        """
+        interest = (self.balance.sum(axis=0) + self.capitalized) * (debt_rate / 4)
+        paid = np.minimum(interest, np.maximum(0.0, self.cash))
+        self.cash -= paid
+        
+        scheduled = self.schedule[np.arange(len(self.age)), np.minimum(self.age, self.schedule.shape[1] - 1)]
+        principal = np.minimum(scheduled[:, None], self.balance)
+        due = principal.sum(axis=0)
+        principal_paid = np.minimum(due, np.maximum(0.0, self.cash))
+        ratio = np.divide(principal_paid, due, out=np.zeros_like(due), where=due > 0)
+        self.balance = np.maximum(0.0, self.balance - principal * ratio)
+        self.cash -= principal_paid
+        self.age += 1
+        
+        unpaid = interest - paid
+        self.capitalized += unpaid
+        return interest, unpaid
+
+
+def _sobol_draws(paths: PortfolioPaths, quarters: int,
+                 rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Quasi-random draws for every quarter, one Sobol point per trial.
+    
+    Each quarter takes the event outcome's uniform first, then the market
+    factors, sector and company noise; dimensions beyond
+    qmc.MAX_SOBOL_DIMENSIONS are pseudo-random.
+    
+    Returns:
+        (event uniforms of shape (quarters, trials), shocks of shape
+        (quarters, shock_dimensions, trials))
+    """
+    u = qmc.uniform_matrix(paths.trials, quarters * (1 + paths.shock_dimensions), rng)
+    u = u.reshape(paths.trials, quarters, 1 + paths.shock_dimensions).transpose(1, 2, 0)
+    return u[:, 0], qmc.norm_ppf(u[:, 1:])
+
+
+def simulate_portfolio(player: 'Player', market: 'Market', quarters: int, trials: int,
+                       rng: np.random.Generator, boosts: Optional[Dict[str, float]] = None,
+                       sobol: bool = False) -> Dict[str, Any]:
+    """
+    Simulate the portfolio forward and measure the change in net worth.
+    
+    Net worth changes by the change in portfolio value less the interest
+    due on each path (paid or capitalized; principal repayments leave it
+    unchanged).
+    
+    Args:
+        player: Player whose portfolio is simulated (not modified)
+        market: Current market (not modified)
+        quarters: Quarters to simulate
+        trials: Number of trials
+        rng: numpy random generator
+        boosts: Stress-test oversampling by event kind (None for plain Monte Carlo)
+        sobol: Draw outcomes and shocks from a scrambled Sobol sequence
+        
+    Returns:
+        Dictionary with 'values' (companies x trials end valuations),
+        'net_worth_change', 'weights' (likelihood ratios, all 1 without
+        stress) and 'interest' (total interest due) per trial,
+        'event_counts' (outcomes x trials, how often each outcome was
+        drawn), and per quarter x trial paths 'net_worth_path',
+        'weight_path' and 'missed_interest' (whether interest has gone
+        unpaid by then)
+    """
+    paths = PortfolioPaths(player.portfolio, market, trials)
+    debt = DebtPaths(player, trials)
+    start_value = sum(c.current_valuation for c in player.portfolio)
+    nominal = outcome_probabilities(market.difficulty_settings)
+    proposal = outcome_probabilities(market.difficulty_settings, boosts)
+    table = AliasTable(proposal)
+    log_ratio = np.log(nominal) - np.log(proposal)
+    
+    log_weight = np.zeros(trials)
+    interest = np.zeros(trials)
+    missed = np.zeros(trials, dtype=bool)
+    event_counts = np.zeros((len(nominal), trials), dtype=int)
+    net_worth_path, weight_path, missed_path = [], [], []
+    event_uniforms = shocks = [None] * quarters
+    if sobol and quarters:
+        event_uniforms, shocks = _sobol_draws(paths, quarters, rng)
+        
+    for quarter in range(quarters):
+        drawn = paths.step(rng, table, shocks[quarter], event_uniforms[quarter])
+        log_weight += log_ratio[drawn]
+        event_counts[drawn, np.arange(trials)] += 1
+        
+        due, unpaid = debt.service(paths.interest_rate + config.DEBT_INTEREST_RATE_SPREAD)
+        interest += due
+        missed |= unpaid > 0
+        
+        values = paths.valuations()
+        net_worth_path.append(values.sum(axis=0) - start_value - interest)
+        weight_path.append(np.exp(log_weight))
+        missed_path.append(missed.copy())
+        
+    return {
+        'values': values if quarters else paths.valuations(),
+        'net_worth_change': net_worth_path[-1] if quarters else np.zeros(trials),
+        'weights': np.exp(log_weight),
+        'interest': interest,
+        'event_counts': event_counts,
+        'net_worth_path': np.array(net_worth_path),
+        'weight_path': np.array(weight_path),
+        'missed_interest': np.array(missed_path)
+    }
+
+
+def tail_risk(losses: np.ndarray, weights: Optional[np.ndarray] = None,
+              confidence: float = None) -> Dict[str, float]:
+    """
+    Value-at-Risk and expected shortfall of a (weighted) loss sample.
+    
+    Each trial counts for weight / trials of probability, so importance
+    weights give unbiased tail probabilities.
+    
+    Args:
+        losses: Loss per trial (positive = money lost)
+        weights: Likelihood ratios per trial (None for equal weights)
+        confidence: Confidence level (defaults to config.RISK_CONFIDENCE)
+        
+    Returns:
+        Dictionary with 'var', 'expected_shortfall' and 'effective_trials'
+        (the equal-weight sample size with the same precision)
+    """
+    confidence = config.RISK_CONFIDENCE if confidence is None else confidence
+    weights = np.ones(len(losses)) if weights is None else np.asarray(weights, dtype=float)
+    tail = 1 - confidence
+    
+    order = np.argsort(losses)[::-1]
+    sorted_losses = losses[order]
+    mass = weights[order] / len(losses)
+    cumulative = np.cumsum(mass)
+    
+    # VaR: the loss where the tail's probability first reaches 1 - confidence
+    j = min(int(np.searchsorted(cumulative, tail - 1e-12)), len(losses) - 1)
+    var = float(sorted_losses[j])
+    before = cumulative[j - 1] if j > 0 else 0.0
+    shortfall = (np.dot(mass[:j], sorted_losses[:j]) + (tail - before) * var) / tail
+    
+    return {
+        'var': var,
+        'expected_shortfall': float(shortfall),
+        'effective_trials': float(weights.sum() ** 2 / np.square(weights).sum())
+    }
+
+
+def fit_stress_boosts(result: Dict[str, Any], difficulty_settings: Dict[str, Any], quarters: int,
+                      tail: float, stressed: Tuple[str, ...] = STRESSED_EVENTS) -> Dict[str, float]:
+    """
+    Cross-entropy fit of the oversampling factors from a pilot run.
+    
+    Each stressed kind is boosted to the (weighted) rate it occurs at among
+    the pilot's worst `tail` share of trials; kinds no more common there
+    than usual are not boosted.
+    
+    Args:
+        result: simulate_portfolio output of the pilot
+        difficulty_settings: Market difficulty settings
+        quarters: Quarters the pilot simulated
+        tail: Share of worst trials to fit to
+        stressed: Names of the kinds that may be boosted
+        
+    Returns:
+        Oversampling factor by event kind name
+    """
+    losses = -result['net_worth_change']
+    weights = result['weights']
+    in_tail = losses >= tail_risk(losses, weights, 1 - tail)['var']
+    tail_weight = weights[in_tail].sum()
+    nominal = outcome_probabilities(difficulty_settings)
+    
+    boosts = {}
+    for i, definition in enumerate(events.EVENT_REGISTRY):
+        if definition.name in stressed:
+            rate = np.dot(weights[in_tail], result['event_counts'][i + 1, in_tail]) / (tail_weight * quarters)
+            boosts[definition.name] = float(max(1.0, rate / nominal[i + 1]))
+    return boosts
+
+
+def _fit_with_pilot(player: 'Player', market: 'Market', quarters: int, trials: int,
+                    confidence: float, rng: np.random.Generator,
+                    sobol: bool = False) -> Tuple[Dict[str, float], int]:
+    """Spend STRESS_TEST_PILOT_SHARE of the trials fitting boosts; returns them and the trials left."""
+    pilot_trials = int(trials * config.STRESS_TEST_PILOT_SHARE)
+    pilot = simulate_portfolio(player, market, quarters, pilot_trials, rng, sobol=sobol)
+    boosts = fit_stress_boosts(pilot, market.difficulty_settings, quarters,
+                               max(1 - confidence, config.STRESS_TEST_PILOT_TAIL))
+    return boosts, trials - pilot_trials
+
+
+def stress_test(player: 'Player', market: 'Market', quarters: int = None, trials: int = None,
+                confidence: float = None, boosts: Optional[Dict[str, float]] = None,
+                seed: int = None, sobol: bool = None) -> Dict[str, Any]:
+    """
+    Tail risk of the portfolio's net worth with crises and crashes oversampled.
+    
+    Unless boosts are given, a pilot of STRESS_TEST_PILOT_SHARE of the
+    trials (plain Monte Carlo) fits them first; the estimates come from the
+    remaining trials.
+    
+    Args:
+        player: Player whose portfolio is tested
+        market: Current market
+        quarters: Horizon (defaults to config.RISK_QUARTERS)
+        trials: Total trials, pilot included (defaults to config.RISK_TRIALS)
+        confidence: Confidence level (defaults to config.RISK_CONFIDENCE)
+        boosts: Oversampling factor by event kind (fitted if None)
+        seed: Optional seed for reproducible results
+        sobol: Quasi-random shocks (defaults to config.SOBOL_SAMPLING)
+        
+    Returns:
+        tail_risk figures for the net worth loss, plus 'quarters',
+        'trials', 'confidence', 'boosts' and 'stressed_share' (share of
+        trials that drew a stressed event)
+    """
+    quarters = quarters or config.RISK_QUARTERS
+    trials = trials or config.RISK_TRIALS
+    confidence = config.RISK_CONFIDENCE if confidence is None else confidence
+    sobol = config.SOBOL_SAMPLING if sobol is None else sobol
+    rng = np.random.default_rng(seed)
+    
+    if boosts is None:
+        boosts, trials = _fit_with_pilot(player, market, quarters, trials, confidence, rng, sobol)
+        
+    result = simulate_portfolio(player, market, quarters, trials, rng, boosts, sobol)
+    risk = tail_risk(-result['net_worth_change'], result['weights'], confidence)
+    stressed = [1 + i for i, d in enumerate(events.EVENT_REGISTRY) if d.name in STRESSED_EVENTS]
+    risk.update({
+        'quarters': quarters,
+        'trials': trials,
+        'confidence': confidence,
+        'boosts': boosts,
+        'stressed_share': float(np.mean(result['event_counts'][stressed].sum(axis=0) > 0))
+    })
+    return risk
+
+
+def risk_report(player: 'Player', market: 'Market', quarters: int = None, trials: int = None,
+                confidence: float = None, stress: bool = False, seed: int = None,
+                sobol: bool = None) -> Dict[str, Any]:
+    """
+    Value-at-Risk dashboard figures for the portfolio and its debt.
+    
+    Contributions split the final quarter's expected shortfall by source
+    (Euler allocation): each company's average loss of value, and the
+    interest due, over the trials in the tail.
+    
+    Args:
+        player: Player whose portfolio is analyzed
+        market: Current market
+        quarters: Horizon (defaults to config.RISK_QUARTERS)
+        trials: Trials (defaults to config.RISK_TRIALS)
+        confidence: Confidence level (defaults to config.RISK_CONFIDENCE)
+        stress: Oversample crises and crashes (fitted by a pilot run)
+        seed: Optional seed for reproducible results
+        sobol: Quasi-random shocks (defaults to config.SOBOL_SAMPLING)
+        
+    Returns:
+        Dictionary with 'horizons' (per quarter ahead: 'quarter', 'var',
+        'expected_shortfall' and 'miss_probability', the chance interest
+        has gone unpaid by then), 'contributions' ((source, amount) pairs,
+        largest first), 'trials', 'confidence' and 'boosts' (None without
+        stress)
+    """
+    quarters = quarters or config.RISK_QUARTERS
+    trials = trials or config.RISK_TRIALS
+    confidence = config.RISK_CONFIDENCE if confidence is None else confidence
+    sobol = config.SOBOL_SAMPLING if sobol is None else sobol
+    rng = np.random.default_rng(seed)
+    
+    boosts = None
+    if stress:
+        boosts, trials = _fit_with_pilot(player, market, quarters, trials, confidence, rng, sobol)
+    result = simulate_portfolio(player, market, quarters, trials, rng, boosts, sobol)
+    
+    horizons = []
+    for q in range(quarters):
+        weights = result['weight_path'][q]
+        risk = tail_risk(-result['net_worth_path'][q], weights, confidence)
+        horizons.append({
+            'quarter': q + 1,
+            'var': risk['var'],
+            'expected_shortfall': risk['expected_shortfall'],
+            'miss_probability': min(1.0, float(np.dot(weights, result['missed_interest'][q]) / trials))
+        })
+        
+    # Average loss by source over the final quarter's tail trials
+    losses = -result['net_worth_change']
+    weights = result['weights']
+    in_tail = losses >= horizons[-1]['var'] if horizons else np.zeros(trials, dtype=bool)
+    tail_weight = weights[in_tail].sum()
+    contributions = []
+    if tail_weight > 0:
+        start = np.array([c.current_valuation for c in player.portfolio])
+        value_loss = start[:, None] - result['values'][:, in_tail]
+        by_company = value_loss @ weights[in_tail] / tail_weight
+        contributions = [(c.name, float(v)) for c, v in zip(player.portfolio, by_company)]
+        interest = float(np.dot(weights[in_tail], result['interest'][in_tail]) / tail_weight)
+        if interest > 0:
+            contributions.append(('Debt interest', interest))
+        contributions.sort(key=lambda item: item[1], reverse=True)
+        
+    return {
+        'horizons': horizons,
+        'contributions': contributions,
+        'trials': trials,
+        'confidence': confidence,
+        'boosts': boosts
+    }
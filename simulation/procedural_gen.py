@@ -543,6 +543,18 @@ def generate_market_sector_shock(sectors: List[str]) -> Dict[str, float]:
 
 
 
+# Valuation tiers (based on market cap / enterprise value)
+VALUATION_TIERS = {
+    'local': (500_000, 5_000_000),                      # $500K - $5M (local businesses)
+    'regional': (5_000_000, 50_000_000),                # $5M - $50M (regional businesses)
+    'micro-cap': (50_000_000, 200_000_000),             # $50M - $200M
+    'small-cap': (200_000_000, 2_000_000_000),          # $200M - $2B
+    'mid-cap': (2_000_000_000, 10_000_000_000),         # $2B - $10B
+    'large-cap': (10_000_000_000, 200_000_000_000),     # $10B - $200B (S&P 500 mix)
+    'mega-cap': (200_000_000_000, 2_000_000_000_000),   # $200B - $2T (mostly S&P 500)
+}
+
+
 def generate_tiered_deal_portfolio(market: 'Market') -> Dict[str, Dict[str, List[Company]]]:
     """
     Generate a comprehensive portfolio of companies organized by sector and valuation tier.
@@ -557,84 +569,90 @@ def generate_tiered_deal_portfolio(market: 'Market') -> Dict[str, Dict[str, List
     portfolio = {}
     sectors = get_sectors()
     
-    # Define valuation tiers (based on market cap / enterprise value)
-    tiers = {
-        'local': (500_000, 5_000_000),                      # $500K - $5M (local businesses)
-        'regional': (5_000_000, 50_000_000),                # $5M - $50M (regional businesses)
-        'micro-cap': (50_000_000, 200_000_000),             # $50M - $200M
-        'small-cap': (200_000_000, 2_000_000_000),          # $200M - $2B
-        'mid-cap': (2_000_000_000, 10_000_000_000),         # $2B - $10B
-        'large-cap': (10_000_000_000, 200_000_000_000),     # $10B - $200B (S&P 500 mix)
-        'mega-cap': (200_000_000_000, 2_000_000_000_000),   # $200B - $2T (mostly S&P 500)
-    }
-    
     # Generate 2-3 companies per sector per tier
     for sector in sectors:
         portfolio[sector] = {}
         
-        for tier_name, (min_val, max_val) in tiers.items():
+        for tier_name in VALUATION_TIERS:
             portfolio[sector][tier_name] = []
             
             # Generate 2-3 companies in this tier
             num_companies_in_tier = random.randint(2, 3)
             
             for _ in range(num_companies_in_tier):
-                # Target a valuation within this tier
-                target_valuation = random.uniform(min_val, max_val)
-                
-                # For large-cap and mega-cap, use 75% real S&P 500 companies, 25% procedural
-                use_sp500 = tier_name in ['large-cap', 'mega-cap'] and random.random() < 0.75
-                
-                if use_sp500:
-                    # Get S&P 500 companies
-                    sp500_companies = get_sp500_companies()
-                    
-                    if sp500_companies:
-                        # Filter by matching game sector
-                        matching_companies = [
-                            c for c in sp500_companies 
-                            if map_gics_sector_to_game_sector(c.get('GICS Sector', '')) == sector
-                        ]
-                        
-                        if matching_companies:
-                            # Select a random S&P 500 company from this sector
-                            sp500_data = random.choice(matching_companies)
-                            company = generate_company_from_sp500(sp500_data, target_valuation)
-                        else:
-                            # Fallback to procedural if no matching sector
-                            use_sp500 = False
-                
-                if not use_sp500:
-                    # Procedural generation
-                    # Work backwards: valuation = EBITDA * multiple
-                    # Get sector multiple from market if available
-                    if market and hasattr(market, 'sector_multiples'):
-                        sector_multiple = market.sector_multiples.get(sector, 10.0)
-                    else:
-                        sector_multiple = 10.0
-                    
-                    # Add some variance to the multiple
-                    company_multiple = sector_multiple * random.uniform(0.8, 1.2)
-                    
-                    # target_valuation = revenue * margin * multiple
-                    # So revenue = target_valuation / (margin * multiple)
-                    typical_margin = random.uniform(0.15, 0.25)
-                    target_revenue = target_valuation / (typical_margin * company_multiple)
-                    
-                    # Clamp to configured range
-                    target_revenue = max(config.MIN_COMPANY_REVENUE, 
-                                       min(config.MAX_COMPANY_REVENUE, target_revenue))
-                    
-                    # Generate company with this target revenue
-                    company = generate_company(sector, revenue_range=(target_revenue * 0.9, target_revenue * 1.1))
-                
-                # Calculate actual valuation
-                if market:
-                    company.calculate_valuation(market)
-                else:
-                    default_multiple = (config.MIN_EBITDA_MULTIPLE + config.MAX_EBITDA_MULTIPLE) / 2
-                    company.current_valuation = company.ebitda * default_multiple
-                
-                portfolio[sector][tier_name].append(company)
+                portfolio[sector][tier_name].append(generate_tier_company(sector, tier_name, market))
     
     return portfolio
+
+
+def generate_tier_company(sector: str, tier_name: str, market: 'Market') -> Company:
+    """
+    Generate one valued company for a sector and valuation tier.
+    
+    Args:
+        sector: Game sector
+        tier_name: Key of VALUATION_TIERS
+        market: Current market state
+        
+    Returns:
+        Company with current_valuation set
+    """
+    min_val, max_val = VALUATION_TIERS[tier_name]
+    
+    # Target a valuation within this tier
+    target_valuation = random.uniform(min_val, max_val)
+    
+    # For large-cap and mega-cap, use 75% real S&P 500 companies, 25% procedural
+    use_sp500 = tier_name in ['large-cap', 'mega-cap'] and random.random() < 0.75
+    
+    if use_sp500:
+        # Get S&P 500 companies
+        sp500_companies = get_sp500_companies()
+        
+        if sp500_companies:
+            # Filter by matching game sector
+            matching_companies = [
+                c for c in sp500_companies 
+                if map_gics_sector_to_game_sector(c.get('GICS Sector', '')) == sector
+            ]
+            
+            if matching_companies:
+                # Select a random S&P 500 company from this sector
+                sp500_data = random.choice(matching_companies)
+                company = generate_company_from_sp500(sp500_data, target_valuation)
+            else:
+                # Fallback to procedural if no matching sector
+                use_sp500 = False
+    
+    if not use_sp500:
+        # Procedural generation
+        # Work backwards: valuation = EBITDA * multiple
+        # Get sector multiple from market if available
+        if market and hasattr(market, 'sector_multiples'):
+            sector_multiple = market.sector_multiples.get(sector, 10.0)
+        else:
+            sector_multiple = 10.0
+        
+        # Add some variance to the multiple
+        company_multiple = sector_multiple * random.uniform(0.8, 1.2)
+        
+        # target_valuation = revenue * margin * multiple
+        # So revenue = target_valuation / (margin * multiple)
+        typical_margin = random.uniform(0.15, 0.25)
+        target_revenue = target_valuation / (typical_margin * company_multiple)
+        
+        # Clamp to configured range
+        target_revenue = max(config.MIN_COMPANY_REVENUE, 
+                           min(config.MAX_COMPANY_REVENUE, target_revenue))
+        
+        # Generate company with this target revenue
+        company = generate_company(sector, revenue_range=(target_revenue * 0.9, target_revenue * 1.1))
+    
+    # Calculate actual valuation
+    if market:
+        company.calculate_valuation(market)
+    else:
+        default_multiple = (config.MIN_EBITDA_MULTIPLE + config.MAX_EBITDA_MULTIPLE) / 2
+        company.current_valuation = company.ebitda * default_multiple
+    
+    return company
@@ -1,9 +1,19 @@
 """
 Stochastic processes for modeling randomness and volatility.
+
+Each process comes in two forms: a scalar version that builds one path from
+the global random stream, and a *_paths version that returns an
+(n_paths, steps + 1) numpy array generated in one call from a numpy
+Generator (seeded off the global stream when none is given, so seeded games
+stay reproducible). Path generators accept dtype=np.float32 to halve memory
+for large Monte Carlo runs, and a simulation.qmc.SobolSampler in place of
+the Generator (one dimension per draw in a path) for quasi-random paths.
 """
 
+import math
 import random
-from typing import List
+from typing import List, Optional, Union
+import numpy as np
 import config
 
 
@@ -159,8 +169,6 @@ def simulate_market_cycle(
     Returns:
         List of quarterly growth rates
     """
-    import math
-    
     growth_rates = []
     for q in range(quarters):
         # Sinusoidal cycle + random noise
@@ -188,7 +196,7 @@ def correlated_random_walk(
     
     Args:
         initial_values: Starting values for each series
-        correlation: Correlation coefficient (-1 to 1)
+        correlation: Correlation coefficient between every pair of series
         drift: Mean drift per step
         volatility: Volatility
         steps: Number of steps
@@ -196,24 +204,172 @@ def correlated_random_walk(
     Returns:
         List of time series (one per initial value)
     """
-    n_series = len(initial_values)
-    series = [[iv] for iv in initial_values]
+    paths = correlated_random_walk_paths(initial_values, correlation, drift, volatility, steps, n_paths=1)
+    return paths[0].tolist()
+
+
+def _generator(rng: Optional[np.random.Generator]) -> np.random.Generator:
+    """Use the given generator (or Sobol sampler), or one seeded off the global random stream."""
+    return rng if rng is not None else np.random.default_rng(random.getrandbits(64))
+
+
+def random_walk_paths(
+    initial_value: float,
+    drift: float,
+    volatility: float,
+    steps: int,
+    n_paths: int,
+    rng: Optional[np.random.Generator] = None,
+    dtype: type = np.float64
+) -> np.ndarray:
+    """
+    Generate many random walks at once (vectorized random_walk).
     
-    for _ in range(steps):
-        # Common shock (drives correlation)
-        common_shock = random.gauss(0, 1)
-        
-        for i in range(n_series):
-            # Idiosyncratic shock
-            idio_shock = random.gauss(0, 1)
-            
-            # Combine shocks with correlation
-            combined_shock = (correlation * common_shock + 
-                            (1 - correlation) * idio_shock)
-            
-            change = drift + volatility * combined_shock
-            new_value = series[i][-1] + change
-            series[i].append(new_value)
-            
-    return series
+    Returns:
+        Array of shape (n_paths, steps + 1), starting at initial_value
+    """
+    z = _generator(rng).standard_normal((n_paths, steps), dtype=dtype)
+    paths = np.empty((n_paths, steps + 1), dtype=dtype)
+    paths[:, 0] = initial_value
+    np.cumsum(drift + volatility * z, axis=1, out=paths[:, 1:])
+    paths[:, 1:] += initial_value
+    return paths
+
 
+def geometric_brownian_motion_paths(
+    initial_value: float,
+    drift: float,
+    volatility: float,
+    steps: int,
+    n_paths: int,
+    dt: float = 1.0,
+    rng: Optional[np.random.Generator] = None,
+    dtype: type = np.float64
+) -> np.ndarray:
+    """
+    Generate many GBM paths at once (vectorized geometric_brownian_motion).
+    
+    Uses the same simplified multiplicative step; a path that hits zero
+    stays there.
+    
+    Returns:
+        Array of shape (n_paths, steps + 1), starting at initial_value
+    """
+    z = _generator(rng).standard_normal((n_paths, steps), dtype=dtype)
+    factors = 1 + (drift - 0.5 * volatility**2) * dt + volatility * (dt**0.5) * z
+    paths = np.empty((n_paths, steps + 1), dtype=dtype)
+    paths[:, 0] = initial_value
+    np.cumprod(np.maximum(factors, 0), axis=1, out=paths[:, 1:])
+    paths[:, 1:] *= initial_value
+    np.maximum(paths, 0, out=paths)
+    return paths
+
+
+def mean_reverting_paths(
+    initial_value: float,
+    long_term_mean: float,
+    reversion_speed: float,
+    volatility: float,
+    steps: int,
+    n_paths: int,
+    dt: float = 1.0,
+    rng: Optional[np.random.Generator] = None,
+    dtype: type = np.float64
+) -> np.ndarray:
+    """
+    Generate many Ornstein-Uhlenbeck paths at once (vectorized mean_reverting_process).
+    
+    The recursion runs over steps, with every path updated together.
+    
+    Returns:
+        Array of shape (n_paths, steps + 1), starting at initial_value
+    """
+    shocks = volatility * (dt**0.5) * _generator(rng).standard_normal((n_paths, steps), dtype=dtype)
+    paths = np.empty((n_paths, steps + 1), dtype=dtype)
+    paths[:, 0] = initial_value
+    pull = reversion_speed * dt
+    for t in range(steps):
+        paths[:, t + 1] = paths[:, t] + pull * (long_term_mean - paths[:, t]) + shocks[:, t]
+    return paths
+
+
+def market_cycle_paths(
+    quarters: int,
+    n_paths: int,
+    base_growth: float = 0.02,
+    cycle_length: int = 16,
+    rng: Optional[np.random.Generator] = None,
+    dtype: type = np.float64
+) -> np.ndarray:
+    """
+    Generate many market cycles at once (vectorized simulate_market_cycle).
+    
+    Returns:
+        Array of quarterly growth rates, shape (n_paths, quarters)
+    """
+    cycle = 0.03 * np.sin(2 * math.pi * np.arange(quarters) / cycle_length)
+    noise = _generator(rng).standard_normal((n_paths, quarters), dtype=dtype)
+    return (base_growth + cycle + 0.02 * noise).astype(dtype, copy=False)
+
+
+def correlated_random_walk_paths(
+    initial_values: List[float],
+    correlation: Union[float, np.ndarray],
+    drift: float,
+    volatility: float,
+    steps: int,
+    n_paths: int,
+    rng: Optional[np.random.Generator] = None,
+    dtype: type = np.float64
+) -> np.ndarray:
+    """
+    Generate many sets of correlated random walks at once.
+    
+    Shocks are independent normals multiplied by a factor of the correlation
+    matrix (Cholesky, or the eigendecomposition when the matrix is only
+    positive semi-definite, e.g. perfectly correlated series), so every
+    pair of series has exactly the requested correlation.
+    
+    Args:
+        initial_values: Starting values for each series
+        correlation: Correlation between every pair of series, or a full
+                     correlation matrix
+        drift: Mean drift per step
+        volatility: Volatility
+        steps: Number of steps
+        n_paths: Number of independent sets of series
+        rng: Optional numpy generator
+        dtype: Output dtype (np.float32 to save memory)
+        
+    Returns:
+        Array of shape (n_paths, n_series, steps + 1)
+        
+    Raises:
+        ValueError: If the correlation matrix is not positive semi-definite
+    """
+    initial = np.asarray(initial_values, dtype=dtype)
+    n_series = len(initial)
+    if np.ndim(correlation) == 0:
+        matrix = np.full((n_series, n_series), float(correlation))
+        np.fill_diagonal(matrix, 1.0)
+    else:
+        matrix = np.asarray(correlation, dtype=float)
+        
+    try:
+        factor = np.linalg.cholesky(matrix)
+    except np.linalg.LinAlgError:
+        # Singular but valid (eigenvalues at zero up to rounding): factor via eigh
+        eigenvalues, eigenvectors = np.linalg.eigh(matrix)
+        if eigenvalues.min() < -1e-10 * n_series:
+            raise ValueError("Correlation matrix must be positive semi-definite")
+        factor = eigenvectors * np.sqrt(np.clip(eigenvalues, 0.0, None))
+    factor = factor.astype(dtype)
+    
+    z = _generator(rng).standard_normal((n_paths, steps, n_series), dtype=dtype)
+    changes = drift + volatility * (z @ factor.T)
+    
+    paths = np.empty((n_paths, n_series, steps + 1), dtype=dtype)
+    paths[:, :, 0] = initial
+    np.cumsum(changes.transpose(0, 2, 1), axis=2, out=paths[:, :, 1:])
+    paths[:, :, 1:] += initial[:, None]
+    return paths
@@ -0,0 +1,143 @@
+"""
+Tests for the event-sourced action log.
+"""
+
+import pytest
+from game.engine import GameEngine
+from game import save_system
+from game.save_system import GameSaver
+from game.action_log import ActionLog
+
+
+def _comparable_state(engine):
+    state = save_system.serialize_game_state(engine)
+    state.pop('timestamp')
+    return state
+
+
+def _play(engine, quarters=6):
+    """Play a short headless game touching every command type."""
+    engine.generate_new_deals()
+    company = engine.available_deals['Technology']['local'][0]
+    engine.perform('acquisition', sector='Technology', tier='local', index=0,
+                   price=company.current_valuation, debt=company.current_valuation * 0.5)
+                   
+    for quarter in range(quarters):
+        if quarter == 1:
+            engine.perform('cost_cutting', company=0, intensity=0.5)
+            engine.perform('mark_operated', company=0)
+        if quarter == 2:
+            engine.perform('financing', amount=500_000, debt=0)
+            engine.perform('capex', company=0, amount=500_000)
+        if quarter == 3:
+            engine.perform('growth_strategy', company=0, strategy='expand')
+        engine.perform('advance_quarter', event_choice='immediate')
+
+
+def test_replay_reproduces_live_state():
+    """Test replaying the whole log rebuilds the live game exactly."""
+    engine = GameEngine()
+    _play(engine)
+    
+    replayed = engine.action_log.replay()
+    
+    assert _comparable_state(replayed) == _comparable_state(engine)
+
+
+def test_keyframes_taken_periodically():
+    """Test keyframes are taken at the start and every interval quarters."""
+    engine = GameEngine()
+    engine.action_log = ActionLog(keyframe_interval=2)
+    _play(engine, quarters=6)
+    
+    assert [k['quarter'] for k in engine.action_log.keyframes] == [0, 2, 4, 6]
+
+
+def test_state_at_quarter_matches_history():
+    """Test time travel returns the state captured during play."""
+    engine = GameEngine()
+    engine.action_log = ActionLog(keyframe_interval=2)
+    engine.generate_new_deals()
+    
+    snapshots = {}
+    for quarter in range(5):
+        engine.perform('advance_quarter')
+        snapshots[engine.time_manager.current_quarter] = _comparable_state(engine)
+        
+    past = engine.action_log.state_at_quarter(3)
+    
+    assert past.time_manager.current_quarter == 3
+    assert _comparable_state(past) == snapshots[3]
+
+
+def test_replay_leaves_random_stream_untouched():
+    """Test replaying does not disturb the live game's random stream."""
+    import random
+    
+    engine = GameEngine()
+    _play(engine, quarters=2)
+    state = random.getstate()
+    
+    engine.action_log.replay(1)
+    
+    assert random.getstate() == state
+
+
+def test_undo_restores_previous_state():
+    """Test undo rolls the live engine back one command."""
+    engine = GameEngine()
+    engine.generate_new_deals()
+    engine.perform('advance_quarter')
+    before = _comparable_state(engine)
+    
+    company = engine.available_deals['Healthcare']['local'][0]
+    engine.perform('acquisition', sector='Healthcare', tier='local', index=0,
+                   price=company.current_valuation)
+    engine.action_log.undo(engine)
+    
+    assert engine.player.portfolio == []
+    assert _comparable_state(engine) == before
+    assert engine.action_log.seq == 1
+
+
+def test_replace_management_charges_fee_once():
+    """Test a management replacement paid through financing is charged once."""
+    import config
+    from models import ledger
+    
+    engine = GameEngine()
+    engine.generate_new_deals()
+    company = engine.available_deals['Technology']['local'][0]
+    engine.perform('acquisition', sector='Technology', tier='local', index=0,
+                   price=company.current_valuation, debt=company.current_valuation)
+    company.manager.cooperativeness = 1.0  # No difficult-termination surcharge
+    engine.player.cash = 50_000_000
+    entries_before = len(engine.player.ledger.entries)
+    
+    engine.perform('financing', amount=config.MANAGER_REPLACEMENT_COST, debt=0,
+                   kind=ledger.MANAGEMENT, company=company.name)
+    engine.perform('replace_management', company=0,
+                   manager={'name': 'New CEO', 'competence': 0.8,
+                            'risk_profile': 0.5, 'cooperativeness': 0.7})
+    
+    new_entries = engine.player.ledger.entries[entries_before:]
+    assert engine.player.cash == pytest.approx(50_000_000 - config.MANAGER_REPLACEMENT_COST)
+    assert [e.kind for e in new_entries] == [ledger.MANAGEMENT]
+
+
+def test_action_log_saved_with_game(tmp_path, monkeypatch):
+    """Test the log is written next to a save and reloaded with it."""
+    monkeypatch.setattr(save_system, 'SAVES_DIR', tmp_path)
+    engine = GameEngine()
+    _play(engine, quarters=2)
+    GameSaver.save(engine, "slot1")
+    
+    restored = GameEngine()
+    assert GameSaver.load("slot1", restored)
+    
+    assert restored.action_log.seq == engine.action_log.seq
+    assert _comparable_state(restored.action_log.replay()) == _comparable_state(engine)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,116 @@
+"""
+Tests for the comparable-company index.
+"""
+
+import random
+import numpy as np
+import pytest
+import config
+from game.engine import GameEngine
+from simulation import comps
+from simulation.comps import ComparableIndex
+
+
+def test_query_returns_nearest_comps():
+    """Test comps are the k closest rows, closest first, excluding the company itself."""
+    engine = GameEngine()
+    engine.generate_new_deals()
+    index = ComparableIndex()
+    index.sync(engine.available_deals)
+    company = engine.available_deals['Healthcare']['regional'][0]
+    
+    result = index.query(company, k=4)
+    
+    target = comps.company_features([company])[0]
+    distances = []
+    for other, features, multiple, code in zip(index.companies, index.features,
+                                               index.multiples, index.sector_code):
+        if other is company or np.isnan(multiple):
+            continue
+        penalty = 0.0 if index.sectors[code] == company.sector else config.COMPS_SECTOR_PENALTY
+        distances.append(np.sqrt(((features - target) ** 2).sum() + penalty ** 2))
+        
+    assert [c['distance'] for c in result['comps']] == pytest.approx(sorted(distances)[:4])
+    assert min(c['distance'] for c in result['comps']) > 0  # Not the company itself (names can repeat)
+    assert result['median_multiple'] == pytest.approx(
+        np.median([c['multiple'] for c in result['comps']]))
+    assert result['implied_valuation'] == pytest.approx(result['median_multiple'] * company.ebitda)
+
+
+def test_reference_set_is_deterministic_and_isolated():
+    """Test building the S&P 500 reference neither varies nor moves the game's RNG."""
+    state = random.getstate()
+    first = comps.sp500_reference(seed=1)
+    assert random.getstate() == state
+    
+    second = comps.sp500_reference(seed=1)
+    assert [c.current_valuation for c in first] == [c.current_valuation for c in second]
+    assert all(c.valuation_multiple >= 12.0 for c in first)
+
+
+def test_sync_tracks_deal_book_incrementally():
+    """Test acquisitions and new deal books update only the deal-book rows."""
+    engine = GameEngine()
+    engine.action_log = None
+    engine.generate_new_deals()
+    engine.player.cash = 1e15
+    reference_rows = len(comps.sp500_reference())
+    
+    listing = engine.available_deals['Technology']['local'][0]
+    engine.find_comps(listing)
+    index = engine._comps_index
+    listed = sum(len(c) for tiers in engine.available_deals.values() for c in tiers.values())
+    assert len(index) == reference_rows + listed
+    
+    engine.perform('acquisition', sector='Technology', tier='local', index=0,
+                   price=listing.current_valuation)
+    engine.find_comps(engine.player.portfolio[0])
+    assert len(index) == reference_rows + listed - 1
+    assert listing not in index.companies
+    
+    engine.generate_new_deals()
+    engine.find_comps(engine.player.portfolio[0])
+    deal_rows = [c for c, source in zip(index.companies, index.sources) if source == 'Deal Book']
+    fresh = [c for tiers in engine.available_deals.values() for cs in tiers.values() for c in cs]
+    assert {id(c) for c in deal_rows} == {id(c) for c in fresh}
+    assert index.sources.count('S&P 500') == reference_rows
+
+
+def test_sync_updates_surviving_listings_in_place():
+    """Test a quarter's forked listings refresh their rows; only new listings are appended."""
+    engine = GameEngine()
+    engine.generate_new_deals()
+    index = ComparableIndex()
+    index.sync(engine.available_deals)
+    before = {c.listing_id for tiers in engine.available_deals.values() for cs in tiers.values() for c in cs}
+    
+    engine.advance_deal_flow()
+    listed = [c for tiers in engine.available_deals.values() for cs in tiers.values() for c in cs]
+    added = []
+    real_add = index._add
+    index._add = lambda companies, source, keys: (added.extend(companies), real_add(companies, source, keys))
+    index.sync(engine.available_deals)
+    
+    assert {c.listing_id for c in added} == {c.listing_id for c in listed} - before
+    assert any(c.listing_id in before for c in listed)
+    rows = [i for i, source in enumerate(index.sources) if source == 'Deal Book']
+    assert sorted(id(index.companies[i]) for i in rows) == sorted(id(c) for c in listed)
+    assert index.features[rows] == pytest.approx(comps.company_features([index.companies[i] for i in rows]))
+    assert np.array_equal(index.multiples[rows], comps.implied_multiples([index.companies[i] for i in rows]),
+                          equal_nan=True)
+
+
+def test_empty_index_has_no_comps():
+    """Test a query against an empty index is well defined."""
+    engine = GameEngine()
+    engine.generate_new_deals()
+    index = ComparableIndex(reference=[])
+    
+    result = index.query(engine.available_deals['Retail & Consumer']['local'][0])
+    
+    assert result['comps'] == []
+    assert np.isnan(result['implied_valuation'])
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -2,7 +2,13 @@
 Tests for DCF calculations.
 """
 
+import numpy as np
 import pytest
+import config
+from models.company import Company
+from models.manager import Manager
+from models.market import Market
+from simulation import dcf, dcf_sensitivity
 from simulation.dcf import (
     project_free_cash_flows,
     discount_cash_flows,
@@ -11,6 +17,12 @@ from simulation.dcf import (
 )
 
 
+def _company():
+    manager = Manager(name="Test", competence=0.7, risk_profile=0.4, cooperativeness=0.6)
+    return Company("TestCo", "Technology", 40_000_000, 0.20, growth_rate=0.02,
+                   volatility=0.05, manager=manager)
+
+
 def test_project_free_cash_flows():
     """Test FCF projection."""
     fcf_list = project_free_cash_flows(
@@ -82,6 +94,99 @@ def test_zero_cash_flows():
     assert pv == 0
 
 
+@pytest.mark.parametrize("growth, margin, rate", [
+    (0.02, 0.25, 0.10),
+    (-0.01, 0.15, 0.08),
+    (0.03, 0.30, 0.015),  # Discount rate below terminal growth
+])
+def test_enterprise_value_batch_matches_scalar(growth, margin, rate):
+    """Test the vectorized DCF equals the scalar one for constant inputs."""
+    years = config.DCF_PROJECTION_YEARS
+    expected = calculate_enterprise_value(10_000_000, growth, margin, rate)
+    
+    values = dcf.enterprise_value_batch(
+        10_000_000 / margin, np.full((3, years), (1 + growth) ** 4 - 1), margin, rate
+    )
+    
+    assert values == pytest.approx(np.full(3, expected))
+
+
+def test_dcf_paths_without_noise_give_point_value():
+    """Test zero draws reproduce today's inputs, so every path values at the point DCF."""
+    company, market = _company(), Market()
+    quarters = 4 * config.DCF_PROJECTION_YEARS
+    
+    growth, margin, rate = dcf.sample_dcf_paths(company, market, np.zeros((4, 5, quarters)))
+    values = dcf.enterprise_value_batch(company.revenue, growth, margin, rate)
+    
+    assert values == pytest.approx(np.full(5, dcf.calculate_dcf_valuation(company, market)))
+
+
+def test_dcf_distribution_brackets_point_value():
+    """Test the range is ordered, centered near the point estimate and reproducible."""
+    company, market = _company(), Market()
+    
+    result = dcf.calculate_dcf_distribution(company, market, n_paths=4000, seed=1)
+    bands = result['bands']
+    
+    assert result['point'] == dcf.calculate_dcf_valuation(company, market)
+    assert bands['p10'] < bands['p50'] < bands['p90']
+    assert bands['p10'] < result['point'] < bands['p90']
+    assert result['mean'] == pytest.approx(result['point'], rel=0.15)
+    assert dcf.calculate_dcf_distribution(company, market, n_paths=4000, seed=1) == result
+    
+    # A more volatile company has a wider range (in proportion to its level)
+    company.volatility = 0.15
+    wide = dcf.calculate_dcf_distribution(company, market, n_paths=4000, seed=1)['bands']
+    assert wide['p90'] / wide['p10'] > bands['p90'] / bands['p10']
+    
+    sobol = dcf.calculate_dcf_distribution(company, market, n_paths=1024, seed=2, sobol=True)
+    assert sobol['mean'] == pytest.approx(result['mean'], rel=0.1)
+
+
+def test_sensitivity_grid_matches_scalar_dcf():
+    """Test every grid cell equals the scalar DCF at that cell's inputs."""
+    company, market = _company(), Market()
+    rate = market.get_discount_rate()
+    
+    grid = dcf_sensitivity.sensitivity_grid(company, market)
+    assert grid['values'].shape == (5, 5)
+    assert grid['base'] == pytest.approx(dcf.calculate_dcf_valuation(company, market))
+    for i, row in enumerate(grid['row_values']):
+        for j, col in enumerate(grid['col_values']):
+            assert grid['values'][i, j] == pytest.approx(
+                calculate_enterprise_value(company.ebitda, company.growth_rate, company.ebitda_margin, row, col))
+                
+    # Growth x margin holds revenue fixed, so margin moves EBITDA
+    grid = dcf_sensitivity.sensitivity_grid(company, market, 'growth', 'margin')
+    growth, margin = grid['row_values'][0], grid['col_values'][-1]
+    assert grid['values'][0, -1] == pytest.approx(
+        calculate_enterprise_value(company.revenue * margin, growth, margin, rate))
+    assert (np.diff(grid['values'], axis=0) > 0).all() and (np.diff(grid['values'], axis=1) > 0).all()
+    
+    with pytest.raises(ValueError):
+        dcf_sensitivity.sensitivity_grid(company, market, 'margin', 'margin')
+
+
+def test_tornado_ranks_one_at_a_time_swings():
+    """Test each bar moves one input from the base case, and bars are sorted by swing."""
+    company, market = _company(), Market()
+    
+    result = dcf_sensitivity.tornado(company, market)
+    bars = {bar['input']: bar for bar in result['bars']}
+    
+    assert set(bars) == set(dcf_sensitivity.TORNADO_RANGES)
+    swings = [bar['swing'] for bar in result['bars']]
+    assert swings == sorted(swings, reverse=True)
+    assert result['base'] == pytest.approx(dcf.calculate_dcf_valuation(company, market))
+    
+    # Higher costs lower the value; the horizon matches the scalar DCF's years argument
+    for name in ('capex_rate', 'nwc_rate', 'tax_rate'):
+        assert bars[name]['low'] > result['base'] > bars[name]['high']
+    assert bars['years']['low'] == pytest.approx(calculate_enterprise_value(
+        company.ebitda, company.growth_rate, company.ebitda_margin, market.get_discount_rate(), years=5))
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
 
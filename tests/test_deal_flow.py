@@ -0,0 +1,125 @@
+"""
+Tests for the persistent deal book.
+"""
+
+import random
+import pytest
+import config
+from game.engine import GameEngine
+from game import save_system
+from simulation import deal_flow, procedural_gen
+
+
+def _names(deals):
+    return [c.name for tiers in deals.values() for companies in tiers.values() for c in companies]
+
+
+def test_listings_age_and_persist():
+    """Test most listings survive a quarter, older and re-priced, without touching the originals."""
+    engine = GameEngine()
+    engine.generate_new_deals()
+    before = [c for tiers in engine.available_deals.values() for companies in tiers.values() for c in companies]
+    snapshot = [(c.revenue, c.current_valuation, c.quarters_listed) for c in before]
+    
+    report = deal_flow.advance_deal_book(engine.available_deals, engine.market,
+                                         engine.deal_schedule.fork(), 1)
+    
+    survivors = [c for tiers in report['deals'].values() for companies in tiers.values()
+                 for c in companies if c.quarters_listed == 1]
+    assert len(survivors) > len(before) // 2
+    assert len(survivors) + len(report['bought_by_rivals']) + len(report['withdrawn']) == len(before)
+    originals = {id(c) for c in before}
+    assert not any(id(c) in originals for c in survivors)
+    assert [(c.revenue, c.current_valuation, c.quarters_listed) for c in before] == snapshot
+
+
+def test_listing_history_grows_while_listed(monkeypatch):
+    """Test listings append each quarter to their history, up to the cap."""
+    monkeypatch.setattr(config, 'DEAL_FLOW_RIVAL_BID_RATE', 0.0)
+    monkeypatch.setattr(config, 'DEAL_FLOW_HISTORY_QUARTERS', 2)
+    engine = GameEngine()
+    engine.generate_new_deals()
+    listing = engine.available_deals['Technology']['local'][0]
+    listing.revenue_history = [1.0]
+    listing.ebitda_history = [0.2]
+    
+    deals = deal_flow.advance_deal_book(engine.available_deals, engine.market,
+                                        engine.deal_schedule, 1)['deals']
+    
+    survivor, = [c for c in deals['Technology']['local'] if c.listing_id == listing.listing_id]
+    assert survivor.revenue_history[0] == 1.0
+    assert survivor.revenue_history[-1] == survivor.revenue
+    assert len(survivor.revenue_history) == len(survivor.ebitda_history) == 2
+    assert listing.revenue_history == [1.0]
+    
+    # Auction deadlines are at least three quarters out, so it is still listed
+    deals = deal_flow.advance_deal_book(deals, engine.market, engine.deal_schedule, 2)['deals']
+    survivor, = [c for c in deals['Technology']['local'] if c.listing_id == listing.listing_id]
+    assert len(survivor.revenue_history) == 2
+    assert survivor.revenue_history[0] != 1.0
+
+
+def test_stale_listings_are_withdrawn_and_tiers_stay_stocked():
+    """Test listings leave by their auction deadline, and no tier is ever left empty."""
+    engine = GameEngine()
+    engine.generate_new_deals()
+    generated = 0
+    
+    quarters = 3 * config.DEAL_FLOW_AUCTION_QUARTERS[1]
+    for quarter in range(1, quarters + 1):
+        engine.market.update_quarter()
+        report = deal_flow.advance_deal_book(engine.available_deals, engine.market,
+                                             engine.deal_schedule, quarter)
+        engine.available_deals = report['deals']
+        generated += report['new_listings']
+        
+        ages = [c.quarters_listed for tiers in engine.available_deals.values()
+                for companies in tiers.values() for c in companies]
+        assert max(ages) <= config.DEAL_FLOW_AUCTION_QUARTERS[1]
+        for sector in procedural_gen.get_sectors():
+            for tier in procedural_gen.VALUATION_TIERS:
+                assert 1 <= len(engine.available_deals[sector][tier]) <= config.DEAL_FLOW_SLOTS_PER_TIER
+                
+    # Refilling costs far less generation than regenerating the whole book
+    assert generated / quarters < len(_names(engine.available_deals)) / 2
+
+
+def test_deal_flow_is_reproducible_from_random_state():
+    """Test the same random state yields the same deal book."""
+    engine = GameEngine()
+    engine.generate_new_deals()
+    
+    state = random.getstate()
+    first = deal_flow.advance_deal_book(engine.available_deals, engine.market,
+                                        engine.deal_schedule.fork(), 1)
+    random.setstate(state)
+    second = deal_flow.advance_deal_book(engine.available_deals, engine.market,
+                                         engine.deal_schedule.fork(), 1)
+    
+    assert _names(first['deals']) == _names(second['deals'])
+    assert ([c.current_valuation for c in first['deals']['Technology']['local']] ==
+            [c.current_valuation for c in second['deals']['Technology']['local']])
+
+
+def test_listing_age_survives_save_round_trip():
+    """Test a saved game keeps how long each deal has been listed."""
+    engine = GameEngine()
+    engine.action_log = None
+    engine.generate_new_deals()
+    engine.perform('advance_quarter', event_choice=0)
+    engine.perform('advance_quarter', event_choice=0)
+    state = save_system.serialize_game_state(engine)
+    
+    restored = GameEngine()
+    save_system.deserialize_game_state(state, restored)
+    
+    ages = [c.quarters_listed for tiers in engine.available_deals.values()
+            for companies in tiers.values() for c in companies]
+    restored_ages = [c.quarters_listed for tiers in restored.available_deals.values()
+                     for companies in tiers.values() for c in companies]
+    assert restored_ages == ages
+    assert max(ages) == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
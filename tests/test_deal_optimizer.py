@@ -0,0 +1,137 @@
+"""
+Tests for the capital allocation optimizer.
+"""
+
+from itertools import combinations
+import numpy as np
+import pytest
+import config
+from game.engine import GameEngine
+from models.company import Company
+from models.manager import Manager
+from models.market import Market
+from models.player import Player
+from simulation import deal_optimizer
+
+
+# (sector, tier, price, growth rate, volatility) of a fixed deal book
+DEALS = [
+    ('Technology', 'local', 1_500_000, 0.05, 0.05),
+    ('Technology', 'regional', 6_000_000, 0.03, 0.10),
+    ('Healthcare', 'local', 2_500_000, 0.04, 0.08),
+    ('Healthcare', 'regional', 9_000_000, 0.02, 0.04),
+    ('Retail', 'local', 800_000, 0.06, 0.15),
+    ('Retail', 'regional', 4_000_000, -0.02, 0.10),
+]
+
+
+def _fixed_deal_book():
+    """Deal book, market and player with no random inputs."""
+    deals = {}
+    for i, (sector, tier, price, growth, volatility) in enumerate(DEALS):
+        company = Company(f"Deal {i}", sector, revenue=price / 3, ebitda_margin=0.2,
+                          growth_rate=growth, volatility=volatility,
+                          manager=Manager(f"Manager {i}", competence=0.6, risk_profile=0.4,
+                                          cooperativeness=0.5))
+        company.current_valuation = price
+        deals.setdefault(sector, {}).setdefault(tier, []).append(company)
+        
+    market = Market()
+    market.growth_rate = 0.01
+    market.interest_rate = 0.04
+    return deals, market, Player()
+
+
+def _brute_force(weights, values, capacity):
+    best = 0.0
+    for r in range(len(weights) + 1):
+        for subset in combinations(range(len(weights)), r):
+            if sum(weights[i] for i in subset) <= capacity:
+                best = max(best, sum(values[i] for i in subset))
+    return best
+
+
+def test_knapsack_matches_brute_force():
+    """Test the DP finds the optimal subset and reconstructs it."""
+    rng = np.random.default_rng(3)
+    for _ in range(20):
+        weights = rng.integers(1, 15, size=9)
+        values = rng.uniform(0, 10, size=9)
+        capacity = 30
+        
+        best, take = deal_optimizer.solve_knapsack(weights, values, capacity)
+        used = int(np.argmax(best))
+        chosen = deal_optimizer.reconstruct_knapsack(take, weights, used)
+        
+        assert best[used] == pytest.approx(_brute_force(weights, values, capacity))
+        assert weights[chosen].sum() == used
+        assert values[chosen].sum() == pytest.approx(best[used])
+
+
+def test_pruning_keeps_the_optimum():
+    """Test dropping dominated same-weight items never loses value."""
+    rng = np.random.default_rng(5)
+    weights = rng.integers(1, 6, size=200)
+    values = rng.uniform(0, 10, size=200)
+    
+    full, _ = deal_optimizer.solve_knapsack(weights, values, 20)
+    keep = deal_optimizer.prune_dominated(weights, values, 20)
+    pruned, _ = deal_optimizer.solve_knapsack(weights[keep], values[keep], 20)
+    
+    assert len(keep) < 200
+    assert pruned.max() == pytest.approx(full.max())
+
+
+def test_optimizer_respects_budget():
+    """Test the chosen deals fit within available capital and are ranked first."""
+    deals, market, player = _fixed_deal_book()
+    
+    plan = deal_optimizer.optimize_deals(deals, player, market)
+    
+    assert plan['selected']
+    assert plan['total_cost'] <= plan['budget'] + 1e-6
+    selected = [c for c in plan['shortlist'] if c['selected']]
+    assert selected == plan['shortlist'][:len(selected)]
+    assert len(selected) == len(plan['selected'])
+    for c in plan['shortlist']:
+        listing = deals[c['sector']][c['tier']][c['index']]
+        assert listing is c['company']
+        assert c['score'] > 0
+
+
+def test_financing_cost_discourages_leverage():
+    """Test expensive debt keeps the optimizer within cash."""
+    deals, market, player = _fixed_deal_book()
+    market.interest_rate = 10.0
+    cheapest = deals['Retail']['local'][0]
+    player.cash = cheapest.current_valuation
+    
+    # Every deal earns less than the debt to fund it would cost
+    horizon = config.DEAL_OPTIMIZER_HORIZON
+    companies = [c for tiers in deals.values() for listed in tiers.values() for c in listed]
+    scores = deal_optimizer.score_candidates(companies, market, horizon,
+                                             config.DEAL_OPTIMIZER_RISK_AVERSION)
+    debt_cost = market.get_debt_rate() / 4 * horizon
+    assert np.all(scores['score'] < scores['price'] * debt_cost)
+    
+    plan = deal_optimizer.optimize_deals(deals, player, market)
+    
+    assert [c['company'] for c in plan['selected']] == [cheapest]
+    assert plan['financing_cost'] <= plan['expected_value']
+
+
+def test_empty_budget_returns_no_deals():
+    """Test a fund without capital gets an empty plan."""
+    engine = GameEngine()
+    engine.generate_new_deals()
+    engine.player.cash = 0
+    engine.player.current_debt = 1e12
+    
+    plan = deal_optimizer.optimize_deals(engine.available_deals, engine.player, engine.market)
+    
+    assert plan['selected'] == []
+    assert plan['shortlist'] == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,165 @@
+"""
+Tests for the deal schedule (dated sale-process events).
+"""
+
+import random
+import numpy as np
+import pytest
+import config
+from game.engine import GameEngine
+from game import save_system
+from simulation import deal_flow, deal_schedule
+from simulation.deal_schedule import DealSchedule
+
+
+def _listings(engine):
+    return [c for tiers in engine.available_deals.values() for companies in tiers.values() for c in companies]
+
+
+def _advance(engine, quarter):
+    report = deal_flow.advance_deal_book(engine.available_deals, engine.market,
+                                         engine.deal_schedule, quarter)
+    engine.available_deals = report.pop('deals')
+    return report
+
+
+def test_events_drain_in_quarter_order():
+    """Test only due events are popped, earliest first, ties in push order."""
+    schedule = DealSchedule()
+    for quarter, listing_id in [(5, 1), (2, 2), (9, 3), (2, 4), (4, 5)]:
+        schedule.push(quarter, deal_schedule.DEADLINE, listing_id)
+        
+    due = list(schedule.due(4))
+    
+    assert [(q, i) for q, kind, i in due] == [(2, 2), (2, 4), (4, 5)]
+    assert schedule.next_event_quarter() == 5
+    assert len(schedule) == 2
+
+
+def test_deadline_withdraws_listing(monkeypatch):
+    """Test a listing leaves the book at its auction deadline."""
+    monkeypatch.setattr(config, 'DEAL_FLOW_RIVAL_BID_RATE', 0.0)
+    monkeypatch.setattr(config, 'DEAL_FLOW_RELIST_CHANCE', 0.0)
+    engine = GameEngine()
+    engine.generate_new_deals()
+    target = _listings(engine)[0]
+    deadline = engine.deal_schedule.deadlines[target.listing_id]
+    
+    for quarter in range(1, deadline):
+        _advance(engine, quarter)
+        assert target.listing_id in [c.listing_id for c in _listings(engine)]
+        
+    report = _advance(engine, deadline)
+    
+    assert target.listing_id not in [c.listing_id for c in _listings(engine)]
+    assert target.name in report['withdrawn']
+    assert target.listing_id not in engine.deal_schedule.location
+
+
+def test_acquired_listing_events_are_skipped():
+    """Test events for a listing the player bought are dropped lazily."""
+    engine = GameEngine()
+    engine.action_log = None
+    engine.generate_new_deals()
+    engine.player.cash = 1e15
+    listing = engine.available_deals['Healthcare']['local'][0]
+    listing_id = listing.listing_id
+    engine.perform('acquisition', sector='Healthcare', tier='local', index=0,
+                   price=listing.current_valuation)
+                   
+    assert listing_id in engine.deal_schedule.deadlines
+    
+    for quarter in range(1, config.DEAL_FLOW_AUCTION_QUARTERS[1] + 1):
+        _advance(engine, quarter)
+        
+    assert listing_id not in engine.deal_schedule.withdrawn
+    assert listing_id not in engine.deal_schedule.location
+    assert listing_id not in engine.deal_schedule.deadlines
+
+
+def test_exclusive_listings_are_safe_from_rivals(monkeypatch):
+    """Test rival funds cannot buy a listing during its exclusivity window."""
+    monkeypatch.setattr(config, 'DEAL_FLOW_RIVAL_BID_RATE', 10.0)
+    monkeypatch.setattr(config, 'DEAL_FLOW_EXCLUSIVE_CHANCE', 0.5)
+    engine = GameEngine()
+    engine.generate_new_deals()
+    exclusive = {c.listing_id for c in _listings(engine) if engine.deal_schedule.is_exclusive(c.listing_id)}
+    assert exclusive
+    
+    _advance(engine, 1)
+    
+    survivors = {c.listing_id for c in _listings(engine)}
+    assert exclusive <= survivors
+    
+    # Once the window closes they are fair game
+    for quarter in range(2, config.DEAL_FLOW_EXCLUSIVITY_QUARTERS + 2):
+        _advance(engine, quarter)
+    assert not exclusive & {c.listing_id for c in _listings(engine)}
+
+
+def test_withdrawn_deal_is_relisted_cheaper(monkeypatch):
+    """Test a withdrawn deal returns after the delay at a discount, under the same listing id."""
+    monkeypatch.setattr(config, 'DEAL_FLOW_RIVAL_BID_RATE', 0.0)
+    monkeypatch.setattr(config, 'DEAL_FLOW_RELIST_CHANCE', 1.0)
+    monkeypatch.setattr(config, 'DEAL_FLOW_REFILL_RATE', 0.0)
+    random.seed(11)
+    np.random.seed(11)
+    engine = GameEngine()
+    engine.generate_new_deals()
+    target = _listings(engine)[0]
+    deadline = engine.deal_schedule.deadlines[target.listing_id]
+    
+    # Leave room in every tier so other relistings cannot crowd the target out
+    monkeypatch.setattr(config, 'DEAL_FLOW_SLOTS_PER_TIER', 100)
+    
+    for quarter in range(1, deadline + 1):
+        _advance(engine, quarter)
+    withdrawn = engine.deal_schedule.withdrawn[target.listing_id]
+    
+    report = {'relisted': []}
+    for quarter in range(deadline + 1, deadline + config.DEAL_FLOW_RELIST_DELAY + 1):
+        report = _advance(engine, quarter)
+        
+    relisted = [c for c in _listings(engine) if c.listing_id == target.listing_id]
+    assert target.name in report['relisted']
+    assert relisted[0].current_valuation == pytest.approx(
+        withdrawn.current_valuation * (1 - config.DEAL_FLOW_RELIST_DISCOUNT))
+    assert relisted[0].quarters_listed == 0
+    assert engine.deal_schedule.deadlines[target.listing_id] > deadline
+    
+    # Repricing keeps the relist discount and the cuts from the first listing
+    never_withdrawn = withdrawn.fork()
+    for company in (relisted[0], never_withdrawn):
+        company.revenue, company.ebitda_margin = withdrawn.revenue, withdrawn.ebitda_margin
+    repriced = deal_flow.advance_listings([relisted[0]], engine.market, np.random.default_rng(5))
+    full_price = deal_flow.advance_listings([never_withdrawn], engine.market, np.random.default_rng(5))
+    assert repriced['valuation'][0] == pytest.approx(
+        full_price['valuation'][0] * (1 - config.DEAL_FLOW_RELIST_DISCOUNT))
+    assert repriced['valuation'][0] < full_price['valuation'][0]
+
+
+def test_schedule_survives_save_round_trip():
+    """Test pending events and withdrawn deals are saved, and old saves get a schedule."""
+    engine = GameEngine()
+    engine.action_log = None
+    engine.generate_new_deals()
+    for _ in range(4):
+        engine.perform('advance_quarter', event_choice=0)
+    state = save_system.serialize_game_state(engine)
+    
+    restored = GameEngine()
+    save_system.deserialize_game_state(state, restored)
+    assert sorted(restored.deal_schedule.heap) == sorted(engine.deal_schedule.heap)
+    assert restored.deal_schedule.deadlines == engine.deal_schedule.deadlines
+    assert set(restored.deal_schedule.withdrawn) == set(engine.deal_schedule.withdrawn)
+    for listing_id, company in engine.deal_schedule.withdrawn.items():
+        assert restored.deal_schedule.withdrawn[listing_id].asking_discount == company.asking_discount
+    
+    del state['deal_schedule']
+    legacy = GameEngine()
+    save_system.deserialize_game_state(state, legacy)
+    assert set(legacy.deal_schedule.deadlines) == {c.listing_id for c in _listings(legacy)}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
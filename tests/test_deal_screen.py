@@ -0,0 +1,104 @@
+"""
+Tests for indexed deal screening.
+"""
+
+import random
+import pytest
+from game.engine import GameEngine
+from simulation.deal_screen import DealIndex
+
+
+def _scan(available_deals, sectors=None, tiers=None, **ranges):
+    getters = {
+        'valuation': lambda c: c.current_valuation,
+        'ebitda_margin': lambda c: c.ebitda_margin,
+        'growth_rate': lambda c: c.growth_rate,
+        'competence': lambda c: c.manager.competence
+    }
+    matches = set()
+    for sector, by_tier in available_deals.items():
+        for tier, companies in by_tier.items():
+            for company in companies:
+                if sectors is not None and sector not in sectors:
+                    continue
+                if tiers is not None and tier not in tiers:
+                    continue
+                if all((low is None or getters[f](company) >= low) and
+                       (high is None or getters[f](company) <= high)
+                       for f, (low, high) in ranges.items()):
+                    matches.add(id(company))
+    return matches
+
+
+def test_query_matches_linear_scan():
+    """Test indexed queries return exactly what a scan of the book finds."""
+    engine = GameEngine()
+    engine.generate_new_deals()
+    index = DealIndex(engine.available_deals)
+    rng = random.Random(11)
+    
+    for _ in range(50):
+        criteria = {
+            'valuation': (rng.choice([None, 1e6, 5e7]), rng.choice([None, 1e9, 1e11])),
+            'ebitda_margin': (rng.choice([None, 0.1, 0.2]), None),
+            'growth_rate': (rng.choice([None, 0.0, 0.05]), None),
+            'competence': (rng.choice([None, 0.5, 0.7]), None)
+        }
+        if rng.random() < 0.5:
+            criteria['sectors'] = rng.sample(list(engine.available_deals), 2)
+        if rng.random() < 0.3:
+            criteria['tiers'] = ['local', 'mid-cap']
+            
+        results = index.query(**criteria)
+        
+        assert {id(listing[3]) for listing in results} == _scan(engine.available_deals, **criteria)
+        valuations = [listing[3].current_valuation for listing in results]
+        assert valuations == sorted(valuations)
+
+
+def test_results_locate_listings():
+    """Test results carry the (sector, tier, index) of each listing."""
+    engine = GameEngine()
+    engine.generate_new_deals()
+    
+    results = engine.screen_deals(order_by='competence', descending=True, limit=5)
+    
+    assert len(results) == 5
+    for sector, tier, index, company in results:
+        assert engine.available_deals[sector][tier][index] is company
+    competence = [listing[3].manager.competence for listing in results]
+    assert competence == sorted(competence, reverse=True)
+
+
+def test_index_rebuilds_when_book_changes():
+    """Test the engine's index follows acquisitions and fresh deal books."""
+    engine = GameEngine()
+    engine.action_log = None
+    engine.generate_new_deals()
+    engine.player.cash = 1e15
+    
+    target = engine.screen_deals(sectors=['Healthcare'], tiers=['local'])[0]
+    first_index = engine._deal_index
+    sector, tier, index, company = target
+    engine.perform('acquisition', sector=sector, tier=tier, index=index,
+                   price=company.current_valuation)
+                   
+    results = engine.screen_deals(sectors=['Healthcare'], tiers=['local'])
+    assert engine._deal_index is not first_index
+    assert company not in [listing[3] for listing in results]
+    
+    engine.generate_new_deals()
+    assert not engine._deal_index.is_current(engine.available_deals)
+
+
+def test_unknown_field_rejected():
+    """Test typos in criteria are errors rather than silently ignored."""
+    index = DealIndex({})
+    
+    assert index.query() == []
+    with pytest.raises(ValueError):
+        index.query(margin=(0.1, None))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,180 @@
+"""
+Tests for the tranche-level debt book.
+"""
+
+import numpy as np
+import pytest
+import config
+from game.engine import GameEngine
+from game import save_system, menus
+from game import input_handlers as ih
+from models.company import Company
+from models.debt import DebtBook, REVOLVER
+from models.player import Player
+
+
+def test_acquisition_loans_amortize_on_schedule():
+    """Test company loans amortize straight-line and revolver draws do not."""
+    book = DebtBook()
+    book.add_tranche(2_800_000, company=0)
+    book.add_tranche(1_000_000)
+    
+    interest, principal = book.quarterly_service(0.08)
+    
+    assert interest.tolist() == pytest.approx([56_000, 20_000])
+    assert principal[0] == pytest.approx(2_800_000 / config.ACQUISITION_LOAN_TERM_QUARTERS)
+    assert principal[1] == 0.0
+    
+    for _ in range(config.ACQUISITION_LOAN_TERM_QUARTERS):
+        _, principal = book.quarterly_service(0.08)
+        book.apply_principal(principal)
+        book.end_quarter()
+        
+    # The acquisition loan is retired; the revolver is untouched
+    assert book.tranches == 1
+    assert book.total == pytest.approx(1_000_000)
+
+
+def test_prepay_hits_revolver_first():
+    """Test prepayments retire revolver draws before company loans."""
+    book = DebtBook()
+    book.add_tranche(500, company=0)
+    book.add_tranche(300)
+    
+    applied = book.prepay(400)
+    
+    assert applied == 400
+    assert book.company_code.tolist() == [0]
+    assert book.total == pytest.approx(400)
+
+
+def test_covenant_breaches_grouped_by_company():
+    """Test covenants are tested on each company's combined loans."""
+    book = DebtBook()
+    rng = np.random.default_rng(0)
+    for i in range(300):
+        book.add_tranche(float(rng.uniform(1, 2)), company=i % 50)
+    book.add_tranche(1e9)  # Revolver draws are not covenant-tested
+    
+    ebitda = {i: 1.0 for i in range(50)}
+    ebitda[7] = 100.0
+    
+    breaches = book.covenant_breaches(ebitda, max_ratio=5.0)
+    breached = {b['company'] for b in breaches}
+    
+    debt_by_company = book.balance_by_company()
+    expected = {i for i in range(50) if debt_by_company[i] / ebitda[i] > 5.0}
+    assert breached == expected
+    assert 7 not in breached
+
+
+def test_same_named_companies_keep_separate_loans():
+    """Test loans are tied to each holding, not to its (possibly repeated) name."""
+    player = Player(starting_cash=1e9)
+    player.base_debt_capacity = 1e9
+    first = Company(name="Acme", sector="Technology", revenue=100_000_000, ebitda_margin=0.08)
+    second = Company(name="Acme", sector="Technology", revenue=100_000_000, ebitda_margin=0.20)
+    for company, loan in ((first, 5e7), (second, 6e7)):
+        player.add_company(company)
+        player.take_debt(loan, company=company.acquisition_id)
+        
+    assert first.acquisition_id != second.acquisition_id
+    assert player.debt_book.balance_by_company().tolist() == [5e7, 6e7]
+    
+    # Each covenant is tested against the holding's own EBITDA: 6.25x and 3x
+    breaches = player.covenant_breaches()
+    assert [(b['company'], b['ratio']) for b in breaches] == [("Acme", pytest.approx(5e7 / first.ebitda))]
+    
+    assert player.repay_company_debt(first) == pytest.approx(5e7)
+    assert player.debt_book.company_balance(second.acquisition_id) == pytest.approx(6e7)
+    assert player.current_debt == pytest.approx(6e7)
+
+
+def test_service_debt_keeps_total_in_sync():
+    """Test debt service keeps current_debt equal to the tranche balances."""
+    player = Player()
+    player.take_debt(4_000_000, company=0)
+    player.take_debt(1_000_000)
+    player.cash = 10_000
+    
+    report = player.service_debt(0.08)
+    
+    assert report['paid'] == 10_000
+    assert report['unpaid'] == pytest.approx(100_000 - 10_000)
+    assert report['principal_paid'] == 0.0
+    assert player.current_debt == pytest.approx(player.debt_book.total)
+    assert player.current_debt > 5_000_000
+
+
+def test_exit_repays_company_loans():
+    """Test selling a company repays the loans secured on it."""
+    engine = GameEngine()
+    engine.action_log = None
+    engine.generate_new_deals()
+    listing = engine.available_deals['Healthcare']['local'][0]
+    price = listing.current_valuation
+    company = engine.perform('acquisition', sector='Healthcare', tier='local', index=0,
+                             price=price, debt=price * 0.6)
+    
+    assert engine.player.debt_book.company_balance(company.acquisition_id) == pytest.approx(price * 0.6)
+    
+    engine.perform('exit', company=0, price=price)
+    
+    assert engine.player.current_debt == pytest.approx(0.0, abs=1e-3)
+    assert engine.player.debt_book.tranches == 0
+
+
+@pytest.mark.parametrize("taxed", [True, False])
+@pytest.mark.parametrize("levered", [True, False])
+def test_exit_summary_reports_proceeds_and_loans(monkeypatch, capsys, taxed, levered):
+    """Test the exit summary prints one net-proceeds line, plus loans repaid when levered."""
+    engine = GameEngine()
+    engine.action_log = None
+    engine.generate_new_deals()
+    listing = engine.available_deals['Healthcare']['local'][0]
+    price = listing.current_valuation
+    company = engine.perform('acquisition', sector='Healthcare', tier='local', index=0,
+                             price=price, debt=price * 0.6 if levered else 0)
+    # Any buyer offer is a gain over a tiny basis and a loss against a huge one
+    company.acquisition_price = 1.0 if taxed else price * 100
+    
+    monkeypatch.setattr(menus, 'exit_menu', lambda *args, **kwargs: company)
+    monkeypatch.setattr(ih, 'prompt_yes_no', lambda *args, **kwargs: True)
+    monkeypatch.setattr(ih, 'press_enter_to_continue', lambda *args, **kwargs: None)
+    engine.exit_investment()
+    
+    summary = capsys.readouterr().out.split("Investment exited successfully!")[1]
+    net_lines = [line for line in summary.splitlines() if line.startswith("Net Proceeds")]
+    assert len(net_lines) == 1
+    assert ("no tax on loss" in net_lines[0]) is not taxed
+    assert ("Taxes Paid" in summary) is taxed
+    assert ("Loans Repaid" in summary) is levered
+    assert company not in engine.player.portfolio
+
+
+def test_debt_book_save_round_trip():
+    """Test tranches survive a save/load cycle and legacy saves get a revolver."""
+    engine = GameEngine()
+    engine.player.add_company(Company(name="Acme", sector="Technology", revenue=10_000_000,
+                                      ebitda_margin=0.2))
+    acquisition_id = engine.player.portfolio[0].acquisition_id
+    engine.player.take_debt(3_000_000, company=acquisition_id)
+    engine.player.take_debt(500_000)
+    state = save_system.serialize_game_state(engine)
+    
+    restored = GameEngine()
+    save_system.deserialize_game_state(state, restored)
+    assert restored.player.portfolio[0].acquisition_id == acquisition_id
+    assert restored.player.next_acquisition_id == engine.player.next_acquisition_id
+    assert restored.player.debt_book.total == pytest.approx(3_500_000)
+    assert restored.player.debt_book.company_balance(acquisition_id) == pytest.approx(3_000_000)
+    
+    del state['player']['debt_book']
+    legacy = GameEngine()
+    save_system.deserialize_game_state(state, legacy)
+    assert legacy.player.debt_book.company_code.tolist() == [REVOLVER]
+    assert legacy.player.debt_book.total == pytest.approx(3_500_000)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,171 @@
+"""
+Tests for delayed event effects.
+"""
+
+import numpy as np
+import pytest
+import config
+from game.engine import GameEngine
+from game import events, save_system
+from game.event_queue import EventQueue, ScheduledEffect
+
+
+def _engine_with_company(monkeypatch):
+    monkeypatch.setattr(config, 'EVENT_PROBABILITY', 0.0)
+    engine = GameEngine()
+    engine.action_log = None
+    engine.refresh_deals = False
+    engine.generate_new_deals()
+    engine.player.cash = 1e15
+    listing = engine.available_deals['Technology']['local'][0]
+    engine.perform('acquisition', sector='Technology', tier='local', index=0,
+                   price=listing.current_valuation)
+    return engine, engine.player.portfolio[-1]
+
+
+def test_queue_pops_due_effects_in_order():
+    """Test only due effects are popped, earliest first, ties in scheduling order."""
+    queue = EventQueue()
+    for quarter, title in [(6, 'a'), (3, 'b'), (3, 'c'), (9, 'd'), (1, 'e')]:
+        queue.schedule(quarter, ScheduledEffect(title, '', {}))
+        
+    assert [e.title for e in queue.due(3)] == ['e', 'b', 'c']
+    assert queue.due(3) == []
+    assert [(q, e.title) for q, e in queue.pending()] == [(6, 'a'), (9, 'd')]
+
+
+def test_lawsuit_settles_later(monkeypatch):
+    """Test a settlement is charged in its quarter, not when the event hits."""
+    engine, company = _engine_with_company(monkeypatch)
+    start = engine.time_manager.current_quarter
+    engine.handle_event({
+        'title': 'CRISIS', 'target': company, 'effects': {},
+        'follow_ups': [{'delay': 2, 'description': 'settles', 'effects': {'settlement_cost': 1e6}}]
+    })
+    
+    reports = [engine.perform('advance_quarter') for _ in range(3)]
+    
+    assert [len(r['scheduled_effects']) for r in reports] == [0, 0, 1]
+    assert reports[2]['scheduled_effects'][0] == ('CRISIS', 'settles')
+    settlements = [e for e in engine.player.ledger.entries if e.amount == -1e6]
+    assert len(settlements) == 1 and settlements[0].company == company.name
+    assert settlements[0].quarter == start + 2
+    assert len(engine.event_queue) == 0
+
+
+def test_recall_and_regulation_spread_over_quarters(monkeypatch):
+    """Test the recovery curve and phase-in add up to the intended totals."""
+    engine, company = _engine_with_company(monkeypatch)
+    severity = 0.3
+    
+    recovery = events._recall_recovery(company, severity)
+    impacts = [f['effects']['revenue_impact'] for f in recovery]
+    assert [f['delay'] for f in recovery] == list(range(1, config.RECALL_RECOVERY_QUARTERS + 1))
+    assert impacts == sorted(impacts, reverse=True)
+    share = config.RECALL_RECOVERY_SHARE
+    assert (1 - severity) * np.prod(1 + np.array(impacts)) == pytest.approx(1 - severity + share * severity)
+    
+    monkeypatch.setattr(events.random, 'uniform', lambda a, b: -0.09)
+    event = events._generate_regulatory_event(company)
+    phased = [event['effects']['margin_impact']] + [f['effects']['margin_impact'] for f in event['follow_ups']]
+    assert len(phased) == config.REGULATORY_PHASE_IN_QUARTERS
+    assert sum(phased) == pytest.approx(-0.09)
+
+
+def _land_follow_ups(engine, company):
+    """Apply every queued effect to the company, skipping the quarters in between."""
+    for quarter, effect in engine.event_queue.pending():
+        company.apply_event(effect.effects)
+
+
+@pytest.mark.parametrize("choice", ['immediate', 'monitor'])
+def test_recall_recovery_follows_mitigated_loss(monkeypatch, choice):
+    """Test a recall wins back a share of the revenue actually lost, never more than was lost."""
+    engine, company = _engine_with_company(monkeypatch)
+    severity = 0.3
+    monkeypatch.setattr(events.random, 'uniform', lambda a, b: severity)
+    monkeypatch.setattr(events.random, 'choice', lambda options: options[0])
+    event = events._generate_crisis_event(company)
+    revenue = company.revenue
+    
+    engine.handle_event(event, choice)
+    _land_follow_ups(engine, company)
+    
+    lost = severity * (1 - config.EVENT_MITIGATION_SHARE) if choice == 'immediate' else severity
+    assert company.revenue == pytest.approx(revenue * (1 - lost * (1 - config.RECALL_RECOVERY_SHARE)))
+    assert company.revenue < revenue
+
+
+@pytest.mark.parametrize("choice", ['immediate', 'monitor'])
+def test_mitigation_covers_regulatory_phase_in(monkeypatch, choice):
+    """Test an immediate response softens every phase of an adverse rule, not just the first."""
+    engine, company = _engine_with_company(monkeypatch)
+    monkeypatch.setattr(events.random, 'uniform', lambda a, b: -0.09)
+    event = events._generate_regulatory_event(company)
+    margin = company.ebitda_margin
+    
+    engine.handle_event(event, choice)
+    _land_follow_ups(engine, company)
+    
+    saved = config.EVENT_MITIGATION_SHARE if choice == 'immediate' else 0.0
+    assert company.ebitda_margin == pytest.approx(margin - 0.09 * (1 - saved))
+
+
+def test_effects_for_sold_companies_are_dropped(monkeypatch):
+    """Test an effect for a company no longer owned is skipped."""
+    engine, company = _engine_with_company(monkeypatch)
+    engine.handle_event({
+        'title': 'CRISIS', 'target': company, 'effects': {},
+        'follow_ups': [{'delay': 1, 'description': 'settles', 'effects': {'settlement_cost': 1e6}}]
+    })
+    engine.player.portfolio.remove(company)
+    cash = engine.player.cash
+    
+    report = engine.perform('advance_quarter')
+    
+    assert report['scheduled_effects'] == []
+    assert engine.player.cash == cash
+
+
+def test_effects_target_the_holding_not_its_name(monkeypatch):
+    """Test a follow-up lands on the company that was hit, even if another shares its name."""
+    engine, first = _engine_with_company(monkeypatch)
+    listing = engine.available_deals['Technology']['local'][0]
+    second = engine.perform('acquisition', sector='Technology', tier='local', index=0,
+                            price=listing.current_valuation)
+    first.name = second.name = "Acme"
+    revenue = (first.revenue, second.revenue)
+    engine.handle_event({
+        'title': 'CRISIS', 'target': first, 'effects': {},
+        'follow_ups': [{'delay': 0, 'description': 'recovers', 'effects': {'revenue_impact': 0.1}}]
+    })
+    
+    assert len(engine.apply_scheduled_effects()) == 1
+    assert first.revenue == pytest.approx(revenue[0] * 1.1)
+    assert second.revenue == revenue[1]
+
+
+def test_queue_survives_save_and_fork(monkeypatch):
+    """Test pending effects are saved, and forks do not share the queue."""
+    engine, company = _engine_with_company(monkeypatch)
+    engine.handle_event({
+        'title': 'Regulatory Change', 'target': company, 'effects': {},
+        'follow_ups': [{'delay': d, 'description': 'phase-in', 'effects': {'margin_impact': -0.01}}
+                       for d in (1, 2)]
+    })
+    
+    restored = GameEngine()
+    save_system.deserialize_game_state(save_system.serialize_game_state(engine), restored)
+    assert ([(q, e.to_dict()) for q, e in restored.event_queue.pending()] ==
+            [(q, e.to_dict()) for q, e in engine.event_queue.pending()])
+            
+    # Effects land in the advance that starts their quarter
+    child = engine.fork()
+    child.perform('advance_quarter')
+    child.perform('advance_quarter')
+    assert len(child.event_queue) == 1
+    assert len(engine.event_queue) == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,157 @@
+"""
+Tests for the event registry and alias-table sampling.
+"""
+
+import random
+import numpy as np
+import pytest
+import config
+from game import events
+from game.events import AliasTable, EventDefinition
+from models.market import Market
+from models.player import Player
+from simulation.batch_sim import CompanyBatch, MarketBatch, EventDeltas
+from simulation.procedural_gen import generate_company
+
+
+def test_alias_table_reproduces_weights():
+    """Test the table's implied distribution matches the weights, and draws follow it."""
+    weights = [5.0, 1.0, 0.0, 2.5, 1.5]
+    table = AliasTable(weights)
+    
+    expected = np.array(weights) / sum(weights)
+    assert table.probabilities() == pytest.approx(expected)
+    
+    draws = table.sample_many(200_000, np.random.default_rng(0))
+    assert np.bincount(draws, minlength=5) / 200_000 == pytest.approx(expected, abs=0.005)
+    assert 2 not in draws
+    
+    rand = random.Random(0).random
+    scalar = [table.sample(rand) for _ in range(20_000)]
+    assert np.bincount(scalar, minlength=5) / 20_000 == pytest.approx(expected, abs=0.015)
+    
+    # One evenly spread uniform per draw gives the weights almost exactly
+    spread = table.sample_uniform((np.arange(1000) + 0.5) / 1000)
+    assert np.bincount(spread, minlength=5) / 1000 == pytest.approx(expected, abs=0.002)
+
+
+def test_event_mix_follows_difficulty():
+    """Test crisis kinds get the crisis pool's share, which grows with difficulty."""
+    names = [d.name for d in events.EVENT_REGISTRY]
+    crisis = [names.index(n) for n in ('company_crisis', 'market_crash', 'management_issue')]
+    
+    for difficulty in ('easy', 'medium', 'hard'):
+        settings = config.DIFFICULTY_SETTINGS[difficulty]
+        p_crisis = config.CRISIS_PROBABILITY * settings['crisis_probability_multiplier']
+        p = events.event_type_probabilities(settings)
+        assert p.sum() == pytest.approx(1.0)
+        assert p[crisis] == pytest.approx((1 - p_crisis) / 8 + p_crisis / 3)
+        assert events.event_alias_table(settings).probabilities() == pytest.approx(p)
+        
+    hard = events.event_type_probabilities(config.DIFFICULTY_SETTINGS['hard'])
+    easy = events.event_type_probabilities(config.DIFFICULTY_SETTINGS['easy'])
+    assert hard[crisis].sum() > easy[crisis].sum()
+
+
+def test_bulk_sampling_matches_event_rate():
+    """Test drawing events for many games at once."""
+    settings = config.DIFFICULTY_SETTINGS['hard']
+    kinds = events.sample_event_types(settings, 100_000, np.random.default_rng(1))
+    
+    rate = config.EVENT_PROBABILITY * settings['event_probability_multiplier']
+    assert np.mean(kinds >= 0) == pytest.approx(rate, abs=0.01)
+    counts = np.bincount(kinds[kinds >= 0], minlength=len(events.EVENT_REGISTRY))
+    assert counts / counts.sum() == pytest.approx(events.event_type_probabilities(settings), abs=0.01)
+
+
+def test_generate_event_uses_targets(monkeypatch):
+    """Test company events need a portfolio, while market events always apply."""
+    monkeypatch.setattr(config, 'EVENT_PROBABILITY', 10.0)
+    market = Market('medium')
+    player = Player(1e9, 'Test')
+    
+    generated = [events.generate_event(player, [], market) for _ in range(200)]
+    assert all(e is None or e['target'] is market for e in generated)
+    assert any(e is not None for e in generated)
+    
+    company = generate_company('Technology')
+    generated = [events.generate_event(player, [company], market) for _ in range(200)]
+    assert all(e is not None for e in generated)
+    assert any(e['target'] is company for e in generated)
+
+
+def test_registered_events_are_sampled(monkeypatch):
+    """Test a new event kind needs only a registry entry."""
+    monkeypatch.setattr(events, 'EVENT_REGISTRY', list(events.EVENT_REGISTRY))
+    monkeypatch.setattr(events, '_alias_tables', {})
+    monkeypatch.setattr(config, 'EVENT_PROBABILITY', 10.0)
+    events.register_event(EventDefinition(
+        'activist_investor', 8.0, 0.0, events._market_target,
+        lambda market, player: {'type': 'activist', 'effects': {}, 'target': market}
+    ))
+    market = Market('medium')
+    
+    generated = [events.generate_event(Player(1e9, 'Test'), [], market) for _ in range(300)]
+    assert sum(e is not None and e['type'] == 'activist' for e in generated) > 100
+
+
+def test_event_deltas_match_scalar_effects():
+    """Test a company event hits only its row, exactly as Company.apply_event does."""
+    market = Market('medium')
+    companies = [generate_company(sector) for sector in ('Technology', 'Healthcare', 'Technology')]
+    batch = CompanyBatch.from_companies(companies)
+    market_batch = MarketBatch.for_companies(market, companies)
+    event = events._generate_crisis_event(companies[1])
+    
+    events.event_deltas(event, companies).apply(batch, market_batch)
+    companies[1].apply_event(event['effects'])
+    
+    assert batch.revenue == pytest.approx([c.revenue for c in companies])
+    assert batch.ebitda_margin == pytest.approx([c.ebitda_margin for c in companies])
+    assert batch.growth_rate == pytest.approx([c.growth_rate for c in companies])
+    
+    crash = events._generate_market_crash_event(market)
+    multiples = market_batch.sector_multiple.copy()
+    events.event_deltas(crash, companies).apply(batch, market_batch)
+    assert market_batch.sector_multiple == pytest.approx(multiples * events.multiple_factor(crash['effects']))
+    assert batch.revenue == pytest.approx([c.revenue for c in companies])
+
+
+def test_event_deltas_compound_repeated_rows():
+    """Test several events on one row apply one after another, and masks select rows."""
+    batch = CompanyBatch.from_companies([generate_company('Technology') for _ in range(4)])
+    revenue, margin = batch.revenue.copy(), batch.ebitda_margin.copy()
+    
+    EventDeltas(np.array([2, 0, 2]), revenue_impact=np.array([-0.5, 0.1, 0.2])).apply(batch)
+    EventDeltas(np.array([False, True, False, True]), margin_impact=2.0).apply(batch)
+    
+    assert batch.revenue == pytest.approx(revenue * [1.1, 1.0, 0.5 * 1.2, 1.0])
+    assert batch.ebitda_margin == pytest.approx([margin[0], 1.0, margin[2], 1.0])
+    with pytest.raises(ValueError):
+        EventDeltas(None, cash_impact=1.0)
+
+
+def test_batch_quarter_of_events():
+    """Test sampled deltas cover each game's event once, on the right rows."""
+    market = Market('hard')
+    company = generate_company('Industrial')
+    games = 20_000
+    rng = np.random.default_rng(3)
+    batch = CompanyBatch.from_company(company, games)
+    market_batch = MarketBatch.from_market(market, company.sector, games)
+    kinds = events.sample_event_types(market.difficulty_settings, games, rng)
+    
+    deltas = events.sample_event_deltas(kinds, None, rng)
+    for delta in deltas:
+        delta.apply(batch, market_batch)
+        
+    assert sum(len(d) for d in deltas) == np.sum(kinds >= 0)
+    untouched = kinds < 0
+    assert np.all(batch.revenue[untouched] == company.revenue)
+    crashed = kinds == [d.name for d in events.EVENT_REGISTRY].index('market_crash')
+    assert np.all(market_batch.growth_rate[crashed] < market.growth_rate - 0.09)
+    assert np.all(market_batch.sector_multiple[crashed] < market.get_sector_multiple(company.sector))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
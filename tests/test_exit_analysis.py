@@ -0,0 +1,163 @@
+"""
+Tests for the exit-now vs. hold grid.
+"""
+
+import copy
+import random
+import numpy as np
+import pytest
+from game.engine import GameEngine
+from simulation import exit_analysis
+
+
+SEED = 5
+
+
+def _pin(company, market):
+    """Give a company fixed operating parameters so exit decisions are deterministic."""
+    company.revenue = 8_000_000
+    company.ebitda_margin = 0.20
+    company.growth_rate = 0.03
+    company.volatility = 0.10
+    company.current_valuation = company.calculate_valuation(market)
+
+
+@pytest.fixture
+def engine():
+    """Game with one levered and one unlevered portfolio company."""
+    random.seed(SEED)
+    np.random.seed(SEED)
+    engine = GameEngine()
+    engine.action_log = None
+    engine.generate_new_deals()
+    for sector, leverage in (('Technology', 0.5), ('Healthcare', 0.0)):
+        listing = engine.available_deals[sector]['local'][0]
+        _pin(listing, engine.market)
+        price = listing.current_valuation
+        engine.perform('acquisition', sector=sector, tier='local', index=0,
+                       price=price, debt=price * leverage)
+    engine.perform('advance_quarter', event_choice=0)
+    
+    # Undo whatever the quarter's events did to the companies
+    for company in engine.player.portfolio:
+        _pin(company, engine.market)
+    return engine
+
+
+def test_exit_grid_shapes_and_exit_now(engine):
+    """Test the grid covers every company and horizon, anchored on today's value."""
+    holds = [0, 2, 4]
+    grid = exit_analysis.exit_grid(engine.player, engine.market,
+                                   engine.time_manager.current_quarter, holds=holds,
+                                   trials=200, seed=3)
+    
+    assert grid['companies'] == [c.name for c in engine.player.portfolio]
+    for key in ('exit_value', 'debt', 'equity_return', 'irr', 'moic'):
+        assert grid[key].shape == (2, 3)
+    assert grid['exit_value'][:, 0].tolist() == pytest.approx(
+        [c.current_valuation for c in engine.player.portfolio]
+    )
+
+
+def test_exit_grid_debt_follows_amortization(engine):
+    """Test projected debt amortizes for the levered company only."""
+    grid = exit_analysis.exit_grid(engine.player, engine.market,
+                                   engine.time_manager.current_quarter, holds=[0, 4],
+                                   trials=50, seed=3)
+    
+    levered, unlevered = grid['debt']
+    book = engine.player.debt_book
+    assert levered[0] == pytest.approx(book.company_balance(engine.player.portfolio[0].acquisition_id))
+    assert levered[1] < levered[0]
+    assert np.all(unlevered == 0.0)
+    
+    # Equity MOIC of the unlevered company is just value over price
+    company = engine.player.portfolio[1]
+    assert grid['moic'][1, 0] == pytest.approx(company.current_valuation / company.acquisition_price)
+
+
+
+def test_exit_advisor_exits_declining_company(engine):
+    """Test a shrinking company is worth more sold today."""
+    company = engine.player.portfolio[1]
+    company.growth_rate = -0.15
+    company.volatility = 0.02
+    
+    result = exit_analysis.optimal_exit(company, engine.player, engine.market,
+                                        horizon=8, trials=500, rng=np.random.default_rng(0))
+    
+    assert result['advice'] == 'exit'
+    assert result['exit_now'] > result['hold_value']
+    assert result['expected_exit_quarter'] == 0.0
+
+
+def test_exit_advisor_holds_compounding_company(engine):
+    """Test a fast-growing company is held and paths exit late."""
+    company = engine.player.portfolio[1]
+    company.growth_rate = 0.08
+    company.volatility = 0.02
+    
+    result = exit_analysis.optimal_exit(company, engine.player, engine.market,
+                                        horizon=8, trials=500, rng=np.random.default_rng(0))
+    
+    assert result['advice'] == 'hold'
+    assert result['hold_value'] > result['exit_now']
+    assert result['exit_probability'].sum() == pytest.approx(1.0)
+    assert result['expected_exit_quarter'] > 4
+
+
+def test_exit_advice_covers_portfolio(engine):
+    """Test the advisor reports on every company with after-tax, net-of-debt values."""
+    advice = exit_analysis.exit_advice(engine.player, engine.market, horizon=4,
+                                       trials=200, seed=1)
+    
+    assert [a['company'] for a in advice] == [c.name for c in engine.player.portfolio]
+    
+    levered = engine.player.portfolio[0]
+    debt = engine.player.debt_book.company_balance(levered.acquisition_id)
+    tax = engine.player.calculate_capital_gains_tax(levered.current_valuation,
+                                                   levered.acquisition_price)
+    assert advice[0]['exit_now'] == pytest.approx(levered.current_valuation - tax - debt)
+
+def test_exit_advice_stacks_many_companies(engine):
+    """Test one stacked simulation gives each company its own slice of paths."""
+    portfolio = engine.player.portfolio
+    unlevered = portfolio[1]
+    for i in range(30):
+        twin = copy.deepcopy(unlevered)
+        twin.name = f"{unlevered.name} {i}"
+        portfolio.append(twin)
+        
+    advice = exit_analysis.exit_advice(engine.player, engine.market, horizon=6,
+                                       trials=400, seed=2)
+    
+    assert [a['company'] for a in advice] == [c.name for c in portfolio]
+    for result in advice:
+        assert result['exit_probability'].shape == (7,)
+        assert result['exit_probability'].sum() == pytest.approx(1.0)
+        
+    # Twins start alike and see separate paths of the same distribution
+    twins = advice[1:]
+    assert all(a['exit_now'] == pytest.approx(twins[0]['exit_now']) for a in twins)
+    hold_values = np.array([a['hold_value'] for a in twins])
+    assert np.ptp(hold_values) > 0
+    assert np.ptp(hold_values) < 0.15 * abs(np.mean(hold_values))
+
+
+def test_sobol_projections_are_tighter(engine):
+    """Test quasi-random exit projections vary less across seeds than pseudo-random ones."""
+    company = engine.player.portfolio[0]
+    
+    def spread(sobol):
+        medians = [exit_analysis.project_exit_values(company, engine.market, [4], 512,
+                                                     np.random.default_rng(seed), sobol)[0]
+                   for seed in range(30)]
+        return np.std(medians)
+        
+    assert spread(True) < spread(False) / 1.2
+    advice = exit_analysis.exit_advice(engine.player, engine.market, trials=256, seed=1, sobol=True)
+    assert len(advice) == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,130 @@
+"""
+Tests for finance utilities.
+"""
+
+from datetime import date
+import math
+import numpy as np
+import pytest
+from models import finance
+
+
+def test_irr_simple_bond():
+    """Test IRR of a par bond equals its coupon."""
+    assert finance.calculate_irr([-100, 10, 10, 110]) == pytest.approx(0.10)
+
+
+def test_irr_fractional_quarters():
+    """Test IRR with fractional quarter offsets."""
+    rate = finance.calculate_irr([-100, 121], quarters=[0, 2.5])
+    assert (1 + rate) ** 2.5 == pytest.approx(1.21)
+
+
+def test_irr_without_sign_change_is_nan():
+    """Test flows with no IRR return NaN instead of a diverged value."""
+    assert math.isnan(finance.calculate_irr([-100, -10]))
+    assert math.isnan(finance.calculate_irr([0, 0, 0]))
+
+
+def test_irr_batch_matches_closed_form():
+    """Test batch IRR on many single-exit streams against the closed form."""
+    rng = np.random.default_rng(0)
+    multiples = rng.uniform(0.05, 4.0, 1000)
+    flows = np.zeros((1000, 21))
+    flows[:, 0] = -1.0
+    flows[:, -1] = multiples
+    
+    rates, converged = finance.calculate_irr_batch(flows)
+    
+    assert converged.all()
+    np.testing.assert_allclose(rates, multiples ** (1 / 20) - 1, atol=1e-9)
+
+
+def test_irr_batch_solves_extreme_multiples():
+    """Test roots beyond the bracketing grid are still found."""
+    rates, converged = finance.calculate_irr_batch([
+        [-1.0, 1000.0],
+        [-1.0, 1e6],
+        [-1.0, 1e-4],
+    ])
+    
+    assert converged.all()
+    np.testing.assert_allclose(rates, [999.0, 1e6 - 1, 1e-4 - 1], rtol=1e-6)
+    
+    # Fractional periods push the log-rate further out
+    assert finance.calculate_irr([-1.0, 1000.0], [0, 0.5]) == pytest.approx(1000.0 ** 2 - 1, rel=1e-6)
+
+
+def test_irr_batch_flags_rows_independently():
+    """Test rows without an IRR are flagged without affecting the others."""
+    rates, converged = finance.calculate_irr_batch([
+        [-100, 10, 10, 110],
+        [100, 10, 10, 10],
+    ])
+    
+    assert converged.tolist() == [True, False]
+    assert rates[0] == pytest.approx(0.10)
+    assert math.isnan(rates[1])
+
+
+def test_irr_batch_multiple_roots_prefers_guess():
+    """Test the root nearest the guess is returned for non-conventional flows."""
+    flows = [[-100, 230, -132]]  # Roots at 10% and 20%
+    
+    low, _ = finance.calculate_irr_batch(flows, guess=0.05)
+    high, _ = finance.calculate_irr_batch(flows, guess=0.25)
+    
+    assert low[0] == pytest.approx(0.10)
+    assert high[0] == pytest.approx(0.20)
+
+
+def test_irr_batch_per_row_periods():
+    """Test per-row period arrays (XIRR-style)."""
+    rates, converged = finance.calculate_irr_batch(
+        [[-100, 110], [-100, 110]],
+        periods=[[0, 1], [0, 2]]
+    )
+    
+    assert converged.all()
+    assert rates[0] == pytest.approx(0.10)
+    assert rates[1] == pytest.approx(1.1 ** 0.5 - 1)
+
+
+def test_xirr_annualizes_by_date():
+    """Test XIRR on dated flows."""
+    rate = finance.calculate_xirr([-1000, 1100], [date(2021, 1, 1), date(2022, 1, 1)])
+    assert rate == pytest.approx(0.10)
+
+
+
+def test_leveraged_returns_batch_matches_solver():
+    """Test the closed-form batch IRR agrees with solving the equity stream."""
+    exit_price = np.array([150.0, 90.0, 250.0])
+    held = np.array([4, 6, 1])
+    
+    equity_return, irr, moic = finance.calculate_leveraged_returns_batch(
+        100.0, exit_price, 60.0, 40.0, held, 0.08
+    )
+    
+    for i in range(3):
+        flows = [-40.0] + [0.0] * (held[i] - 1) + [exit_price[i] - 60.0]
+        assert irr[i] == pytest.approx(finance.calculate_irr(flows) * 4)
+        assert moic[i] == pytest.approx((exit_price[i] - 60.0) / 40.0)
+    assert equity_return[0] == pytest.approx(150 - 60 - 40 - 60 * 0.02 * 4)
+
+
+def test_leveraged_returns_batch_broadcasts_grid():
+    """Test a column of exits and a row of holds give a full grid."""
+    _, irr, moic = finance.calculate_leveraged_returns_batch(
+        100.0, np.array([[50.0], [200.0]]), 80.0, 20.0, np.array([[1, 2, 4]]), 0.06
+    )
+    
+    assert irr.shape == moic.shape == (2, 3)
+    assert np.isnan(irr[0]).all()  # Proceeds do not cover the debt
+    assert (np.diff(irr[1]) < 0).all()  # Same proceeds, longer hold
+    
+    scalar = finance.calculate_leveraged_returns(100.0, 200.0, 80.0, 20.0, 2, 0.06)
+    assert scalar[1] == pytest.approx(irr[1, 1])
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,86 @@
+"""
+Tests for copy-on-write game forks used by what-if analysis.
+"""
+
+import pytest
+from game.engine import GameEngine
+from game import save_system
+
+
+def _state(engine):
+    state = save_system.serialize_game_state(engine)
+    state.pop('timestamp')
+    return state
+
+
+@pytest.fixture
+def engine():
+    """Game with a deal book and one portfolio company."""
+    engine = GameEngine()
+    engine.action_log = None
+    engine.generate_new_deals()
+    listing = engine.available_deals['Technology']['local'][0]
+    engine.perform('acquisition', sector='Technology', tier='local', index=0,
+                   price=listing.current_valuation)
+    engine.perform('advance_quarter')
+    return engine
+
+
+def test_fork_shares_history_until_written(engine):
+    """Test forks share history lists and copy them on first append."""
+    parent_company = engine.player.portfolio[0]
+    child = engine.fork()
+    child_company = child.player.portfolio[0]
+    
+    assert child_company is not parent_company
+    assert child_company.manager is parent_company.manager
+    assert child_company.revenue_history is parent_company.revenue_history
+    assert child.market.interest_rate_history is engine.market.interest_rate_history
+    
+    child.perform('advance_quarter')
+    
+    assert child_company.revenue_history is not parent_company.revenue_history
+    assert len(child_company.revenue_history) == len(parent_company.revenue_history) + 1
+
+
+def test_fork_is_independent(engine):
+    """Test simulating and operating on a fork leaves the parent untouched."""
+    before = _state(engine)
+    
+    child = engine.fork()
+    child.perform('cost_cutting', company=0, intensity=0.9)
+    child.perform('exit', company=0, price=1.0)
+    for _ in range(3):
+        child.perform('advance_quarter')
+        
+    assert _state(engine) == before
+    assert child.time_manager.current_quarter == engine.time_manager.current_quarter + 3
+
+
+def test_acquisition_on_fork_does_not_touch_shared_listing(engine):
+    """Test acquiring a shared listing on a fork does not mutate the parent's copy."""
+    listing = engine.available_deals['Healthcare']['local'][0]
+    
+    child = engine.fork()
+    company = child.perform('acquisition', sector='Healthcare', tier='local', index=0,
+                            price=listing.current_valuation)
+                            
+    assert company is not listing
+    assert listing.acquisition_price is None
+    assert engine.available_deals['Healthcare']['local'][0] is listing
+
+
+def test_what_if_projects_forward(engine):
+    """Test what_if applies actions on a fork and simulates ahead."""
+    before = _state(engine)
+    
+    projection = engine.what_if([('cost_cutting', {'company': 0, 'intensity': 0.5})], quarters=4)
+    
+    assert projection.time_manager.current_quarter == engine.time_manager.current_quarter + 4
+    assert len(projection.player.portfolio[0].revenue_history) == \
+        len(engine.player.portfolio[0].revenue_history) + 4
+    assert _state(engine) == before
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
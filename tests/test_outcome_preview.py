@@ -0,0 +1,189 @@
+"""
+Tests for vectorized batch simulation and operation outcome previews.
+"""
+
+import random
+import numpy as np
+import pytest
+from models.company import Company
+from models.manager import Manager
+from models.market import Market
+from simulation.batch_sim import CompanyBatch, MarketBatch, percentile_bands, normal_draws, paired_interval
+from simulation import outcome_preview, portfolio_ops
+
+
+def _company(history=None):
+    manager = Manager(name="Test", competence=0.7, risk_profile=0.4, cooperativeness=0.6)
+    company = Company("TestCo", "Technology", 10_000_000, 0.20, growth_rate=0.03,
+                      volatility=0.05, manager=manager)
+    if history:
+        company.revenue_history = list(history)
+        company.revenue = history[-1]
+    return company
+
+
+@pytest.mark.parametrize("history", [
+    [100, 110, 121, 133],
+    [100, 104, 108, 112],
+    [100, 100, 100, 100],
+    [100, 99, 98, 97],
+    [100, 90, 80, 70],
+    [100, 110],
+])
+def test_batch_valuation_matches_scalar(history):
+    """Test the vectorized valuation mirrors Company.calculate_valuation."""
+    company = _company(history)
+    market = Market()
+    
+    batch = CompanyBatch.from_company(company, trials=3)
+    market_batch = MarketBatch.from_market(market, company.sector, trials=3)
+    
+    expected = company.calculate_valuation(market)
+    np.testing.assert_allclose(batch.valuation(market_batch), expected)
+    
+    # A full-width window NaN-padded for the missing history (as stacked batches use)
+    window = np.full((3, CompanyBatch.WINDOW), np.nan)
+    window[:, CompanyBatch.WINDOW - len(history):] = history
+    batch.revenue_window = window
+    np.testing.assert_allclose(batch.valuation(market_batch), expected)
+
+
+def test_batch_quarter_matches_scalar_with_no_noise():
+    """Test the company kernel matches the scalar model when all draws are zero."""
+    company = _company()
+    market = Market()
+    batch = CompanyBatch.from_company(company, trials=2)
+    market_batch = MarketBatch.from_market(market, company.sector, trials=2)
+    
+    growth = batch.simulate_quarter(market_batch, np.zeros((3, 2)))
+    
+    expected_growth = company.growth_rate + (0.7 - 0.5) * 0.1 + market.growth_rate
+    np.testing.assert_allclose(growth, expected_growth)
+    np.testing.assert_allclose(batch.revenue, company.revenue * (1 + expected_growth))
+    assert batch.revenue_window.shape == (2, 2)
+
+
+def test_cost_cutting_preview_bands():
+    """Test cost-cutting bands reflect the operation's effects."""
+    company = _company()
+    company.calculate_valuation(Market())
+    
+    preview = outcome_preview.preview_operation(company, Market(), 'cost_cutting',
+                                                intensity=0.8, trials=2000, seed=1)
+    bands = preview['bands']
+    
+    # Health damage is deterministic at high intensity
+    assert bands['health']['p50'] == pytest.approx(company.operational_health - 0.8 * 0.25)
+    assert bands['margin']['p50'] > company.ebitda_margin
+    assert bands['growth']['p90'] < company.growth_rate
+    assert bands['valuation']['p10'] <= bands['valuation']['p50'] <= bands['valuation']['p90']
+    assert 'cost' not in bands
+
+
+@pytest.mark.parametrize("operation, params, apply", [
+    ('cost_cutting', {'intensity': 0.9}, lambda c: portfolio_ops.apply_cost_cutting(c, 0.9)),
+    ('capex', {'amount': 800_000}, lambda c: portfolio_ops.apply_capex_investment(c, 800_000)),
+    ('strategy', {'strategy': 'roll_up'}, lambda c: portfolio_ops.pursue_acquisition_strategy(c, 'roll_up')),
+])
+def test_sampled_effects_match_the_game(operation, params, apply):
+    """Test sampled operation effects have the distribution the game applies."""
+    random.seed(8)
+    trials = 4000
+    
+    applied = {'margin': [], 'growth': [], 'health': [], 'revenue': [], 'volatility': []}
+    for _ in range(trials):
+        company = _company()
+        company.operational_health = 0.6
+        apply(company)
+        for key, value in zip(applied, (company.ebitda_margin, company.growth_rate,
+                                        company.operational_health, company.revenue,
+                                        company.volatility)):
+            applied[key].append(value)
+            
+    company = _company()
+    company.operational_health = 0.6
+    batch = CompanyBatch.from_company(company, trials)
+    outcome_preview.sample_operation(batch, operation, params, np.random.default_rng(8))
+    sampled = (batch.ebitda_margin, batch.growth_rate, batch.operational_health,
+               batch.revenue, batch.volatility)
+    
+    for key, values in zip(applied, sampled):
+        expected = np.array(applied[key])
+        tolerance = 5 * expected.std() * np.sqrt(2 / trials) + 1e-12
+        assert values.mean() == pytest.approx(expected.mean(), abs=tolerance), key
+
+
+def test_strategy_preview_reports_cost():
+    """Test roll-up previews include the cost distribution."""
+    company = _company()
+    
+    preview = outcome_preview.preview_operation(company, Market(), 'strategy',
+                                                strategy='roll_up', trials=2000, seed=1)
+                                                
+    cost = preview['bands']['cost']
+    assert company.revenue * 1.5 <= cost['p10'] <= cost['p90'] <= company.revenue * 2.0
+
+
+def test_preview_is_reproducible_and_pure():
+    """Test seeded previews repeat exactly and leave the company untouched."""
+    company = _company()
+    before = (company.revenue, company.ebitda_margin, company.growth_rate, company.operational_health)
+    
+    first = outcome_preview.preview_operation(company, Market(), 'capex', amount=1_000_000, seed=7)
+    second = outcome_preview.preview_operation(company, Market(), 'capex', amount=1_000_000, seed=7)
+    
+    assert first == second
+    assert (company.revenue, company.ebitda_margin, company.growth_rate,
+            company.operational_health) == before
+
+
+def test_percentile_bands():
+    """Test percentile band labels and ordering."""
+    bands = percentile_bands(np.arange(101), percentiles=(5, 50, 95))
+    assert bands == {'p5': 5.0, 'p50': 50.0, 'p95': 95.0}
+
+
+def test_antithetic_draws_and_paired_interval():
+    """Test antithetic draws mirror each other and intervals treat each pair as one sample."""
+    z = normal_draws(np.random.default_rng(0), (3, 6), antithetic=True)
+    np.testing.assert_array_equal(z[:, 3:], -z[:, :3])
+    with pytest.raises(ValueError):
+        normal_draws(np.random.default_rng(0), (3, 5), antithetic=True)
+        
+    values = np.array([1.0, 4.0, 2.0, 3.0, 0.0, 6.0])
+    interval = paired_interval(values, antithetic=True, confidence=0.95)
+    pair_means = np.array([2.0, 2.0, 4.0])
+    assert interval['mean'] == pytest.approx(values.mean())
+    assert interval['stderr'] == pytest.approx(pair_means.std(ddof=1) / np.sqrt(3))
+    assert interval['high'] - interval['mean'] == pytest.approx(1.959964 * interval['stderr'])
+
+
+def test_compare_operations_on_common_random_numbers():
+    """Test arms share their shocks, so differences are far tighter than independent runs."""
+    company = _company()
+    arms = {
+        'hold': {'operation': None},
+        'same': {'operation': None},
+        'capex': {'operation': 'capex', 'amount': 1_000_000},
+        'cut': {'operation': 'cost_cutting', 'intensity': 0.5}
+    }
+    
+    result = outcome_preview.compare_operations(company, Market(), arms, trials=2001, seed=3)
+    
+    assert result['trials'] == 2002
+    assert result['differences']['same']['mean'] == 0.0
+    assert result['differences']['same']['stderr'] == 0.0
+    capex = result['differences']['capex']
+    assert capex['low'] <= capex['mean'] <= capex['high']
+    assert capex['mean'] > 0
+    assert capex['variance_reduction'] > 10
+    assert result['differences']['cut']['variance_reduction'] > 10
+    assert outcome_preview.compare_operations(company, Market(), arms, trials=2001, seed=3) == result
+    
+    # The paired standard error is honest against a much larger run
+    reference = outcome_preview.compare_operations(company, Market(), arms, trials=40_000, seed=4)
+    assert abs(reference['differences']['capex']['mean'] - capex['mean']) < 5 * capex['stderr']
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
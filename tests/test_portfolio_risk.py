@@ -0,0 +1,173 @@
+"""
+Tests for portfolio tail risk and importance-sampled stress tests.
+"""
+
+import random
+import numpy as np
+import pytest
+import config
+from game.engine import GameEngine
+from game import events
+from simulation import portfolio_risk
+from simulation.portfolio_risk import PortfolioPaths, DebtPaths
+
+
+def _engine_with_portfolio(sectors=2):
+    random.seed(2)
+    engine = GameEngine()
+    engine.action_log = None
+    engine.generate_new_deals()
+    engine.player.cash = 1e15
+    for sector in list(engine.available_deals)[:sectors]:
+        listing = engine.available_deals[sector]['regional'][0]
+        engine.perform('acquisition', sector=sector, tier='regional', index=0,
+                       price=listing.current_valuation)
+    return engine
+
+
+def test_outcome_probabilities_tilt():
+    """Test the proposal boosts stressed kinds, stays normalized and respects the cap."""
+    settings = config.DIFFICULTY_SETTINGS['medium']
+    nominal = portfolio_risk.outcome_probabilities(settings)
+    names = ['none'] + [d.name for d in events.EVENT_REGISTRY]
+    crisis, crash = names.index('company_crisis'), names.index('market_crash')
+    
+    assert nominal.sum() == pytest.approx(1.0)
+    assert 1 - nominal[0] == pytest.approx(config.EVENT_PROBABILITY)
+    
+    tilted = portfolio_risk.outcome_probabilities(settings, {'company_crisis': 3.0, 'market_crash': 2.0})
+    assert tilted.sum() == pytest.approx(1.0)
+    assert tilted[crisis] == pytest.approx(3 * nominal[crisis])
+    assert tilted[crash] == pytest.approx(2 * nominal[crash])
+    others = [i for i in range(len(names)) if i not in (crisis, crash)]
+    assert tilted[others] / nominal[others] == pytest.approx(np.full(len(others), tilted[0] / nominal[0]))
+    
+    capped = portfolio_risk.outcome_probabilities(settings, {'company_crisis': 1000.0})
+    assert capped[crisis] == pytest.approx(config.STRESS_TEST_MAX_SHARE)
+
+
+def test_tail_risk_weighted_estimates():
+    """Test VaR/ES on equal weights, and that a weight of 2 counts like a duplicate trial."""
+    losses = np.arange(1.0, 101.0)
+    risk = portfolio_risk.tail_risk(losses, confidence=0.95)
+    assert risk['var'] == 96.0
+    assert risk['expected_shortfall'] == pytest.approx(np.mean(losses[-5:]))
+    
+    rng = np.random.default_rng(0)
+    sample = rng.normal(size=500)
+    weights = rng.integers(1, 4, 500).astype(float)
+    duplicated = np.repeat(sample, weights.astype(int))
+    weighted = portfolio_risk.tail_risk(sample, weights * len(sample) / weights.sum(), confidence=0.9)
+    plain = portfolio_risk.tail_risk(duplicated, confidence=0.9)
+    assert weighted['var'] == pytest.approx(plain['var'])
+    assert weighted['expected_shortfall'] == pytest.approx(plain['expected_shortfall'])
+    assert weighted['effective_trials'] < len(sample)
+
+
+def test_companies_share_market_paths():
+    """Test companies in one sector see the same market, and events hit one company per trial."""
+    engine = _engine_with_portfolio(sectors=1)
+    company = engine.player.portfolio[0]
+    engine.player.portfolio.append(company.fork())
+    paths = PortfolioPaths(engine.player.portfolio, engine.market, trials=500)
+    
+    rng = np.random.default_rng(1)
+    for _ in range(3):
+        paths.step(rng)
+        
+    market = paths._company_market()
+    assert paths.market.growth_rate.shape == (500,)
+    assert np.array_equal(market.growth_rate[:500], market.growth_rate[500:])
+    assert paths.valuations().shape == (2, 500)
+    assert not np.array_equal(paths.batch.revenue[:500], paths.batch.revenue[500:])
+
+
+def test_market_shift_moves_interest_rate():
+    """Test a market shift's rate change reaches each trial's debt rate once."""
+    engine = _engine_with_portfolio(sectors=2)
+    paths = PortfolioPaths(engine.player.portfolio, engine.market, trials=1000)
+    start = paths.interest_rate.copy()
+    shift = [d.name for d in events.EVENT_REGISTRY].index('market_shift') + 1
+    weights = np.zeros(len(events.EVENT_REGISTRY) + 1)
+    weights[shift] = 1.0
+    
+    drawn = paths.step(np.random.default_rng(4), events.AliasTable(weights),
+                       shocks=np.zeros((paths.shock_dimensions, 1000)))
+    
+    assert np.all(drawn == shift)
+    change = paths.interest_rate - start
+    assert np.all(np.abs(change) <= 0.01 + 1e-12)
+    assert change.std() == pytest.approx(0.02 / np.sqrt(12), rel=0.1)
+
+
+def test_stress_test_is_unbiased():
+    """Test oversampled, reweighted runs agree with a large plain Monte Carlo run."""
+    engine = _engine_with_portfolio()
+    player, market = engine.player, engine.market
+    
+    plain = portfolio_risk.simulate_portfolio(player, market, 4, 100_000, np.random.default_rng(0))
+    truth = portfolio_risk.tail_risk(-plain['net_worth_change'], confidence=0.99)
+    
+    boosts = {'company_crisis': 4.0, 'market_crash': 2.0}
+    tilted = portfolio_risk.simulate_portfolio(player, market, 4, 100_000, np.random.default_rng(1), boosts)
+    assert tilted['weights'].mean() == pytest.approx(1.0, abs=0.03)
+    
+    stressed = portfolio_risk.stress_test(player, market, trials=10_000, confidence=0.99, seed=2)
+    assert stressed['boosts']['company_crisis'] > 1.0
+    assert stressed['trials'] == 10_000 - int(10_000 * config.STRESS_TEST_PILOT_SHARE)
+    assert stressed['var'] == pytest.approx(truth['var'], rel=0.1)
+    assert stressed['expected_shortfall'] == pytest.approx(truth['expected_shortfall'], rel=0.1)
+    stressed_outcomes = [1 + i for i, d in enumerate(events.EVENT_REGISTRY)
+                         if d.name in portfolio_risk.STRESSED_EVENTS]
+    assert stressed['stressed_share'] > np.mean(plain['event_counts'][stressed_outcomes].sum(axis=0) > 0)
+
+
+def test_debt_paths_match_player_service():
+    """Test one quarter of path debt service matches Player.service_debt, including capitalized interest."""
+    for cash in (1e9, 1e5):
+        engine = _engine_with_portfolio(sectors=1)
+        player = engine.player
+        player.cash = 0.0
+        player.take_debt(5e7)
+        player.cash = cash
+        paths = DebtPaths(player, trials=3)
+        
+        interest, unpaid = paths.service(np.full(3, 0.08))
+        serviced = player.service_debt(0.08)
+        
+        assert interest == pytest.approx(np.full(3, serviced['paid'] + serviced['unpaid']))
+        assert unpaid == pytest.approx(np.full(3, serviced['unpaid']))
+        assert paths.cash == pytest.approx(np.full(3, player.cash))
+        assert paths.balance.sum(axis=0) + paths.capitalized == pytest.approx(np.full(3, player.current_debt))
+        assert (serviced['unpaid'] > 0) == (cash < 1e6)
+
+
+def test_risk_report_horizons_and_contributions():
+    """Test the dashboard reports every horizon and splits the shortfall by source."""
+    engine = _engine_with_portfolio(sectors=3)
+    player = engine.player
+    player.take_debt(2e7)
+    player.cash = 0.0
+    
+    report = portfolio_risk.risk_report(player, engine.market, quarters=4, trials=4000, seed=0)
+    
+    assert [h['quarter'] for h in report['horizons']] == [1, 2, 3, 4]
+    assert report['horizons'][-1]['var'] > report['horizons'][0]['var']
+    assert all(h['expected_shortfall'] >= h['var'] for h in report['horizons'])
+    assert sum(amount for _, amount in report['contributions']) == pytest.approx(
+        report['horizons'][-1]['expected_shortfall'], rel=1e-6)
+    assert 'Debt interest' in [name for name, _ in report['contributions']]
+    # No cash at all: interest goes unpaid on every path
+    assert report['horizons'][0]['miss_probability'] == 1.0
+    
+    player.cash = 1e12
+    report = portfolio_risk.risk_report(player, engine.market, quarters=2, trials=500, seed=0)
+    assert all(h['miss_probability'] == 0.0 for h in report['horizons'])
+    
+    sobol = portfolio_risk.risk_report(player, engine.market, quarters=2, trials=512, seed=0, sobol=True)
+    assert sobol == portfolio_risk.risk_report(player, engine.market, quarters=2, trials=512, seed=0, sobol=True)
+    assert sobol['horizons'][1]['var'] == pytest.approx(report['horizons'][1]['var'], rel=0.5)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
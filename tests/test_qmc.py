@@ -0,0 +1,73 @@
+"""
+Tests for the scrambled Sobol sampler.
+"""
+
+from collections import Counter
+from statistics import NormalDist
+import numpy as np
+import pytest
+from simulation import qmc, stochastic
+from simulation.qmc import SobolSampler
+
+
+def test_primitive_polynomials_and_unscrambled_points():
+    """Test the polynomial counts per degree and the classic first Sobol points."""
+    degrees = Counter(degree for degree, _ in qmc.primitive_polynomials(52))
+    assert [degrees[d] for d in range(1, 9)] == [1, 1, 2, 2, 6, 6, 18, 16]
+    assert qmc.primitive_polynomials(4) == ((1, 0b11), (2, 0b111), (3, 0b1011), (3, 0b1101))
+    
+    points = SobolSampler(2, scramble=False).random(8) - 0.5 / 2 ** qmc.BITS
+    np.testing.assert_allclose(points[:, 0], [0, 0.5, 0.75, 0.25, 0.375, 0.875, 0.625, 0.125])
+    np.testing.assert_allclose(points[:, 1], [0, 0.5, 0.25, 0.75, 0.375, 0.875, 0.125, 0.625])
+
+
+def test_scrambled_points_stay_balanced():
+    """Test every dimension is stratified, and the first two dimensions jointly, after scrambling."""
+    sampler = SobolSampler(40, rng=np.random.default_rng(0))
+    points = sampler.random(256)
+    
+    assert ((points > 0) & (points < 1)).all()
+    for d in range(40):
+        assert (np.bincount((points[:, d] * 64).astype(int), minlength=64) == 4).all()
+    cells = (points[:, 0] * 16).astype(int) * 16 + (points[:, 1] * 16).astype(int)
+    assert (np.bincount(cells, minlength=256) == 1).all()
+    
+    # Continuing the sequence matches one longer run
+    again = SobolSampler(40, rng=np.random.default_rng(0))
+    np.testing.assert_array_equal(np.vstack([again.random(100), again.random(156)]), points)
+
+
+def test_normal_draws():
+    """Test the inverse CDF and the Generator-style normal draws."""
+    u = np.array([1e-9, 0.001, 0.02425, 0.3, 0.5, 0.9, 0.99999])
+    expected = [NormalDist().inv_cdf(p) for p in u]
+    assert qmc.norm_ppf(u) == pytest.approx(expected, rel=1e-8)
+    
+    sampler = SobolSampler(12, rng=np.random.default_rng(1))
+    z = sampler.standard_normal((4096, 3, 4), dtype=np.float32)
+    assert z.shape == (4096, 3, 4) and z.dtype == np.float32
+    assert z.mean() == pytest.approx(0.0, abs=1e-3)
+    assert z.std() == pytest.approx(1.0, abs=1e-3)
+    with pytest.raises(ValueError):
+        sampler.standard_normal((16, 5))
+
+
+def test_sobol_paths_converge_faster():
+    """Test a sampler drops into the path generators and beats pseudo-random error several times over."""
+    drift, volatility, steps, paths = 0.02, 0.1, 8, 1024
+    exact = 100 * (1 + drift - 0.5 * volatility ** 2) ** steps
+    
+    def error(rng):
+        final = stochastic.geometric_brownian_motion_paths(100, drift, volatility, steps, paths, rng=rng)[:, -1]
+        return final.mean() - exact
+        
+    pseudo = [error(np.random.default_rng(seed)) for seed in range(20)]
+    sobol = [error(SobolSampler(steps, rng=np.random.default_rng(seed))) for seed in range(20)]
+    assert np.sqrt(np.mean(np.square(sobol))) < np.sqrt(np.mean(np.square(pseudo))) / 5
+    
+    mixed = qmc.normal_matrix(64, 10, np.random.default_rng(2), max_sobol=4)
+    assert mixed.shape == (64, 10)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
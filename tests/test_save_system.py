@@ -0,0 +1,250 @@
+"""
+Tests for the save/load system.
+"""
+
+import json
+import pytest
+from game.engine import GameEngine
+from game import save_system
+from game.save_system import GameSaver
+from game import autosave
+from models.company import Company
+from simulation import procedural_gen
+
+
+@pytest.fixture
+def saves_dir(tmp_path, monkeypatch):
+    """Redirect saves to a temporary directory."""
+    monkeypatch.setattr(save_system, 'SAVES_DIR', tmp_path)
+    return tmp_path
+
+
+def test_save_updates_index(saves_dir):
+    """Test saving writes a header into the index manifest."""
+    engine = GameEngine()
+    engine.time_manager.advance_quarter()
+    
+    assert GameSaver.save(engine, "slot1")
+    
+    index = GameSaver.read_index()
+    assert "slot1" in index
+    assert index["slot1"]['current_quarter'] == 1
+    assert (saves_dir / "slot1.json").exists()
+    
+    saves = GameSaver.list_saves()
+    assert [name for name, _, _ in saves] == ["slot1"]
+
+
+def test_list_saves_uses_index_without_parsing(saves_dir):
+    """Test indexed saves are listed from their header, not their body."""
+    engine = GameEngine()
+    GameSaver.save(engine, "slot1")
+    
+    # A header that disagrees with the body proves the body was not read
+    index = GameSaver.read_index()
+    index["slot1"]['timestamp'] = "from-index"
+    GameSaver.write_index(index)
+    
+    saves = GameSaver.list_saves()
+    assert saves[0][1] == "from-index"
+
+
+def test_list_saves_repairs_index(saves_dir):
+    """Test unindexed saves are parsed once and added to the index."""
+    engine = GameEngine()
+    state = save_system.serialize_game_state(engine)
+    with open(saves_dir / "legacy.json", 'w') as f:
+        json.dump(state, f)
+        
+    saves = GameSaver.list_saves()
+    
+    assert saves[0][0] == "legacy"
+    assert "legacy" in GameSaver.read_index()
+
+
+def test_save_named_index_keeps_manifest(saves_dir):
+    """Test a save called 'index' neither clobbers nor hides behind the manifest."""
+    engine = GameEngine()
+    
+    assert GameSaver.save(engine, "index")
+    assert GameSaver.save(engine, "slot1")
+    
+    assert set(GameSaver.read_index()) == {"index", "slot1"}
+    assert sorted(name for name, _, _ in GameSaver.list_saves()) == ["index", "slot1"]
+    assert GameSaver.load("index", GameEngine())
+
+
+def test_delete_removes_index_entry(saves_dir):
+    """Test deleting a save removes it from the index."""
+    engine = GameEngine()
+    GameSaver.save(engine, "slot1")
+    
+    assert GameSaver.delete("slot1")
+    
+    assert "slot1" not in GameSaver.read_index()
+    assert GameSaver.list_saves() == []
+
+
+def test_save_load_round_trip(saves_dir):
+    """Test tiered deals and portfolio survive a save/load cycle."""
+    engine = GameEngine()
+    engine.available_deals = procedural_gen.generate_tiered_deal_portfolio(engine.market)
+    company = engine.available_deals['Technology']['local'][0]
+    engine.player.add_company(company)
+    engine.player.cash = 1_234_567
+    GameSaver.save(engine, "slot1")
+    
+    restored = GameEngine()
+    assert GameSaver.load("slot1", restored)
+    
+    assert restored.player.cash == 1_234_567
+    assert restored.player.portfolio[0].name == company.name
+    assert set(restored.available_deals) == set(engine.available_deals)
+    assert (len(restored.available_deals['Technology']['local']) ==
+            len(engine.available_deals['Technology']['local']))
+
+
+def test_autosave_writes_in_background(saves_dir):
+    """Test autosave snapshots are written and indexed by the worker thread."""
+    engine = GameEngine()
+    saver = autosave.AutoSaver()
+    
+    saver.snapshot(engine)
+    assert saver.flush(timeout=5)
+    saver.close(timeout=5)
+    
+    assert saver.last_error is None
+    assert (saves_dir / "autosave.json").exists()
+    assert "autosave" in GameSaver.read_index()
+    assert not list(saves_dir.glob("*.tmp"))
+
+
+def test_autosave_snapshot_is_isolated(saves_dir):
+    """Test the snapshot does not share mutable state with the live game."""
+    engine = GameEngine()
+    state = save_system.serialize_game_state(engine)
+    
+    engine.market.interest_rate_history.append(0.99)
+    engine.player.record_deal('acquisition', 'X', 1.0, 0)
+    
+    assert 0.99 not in state['market']['interest_rate_history']
+    assert state['player']['deal_history'] == []
+
+
+def test_autosave_recovery_replays_journal(saves_dir):
+    """Test recovery restores the snapshot and replays journaled actions."""
+    engine = GameEngine()
+    engine.generate_new_deals()
+    engine.autosaver = autosave.AutoSaver()
+    engine.autosaver.snapshot(engine)
+    engine.autosaver.flush(timeout=5)
+    
+    # Acquire after the snapshot - only the journal knows about it
+    listing = engine.available_deals['Healthcare']['regional'][0]
+    company = engine.perform('acquisition', sector='Healthcare', tier='regional', index=0,
+                             price=listing.current_valuation)
+    engine._journal_action('acquisition', companies=[company],
+                           deals_removed=[('Healthcare', 'regional', company.listing_id)])
+    engine.autosaver.close(timeout=5)
+    
+    # Simulate a torn write from a crash mid-append
+    with open(engine.autosaver.journal.path, 'a') as f:
+        f.write('{"seq": 2, "act')
+        
+    restored = GameEngine()
+    assert autosave.recover(restored)
+    
+    assert restored.player.cash == pytest.approx(engine.player.cash)
+    assert [c.name for c in restored.player.portfolio] == [company.name]
+    restored_names = [c.name for c in restored.available_deals['Healthcare']['regional']]
+    assert len(restored_names) == len(engine.available_deals['Healthcare']['regional'])
+
+
+def test_autosave_truncates_journal(saves_dir):
+    """Test a written snapshot drops the journal records it covers."""
+    engine = GameEngine()
+    saver = autosave.AutoSaver()
+    saver.journal.append('exit', 0, engine.player)
+    
+    saver.snapshot(engine)
+    saver.flush(timeout=5)
+    saver.close(timeout=5)
+    
+    assert saver.journal.read() == []
+
+
+
+def test_journal_records_only_what_changed(saves_dir, monkeypatch):
+    """Test journal records are deltas, fsynced off the main thread."""
+    import threading
+    
+    synced_on = []
+    real_fsync = autosave.os.fsync
+    def recording_fsync(fd):
+        synced_on.append(threading.current_thread().name)
+        real_fsync(fd)
+    monkeypatch.setattr(autosave.os, 'fsync', recording_fsync)
+    
+    engine = GameEngine()
+    for _ in range(3):
+        engine.player.ledger.record('capex', -100_000.0)
+    engine.autosaver = autosave.AutoSaver()
+    engine.autosaver.snapshot(engine)
+    
+    engine.perform('financing', amount=250_000, debt=0)
+    engine._journal_action('capex')
+    engine.autosaver.close(timeout=5)
+    
+    record, = engine.autosaver.journal.read()
+    assert record['player'] == {'cash': engine.player.cash}
+    assert len(record['ledger_entries']) == 1
+    assert 'ledger' not in record and 'debt_book' not in record
+    assert synced_on and 'MainThread' not in synced_on
+    
+    restored = GameEngine()
+    assert autosave.recover(restored)
+    assert restored.player.cash == pytest.approx(engine.player.cash)
+    assert len(restored.player.ledger.entries) == len(engine.player.ledger.entries)
+
+
+def test_journal_replay_matches_holdings_by_id(saves_dir):
+    """Test replayed after-images and exits find their company even when names repeat."""
+    engine = GameEngine()
+    for revenue in (10_000_000, 20_000_000):
+        engine.player.add_company(Company(name="Acme", sector="Technology", revenue=revenue,
+                                          ebitda_margin=0.2))
+    first, second = engine.player.portfolio
+    saver = autosave.AutoSaver()
+    second.revenue = 25_000_000
+    saver.journal.append('capex', 0, engine.player, companies=[second])
+    saver.journal.append('exit', 0, engine.player, removed=[first.acquisition_id])
+    saver.close(timeout=5)
+    
+    restored = GameEngine()
+    save_system.deserialize_game_state(save_system.serialize_game_state(engine), restored)
+    restored.player.portfolio[1].revenue = 20_000_000
+    for record in saver.journal.read():
+        autosave.apply_journal_record(record, restored)
+        
+    assert [(c.acquisition_id, c.revenue) for c in restored.player.portfolio] == [
+        (second.acquisition_id, 25_000_000)
+    ]
+
+
+def test_journal_skips_deals_missing_from_book(saves_dir):
+    """Test replaying a deal removal for a sector or tier not in the book is a no-op."""
+    engine = GameEngine()
+    engine.available_deals = {'Technology': {'local': []}}
+    saver = autosave.AutoSaver()
+    saver.journal.append('acquisition', 0, engine.player,
+                         deals_removed=[('Healthcare', 'regional', 0), ('Technology', 'global', 1)])
+    saver.close(timeout=5)
+    
+    record, = saver.journal.read()
+    autosave.apply_journal_record(record, engine)
+    
+    assert engine.available_deals == {'Technology': {'local': []}}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,90 @@
+"""
+Tests for the vectorized stochastic path generators.
+"""
+
+import random
+import numpy as np
+import pytest
+from simulation import stochastic
+
+
+def test_paths_match_scalar_processes_without_noise():
+    """Test each path generator follows its scalar process when volatility is zero."""
+    rng = np.random.default_rng(0)
+    
+    walk = stochastic.random_walk_paths(10.0, 0.5, 0.0, 6, n_paths=3, rng=rng)
+    assert walk.shape == (3, 7)
+    np.testing.assert_allclose(walk[1], stochastic.random_walk(10.0, 0.5, 0.0, 6))
+    
+    gbm = stochastic.geometric_brownian_motion_paths(100.0, 0.05, 0.0, 6, n_paths=2, dt=0.25, rng=rng)
+    np.testing.assert_allclose(gbm[0], stochastic.geometric_brownian_motion(100.0, 0.05, 0.0, 6, dt=0.25))
+    
+    ou = stochastic.mean_reverting_paths(0.10, 0.04, 0.3, 0.0, 8, n_paths=2, rng=rng)
+    np.testing.assert_allclose(ou[1], stochastic.mean_reverting_process(0.10, 0.04, 0.3, 0.0, 8))
+    
+    cycle = stochastic.market_cycle_paths(16, n_paths=50_000, rng=rng)
+    expected = 0.02 + 0.03 * np.sin(2 * np.pi * np.arange(16) / 16)
+    np.testing.assert_allclose(cycle.mean(axis=0), expected, atol=0.001)
+
+
+def test_path_statistics_and_absorbing_zero():
+    """Test walk increments have the requested moments and GBM paths stay at zero once there."""
+    rng = np.random.default_rng(1)
+    walk = stochastic.random_walk_paths(0.0, 0.1, 2.0, 5, n_paths=100_000, rng=rng)
+    increments = np.diff(walk, axis=1)
+    assert increments.mean() == pytest.approx(0.1, abs=0.01)
+    assert increments.std() == pytest.approx(2.0, rel=0.01)
+    
+    gbm = stochastic.geometric_brownian_motion_paths(1.0, 0.0, 1.5, 20, n_paths=1000, rng=rng)
+    assert gbm.min() >= 0
+    hit = gbm[:, :-1] == 0
+    assert hit.any()
+    assert (gbm[:, 1:][hit] == 0).all()
+
+
+def test_correlated_walk_uses_requested_correlation():
+    """Test every pair of series has the requested correlation, for a scalar or a full matrix."""
+    rng = np.random.default_rng(2)
+    paths = stochastic.correlated_random_walk_paths([0.0, 5.0, 10.0], 0.6, 0.0, 1.0, 20, n_paths=5000, rng=rng)
+    assert paths.shape == (5000, 3, 21)
+    assert paths[:, :, 0].tolist() == [[0.0, 5.0, 10.0]] * 5000
+    
+    increments = np.diff(paths, axis=2).transpose(1, 0, 2).reshape(3, -1)
+    expected = np.full((3, 3), 0.6)
+    np.fill_diagonal(expected, 1.0)
+    np.testing.assert_allclose(np.corrcoef(increments), expected, atol=0.02)
+    
+    matrix = np.array([[1.0, -0.5], [-0.5, 1.0]])
+    pair = stochastic.correlated_random_walk_paths([0.0, 0.0], matrix, 0.0, 1.0, 20, n_paths=5000, rng=rng)
+    pair_increments = np.diff(pair, axis=2).transpose(1, 0, 2).reshape(2, -1)
+    assert np.corrcoef(pair_increments)[0, 1] == pytest.approx(-0.5, abs=0.02)
+    
+    with pytest.raises(ValueError):
+        stochastic.correlated_random_walk_paths([0.0, 0.0, 0.0], -0.9, 0.0, 1.0, 5, n_paths=1, rng=rng)
+        
+    # Perfect correlation is singular but valid: the series move in lockstep
+    lockstep = stochastic.correlated_random_walk_paths([1.0, 2.0], 1.0, 0.0, 0.1, 10, n_paths=50, rng=rng)
+    np.testing.assert_allclose(lockstep[:, 1] - lockstep[:, 0], 1.0)
+    assert len(stochastic.correlated_random_walk([1.0, 2.0], 1.0, 0.0, 0.1, 3)) == 2
+
+
+def test_float32_and_reproducibility():
+    """Test float32 output, seeded repeatability, and that scalar walks follow the global seed."""
+    paths = stochastic.mean_reverting_paths(0.05, 0.04, 0.2, 0.01, 10, n_paths=100,
+                                            rng=np.random.default_rng(3), dtype=np.float32)
+    again = stochastic.mean_reverting_paths(0.05, 0.04, 0.2, 0.01, 10, n_paths=100,
+                                            rng=np.random.default_rng(3), dtype=np.float32)
+    assert paths.dtype == np.float32
+    np.testing.assert_array_equal(paths, again)
+    assert stochastic.correlated_random_walk_paths([1.0], 0.0, 0.0, 1.0, 4, n_paths=2,
+                                                   dtype=np.float32).dtype == np.float32
+                                                   
+    random.seed(4)
+    first = stochastic.correlated_random_walk([1.0, 2.0], 0.3, 0.0, 1.0, 5)
+    random.seed(4)
+    assert stochastic.correlated_random_walk([1.0, 2.0], 0.3, 0.0, 1.0, 5) == first
+    assert len(first) == 2 and len(first[0]) == 6
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
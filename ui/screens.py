@@ -6,6 +6,7 @@ from rich.console import Console
 from rich.panel import Panel
 from rich.text import Text
 from rich.align import Align
+import math
 import time
 import random
 import json
@@ -239,6 +240,10 @@ def show_endgame_summary(player: Player, time_manager: TimeManager) -> None:
     else:
         annualized_return = 0
         
+    # Fund metrics from the capital-flow ledger
+    fund = player.fund_metrics(time_manager.current_quarter)
+    fund_irr = "n/a" if math.isnan(fund['irr']) else f"{fund['irr']:.1%}"
+    
     # Results panel
     difficulty_settings = config.DIFFICULTY_SETTINGS.get(player.difficulty, config.DIFFICULTY_SETTINGS['medium'])
     tax_rate = difficulty_settings['capital_gains_tax_rate']
@@ -254,6 +259,14 @@ FINANCIAL PERFORMANCE:
   Return Multiple:      {return_multiple:>15.2f}x
   Annualized Return:    {annualized_return:>15.1%}
 
+FUND METRICS:
+  Equity Paid In:       ${fund['paid_in']:>15,.0f}
+  Net Distributions:    ${fund['distributed']:>15,.0f}
+  TVPI:                 {fund['tvpi']:>15.2f}x
+  DPI:                  {fund['dpi']:>15.2f}x
+  RVPI:                 {fund['rvpi']:>15.2f}x
+  Fund IRR:             {fund_irr:>15}
+
 PORTFOLIO:
   Companies Owned:      {len(player.portfolio):>15}
   Portfolio Value:      ${player.compute_portfolio_value():>15,.0f}
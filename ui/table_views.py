@@ -2,7 +2,9 @@
 Table views - formatted displays using rich library.
 """
 
-from typing import List
+from typing import List, Dict, Any
+import math
+import numpy as np
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
@@ -126,8 +128,153 @@ def display_portfolio(companies: List[Company]) -> None:
         print("=" * 70)
 
 
-def display_company_detail(company: Company) -> None:
-    """Display detailed information about a company."""
+def display_exit_grid(grid: Dict[str, Any]) -> None:
+    """
+    Display "exit now vs. hold" outcomes for every portfolio company.
+    
+    Args:
+        grid: Result of simulation.exit_analysis.exit_grid
+    """
+    if not grid['companies']:
+        return
+        
+    table = Table(title="Exit Now vs. Hold (projected value, equity MOIC and IRR)", show_lines=True)
+    table.add_column("Company", style="cyan")
+    for hold in grid['holds']:
+        table.add_column("Exit Now" if hold == 0 else f"Hold {hold}Q", justify="right")
+        
+    for i, name in enumerate(grid['companies']):
+        irr_row = grid['irr'][i]
+        best = int(np.nanargmax(irr_row)) if not np.isnan(irr_row).all() else None
+        
+        cells = []
+        for j in range(len(grid['holds'])):
+            irr = irr_row[j]
+            irr_text = "n/a" if np.isnan(irr) else f"{irr:.0%}"
+            cell = f"${grid['exit_value'][i, j]:,.0f}\n{grid['moic'][i, j]:.2f}x\nIRR {irr_text}"
+            if j == best:
+                cell = f"[bold green]{cell}[/bold green]"
+            cells.append(cell)
+        table.add_row(name, *cells)
+        
+    console.print(table)
+
+
+def display_exit_advice(advice: List[Dict[str, Any]]) -> None:
+    """
+    Display the exit advisor's hold-vs-exit valuation for each company.
+    
+    Args:
+        advice: Result of simulation.exit_analysis.exit_advice
+    """
+    if not advice:
+        return
+        
+    table = Table(title="Exit Advisor (after-tax equity value, net of company loans)")
+    table.add_column("Company", style="cyan")
+    table.add_column("Exit Now", justify="right")
+    table.add_column("Value of Holding", justify="right")
+    table.add_column("Advice", justify="center")
+    table.add_column("Expected Exit", justify="right")
+    
+    for result in advice:
+        if result['advice'] == 'exit':
+            advice_str = "[bold yellow]EXIT[/bold yellow]"
+            timing = "now"
+        else:
+            advice_str = "[bold green]HOLD[/bold green]"
+            timing = f"~{result['expected_exit_quarter']:.0f}Q"
+        table.add_row(
+            result['company'],
+            f"${result['exit_now']:,.0f}",
+            f"${result['hold_value']:,.0f}",
+            advice_str,
+            timing
+        )
+        
+    console.print(table)
+
+
+def display_deal_shortlist(plan: Dict[str, Any]) -> None:
+    """
+    Display the deal optimizer's ranked shortlist.
+    
+    Args:
+        plan: Result of simulation.deal_optimizer.optimize_deals
+    """
+    table = Table(title=f"Best Use of ${plan['budget']:,.0f} Available Capital")
+    table.add_column("#", style="dim")
+    table.add_column("Company", style="cyan")
+    table.add_column("Sector", style="magenta")
+    table.add_column("Tier")
+    table.add_column("Price", justify="right", style="yellow")
+    table.add_column("Expected Gain", justify="right", style="green")
+    table.add_column("Risk-Adj. Score", justify="right")
+    table.add_column("Pick", justify="center")
+    
+    for i, candidate in enumerate(plan['shortlist'], 1):
+        table.add_row(
+            str(i),
+            candidate['company'].name,
+            candidate['sector'],
+            candidate['tier'],
+            f"${candidate['price']:,.0f}",
+            f"${candidate['expected_gain']:,.0f}",
+            f"${candidate['score']:,.0f}",
+            "[bold green]✓[/bold green]" if candidate['selected'] else ""
+        )
+        
+    console.print(table)
+    
+    if plan['selected']:
+        print(f"Optimal set: {len(plan['selected'])} deals costing ${plan['total_cost']:,.0f} "
+              f"(risk-adjusted value ${plan['expected_value']:,.0f}, "
+              f"debt cost ${plan['financing_cost']:,.0f})")
+
+
+def display_screen_results(results: List[tuple]) -> None:
+    """
+    Display deal screening matches.
+    
+    Args:
+        results: (sector, tier, index, company) listings
+    """
+    table = Table(title="Screened Deals")
+    table.add_column("#", style="dim")
+    table.add_column("Company", style="cyan")
+    table.add_column("Sector", style="magenta")
+    table.add_column("Tier")
+    table.add_column("Valuation", justify="right", style="bold green")
+    table.add_column("Margin", justify="right", style="yellow")
+    table.add_column("Growth", justify="right", style="blue")
+    table.add_column("Mgr. Competence", justify="right")
+    
+    for i, (sector, tier, index, company) in enumerate(results, 1):
+        table.add_row(
+            str(i),
+            company.name,
+            sector,
+            tier,
+            f"${company.current_valuation:,.0f}",
+            f"{company.ebitda_margin:.1%}",
+            f"{company.growth_rate:.1%}",
+            f"{company.manager.competence:.0%}"
+        )
+        
+    console.print(table)
+
+
+def display_company_detail(company: Company, comps: Dict[str, Any] = None,
+                           dcf: Dict[str, Any] = None, sensitivity: Dict[str, Any] = None) -> None:
+    """
+    Display detailed information about a company.
+    
+    Args:
+        company: Company to display
+        comps: Optional comparable-company result (ComparableIndex.query)
+        dcf: Optional DCF valuation range (dcf.calculate_dcf_distribution)
+        sensitivity: Optional DCF sensitivity (dcf_sensitivity.sensitivity_report)
+    """
     # Financial metrics
     financial_table = Table(title=f"{company.name} - Financial Metrics", show_header=False)
     financial_table.add_column("Metric", style="cyan")
@@ -146,6 +293,10 @@ def display_company_detail(company: Company) -> None:
     financial_table.add_row("Quarterly Growth", f"{company.get_quarterly_growth():+.1%}")
     financial_table.add_row("Current Valuation", f"${company.current_valuation:,.0f}")
     
+    if dcf:
+        financial_table.add_row("DCF Value", f"${dcf['point']:,.0f}")
+        financial_table.add_row("DCF Range", format_dcf_range(dcf))
+        
     if company.acquisition_price:
         financial_table.add_row("Acquisition Price", f"${company.acquisition_price:,.0f}")
         value_change = company.current_valuation - company.acquisition_price
@@ -165,6 +316,118 @@ def display_company_detail(company: Company) -> None:
     mgmt_table.add_row("Cooperativeness", f"{company.manager.cooperativeness:.1%}")
     
     console.print(mgmt_table)
+    
+    if sensitivity:
+        display_dcf_sensitivity(sensitivity)
+        
+    if comps and comps['comps']:
+        display_comps(company, comps)
+
+
+# Display names of the DCF sensitivity inputs
+DCF_INPUT_LABELS = {
+    'discount_rate': "Discount Rate",
+    'terminal_growth': "Terminal Growth",
+    'growth': "Growth (qtr)",
+    'margin': "EBITDA Margin",
+    'capex_rate': "Capex / Revenue",
+    'nwc_rate': "NWC / Revenue",
+    'tax_rate': "Tax Rate",
+    'years': "Projection Years"
+}
+
+# Heat-table cell styles by change from the base value (upper bound, style)
+DCF_HEAT_STYLES = [
+    (-0.20, "bold white on red3"),
+    (-0.05, "black on light_salmon1"),
+    (0.05, "black on grey70"),
+    (0.20, "black on pale_green3"),
+    (math.inf, "bold white on green4")
+]
+
+
+def format_dcf_input(name: str, value: float) -> str:
+    """A DCF input as shown in sensitivity tables ("10.5%", or "8 yrs" for the horizon)."""
+    return f"{value:.0f} yrs" if name == 'years' else f"{value:.1%}"
+
+
+def display_dcf_sensitivity(sensitivity: Dict[str, Any]) -> None:
+    """
+    Display a DCF sensitivity heat table and tornado.
+    
+    Grid cells are shaded by their change from the value at today's
+    inputs; the tornado lists the secondary assumptions, widest swing first.
+    
+    Args:
+        sensitivity: Result of simulation.dcf_sensitivity.sensitivity_report
+    """
+    grid = sensitivity['grid']
+    base = grid['base']
+    rows, cols = grid['rows'], grid['cols']
+    
+    table = Table(title=f"DCF Sensitivity ($M) - {DCF_INPUT_LABELS[rows]} x {DCF_INPUT_LABELS[cols]}")
+    table.add_column(DCF_INPUT_LABELS[rows], style="cyan")
+    for value in grid['col_values']:
+        table.add_column(format_dcf_input(cols, value), justify="right")
+        
+    for i, row_value in enumerate(grid['row_values']):
+        cells = []
+        for value in grid['values'][i]:
+            change = value / base - 1 if base > 0 else 0.0
+            style = next(style for bound, style in DCF_HEAT_STYLES if change < bound)
+            cells.append(f"[{style}]${value / 1_000_000:,.1f}M[/]")
+        table.add_row(format_dcf_input(rows, row_value), *cells)
+        
+    console.print(table)
+    
+    bars = sensitivity['tornado']['bars']
+    if not bars:
+        return
+        
+    widest = max(bar['swing'] for bar in bars) or 1.0
+    tornado = Table(title=f"DCF Tornado ($M, base ${sensitivity['tornado']['base'] / 1_000_000:,.1f}M)")
+    tornado.add_column("Assumption", style="cyan")
+    tornado.add_column("Low", justify="right")
+    tornado.add_column("High", justify="right")
+    tornado.add_column("Swing", style="yellow")
+    
+    for bar in bars:
+        width = max(1, round(16 * bar['swing'] / widest))
+        tornado.add_row(
+            DCF_INPUT_LABELS.get(bar['input'], bar['input']),
+            f"{format_dcf_input(bar['input'], bar['low_value'])}: ${bar['low'] / 1_000_000:,.1f}M",
+            f"{format_dcf_input(bar['input'], bar['high_value'])}: ${bar['high'] / 1_000_000:,.1f}M",
+            f"{'█' * width} ${bar['swing'] / 1_000_000:,.1f}M"
+        )
+        
+    console.print(tornado)
+
+
+def format_dcf_range(dcf: Dict[str, Any]) -> str:
+    """Outer percentile band of a DCF distribution, e.g. "$8,190,187 - $141,279,825 (P10-P90)"."""
+    labels = list(dcf['bands'])
+    low, high = labels[0], labels[-1]
+    return f"${dcf['bands'][low]:,.0f} - ${dcf['bands'][high]:,.0f} ({low.upper()}-{high.upper()})"
+
+
+def display_comps(company: Company, comps: Dict[str, Any]) -> None:
+    """Display a company's nearest comparable companies and the valuation they imply."""
+    table = Table(title="Comparable Companies")
+    table.add_column("Company", style="cyan")
+    table.add_column("Sector", style="magenta")
+    table.add_column("Source", style="dim")
+    table.add_column("EV/EBITDA", justify="right", style="yellow")
+    
+    for comp in comps['comps']:
+        table.add_row(comp['name'], comp['sector'], comp['source'], f"{comp['multiple']:.1f}x")
+        
+    console.print(table)
+    
+    implied = comps['implied_valuation']
+    line = f"Median comp multiple: {comps['median_multiple']:.1f}x -> implied value ${implied:,.0f}"
+    if company.current_valuation > 0:
+        line += f" ({implied / company.current_valuation - 1:+.0%} vs. current valuation)"
+    console.print(line)
 
 
 def display_market_conditions(market: Market) -> None:
@@ -236,6 +499,12 @@ def display_player_summary(player: Player) -> None:
     summary_table.add_row("Portfolio Companies", str(len(player.portfolio)))
     summary_table.add_row("Reputation", f"{player.reputation:.1%}")
     
+    fund = player.fund_metrics()
+    if fund['paid_in'] > 0:
+        summary_table.add_row("TVPI / DPI", f"{fund['tvpi']:.2f}x / {fund['dpi']:.2f}x")
+        irr_text = "n/a" if math.isnan(fund['irr']) else f"{fund['irr']:.1%}"
+        summary_table.add_row("Fund IRR", irr_text)
+    
     console.print(summary_table)
 
 
@@ -262,3 +531,44 @@ def display_deal_history(player: Player) -> None:
         
     console.print(history_table)
 
+
+def display_risk_report(report: Dict[str, Any]) -> None:
+    """
+    Display portfolio Value-at-Risk by horizon and the sources of tail losses.
+    
+    Args:
+        report: Result of simulation.portfolio_risk.risk_report
+    """
+    confidence = report['confidence']
+    title = f"Portfolio Risk ({confidence:.0%} confidence, {report['trials']:,} paths)"
+    if report['boosts']:
+        title += " - Stress Test"
+    table = Table(title=title)
+    table.add_column("Horizon")
+    table.add_column("Value-at-Risk", justify="right", style="yellow")
+    table.add_column("Expected Shortfall", justify="right", style="red")
+    table.add_column("Missed Interest", justify="right")
+    
+    for horizon in report['horizons']:
+        table.add_row(
+            f"{horizon['quarter']} quarter{'s' if horizon['quarter'] > 1 else ''}",
+            f"${horizon['var']:,.0f}",
+            f"${horizon['expected_shortfall']:,.0f}",
+            f"{horizon['miss_probability']:.1%}"
+        )
+        
+    console.print(table)
+    
+    if report['boosts']:
+        boosts = ", ".join(f"{name.replace('_', ' ')} x{boost:.1f}" for name, boost in report['boosts'].items())
+        print(f"Oversampled: {boosts} (results reweighted)")
+        
+    if report['contributions']:
+        contributions = Table(title="Contribution to Expected Shortfall")
+        contributions.add_column("Source", style="cyan")
+        contributions.add_column("Loss in Tail", justify="right", style="red")
+        contributions.add_column("Share", justify="right")
+        total = sum(amount for _, amount in report['contributions'])
+        for name, amount in report['contributions'][:10]:
+            contributions.add_row(name, f"${amount:,.0f}", f"{amount / total:.0%}" if total else "-")
+        console.print(contributions)